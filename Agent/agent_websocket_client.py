@@ -10,8 +10,10 @@ import logging
 import signal
 import sys
 from system_collector import SystemCollector
+from modules.alert_monitor import get_alert_monitor
 import uuid
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -31,6 +33,22 @@ class ITSMAgent:
 
         self.last_scan_time = 0
 
+        # Commands run in worker threads so the event loop stays responsive
+        self.load_command_config()
+        self.command_executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_commands + 1,
+            thread_name_prefix='ws-command'
+        )
+        self.command_slots = asyncio.Semaphore(self.max_concurrent_commands)
+        self.active_commands = {}
+
+        # Alerts are pushed as soon as a rule changes state
+        self.load_alert_config()
+        if self.push_alerts:
+            self.capabilities.append('alertPush')
+        self.loop = None
+        self.alert_monitor = None
+
     def load_autonomous_config(self):
         """Load autonomous scanning configuration"""
         try:
@@ -49,6 +67,66 @@ class ITSMAgent:
             self.scan_interval = 300
             self.scan_type = 'ping'
 
+    def load_command_config(self):
+        """Load remote command execution limits"""
+        # Per-command timeouts in seconds, overridable as <command>_timeout
+        self.command_timeouts = {
+            'collectSystemInfo': 300,
+            'networkScan': 900,
+            'syncAD': 600
+        }
+        try:
+            from configparser import ConfigParser
+            config = ConfigParser()
+            config.read('config.ini')
+
+            self.max_concurrent_commands = config.getint('websocket', 'max_concurrent_commands', fallback=2)
+            self.command_timeout = config.getint('websocket', 'command_timeout', fallback=120)
+            self.progress_interval = config.getint('websocket', 'progress_interval', fallback=15)
+            for command in self.command_timeouts:
+                self.command_timeouts[command] = config.getint(
+                    'websocket', f'{command}_timeout', fallback=self.command_timeouts[command]
+                )
+        except Exception as e:
+            logger.warning(f"Could not load command config, using defaults: {e}")
+            self.max_concurrent_commands = 2
+            self.command_timeout = 120
+            self.progress_interval = 15
+
+    def load_alert_config(self):
+        """Load real-time alert push settings"""
+        try:
+            from configparser import ConfigParser
+            config = ConfigParser()
+            config.read('config.ini')
+
+            self.push_alerts = config.getboolean('alerting', 'push_alerts', fallback=False)
+            self.alert_sample_interval = config.getfloat('alerting', 'sample_interval', fallback=5.0)
+        except Exception as e:
+            logger.warning(f"Could not load alerting config, using defaults: {e}")
+            self.push_alerts = False
+            self.alert_sample_interval = 5.0
+
+    def start_alert_push(self):
+        """Subscribe to the alert monitor so alerts go out over the WebSocket immediately"""
+        self.loop = asyncio.get_running_loop()
+        self.alert_monitor = get_alert_monitor()
+        self.alert_monitor.interval = self.alert_sample_interval
+        self.alert_monitor.add_listener(self.on_alert_event)
+        logger.info(f"Pushing alerts in real time (sampling every {self.alert_sample_interval}s)")
+
+    def on_alert_event(self, event, alert):
+        """Forward an alert state change from the monitor thread to the event loop"""
+        if not self.loop or self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.send_message({
+            'type': 'agent-alert',
+            'agentId': self.agent_id,
+            'event': event,
+            'alert': alert,
+            'timestamp': datetime.utcnow().isoformat()
+        }), self.loop)
+
     async def connect(self):
         """Connect to the ITSM server via WebSocket"""
         try:
@@ -128,7 +206,11 @@ class ITSMAgent:
             logger.info("💓 Started ping loop task")
 
             # Listen for messages
-            await self.listen_for_messages()
+            try:
+                await self.listen_for_messages()
+            finally:
+                # Responses for in-flight commands can't be delivered any more
+                self.cancel_all_commands()
 
         except websockets.exceptions.ConnectionClosed as e:
             logger.error(f"🔌 Connection closed: {e}")
@@ -181,35 +263,77 @@ class ITSMAgent:
 
         elif message_type == 'command':
             logger.info(f"Received command: {data.get('command')} with requestId: {data.get('requestId')}")
-            await self.handle_command(data)
+            self.dispatch_command(data)
+
+        elif message_type == 'cancel-command':
+            request_id = data.get('requestId')
+            if not self.cancel_command(request_id):
+                logger.warning(f"No running command with requestId: {request_id}")
 
         else:
             logger.warning(f"Unknown message type: {message_type}, data: {data}")
 
+    def dispatch_command(self, data):
+        """Run a command in the background so message handling never blocks"""
+        request_id = data.get('requestId')
+        if request_id in self.active_commands:
+            logger.warning(f"Command {request_id} is already running, ignoring duplicate")
+            return None
+
+        task = asyncio.create_task(self.handle_command(data))
+        self.active_commands[request_id] = task
+        task.add_done_callback(lambda _: self.active_commands.pop(request_id, None))
+        return task
+
+    def cancel_command(self, request_id):
+        """Cancel a queued or running command"""
+        task = self.active_commands.get(request_id)
+        if not task or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def cancel_all_commands(self):
+        """Cancel every queued or running command"""
+        for request_id in list(self.active_commands):
+            self.cancel_command(request_id)
+
+    def get_command_timeout(self, command):
+        """Get the timeout in seconds for a command"""
+        return self.command_timeouts.get(command, self.command_timeout)
+
     async def handle_command(self, data):
         """Handle remote commands"""
         request_id = data.get('requestId')
         command = data.get('command')
         params = data.get('params', {})
-
-        logger.info(f"Executing command: {command} with params: {params}")
+        timeout = self.get_command_timeout(command)
+
+        handlers = {
+            'syncAD': lambda progress: self.sync_active_directory(params.get('config', {})),
+            'testADConnection': lambda progress: self.test_ad_connection(params),
+            'getADStatus': lambda progress: self.get_ad_status(),
+            'collectSystemInfo': lambda progress: self.system_collector.collect_all(),
+            'networkScan': lambda progress: self.perform_network_scan(params, progress)
+        }
 
         try:
-            if command == 'syncAD':
-                result = self.sync_active_directory(params.get('config', {}))
-            elif command == 'testADConnection':
-                result = self.test_ad_connection(params)
-            elif command == 'getADStatus':
-                result = self.get_ad_status()
-            elif command == 'collectSystemInfo':
-                result = self.system_collector.collect_all()
-            elif command == 'networkScan':
-                result = self.perform_network_scan(params)
-            else:
+            handler = handlers.get(command)
+            if handler is None:
                 result = {'success': False, 'error': f'Unknown command: {command}'}
+            else:
+                if self.command_slots.locked():
+                    await self.send_progress(request_id, command, 'queued')
+
+                async with self.command_slots:
+                    logger.info(f"Executing command: {command} with params: {params} (timeout {timeout}s)")
+                    result = await asyncio.wait_for(
+                        self.run_with_progress(request_id, command, handler),
+                        timeout=timeout
+                    )
 
             # Send response back to server
-            await self.websocket.send(json.dumps({
+            await self.send_message({
                 'type': 'command-response',
                 'requestId': request_id,
                 'payload': {
@@ -217,20 +341,94 @@ class ITSMAgent:
                     'data': result,
                     'error': result.get('error') if not result.get('success', True) else None
                 }
-            }))
+            })
+
+        except asyncio.TimeoutError:
+            logger.error(f"Command {command} ({request_id}) timed out after {timeout}s")
+            await self.send_message({
+                'type': 'command-response',
+                'requestId': request_id,
+                'payload': {
+                    'success': False,
+                    'status': 'timeout',
+                    'error': f'Command timed out after {timeout} seconds'
+                }
+            })
+
+        except asyncio.CancelledError:
+            logger.info(f"Command {command} ({request_id}) cancelled")
+            await self.send_message({
+                'type': 'command-response',
+                'requestId': request_id,
+                'payload': {
+                    'success': False,
+                    'status': 'cancelled',
+                    'error': 'Command cancelled'
+                }
+            })
 
         except Exception as e:
             logger.error(f"Command execution error: {e}")
-            await self.websocket.send(json.dumps({
+            await self.send_message({
                 'type': 'command-response',
                 'requestId': request_id,
                 'payload': {
                     'success': False,
                     'error': str(e)
                 }
-            }))
+            })
+
+    async def run_with_progress(self, request_id, command, handler):
+        """Run a blocking handler in the executor, sending periodic progress messages.
 
-    def perform_network_scan(self, params):
+        The handler receives a thread-safe progress(stage, **details) callback.
+        Cancelling the coroutine abandons the worker thread's result; threads
+        that have already started run to completion in the background.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+
+        def progress(stage, **details):
+            asyncio.run_coroutine_threadsafe(
+                self.send_progress(request_id, command, stage, **details), loop
+            )
+
+        future = loop.run_in_executor(self.command_executor, handler, progress)
+        await self.send_progress(request_id, command, 'running')
+
+        while True:
+            done, _ = await asyncio.wait({future}, timeout=self.progress_interval)
+            if done:
+                return future.result()
+            await self.send_progress(
+                request_id, command, 'running',
+                elapsed_seconds=round(time.monotonic() - started, 1)
+            )
+
+    async def send_progress(self, request_id, command, stage, **details):
+        """Send a command-progress message for a long-running command"""
+        await self.send_message({
+            'type': 'command-progress',
+            'requestId': request_id,
+            'command': command,
+            'stage': stage,
+            'timestamp': datetime.utcnow().isoformat(),
+            **details
+        })
+
+    async def send_message(self, message):
+        """Send a message if connected, logging instead of raising on failure"""
+        if not self.websocket:
+            logger.warning(f"WebSocket not connected - dropping {message.get('type')} message")
+            return False
+        try:
+            await self.websocket.send(json.dumps(message))
+            return True
+        except Exception as e:
+            logger.error(f"Error sending {message.get('type')} message: {e}")
+            return False
+
+    def perform_network_scan(self, params, progress=None):
         """Perform network scan on the specified subnet"""
         try:
             subnet = params.get('subnet')
@@ -238,6 +436,8 @@ class ITSMAgent:
             session_id = params.get('session_id')
 
             logger.info(f"Starting network scan for subnet: {subnet}, type: {scan_type}, session: {session_id}")
+            if progress:
+                progress('scanning', subnet=subnet)
 
             # Use the enhanced network scan method
             scan_result = self.system_collector.collect_network_scan(subnet=subnet, scan_type=scan_type)
@@ -247,6 +447,8 @@ class ITSMAgent:
                 return {'success': False, 'error': scan_result['error']}
 
             logger.info(f"Network scan completed. Found {scan_result.get('total_devices_found', 0)} devices")
+            if progress:
+                progress('collecting_local_info', devices_found=scan_result.get('total_devices_found', 0))
 
             # Get local system info for the agent itself
             try:
@@ -312,8 +514,10 @@ class ITSMAgent:
             logger.info("🔍 Starting autonomous network scan...")
             self.last_scan_time = current_time
 
+            loop = asyncio.get_running_loop()
+
             # Get local network info to determine subnet
-            system_info = self.system_collector.collect_all()
+            system_info = await loop.run_in_executor(self.command_executor, self.system_collector.collect_all)
             local_subnet = None
             local_ip = None
 
@@ -335,7 +539,7 @@ class ITSMAgent:
             logger.info(f"📡 Scanning local subnet: {local_subnet} from IP: {local_ip}")
 
             # Perform network scan
-            scan_result = self.perform_network_scan({
+            scan_result = await loop.run_in_executor(self.command_executor, self.perform_network_scan, {
                 'subnet': local_subnet,
                 'scan_type': 'ping',
                 'session_id': f"auto_scan_{int(current_time)}",
@@ -377,6 +581,9 @@ class ITSMAgent:
         logger.info(f"Starting ITSM Agent {self.agent_id}")
         logger.info(f"🤖 Autonomous network scanning: {'Enabled' if self.auto_scan_enabled else 'Disabled'}")
 
+        if self.push_alerts:
+            self.start_alert_push()
+
         # Start scan loop
         if self.auto_scan_enabled:
             scan_task = asyncio.create_task(self.scan_loop())
@@ -394,6 +601,10 @@ class ITSMAgent:
     def stop(self):
         """Stop the agent"""
         self.running = False
+        self.cancel_all_commands()
+        if self.alert_monitor:
+            self.alert_monitor.remove_listener(self.on_alert_event)
+        self.command_executor.shutdown(wait=False, cancel_futures=True)
         if self.websocket:
             asyncio.create_task(self.websocket.close())
 
@@ -9,11 +9,17 @@ import logging
 import requests
 from urllib.parse import urljoin
 
+from report_delta import compute_delta, normalize_snapshot
+from report_inventory import InventoryTracker
+from report_encoding import encode_payload, parse_accept_encoding, CONTENT_TYPES
+
 
 class APIClient:
     """Client for communicating with ITSM API"""
     
-    def __init__(self, base_url, auth_token, timeout=30, retry_attempts=3, retry_delay=5):
+    def __init__(self, base_url, auth_token, timeout=30, retry_attempts=3, retry_delay=5,
+                 report_mode='full', full_report_every=24, compression='gzip', body_format='json',
+                 min_compress_size=1024, inventory_mode='full'):
         """Initialize API client with configuration"""
         self.base_url = base_url.rstrip('/')
         self.auth_token = auth_token
@@ -22,6 +28,33 @@ class APIClient:
         self.retry_delay = retry_delay
         self.logger = logging.getLogger('APIClient')
         
+        # Incremental reporting state
+        self.report_mode = report_mode
+        self.full_report_every = full_report_every
+        self.report_sequence = 0
+        self.acked_sequence = None
+        self.acked_snapshot = None
+        self.deltas_since_full = 0
+        self.force_full_report = False
+        
+        # Software inventories sent as fingerprints and change sets
+        self.inventory_mode = inventory_mode
+        self.inventory = InventoryTracker()
+        
+        # Report transport encoding and metrics
+        self.compression = compression
+        self.body_format = body_format
+        self.min_compress_size = min_compress_size
+        self.transport_metrics = {
+            'requests': 0,
+            'raw_bytes': 0,
+            'encoded_bytes': 0,
+            'encode_ms': 0.0,
+            'last_request': None
+        }
+        
+        self.last_status_code = None
+        
         # Setup session with default headers
         self.session = requests.Session()
         self.session.headers.update({
@@ -32,16 +65,225 @@ class APIClient:
     
     def report_system_info(self, system_info):
         """Report system information to the API"""
-        endpoint = '/api/report'
-        url = urljoin(self.base_url, endpoint)
+        snapshot = normalize_snapshot(system_info)
+        
+        if self._should_send_delta():
+            result = self._send_delta_report(self._compact_inventory(snapshot))
+            if result is not None:
+                return result
+        
+        result = self._send_full_report(self._compact_inventory(snapshot))
+        if result is None:
+            # The inventory change set was not understood, resend with full inventories
+            result = self._send_full_report(self._compact_inventory(snapshot))
+        return result
+    
+    def _compact_inventory(self, snapshot):
+        """Replace inventories with fingerprints or change sets when inventory diffing is on"""
+        if self.inventory_mode != 'diff':
+            return snapshot
+        return self.inventory.compact(snapshot)
+    
+    def _accept_inventory(self, report, response):
+        """Promote the report's inventories to the diff base once the server has them.
+        
+        Returns False when the report relied on the base but the server did
+        not acknowledge its inventory fingerprint.
+        """
+        if self.inventory_mode != 'diff':
+            return True
+        if self.inventory.is_compacted(report):
+            if self._get_response_field(response, 'inventory_fingerprint') != report['inventory']['fingerprint']:
+                self.logger.warning("Inventory change set was not acknowledged, falling back to full inventories")
+                self.inventory_mode = 'full'
+                self.inventory.reset()
+                return False
+        self.inventory.acknowledge()
+        if self._response_requests_full_report(response):
+            self.inventory.reset()
+        return True
+    
+    def _should_send_delta(self):
+        """Check whether the next report can be sent as a delta"""
+        return (
+            self.report_mode == 'delta'
+            and self.acked_snapshot is not None
+            and not self.force_full_report
+            and self.deltas_since_full < self.full_report_every
+        )
+    
+    def _send_full_report(self, snapshot):
+        """Send a full report snapshot and remember it once acknowledged.
+        
+        Returns None when the server ignored an inventory change set.
+        """
+        url = urljoin(self.base_url, '/api/report')
+        self.report_sequence += 1
+        sequence = self.report_sequence
+        
+        success, response = self._post_report(
+            url, snapshot,
+            headers={'X-Report-Type': 'full', 'X-Report-Sequence': str(sequence)}
+        )
+        
+        if success:
+            if not self._accept_inventory(snapshot, response):
+                return None
+            self.acked_snapshot = snapshot
+            self.acked_sequence = sequence
+            self.deltas_since_full = 0
+            self.force_full_report = self._response_requests_full_report(response)
+        
+        return success
+    
+    def _send_delta_report(self, snapshot):
+        """Send the changes since the last acknowledged snapshot.
+        
+        Returns None when the server needs a full snapshot instead.
+        """
+        operations = compute_delta(self.acked_snapshot, snapshot)
+        self.report_sequence += 1
+        sequence = self.report_sequence
+        
+        delta_report = {
+            'hostname': snapshot.get('hostname'),
+            'report_type': 'delta',
+            'sequence': sequence,
+            'base_sequence': self.acked_sequence,
+            'timestamp': snapshot.get('timestamp'),
+            'patch': operations
+        }
+        
+        # A delta that is not smaller than the snapshot is not worth sending
+        if len(json.dumps(delta_report)) >= len(json.dumps(snapshot)):
+            self.logger.debug("Delta is not smaller than full snapshot, sending full report")
+            return None
+        
+        url = urljoin(self.base_url, '/api/report/delta')
+        success, response = self._post_report(
+            url, delta_report,
+            headers={'X-Report-Type': 'delta', 'X-Report-Sequence': str(sequence)}
+        )
+        
+        if response is not None and response.status_code in [404, 409, 410]:
+            # Server has no matching base snapshot or does not support deltas
+            self.logger.info(f"Server rejected delta report ({response.status_code}), sending full snapshot")
+            if response.status_code == 404:
+                self.report_mode = 'full'
+            else:
+                # The server lost its base, including the inventories
+                self.inventory.reset()
+            return None
+        
+        if success:
+            if self._response_requests_full_report(response):
+                self.logger.info("Server requested a full snapshot")
+                self.inventory.reset()
+                return None
+            if self._get_response_field(response, 'acknowledged_sequence') != sequence:
+                # Anything other than an explicit acknowledgement means deltas are not understood
+                self.logger.warning("Delta report was not acknowledged, falling back to full reports")
+                self.report_mode = 'full'
+                return None
+            if not self._accept_inventory(snapshot, response):
+                return None
+            self.acked_snapshot = snapshot
+            self.acked_sequence = sequence
+            self.deltas_since_full += 1
+            self.logger.info(f"Sent delta report with {len(operations)} changes (sequence {sequence})")
+        
+        return success
+    
+    def _post_report(self, url, payload, headers):
+        """POST a report with the configured encoding, falling back to plain JSON if refused"""
+        body, encoding_headers, metrics = encode_payload(
+            payload, self.body_format, self.compression, self.min_compress_size
+        )
+        self._record_transport_metrics(metrics)
+        
+        success, response = self._request_with_retry(
+            'POST', url, data=body, headers={**headers, **encoding_headers}
+        )
+        
+        if not success and self._encoding_rejected(response, metrics):
+            self.logger.warning(
+                f"Server refused {metrics['format']}/{metrics['compression']} report body "
+                f"({response.status_code}), retrying as {self.body_format}/{self.compression}"
+            )
+            return self._post_report(url, payload, headers)
+        
+        return success, response
+    
+    def _encoding_rejected(self, response, metrics):
+        """Check whether a failed response refused the body encoding, narrowing it if so"""
+        if response is None or (metrics['format'] == 'json' and metrics['compression'] == 'identity'):
+            return False
+        
+        # 415 is an explicit refusal; a 400 for a binary body usually means it was not parsed
+        if response.status_code != 415 and not (response.status_code == 400 and metrics['format'] != 'json'):
+            return False
+        
+        accepted_encodings = parse_accept_encoding(response.headers.get('Accept-Encoding'))
+        accepted_types = response.headers.get('Accept', '')
+        
+        if metrics['compression'] != 'identity' and metrics['compression'] not in accepted_encodings:
+            self.compression = 'gzip' if 'gzip' in accepted_encodings and metrics['compression'] != 'gzip' else 'identity'
+        if metrics['format'] != 'json' and CONTENT_TYPES[metrics['format']] not in accepted_types:
+            self.body_format = 'json'
+        
+        if self.compression == metrics['compression'] and self.body_format == metrics['format']:
+            # The server did not say what it accepts, use plain JSON
+            self.compression = 'identity'
+            self.body_format = 'json'
         
-        return self._make_request_with_retry('POST', url, json=system_info)
+        return True
+    
+    def _record_transport_metrics(self, metrics):
+        """Accumulate raw vs. encoded size and encode time"""
+        self.transport_metrics['requests'] += 1
+        self.transport_metrics['raw_bytes'] += metrics['raw_bytes']
+        self.transport_metrics['encoded_bytes'] += metrics['encoded_bytes']
+        self.transport_metrics['encode_ms'] = round(self.transport_metrics['encode_ms'] + metrics['encode_ms'], 3)
+        self.transport_metrics['last_request'] = metrics
+        
+        self.logger.debug(
+            f"Encoded report as {metrics['format']}/{metrics['compression']}: "
+            f"{metrics['raw_bytes']} -> {metrics['encoded_bytes']} bytes in {metrics['encode_ms']}ms"
+        )
+    
+    def get_transport_metrics(self):
+        """Get cumulative report transport metrics"""
+        metrics = dict(self.transport_metrics)
+        if metrics['raw_bytes']:
+            metrics['overall_ratio'] = round(metrics['encoded_bytes'] / metrics['raw_bytes'], 4)
+        return metrics
+    
+    def _response_requests_full_report(self, response):
+        """Check whether the server asked for a full snapshot on the next report"""
+        return bool(self._get_response_field(response, 'full_snapshot_required'))
+    
+    def _get_response_field(self, response, field):
+        """Get a field from a JSON object response, or None"""
+        if response is None:
+            return None
+        try:
+            response_data = response.json()
+        except ValueError:
+            return None
+        return response_data.get(field) if isinstance(response_data, dict) else None
     
     def _make_request_with_retry(self, method, url, **kwargs):
         """Make HTTP request with retry logic and exponential backoff"""
+        success, _ = self._request_with_retry(method, url, **kwargs)
+        return success
+    
+    def _request_with_retry(self, method, url, **kwargs):
+        """Make HTTP request with retry logic, returning (success, last response)"""
         last_exception = None
+        response = None
         
         for attempt in range(self.retry_attempts):
+            self.last_status_code = None
             try:
                 self.logger.info(f"Making {method} request to {url} (attempt {attempt + 1}/{self.retry_attempts})")
                 
@@ -54,6 +296,7 @@ class APIClient:
                 )
                 
                 # Log the response
+                self.last_status_code = response.status_code
                 self.logger.info(f"Response status: {response.status_code}")
                 
                 # Check if request was successful
@@ -64,12 +307,12 @@ class APIClient:
                         self.logger.debug(f"Response data: {response_data}")
                     except json.JSONDecodeError:
                         self.logger.debug("Response is not JSON")
-                    return True
+                    return True, response
                 
-                elif response.status_code in [400, 401, 403, 404]:
+                elif response.status_code in [400, 401, 403, 404, 409, 410, 413, 422]:
                     # Client errors - don't retry
                     self.logger.error(f"Client error {response.status_code}: {response.text}")
-                    return False
+                    return False, response
                 
                 else:
                     # Server errors - retry
@@ -100,7 +343,7 @@ class APIClient:
         
         # All attempts failed
         self.logger.error(f"All {self.retry_attempts} attempts failed. Last error: {last_exception}")
-        return False
+        return False, response
     
     def test_connection(self):
         """Test connection to the API"""
@@ -118,6 +118,10 @@ def create_installation_directory():
         'linux_collector.py',
         'macos_collector.py',
         'api_client.py',
+        'report_delta.py',
+        'report_encoding.py',
+        'report_inventory.py',
+        'report_outbox.py',
         'service_wrapper.py',
         'config.ini'
     ]
@@ -139,6 +143,17 @@ def create_installation_directory():
     if copied_files == 0:
         print("Error: No files were copied")
         return None
+
+    # The collection modules package is imported at startup
+    modules_dir = install_dir / 'modules'
+    if (script_dir / 'modules').is_dir():
+        if modules_dir.exists():
+            shutil.rmtree(modules_dir)
+        shutil.copytree(script_dir / 'modules', modules_dir, ignore=shutil.ignore_patterns('__pycache__'))
+        print("✓ Copied modules/")
+    else:
+        print("Error: Source directory not found: modules")
+        return None
     
     print(f"Successfully copied {copied_files}/{len(files_to_copy)} files")
     return install_dir
@@ -213,6 +228,15 @@ try:
     print('[OK] system_collector imported')
 except ImportError as e:
     print('[ERROR] system_collector import failed:', e)
+    sys.exit(1)
+
+try:
+    import api_client
+    import modules.module_manager
+    print('[OK] api_client and modules imported')
+except ImportError as e:
+    print('[ERROR] agent module import failed:', e)
+    sys.exit(1)
 
 print('[OK] Import test completed')
 """
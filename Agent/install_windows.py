@@ -64,6 +64,10 @@ def create_installation_directory():
         'linux_collector.py',
         'macos_collector.py',
         'api_client.py',
+        'report_delta.py',
+        'report_encoding.py',
+        'report_inventory.py',
+        'report_outbox.py',
         'service_wrapper.py',
         'config.ini',
         'fix_windows_service.py'
@@ -81,6 +85,16 @@ def create_installation_directory():
             print(f"✗ Source file not found: {file_name}")
             return None
 
+    # The collection modules package is imported at startup
+    modules_dir = install_dir / 'modules'
+    if not (script_dir / 'modules').is_dir():
+        print("✗ Source directory not found: modules")
+        return None
+    if modules_dir.exists():
+        shutil.rmtree(modules_dir)
+    shutil.copytree(script_dir / 'modules', modules_dir, ignore=shutil.ignore_patterns('__pycache__'))
+    print("✓ Copied modules/")
+
     return install_dir
 
 
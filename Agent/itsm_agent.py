@@ -16,6 +16,9 @@ from pathlib import Path
 
 from system_collector import SystemCollector
 from api_client import APIClient
+from report_outbox import ReportOutbox, OutboxSender
+from modules.change_events import ChangeMonitor
+from modules.shell_broker import get_shell_broker
 from service_wrapper import ServiceWrapper
 
 
@@ -28,6 +31,7 @@ class ITSMAgent:
         self.config = ConfigParser()
         self.running = False
         self.shutdown_event = threading.Event()
+        self.wake_event = threading.Event()
 
         # Load configuration
         self._load_config()
@@ -40,12 +44,60 @@ class ITSMAgent:
         self.api_client = APIClient(
             base_url=self.config.get('api', 'base_url'),
             auth_token=self.config.get('api', 'auth_token'),
-            timeout=self.config.getint('api', 'timeout', fallback=30)
+            timeout=self.config.getint('api', 'timeout', fallback=30),
+            retry_attempts=self.config.getint('api', 'retry_attempts', fallback=3),
+            retry_delay=self.config.getint('api', 'retry_delay', fallback=5),
+            report_mode=self.config.get('api', 'report_mode', fallback='full'),
+            full_report_every=self.config.getint('api', 'full_report_every', fallback=24),
+            inventory_mode=self.config.get('api', 'inventory_mode', fallback='full'),
+            compression=self.config.get('api', 'compression', fallback='gzip'),
+            body_format=self.config.get('api', 'body_format', fallback='json')
         )
 
         # Collection interval in seconds
         self.collection_interval = self.config.getint('agent', 'collection_interval', fallback=600)
 
+        # Scheduler tick for per-module collection schedules
+        self.scheduler_tick = self.config.getint('agent', 'scheduler_tick', fallback=30)
+        self.latest_module_data = None
+
+        # Collection modules run only when listed; reports are built from the scheduled sections
+        report_modules = self.config.get('agent', 'report_modules', fallback='')
+        self.report_modules = self.system_collector.set_report_modules(
+            [name.strip() for name in report_modules.split(',') if name.strip()]
+        )
+
+        # Metric history for trend analysis survives restarts when a path is set
+        metrics_history_path = self.config.get('agent', 'metrics_history_path', fallback='history')
+        if metrics_history_path:
+            self.system_collector.set_metrics_history_path(metrics_history_path)
+
+        # Event-driven change detection (USB, disks, network) on top of the schedule
+        self.change_monitor = None
+        self.event_report_min_interval = self.config.getint('agent', 'event_report_min_interval', fallback=60)
+        if self.config.getboolean('agent', 'event_driven', fallback=True):
+            self.change_monitor = ChangeMonitor(on_change=lambda modules: self.wake_event.set())
+
+        # Long-lived shell sessions for probe commands; 0 spawns a process per command
+        get_shell_broker().pool_size = self.config.getint('agent', 'shell_workers', fallback=2)
+
+        # Durable outbox so collection never waits on the network
+        self.report_outbox = None
+        self.outbox_sender = None
+        try:
+            self.report_outbox = ReportOutbox(
+                path=self.config.get('agent', 'outbox_path', fallback='outbox/reports.db'),
+                max_bytes=self.config.getint('agent', 'outbox_max_size', fallback=52428800)
+            )
+            self.outbox_sender = OutboxSender(
+                self.report_outbox,
+                self.api_client,
+                batch_size=self.config.getint('agent', 'outbox_batch_size', fallback=10),
+                base_delay=self.config.getint('api', 'retry_delay', fallback=5)
+            )
+        except Exception as e:
+            self.logger.warning(f"Report outbox unavailable, reporting directly: {e}")
+
         self.logger.info("ITSM Agent initialized successfully")
 
     def _load_config(self):
@@ -54,6 +106,16 @@ class ITSMAgent:
         defaults = {
             'agent': {
                 'collection_interval': '600',  # 10 minutes
+                'scheduler_tick': '30',
+                'report_modules': '',
+                'event_driven': 'true',
+                'event_report_min_interval': '60',
+                'event_poll_interval': '3600',
+                'metrics_history_path': 'history',
+                'outbox_path': 'outbox/reports.db',
+                'outbox_max_size': '52428800',  # 50MB
+                'outbox_batch_size': '10',
+                'shell_workers': '2',
                 'log_level': 'INFO',
                 'log_max_size': '10485760',  # 10MB
                 'log_backup_count': '5'
@@ -63,7 +125,12 @@ class ITSMAgent:
                 'auth_token': os.getenv('ITSM_AUTH_TOKEN', 'your-auth-token-here'),
                 'timeout': '30',
                 'retry_attempts': '3',
-                'retry_delay': '5'
+                'retry_delay': '5',
+                'report_mode': 'full',
+                'full_report_every': '24',
+                'inventory_mode': 'full',
+                'compression': 'gzip',
+                'body_format': 'json'
             }
         }
 
@@ -149,13 +216,43 @@ class ITSMAgent:
                 # Signal handlers may not work in all environments
                 self.logger.warning(f"Could not set signal handlers: {e}")
 
+        # Start draining any reports queued before the last shutdown
+        if self.outbox_sender:
+            self.outbox_sender.start()
+
+        self._start_change_monitor()
+
         # Main collection loop
+        next_report_time = 0
+        last_report_time = 0
         while self.running and not self.shutdown_event.is_set():
             try:
-                self._collect_and_report()
-
-                # Wait for next collection or shutdown
-                if self.shutdown_event.wait(timeout=self.collection_interval):
+                # Modules with detected changes are collected right away
+                dirty_modules = self.change_monitor.consume_dirty() if self.change_monitor else set()
+                if dirty_modules:
+                    self.system_collector.mark_modules_dirty(dirty_modules)
+                    # Report promptly, but no more often than event_report_min_interval
+                    next_report_time = min(next_report_time, last_report_time + self.event_report_min_interval)
+
+                # Refresh only the enabled modules whose schedule is due
+                if self.report_modules:
+                    module_data = self.system_collector.collect_due_modules()
+                    if module_data is not None:
+                        self.latest_module_data = module_data
+
+                if time.time() >= next_report_time:
+                    self._collect_and_report()
+                    last_report_time = time.time()
+                    next_report_time = last_report_time + self.collection_interval
+
+                # Wait for the next due module, the next report, a change event or shutdown
+                wait_time = next_report_time - time.time()
+                next_module_due = self.system_collector.get_seconds_until_next_module_due() if self.report_modules else None
+                if next_module_due is not None:
+                    wait_time = min(wait_time, max(next_module_due, self.scheduler_tick))
+                self.wake_event.wait(timeout=max(wait_time, 1))
+                self.wake_event.clear()
+                if self.shutdown_event.is_set():
                     break  # Shutdown requested
 
             except Exception as e:
@@ -163,6 +260,15 @@ class ITSMAgent:
                 # Brief pause before retrying
                 time.sleep(30)
 
+        if self.change_monitor:
+            self.change_monitor.stop()
+        if self.outbox_sender:
+            self.outbox_sender.stop()
+            self.outbox_sender.join(timeout=5)
+        if self.report_outbox:
+            self.report_outbox.close()
+        get_shell_broker().close()
+
         self.logger.info("ITSM Agent stopped")
 
     def stop(self):
@@ -170,14 +276,31 @@ class ITSMAgent:
         self.logger.info("Stopping ITSM Agent...")
         self.running = False
         self.shutdown_event.set()
+        self.wake_event.set()
+
+    def _start_change_monitor(self):
+        """Start change event sources and relax polling for the modules they cover"""
+        if not self.change_monitor:
+            return
+
+        active_sources = self.change_monitor.start()
+        if not active_sources:
+            self.logger.info("No change event sources available, relying on scheduled collection")
+            return
+
+        self.logger.info(f"Change detection active: {', '.join(active_sources)}")
+        # USB changes are reported by events; polling remains only as a safety net
+        event_poll_interval = self.config.getint('agent', 'event_poll_interval', fallback=3600)
+        self.system_collector.set_module_interval('usb', event_poll_interval)
+        self.system_collector.set_section_interval('usb_devices', event_poll_interval)
 
     def _collect_and_report(self):
         """Collect system information and report to API"""
         try:
             self.logger.info("Starting system information collection...")
 
-            # Collect system information
-            system_info = self.system_collector.collect_all()
+            # Refresh the report sections that are due and reuse the rest
+            system_info = self.system_collector.collect_report()
 
             self.logger.info(f"Collected information for {len(system_info)} categories")
 
@@ -192,6 +315,30 @@ class ITSMAgent:
                 if 'usage_percentage' not in memory_data and 'percent' in memory_data:
                     memory_data['usage_percentage'] = memory_data['percent']
 
+            # Merge the latest fresh and cached sections of the enabled modules
+            if self.report_modules and self.latest_module_data:
+                system_info['modules'] = {
+                    name: data for name, data in self.latest_module_data.items()
+                    if not name.startswith('_') and name != 'timestamp'
+                }
+                system_info['_module_status'] = self.latest_module_data.get('_module_status', {})
+                system_info['_collection_status'].update({
+                    'modular': True,
+                    'collection_time': self.latest_module_data.get('timestamp'),
+                    'fresh_modules': self.latest_module_data['_collection_metadata'].get('fresh_modules', []),
+                    'cached_modules': self.latest_module_data['_collection_metadata'].get('cached_modules', [])
+                })
+
+            # Queue the report for the background sender
+            if self.report_outbox:
+                try:
+                    self.report_outbox.enqueue(system_info)
+                    self.outbox_sender.notify()
+                    self.logger.info(f"Queued system information for reporting ({self.report_outbox.get_stats()['pending']} pending)")
+                    return
+                except Exception as e:
+                    self.logger.error(f"Could not queue report, sending directly: {e}")
+
             # Report to API
             success = self.api_client.report_system_info(system_info)
 
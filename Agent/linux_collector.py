@@ -6,10 +6,12 @@ Linux-specific system information gathering
 import os
 import platform
 import subprocess
-import psutil
 import logging
 from datetime import datetime
 import shutil
+from modules.process_snapshot import get_process_snapshot
+from modules.log_tail import get_package_history, tail_lines
+from modules.package_db import get_package_database, rpm_version
 
 
 class LinuxCollector:
@@ -41,24 +43,13 @@ class LinuxCollector:
 
             # Last update time
             try:
-                if os.path.exists('/var/log/apt/history.log'):
-                    result = subprocess.run(['tail', '-n', '50', '/var/log/apt/history.log'], 
-                                            capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        lines = result.stdout.strip().split('\n')
-                        for line in reversed(lines):
-                            if line.startswith('Start-Date:'):
-                                info['last_update'] = line.split(':', 1)[1].strip()
-                                break
-
-                elif os.path.exists('/var/log/dnf.log') or os.path.exists('/var/log/yum.log'):
-                    log_file = '/var/log/dnf.log' if os.path.exists('/var/log/dnf.log') else '/var/log/yum.log'
-                    result = subprocess.run(['tail', '-n', '10', log_file], 
-                                            capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        lines = result.stdout.strip().split('\n')
-                        if lines:
-                            info['last_update'] = ' '.join(lines[-1].split()[0:2])
+                history = get_package_history().get()
+                if history['records']:
+                    info['last_update'] = history['records'][-1]['date']
+                elif os.path.exists('/var/log/dnf.log'):
+                    lines = tail_lines('/var/log/dnf.log', 1)
+                    if lines:
+                        info['last_update'] = ' '.join(lines[-1].split()[0:2])
             except Exception:
                 pass
 
@@ -86,40 +77,27 @@ class LinuxCollector:
 
                     # Get recent update history with more details
                     try:
-                        if os.path.exists('/var/log/apt/history.log'):
-                            result = subprocess.run(['grep', '-E', '(Start-Date|Install|Upgrade):', '/var/log/apt/history.log'], 
-                                                    capture_output=True, text=True, timeout=15)
-                            if result.returncode == 0:
-                                recent_updates = []
-                                lines = result.stdout.strip().split('\n')
-
-                                # Parse the log to get meaningful update entries
-                                current_update = None
-                                for line in lines[-50:]:  # Last 50 lines for context
-                                    if line.startswith('Start-Date:'):
-                                        if current_update:
-                                            recent_updates.append(current_update)
-                                        current_update = {
-                                            "date": line.replace('Start-Date:', '').strip(),
-                                            "type": "system_update",
-                                            "packages": []
-                                        }
-                                    elif current_update and (line.startswith('Install:') or line.startswith('Upgrade:')):
-                                        # Extract package names from install/upgrade lines
-                                        action = "Install" if line.startswith('Install:') else "Upgrade"
-                                        packages = line.split(':', 1)[1].strip()
-                                        current_update["action"] = action
-                                        current_update["package"] = f"{action}: {packages[:100]}..."  # Truncate long lists
-
-                                if current_update:
-                                    recent_updates.append(current_update)
-
-                                # Keep only the last 5 updates
-                                recent_updates = recent_updates[-5:] if recent_updates else []
-
-                                if recent_updates:
-                                    patch_summary["recent_patches"] = recent_updates
-                                    patch_summary["last_update_date"] = recent_updates[-1]["date"]
+                        history = get_package_history().get()
+                        if history['manager'] == 'apt':
+                            recent_updates = []
+                            for record in history['records'][-5:]:
+                                update = {
+                                    "date": record['date'],
+                                    "type": "system_update",
+                                    "packages": [package['name'] for action in ('install', 'upgrade')
+                                                 for package in record['actions'].get(action, [])]
+                                }
+                                for action in ('upgrade', 'install'):
+                                    if action in record['actions']:
+                                        names = ', '.join(package['name'] for package in record['actions'][action])
+                                        update["action"] = action.capitalize()
+                                        update["package"] = f"{update['action']}: {names[:100]}..."  # Truncate long lists
+                                        break
+                                recent_updates.append(update)
+
+                            if recent_updates:
+                                patch_summary["recent_patches"] = recent_updates
+                                patch_summary["last_update_date"] = recent_updates[-1]["date"]
                     except Exception:
                         pass
 
@@ -337,13 +315,8 @@ class LinuxCollector:
             # Antivirus status (basic check for common AV)
             av_processes = ['clamav', 'rkhunter', 'chkrootkit']
             info['antivirus_status'] = 'unknown'
-            for proc in psutil.process_iter(['name']):
-                try:
-                    if any(av in proc.info['name'].lower() for av in av_processes):
-                        info['antivirus_status'] = 'enabled'
-                        break
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            if get_process_snapshot().has_name_containing(av_processes):
+                info['antivirus_status'] = 'enabled'
 
             return info
         except Exception as e:
@@ -355,43 +328,48 @@ class LinuxCollector:
         try:
             software = []
 
+            database = get_package_database()
+            dpkg_packages = database.packages('dpkg')
+            rpm_packages = database.packages('rpm')
+
             # Try different package managers
-            if os.path.exists('/usr/bin/dpkg'):
+            if dpkg_packages is not None:
                 # Debian/Ubuntu
-                result = subprocess.run([
-                    'dpkg', '-l'
-                ], capture_output=True, text=True, timeout=60)
-
-                if result.returncode == 0:
-                    for line in result.stdout.split('\n'):
-                        if line.startswith('ii'):
-                            parts = line.split()
-                            if len(parts) >= 3:
-                                software.append({
-                                    'name': parts[1],
-                                    'version': parts[2],
-                                    'vendor': 'debian'
-                                })
+                for package in dpkg_packages:
+                    software.append({
+                        'name': package['name'],
+                        'version': package.get('version'),
+                        'vendor': 'debian'
+                    })
+
+            elif rpm_packages is not None:
+                # RedHat/CentOS/Fedora
+                for package in rpm_packages:
+                    software.append({
+                        'name': package['name'],
+                        'version': package.get('version'),
+                        'vendor': package.get('vendor')
+                    })
 
             elif os.path.exists('/usr/bin/rpm'):
-                # RedHat/CentOS/Fedora
+                # Berkeley DB rpm databases (rpm < 4.16) are read through rpm itself,
+                # with versions in the same [epoch:]version-release form as the sqlite reader
                 result = subprocess.run([
-                    'rpm', '-qa', '--queryformat', '%{NAME}|%{VERSION}|%{VENDOR}\n'
+                    'rpm', '-qa', '--queryformat', '%{NAME}|%{EPOCH}|%{VERSION}|%{RELEASE}|%{VENDOR}\n'
                 ], capture_output=True, text=True, timeout=60)
 
                 if result.returncode == 0:
                     for line in result.stdout.split('\n'):
                         if '|' in line:
                             parts = line.split('|')
-                            if len(parts) >= 3:
+                            if len(parts) >= 5:
                                 software.append({
                                     'name': parts[0],
-                                    'version': parts[1],
-                                    'vendor': parts[2]
+                                    'version': rpm_version(parts[2], parts[3], parts[1]),
+                                    'vendor': parts[4]
                                 })
 
-            # Limit to top 50 packages to avoid overwhelming the API
-            return software[:50]
+            return software
         except Exception as e:
             self.logger.error(f"Error getting Linux software info: {e}")
             return []
@@ -9,6 +9,7 @@ import subprocess
 import psutil
 import logging
 from datetime import datetime
+from modules.process_snapshot import get_process_snapshot
 
 
 class MacOSCollector:
@@ -226,13 +227,8 @@ class MacOSCollector:
             # Basic antivirus detection (look for common processes)
             av_processes = ['sophos', 'avast', 'avg', 'norton', 'mcafee']
             info['antivirus_status'] = 'unknown'
-            for proc in psutil.process_iter(['name']):
-                try:
-                    if any(av in proc.info['name'].lower() for av in av_processes):
-                        info['antivirus_status'] = 'enabled'
-                        break
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            if get_process_snapshot().has_name_containing(av_processes):
+                info['antivirus_status'] = 'enabled'
 
             return info
         except Exception as e:
@@ -0,0 +1,315 @@
+"""
+Alert Monitor for ITSM Agent
+Samples live metrics every few seconds and evaluates alert rules as a stream
+"""
+
+import time
+import fnmatch
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+import psutil
+
+from .cpu_sampler import get_cpu_sampler
+from .net_io import get_net_io_snapshot
+from .disk_io import is_tracked_partition
+from .alert_state import alert_fingerprint
+
+
+DEFAULT_THRESHOLDS = {
+    'cpu_critical': 90,
+    'cpu_warning': 75,
+    'memory_critical': 85,
+    'memory_warning': 70,
+    'disk_critical': 90,
+    'disk_warning': 80,
+    'network_error_rate': 5,
+    'memory_growth_rate': 10,  # percentage points per minute
+    'disk_growth_rate': 2      # percentage points per minute
+}
+
+# Seconds a condition must hold before the alert fires
+DEFAULT_DURATIONS = {
+    'CPU_CRITICAL': 120,
+    'CPU_WARNING': 300,
+    'MEMORY_CRITICAL': 60,
+    'MEMORY_WARNING': 300,
+    'DISK_CRITICAL': 0,
+    'DISK_WARNING': 0,
+    'NETWORK_ERRORS': 60,
+    'MEMORY_GROWTH': 0,
+    'DISK_GROWTH': 0
+}
+
+# Percentage points a value must fall below the threshold before an alert clears
+DEFAULT_HYSTERESIS = 5
+
+class AlertRule:
+    """A threshold or rate-of-change condition on one metric (or a metric pattern).
+
+    A rule fires once value >= threshold has held for duration seconds and
+    clears when value drops below clear_threshold. With rate_window set the
+    rule is evaluated on the change per minute over that many seconds.
+    """
+
+    def __init__(self, alert_type: str, metric: str, threshold: float, severity: str,
+                 duration: float = 0, clear_threshold: Optional[float] = None,
+                 rate_window: Optional[float] = None, message: Optional[str] = None):
+        self.alert_type = alert_type
+        self.metric = metric
+        self.threshold = threshold
+        self.severity = severity
+        self.duration = duration
+        self.clear_threshold = threshold if clear_threshold is None else clear_threshold
+        self.rate_window = rate_window
+        self.message = message or '{label} at {value}'
+
+    def matches(self, metric_name: str) -> bool:
+        """Check if the rule applies to a concrete metric name"""
+        return fnmatch.fnmatchcase(metric_name, self.metric)
+
+
+def build_default_rules(thresholds: Dict[str, float], durations: Optional[Dict[str, float]] = None,
+                        hysteresis: float = DEFAULT_HYSTERESIS) -> List[AlertRule]:
+    """Build the standard CPU, memory, disk and network rules from a thresholds dict"""
+    thresholds = {**DEFAULT_THRESHOLDS, **thresholds}
+    durations = {**DEFAULT_DURATIONS, **(durations or {})}
+
+    def level(alert_type, metric, key, severity, message):
+        return AlertRule(alert_type, metric, thresholds[key], severity, durations[alert_type],
+                         clear_threshold=thresholds[key] - hysteresis, message=message)
+
+    return [
+        level('CPU_CRITICAL', 'cpu.percent', 'cpu_critical', 'critical', 'CPU usage at {value}%'),
+        level('CPU_WARNING', 'cpu.percent', 'cpu_warning', 'warning', 'CPU usage at {value}%'),
+        level('MEMORY_CRITICAL', 'memory.percent', 'memory_critical', 'critical', 'Memory usage at {value}%'),
+        level('MEMORY_WARNING', 'memory.percent', 'memory_warning', 'warning', 'Memory usage at {value}%'),
+        level('DISK_CRITICAL', 'disk.*.percent', 'disk_critical', 'critical', 'Disk {label} usage at {value}%'),
+        level('DISK_WARNING', 'disk.*.percent', 'disk_warning', 'warning', 'Disk {label} usage at {value}%'),
+        AlertRule('NETWORK_ERRORS', 'network.error_rate', thresholds['network_error_rate'], 'warning',
+                  durations['NETWORK_ERRORS'], clear_threshold=thresholds['network_error_rate'] / 2,
+                  message='Network error rate at {value}%'),
+        AlertRule('MEMORY_GROWTH', 'memory.percent', thresholds['memory_growth_rate'], 'warning',
+                  durations['MEMORY_GROWTH'], clear_threshold=thresholds['memory_growth_rate'] / 2,
+                  rate_window=60, message='Memory usage rising {value} points per minute'),
+        AlertRule('DISK_GROWTH', 'disk.*.percent', thresholds['disk_growth_rate'], 'warning',
+                  durations['DISK_GROWTH'], clear_threshold=thresholds['disk_growth_rate'] / 2,
+                  rate_window=120, message='Disk {label} filling {value} points per minute')
+    ]
+
+
+class AlertMonitor(threading.Thread):
+    """Samples metrics every interval seconds and evaluates alert rules on each sample.
+
+    Listeners are called with (event, alert) where event is 'fired' or
+    'resolved', from the monitor thread, as soon as a rule changes state.
+    """
+
+    def __init__(self, interval: float = 5.0, rules: Optional[List[AlertRule]] = None):
+        super().__init__(name='alert-monitor', daemon=True)
+        self.interval = interval
+        self.rules = rules if rules is not None else build_default_rules({})
+        self.logger = logging.getLogger('AlertMonitor')
+        self.latest_metrics = {}
+        self._active = {}
+        self._pending = {}
+        self._history = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._partitions = []
+        self._partitions_checked = 0.0
+
+    def run(self):
+        """Sample and evaluate until stopped"""
+        while not self._stop_event.is_set():
+            try:
+                self.evaluate(self.sample_metrics())
+            except Exception as e:
+                self.logger.debug(f"Alert evaluation failed: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        """Stop sampling"""
+        self._stop_event.set()
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Register a callback for alert state changes"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Unregister a callback"""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def set_rules(self, rules: List[AlertRule]):
+        """Replace the rule set, dropping state of rules that no longer exist"""
+        with self._lock:
+            self.rules = rules
+            types = {rule.alert_type for rule in rules}
+            self._active = {key: alert for key, alert in self._active.items() if key[0] in types}
+            self._pending = {key: since for key, since in self._pending.items() if key[0] in types}
+
+    def active_alerts(self) -> List[Dict[str, Any]]:
+        """Get alerts whose condition currently holds"""
+        with self._lock:
+            return [dict(alert) for alert in self._active.values()]
+
+    def sample_metrics(self) -> Dict[str, float]:
+        """Read current CPU, memory, disk and network metrics without blocking"""
+        metrics = {'cpu.percent': get_cpu_sampler().current_percent()}
+
+        vmem = psutil.virtual_memory()
+        metrics['memory.percent'] = vmem.percent
+        metrics['swap.percent'] = psutil.swap_memory().percent
+
+        # Partition list changes rarely; re-read it once a minute
+        now = time.monotonic()
+        if now - self._partitions_checked > 60:
+            self._partitions = [
+                partition.mountpoint for partition in psutil.disk_partitions(all=False)
+                if is_tracked_partition(partition)
+            ]
+            self._partitions_checked = now
+        for mountpoint in self._partitions:
+            try:
+                metrics[f'disk.{mountpoint}.percent'] = psutil.disk_usage(mountpoint).percent
+            except (PermissionError, OSError):
+                continue
+
+        # Shared with the collectors; a snapshot from this interval is reused
+        net_rates = get_net_io_snapshot(max_age=self.interval / 2).totals().get('rates')
+        if net_rates:
+            metrics['network.error_rate'] = net_rates['error_rate_percent']
+            if 'max_utilization_percent' in net_rates:
+                metrics['network.utilization_percent'] = net_rates['max_utilization_percent']
+
+        return metrics
+
+    def evaluate(self, metrics: Dict[str, float], timestamp: Optional[float] = None) -> List[tuple]:
+        """Evaluate every rule against one sample; returns the (event, alert) transitions"""
+        timestamp = time.time() if timestamp is None else timestamp
+        events = []
+
+        with self._lock:
+            self.latest_metrics = dict(metrics)
+            self._record_history(metrics, timestamp)
+
+            for rule in self.rules:
+                for metric_name, raw_value in metrics.items():
+                    if raw_value is None or not rule.matches(metric_name):
+                        continue
+                    value = self._rate_per_minute(metric_name, rule.rate_window, timestamp) if rule.rate_window else raw_value
+                    if value is None:
+                        continue
+                    event = self._evaluate_rule(rule, metric_name, value, timestamp)
+                    if event:
+                        events.append(event)
+            listeners = list(self._listeners)
+
+        for event, alert in events:
+            self.logger.info(f"Alert {event}: {alert['type']} {alert['message']}")
+            for listener in listeners:
+                try:
+                    listener(event, dict(alert))
+                except Exception as e:
+                    self.logger.error(f"Alert listener failed: {e}")
+        return events
+
+    def _evaluate_rule(self, rule: AlertRule, metric_name: str, value: float, timestamp: float) -> Optional[tuple]:
+        key = (rule.alert_type, metric_name)
+        active = self._active.get(key)
+
+        if active:
+            if value < rule.clear_threshold:
+                del self._active[key]
+                active.update(self._alert_values(rule, metric_name, value))
+                active['resolved_at'] = datetime.utcfromtimestamp(timestamp).isoformat()
+                return 'resolved', active
+            active.update(self._alert_values(rule, metric_name, value))
+            return None
+
+        if value < rule.threshold:
+            self._pending.pop(key, None)
+            return None
+
+        since = self._pending.setdefault(key, timestamp)
+        if timestamp - since < rule.duration:
+            return None
+
+        del self._pending[key]
+        alert = self._create_alert(rule, metric_name, value, since)
+        self._active[key] = alert
+        return 'fired', alert
+
+    def _alert_values(self, rule: AlertRule, metric_name: str, value: float) -> Dict[str, Any]:
+        label = metric_name[len('disk.'):-len('.percent')] if metric_name.startswith('disk.') else metric_name
+        value = round(value, 2)
+        return {
+            'value': value,
+            'message': rule.message.format(label=label, value=value)
+        }
+
+    def _create_alert(self, rule: AlertRule, metric_name: str, value: float, since: float) -> Dict[str, Any]:
+        """Create a standardized alert"""
+        alert = {
+            'id': f"{rule.alert_type}_{alert_fingerprint({'type': rule.alert_type, 'metric': metric_name})}",
+            'type': rule.alert_type,
+            'severity': rule.severity,
+            'metric': metric_name,
+            'threshold': rule.threshold,
+            'condition_since': datetime.utcfromtimestamp(since).isoformat(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'acknowledged': False,
+            'source': 'agent_monitoring'
+        }
+        alert['fingerprint'] = alert_fingerprint(alert)
+        alert.update(self._alert_values(rule, metric_name, value))
+        return alert
+
+    def _record_history(self, metrics: Dict[str, float], timestamp: float):
+        """Keep enough samples per metric for the longest rate window"""
+        horizon = max((rule.rate_window for rule in self.rules if rule.rate_window), default=0)
+        if not horizon:
+            return
+        for name, value in metrics.items():
+            if value is None:
+                continue
+            history = self._history.setdefault(name, deque())
+            history.append((timestamp, value))
+            while len(history) > 1 and timestamp - history[1][0] >= horizon:
+                history.popleft()
+
+    def _rate_per_minute(self, metric_name: str, window: float, timestamp: float) -> Optional[float]:
+        """Change per minute over roughly the last window seconds"""
+        history = self._history.get(metric_name)
+        if not history or len(history) < 2:
+            return None
+        start_time, start_value = history[0]
+        for sample_time, sample_value in history:
+            if timestamp - sample_time <= window:
+                break
+            start_time, start_value = sample_time, sample_value
+        elapsed = timestamp - start_time
+        if elapsed < window / 2:
+            return None
+        return (history[-1][1] - start_value) / elapsed * 60
+
+
+_monitor_lock = threading.Lock()
+_monitor: Optional[AlertMonitor] = None
+
+
+def get_alert_monitor() -> AlertMonitor:
+    """Get the shared alert monitor, starting it on first use"""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = AlertMonitor()
+            _monitor.start()
+        return _monitor
@@ -0,0 +1,230 @@
+"""
+Alert State for ITSM Agent
+Fingerprint-based alert lifecycle, suppression expiry index and flap detection
+"""
+
+import heapq
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+
+OPEN = 'open'
+ACKNOWLEDGED = 'acknowledged'
+RESOLVED = 'resolved'
+
+
+def alert_fingerprint(alert: Dict[str, Any]) -> str:
+    """Stable identity of an alert condition: its type and the metric it watches"""
+    key = f"{alert.get('type')}|{alert.get('metric', '')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.utcfromtimestamp(timestamp).isoformat()
+
+
+class SuppressionIndex:
+    """Suppression windows keyed by string, expired in deadline order.
+
+    Lookups are a dict hit. Expiry pops a min-heap of (deadline, key) so
+    only windows that have actually ended are visited; entries replaced by
+    a newer deadline are skipped lazily.
+    """
+
+    def __init__(self):
+        self._deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def suppress(self, key: str, until: float):
+        """Suppress key until the given timestamp"""
+        self._deadlines[key] = until
+        heapq.heappush(self._heap, (until, key))
+
+    def lift(self, key: str):
+        """End a suppression early"""
+        self._deadlines.pop(key, None)
+
+    def expire(self, now: float) -> List[str]:
+        """Drop suppressions whose deadline has passed; returns the expired keys"""
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            until, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == until:
+                del self._deadlines[key]
+                expired.append(key)
+        # Rebuild when lazily deleted entries dominate the heap
+        if len(self._heap) > 2 * len(self._deadlines) + 16:
+            self._heap = [(until, key) for key, until in self._deadlines.items()]
+            heapq.heapify(self._heap)
+        return expired
+
+    def is_suppressed(self, key: str, now: float) -> bool:
+        """Check if key is suppressed at now"""
+        until = self._deadlines.get(key)
+        return until is not None and until > now
+
+    def active(self) -> Dict[str, float]:
+        """Get current suppressions and their deadlines"""
+        return dict(self._deadlines)
+
+
+class AlertTracker:
+    """Deduplicates alert observations into one record per fingerprint.
+
+    Each record moves open -> acknowledged -> resolved. A condition that
+    holds across many cycles stays one record whose value and update count
+    change; it only produces a new occurrence after it has resolved. A
+    condition that toggles flap_threshold times within flap_window seconds
+    is marked flapping and held open until it has been stable for a full
+    window, so it does not open and resolve a ticket on every toggle.
+    """
+
+    def __init__(self, flap_threshold: int = 4, flap_window: float = 600, max_resolved: int = 200,
+                 history_size: int = 100):
+        self.flap_threshold = flap_threshold
+        self.flap_window = flap_window
+        self.max_resolved = max_resolved
+        self.logger = logging.getLogger('AlertTracker')
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.resolved: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.history = deque(maxlen=history_size)
+        self.suppressions = SuppressionIndex()
+        self._transitions: Dict[str, deque] = {}
+        self._present: Dict[str, bool] = {}
+        self._changes = self._empty_changes()
+        self._lock = threading.Lock()
+
+    def observe(self, alerts: List[Dict[str, Any]], now: float) -> Dict[str, List[Dict[str, Any]]]:
+        """Fold the currently firing alerts into the tracked state.
+
+        Returns {'opened', 'resolved'} with the records that changed state in
+        this observation.
+        """
+        opened, resolved = [], []
+        with self._lock:
+            self.suppressions.expire(now)
+            current = {}
+            for alert in alerts:
+                current[alert.get('fingerprint') or alert_fingerprint(alert)] = alert
+
+            for fingerprint, alert in current.items():
+                self._note_presence(fingerprint, True, now)
+                record = self.records.get(fingerprint)
+                if record is None:
+                    record = self._open(fingerprint, alert, now)
+                    opened.append(record)
+                else:
+                    self._update(record, alert, now)
+
+            for fingerprint, record in list(self.records.items()):
+                if fingerprint in current:
+                    continue
+                self._note_presence(fingerprint, False, now)
+                if self._is_flapping(fingerprint, now):
+                    record['flapping'] = True
+                    continue
+                resolved.append(self._resolve(fingerprint, now))
+
+            for fingerprint, record in self.records.items():
+                if record.get('flapping') and fingerprint in current and not self._is_flapping(fingerprint, now):
+                    record['flapping'] = False
+
+            self._changes['opened'].extend(opened)
+            self._changes['resolved'].extend(resolved)
+
+        return {'opened': opened, 'resolved': resolved}
+
+    def consume_changes(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Get and clear the records opened or resolved since the last call"""
+        with self._lock:
+            changes, self._changes = self._changes, self._empty_changes()
+        return {kind: list(records) for kind, records in changes.items()}
+
+    def _empty_changes(self) -> Dict[str, deque]:
+        # Bounded in case nobody consumes them
+        return {'opened': deque(maxlen=self.history.maxlen), 'resolved': deque(maxlen=self.history.maxlen)}
+
+    def _note_presence(self, fingerprint: str, present: bool, now: float):
+        """Record a transition when a condition appears or disappears"""
+        if self._present.get(fingerprint) == present:
+            return
+        self._present[fingerprint] = present
+        transitions = self._transitions.setdefault(fingerprint, deque(maxlen=self.flap_threshold * 2))
+        transitions.append(now)
+
+    def _is_flapping(self, fingerprint: str, now: float) -> bool:
+        transitions = self._transitions.get(fingerprint, ())
+        recent = sum(1 for timestamp in transitions if now - timestamp <= self.flap_window)
+        return recent >= self.flap_threshold
+
+    def _open(self, fingerprint: str, alert: Dict[str, Any], now: float) -> Dict[str, Any]:
+        previous = self.resolved.pop(fingerprint, None)
+        occurrence = previous['occurrence'] + 1 if previous else 1
+        record = dict(alert)
+        record.update({
+            'id': f"{fingerprint}-{occurrence}",
+            'fingerprint': fingerprint,
+            'occurrence': occurrence,
+            'state': OPEN,
+            'first_seen': _isoformat(now),
+            'last_seen': _isoformat(now),
+            'updates': 0,
+            'flapping': False
+        })
+        self.records[fingerprint] = record
+        self.history.append({'event': 'opened', 'id': record['id'], 'type': record.get('type'), 'timestamp': record['first_seen']})
+        return record
+
+    def _update(self, record: Dict[str, Any], alert: Dict[str, Any], now: float):
+        for key in ('value', 'message', 'severity'):
+            if key in alert:
+                record[key] = alert[key]
+        record['last_seen'] = _isoformat(now)
+        record['updates'] += 1
+
+    def _resolve(self, fingerprint: str, now: float) -> Dict[str, Any]:
+        record = self.records.pop(fingerprint)
+        record['state'] = RESOLVED
+        record['flapping'] = False
+        record['resolved_at'] = _isoformat(now)
+        self.resolved[fingerprint] = record
+        while len(self.resolved) > self.max_resolved:
+            old_fingerprint, _ = self.resolved.popitem(last=False)
+            self._transitions.pop(old_fingerprint, None)
+            self._present.pop(old_fingerprint, None)
+        self.history.append({'event': 'resolved', 'id': record['id'], 'type': record.get('type'), 'timestamp': record['resolved_at']})
+        return record
+
+    def acknowledge(self, alert_id: str) -> bool:
+        """Acknowledge an open alert by id or fingerprint"""
+        with self._lock:
+            for fingerprint, record in self.records.items():
+                if alert_id in (record['id'], fingerprint) and record['state'] == OPEN:
+                    record['state'] = ACKNOWLEDGED
+                    record['acknowledged'] = True
+                    self.history.append({'event': 'acknowledged', 'id': record['id'], 'type': record.get('type'),
+                                         'timestamp': datetime.utcnow().isoformat()})
+                    return True
+        return False
+
+    def suppress(self, key: str, until: float):
+        """Suppress alerts matching key (a fingerprint or "TYPE_severity") until a timestamp"""
+        with self._lock:
+            self.suppressions.suppress(key, until)
+
+    def is_suppressed(self, record: Dict[str, Any], now: float) -> bool:
+        """Check the record's fingerprint and type/severity against active suppressions"""
+        return (self.suppressions.is_suppressed(record['fingerprint'], now) or
+                self.suppressions.is_suppressed(f"{record.get('type')}_{record.get('severity')}", now))
+
+    def active(self) -> List[Dict[str, Any]]:
+        """Get open and acknowledged records"""
+        with self._lock:
+            return [dict(record) for record in self.records.values()]
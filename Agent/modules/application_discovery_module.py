@@ -4,6 +4,7 @@ Application Discovery & Monitoring Module
 Automatically detects and monitors business applications and services
 """
 
+import os
 import logging
 import platform
 import subprocess
@@ -13,11 +14,16 @@ import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from .base_module import BaseModule
+from .process_snapshot import get_process_snapshot
+from .package_db import get_package_database
+from .process_cache import get_process_cache
 
 
 class ApplicationDiscoveryModule(BaseModule):
     """Application discovery and monitoring module"""
     
+    collection_interval = 21600  # seconds
+    
     def __init__(self):
         super().__init__('ApplicationDiscovery')
         self.is_windows = platform.system().lower() == 'windows'
@@ -161,52 +167,38 @@ class ApplicationDiscoveryModule(BaseModule):
     
     def _get_apt_packages(self) -> List[Dict[str, Any]]:
         """Get APT packages (Debian/Ubuntu)"""
-        packages = []
-        
-        try:
-            result = subprocess.run(['dpkg', '-l'], capture_output=True, text=True, timeout=30)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n')[5:]:  # Skip header lines
-                    if line.strip() and line.startswith('ii'):
-                        parts = line.split()
-                        if len(parts) >= 3:
-                            packages.append({
-                                'name': parts[1],
-                                'version': parts[2],
-                                'platform': 'Linux',
-                                'package_manager': 'APT',
-                                'discovery_method': 'Package Manager'
-                            })
-        except Exception as e:
-            self.logger.debug(f"APT not available or error: {e}")
-            
-        return packages
+        return self._packages_from_database('dpkg', 'APT')
     
     def _get_yum_packages(self) -> List[Dict[str, Any]]:
         """Get YUM/DNF packages (RedHat/CentOS/Fedora)"""
+        if get_package_database().available('rpm'):
+            return self._packages_from_database('rpm', 'RPM')
+        
         packages = []
         
         try:
-            # Try dnf first, then yum
-            for cmd in ['dnf', 'yum']:
-                try:
-                    result = subprocess.run([cmd, 'list', 'installed'], 
-                                          capture_output=True, text=True, timeout=30)
-                    if result.returncode == 0:
-                        for line in result.stdout.split('\n'):
-                            if '.' in line and not line.startswith('Installed'):
-                                parts = line.split()
-                                if len(parts) >= 2:
-                                    packages.append({
-                                        'name': parts[0].split('.')[0],
-                                        'version': parts[1],
-                                        'platform': 'Linux',
-                                        'package_manager': cmd.upper(),
-                                        'discovery_method': 'Package Manager'
-                                    })
-                        break  # If one succeeds, don't try the other
-                except Exception:
-                    continue
+            # Berkeley DB rpm databases (rpm < 4.16) are only readable through the package manager
+            if os.path.exists('/var/lib/rpm'):
+                # Try dnf first, then yum
+                for cmd in ['dnf', 'yum']:
+                    try:
+                        result = subprocess.run([cmd, 'list', 'installed'], 
+                                              capture_output=True, text=True, timeout=30)
+                        if result.returncode == 0:
+                            for line in result.stdout.split('\n'):
+                                if '.' in line and not line.startswith('Installed'):
+                                    parts = line.split()
+                                    if len(parts) >= 2:
+                                        packages.append({
+                                            'name': parts[0].split('.')[0],
+                                            'version': parts[1],
+                                            'platform': 'Linux',
+                                            'package_manager': cmd.upper(),
+                                            'discovery_method': 'Package Manager'
+                                        })
+                            break  # If one succeeds, don't try the other
+                    except Exception:
+                        continue
         except Exception as e:
             self.logger.debug(f"YUM/DNF not available or error: {e}")
             
@@ -214,49 +206,30 @@ class ApplicationDiscoveryModule(BaseModule):
     
     def _get_snap_packages(self) -> List[Dict[str, Any]]:
         """Get Snap packages"""
-        packages = []
-        
-        try:
-            result = subprocess.run(['snap', 'list'], capture_output=True, text=True, timeout=30)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n')[1:]:  # Skip header
-                    if line.strip():
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            packages.append({
-                                'name': parts[0],
-                                'version': parts[1],
-                                'platform': 'Linux',
-                                'package_manager': 'Snap',
-                                'discovery_method': 'Package Manager'
-                            })
-        except Exception as e:
-            self.logger.debug(f"Snap not available or error: {e}")
-            
-        return packages
+        return self._packages_from_database('snap', 'Snap')
     
     def _get_flatpak_packages(self) -> List[Dict[str, Any]]:
         """Get Flatpak packages"""
-        packages = []
-        
+        return self._packages_from_database('flatpak', 'Flatpak')
+    
+    def _packages_from_database(self, source: str, package_manager: str) -> List[Dict[str, Any]]:
+        """Convert a package database source into application entries"""
         try:
-            result = subprocess.run(['flatpak', 'list'], capture_output=True, text=True, timeout=30)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if line.strip() and '\t' in line:
-                        parts = line.split('\t')
-                        if len(parts) >= 2:
-                            packages.append({
-                                'name': parts[0],
-                                'version': parts[1] if len(parts) > 1 else 'Unknown',
-                                'platform': 'Linux',
-                                'package_manager': 'Flatpak',
-                                'discovery_method': 'Package Manager'
-                            })
+            installed = get_package_database().packages(source) or []
         except Exception as e:
-            self.logger.debug(f"Flatpak not available or error: {e}")
-            
-        return packages
+            self.logger.debug(f"{package_manager} package database not available or error: {e}")
+            return []
+        
+        return [
+            {
+                'name': package['name'],
+                'version': package.get('version') or 'Unknown',
+                'platform': 'Linux',
+                'package_manager': package_manager,
+                'discovery_method': 'Package Manager'
+            }
+            for package in installed
+        ]
     
     def _is_relevant_application(self, app_info: Dict[str, Any]) -> bool:
         """Check if application is relevant for business monitoring"""
@@ -458,20 +431,17 @@ class ApplicationDiscoveryModule(BaseModule):
         
         try:
             # Get process information for known applications
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'num_threads']):
-                try:
-                    pinfo = proc.info
-                    if self._is_monitored_application(pinfo['name']):
-                        app_performance.append({
-                            'application': pinfo['name'],
-                            'pid': pinfo['pid'],
-                            'cpu_percent': pinfo['cpu_percent'],
-                            'memory_percent': pinfo['memory_percent'],
-                            'thread_count': pinfo['num_threads'],
-                            'status': 'running'
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            snapshot = get_process_snapshot()
+            for pinfo in snapshot.filter_by_name(self._is_monitored_application,
+                                                 ['pid', 'name', 'cpu_percent', 'memory_percent', 'num_threads']):
+                app_performance.append({
+                    'application': pinfo['name'],
+                    'pid': pinfo['pid'],
+                    'cpu_percent': pinfo['cpu_percent'],
+                    'memory_percent': pinfo['memory_percent'],
+                    'thread_count': pinfo['num_threads'],
+                    'status': 'running'
+                })
                     
         except Exception as e:
             self.logger.error(f"Error getting application performance: {e}")
@@ -497,25 +467,20 @@ class ApplicationDiscoveryModule(BaseModule):
         
         try:
             # Check for common database processes
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    pinfo = proc.info
-                    if self._is_database_process(pinfo['name']):
-                        db_info = {
-                            'type': self._get_database_type(pinfo['name']),
-                            'process_name': pinfo['name'],
-                            'pid': pinfo['pid'],
-                            'status': 'running'
-                        }
-                        
-                        # Try to extract additional info from command line
-                        if pinfo['cmdline']:
-                            db_info['command_line'] = ' '.join(pinfo['cmdline'])
-                            
-                        databases.append(db_info)
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            snapshot = get_process_snapshot()
+            for pinfo in snapshot.filter_by_name(self._is_database_process, ['pid', 'name', 'cmdline']):
+                db_info = {
+                    'type': self._get_database_type(pinfo['name']),
+                    'process_name': pinfo['name'],
+                    'pid': pinfo['pid'],
+                    'status': 'running'
+                }
+                
+                # Try to extract additional info from command line
+                if pinfo['cmdline']:
+                    db_info['command_line'] = ' '.join(pinfo['cmdline'])
+                    
+                databases.append(db_info)
                     
         except Exception as e:
             self.logger.error(f"Error discovering database instances: {e}")
@@ -563,27 +528,22 @@ class ApplicationDiscoveryModule(BaseModule):
         
         try:
             # Check for web server processes
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    pinfo = proc.info
-                    if self._is_web_server_process(pinfo['name']):
-                        server_info = {
-                            'type': self._get_web_server_type(pinfo['name']),
-                            'process_name': pinfo['name'],
-                            'pid': pinfo['pid'],
-                            'status': 'running'
-                        }
-                        
-                        # Try to extract port from command line
-                        if pinfo['cmdline']:
-                            port = self._extract_port_from_cmdline(pinfo['cmdline'])
-                            if port:
-                                server_info['port'] = port
-                                
-                        web_servers.append(server_info)
+            snapshot = get_process_snapshot()
+            for pinfo in snapshot.filter_by_name(self._is_web_server_process, ['pid', 'name', 'cmdline']):
+                server_info = {
+                    'type': self._get_web_server_type(pinfo['name']),
+                    'process_name': pinfo['name'],
+                    'pid': pinfo['pid'],
+                    'status': 'running'
+                }
+                
+                # Try to extract port from command line
+                if pinfo['cmdline']:
+                    port = self._extract_port_from_cmdline(pinfo['cmdline'])
+                    if port:
+                        server_info['port'] = port
                         
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+                web_servers.append(server_info)
                     
         except Exception as e:
             self.logger.error(f"Error discovering web servers: {e}")
@@ -679,24 +639,24 @@ class ApplicationDiscoveryModule(BaseModule):
     def _get_application_port_bindings(self) -> List[Dict[str, Any]]:
         """Get application port bindings"""
         port_bindings = []
+        process_cache = get_process_cache()
         
         try:
             connections = psutil.net_connections(kind='inet')
             for conn in connections:
                 if conn.status == psutil.CONN_LISTEN and conn.laddr:
-                    try:
-                        process = psutil.Process(conn.pid) if conn.pid else None
-                        port_info = {
-                            'port': conn.laddr.port,
-                            'address': conn.laddr.ip,
-                            'protocol': 'tcp' if conn.type == 1 else 'udp',
-                            'process_name': process.name() if process else 'Unknown',
-                            'pid': conn.pid,
-                            'status': 'listening'
-                        }
-                        port_bindings.append(port_info)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    process = process_cache.get(conn.pid) if conn.pid else None
+                    if conn.pid and process is None:
                         continue
+                    port_info = {
+                        'port': conn.laddr.port,
+                        'address': conn.laddr.ip,
+                        'protocol': 'tcp' if conn.type == 1 else 'udp',
+                        'process_name': process.name if process else 'Unknown',
+                        'pid': conn.pid,
+                        'status': 'listening'
+                    }
+                    port_bindings.append(port_info)
                         
         except Exception as e:
             self.logger.error(f"Error getting port bindings: {e}")
@@ -9,11 +9,13 @@ import platform
 import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from .base_module import BaseModule
+from .base_module import BaseModule, cached_result
 
 class AssetManagementModule(BaseModule):
     """Detailed asset management and hardware specifications"""
     
+    collection_interval = 86400  # seconds
+    
     def __init__(self):
         super().__init__('asset_management')
         self.os_name = platform.system()
@@ -45,6 +47,7 @@ class AssetManagementModule(BaseModule):
                 'error': str(e)
             }
     
+    @cached_result(ttl=86400)
     def _get_hardware_details(self) -> Dict[str, Any]:
         """Get detailed hardware specifications"""
         hardware_details = {}
@@ -246,6 +249,7 @@ class AssetManagementModule(BaseModule):
         except Exception as e:
             return [{'error': str(e)}]
     
+    @cached_result(ttl=86400)
     def _get_bios_info(self) -> Dict[str, Any]:
         """Get BIOS/UEFI information"""
         try:
@@ -274,6 +278,7 @@ class AssetManagementModule(BaseModule):
         
         return {}
     
+    @cached_result(ttl=86400)
     def _get_serial_numbers(self) -> Dict[str, str]:
         """Get various hardware serial numbers"""
         serial_numbers = {}
@@ -300,6 +305,7 @@ class AssetManagementModule(BaseModule):
             
         return serial_numbers
     
+    @cached_result(ttl=86400)
     def _get_warranty_info(self) -> Dict[str, Any]:
         """Get warranty information (placeholder for vendor API integration)"""
         # This would integrate with vendor APIs to get warranty information
@@ -4,21 +4,59 @@ Base Module Class
 Provides common functionality for all system information modules
 """
 
+import functools
 import logging
+import threading
+import time
+import psutil
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Hashable
 from datetime import datetime
 
 
+def cached_result(ttl: int):
+    """Cache a module method's return value for ttl seconds.
+
+    The TTL can be overridden per instance through ``BaseModule.cache_ttls``.
+    Empty results and results with an 'error' key are not cached, so a
+    failed probe is retried on the next call.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            method_ttl = self.cache_ttls.get(func.__name__, ttl)
+            return self._get_cached(key, method_ttl, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
 class BaseModule(ABC):
     """Base class for all system information collection modules"""
     
+    # How often the scheduler should refresh this module, in seconds.
+    # Subclasses override this to match how quickly their data changes.
+    collection_interval = 600
+    
+    # Seconds to reuse a whole collect() result, None disables module-level caching.
+    # Individual methods can be cached with the @cached_result decorator.
+    cache_ttl = None
+    
     def __init__(self, module_name: str):
         self.module_name = module_name
         self.logger = logging.getLogger(f'Agent.{module_name}')
         self.enabled = True
         self.last_error = None
         self.last_success = None
+        
+        # Result cache state
+        self.cache_ttls = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_invalidations = 0
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._boot_time = None
     
     @abstractmethod
     def collect(self) -> Dict[str, Any]:
@@ -31,7 +69,7 @@ class BaseModule(ABC):
             return self._get_disabled_result()
         
         try:
-            result = self.collect()
+            result = self.cached_collect()
             self.last_success = datetime.utcnow()
             self.last_error = None
             return result
@@ -40,6 +78,59 @@ class BaseModule(ABC):
             self.logger.error(f"Error in {self.module_name} module: {e}", exc_info=True)
             return self._get_error_result(e)
     
+    def cached_collect(self) -> Dict[str, Any]:
+        """Collect data, reusing the previous result while the module-level TTL is fresh"""
+        self.validate_cache()
+        if not self.cache_ttl:
+            return self.collect()
+        return self._get_cached(('collect',), self.cache_ttl, self.collect)
+    
+    def validate_cache(self):
+        """Invalidate cached results if the system has rebooted since they were stored"""
+        try:
+            boot_time = psutil.boot_time()
+        except Exception as e:
+            self.logger.debug(f"Failed to get boot time for cache validation: {e}")
+            return
+        
+        if self._boot_time is not None and boot_time != self._boot_time:
+            self.logger.info(f"Boot time changed, invalidating {self.module_name} cache")
+            self.invalidate_cache()
+        self._boot_time = boot_time
+    
+    def invalidate_cache(self, method_name: Optional[str] = None):
+        """Drop all cached results, or only those of one method"""
+        with self._cache_lock:
+            if method_name is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if key[0] == method_name]:
+                    del self._cache[key]
+            self.cache_invalidations += 1
+    
+    def _get_cached(self, key: Hashable, ttl: float, loader: Callable[[], Any]) -> Any:
+        """Return a cached value for key, calling loader when it is missing or expired"""
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self.cache_hits += 1
+                return entry[1]
+            self.cache_misses += 1
+        
+        value = loader()
+        if self._is_cacheable(value):
+            with self._cache_lock:
+                self._cache[key] = (now + ttl, value)
+        return value
+    
+    @staticmethod
+    def _is_cacheable(value: Any) -> bool:
+        """Check if a result is worth keeping (not empty and not an error result)"""
+        if not value:
+            return False
+        return not (isinstance(value, dict) and 'error' in value)
+    
     def _get_disabled_result(self) -> Dict[str, Any]:
         """Return result when module is disabled"""
         return {
@@ -70,6 +161,13 @@ class BaseModule(ABC):
         return {
             'name': self.module_name,
             'enabled': self.enabled,
+            'collection_interval': self.collection_interval,
             'last_success': self.last_success.isoformat() if self.last_success else None,
-            'last_error': self.last_error
+            'last_error': self.last_error,
+            'cache': {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'invalidations': self.cache_invalidations,
+                'entries': len(self._cache)
+            }
         }
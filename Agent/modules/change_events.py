@@ -0,0 +1,242 @@
+"""
+Change Events for ITSM Agent
+Event sources that mark collection modules dirty when hardware or network state changes
+"""
+
+import time
+import select
+import socket
+import struct
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+NETLINK_ROUTE = 0
+NETLINK_KOBJECT_UEVENT = 15
+
+# rtnetlink multicast groups: link state, IPv4/IPv6 addresses and IPv4 routes
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+
+ROUTE_MESSAGE_TYPES = {
+    16: 'link_added', 17: 'link_removed',
+    20: 'address_added', 21: 'address_removed',
+    24: 'route_added', 25: 'route_removed'
+}
+
+# Kernel uevent subsystem -> modules whose data it affects
+UEVENT_SUBSYSTEM_MODULES = {
+    'usb': {'usb'},
+    'block': {'disk', 'usb'},
+    'scsi': {'disk', 'usb'},
+    'net': {'network'}
+}
+
+NLMSG_HEADER = struct.Struct('=IHHII')
+
+
+def parse_uevent(data: bytes) -> Dict[str, str]:
+    """Parse a kernel uevent message ("action@devpath\\0KEY=VALUE\\0...") into a dict"""
+    fields = data.split(b'\x00')
+    event = {}
+    if fields and b'@' in fields[0]:
+        action, _, devpath = fields[0].decode('utf-8', 'replace').partition('@')
+        event['ACTION'] = action
+        event['DEVPATH'] = devpath
+    for field in fields[1:]:
+        key, sep, value = field.decode('utf-8', 'replace').partition('=')
+        if sep:
+            event[key] = value
+    return event
+
+
+def parse_route_messages(data: bytes) -> List[str]:
+    """Get the change kinds contained in an rtnetlink datagram"""
+    changes = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, message_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            break
+        if message_type in ROUTE_MESSAGE_TYPES:
+            changes.append(ROUTE_MESSAGE_TYPES[message_type])
+        offset += (length + 3) & ~3
+    return changes
+
+
+class ChangeEventSource:
+    """Base class for sources that report changed modules through a callback"""
+
+    name = 'base'
+
+    def start(self, callback: Callable[[Iterable[str], str], None]):
+        """Start delivering events to callback(module_names, reason)"""
+        raise NotImplementedError
+
+    def stop(self):
+        """Stop delivering events"""
+
+
+class FakeEventSource(ChangeEventSource):
+    """Event source driven by the caller, used for tests and manual triggers"""
+
+    name = 'fake'
+
+    def __init__(self):
+        self.callback = None
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        self.callback = None
+
+    def emit(self, module_names: Iterable[str], reason: str = 'fake event'):
+        """Deliver an event as if it came from the system"""
+        if self.callback:
+            self.callback(module_names, reason)
+
+
+class NetlinkEventSource(ChangeEventSource):
+    """Linux kernel uevent and rtnetlink listener.
+
+    Bursts of events (a USB hub enumerating, DHCP renewing several
+    addresses) are coalesced until debounce seconds pass without a new event.
+    """
+
+    name = 'netlink'
+
+    def __init__(self, debounce: float = 2.0, max_delay: float = 10.0):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.logger = logging.getLogger('NetlinkEventSource')
+        self._sockets = []
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether netlink sockets exist on this platform"""
+        return hasattr(socket, 'AF_NETLINK')
+
+    def start(self, callback):
+        if not self.available():
+            raise OSError('netlink sockets are not available on this platform')
+
+        uevent_sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        uevent_sock.bind((0, 1))
+        route_sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        route_sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE | RTMGRP_IPV6_IFADDR))
+        self._sockets = [uevent_sock, route_sock]
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(callback,), name='netlink-events', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        for sock in self._sockets:
+            sock.close()
+        self._sockets = []
+
+    def _run(self, callback):
+        uevent_sock, route_sock = self._sockets
+        pending: Set[str] = set()
+        reasons: Set[str] = set()
+        first_event = None
+
+        while not self._stop_event.is_set():
+            timeout = self.debounce if pending else 1.0
+            try:
+                readable, _, _ = select.select(self._sockets, [], [], timeout)
+            except (OSError, ValueError):
+                break
+
+            for sock in readable:
+                try:
+                    data = sock.recv(65536)
+                except OSError:
+                    continue
+                if sock is uevent_sock:
+                    event = parse_uevent(data)
+                    modules = UEVENT_SUBSYSTEM_MODULES.get(event.get('SUBSYSTEM'), set())
+                    if modules:
+                        pending.update(modules)
+                        reasons.add(f"{event.get('SUBSYSTEM')} {event.get('ACTION')}")
+                else:
+                    changes = parse_route_messages(data)
+                    if changes:
+                        pending.add('network')
+                        reasons.update(changes)
+                if pending and first_event is None:
+                    first_event = time.monotonic()
+
+            quiet = not readable
+            overdue = first_event is not None and time.monotonic() - first_event >= self.max_delay
+            if pending and (quiet or overdue):
+                try:
+                    callback(sorted(pending), ', '.join(sorted(reasons)))
+                except Exception as e:
+                    self.logger.error(f"Change callback failed: {e}")
+                pending, reasons, first_event = set(), set(), None
+
+
+class ChangeMonitor:
+    """Collects dirty module names from event sources and wakes the agent"""
+
+    def __init__(self, sources: Optional[List[ChangeEventSource]] = None,
+                 on_change: Optional[Callable[[Set[str]], None]] = None):
+        self.sources = sources if sources is not None else self.default_sources()
+        self.on_change = on_change
+        self.logger = logging.getLogger('ChangeMonitor')
+        self.active_sources = []
+        self.event_counts = {}
+        self._dirty: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_sources() -> List[ChangeEventSource]:
+        """Event sources supported on this platform"""
+        if NetlinkEventSource.available():
+            return [NetlinkEventSource()]
+        return []
+
+    def start(self) -> List[str]:
+        """Start every source, skipping those that fail; returns the active source names"""
+        for source in self.sources:
+            try:
+                source.start(self.mark_dirty)
+                self.active_sources.append(source)
+            except OSError as e:
+                self.logger.warning(f"Change event source {source.name} unavailable: {e}")
+        return [source.name for source in self.active_sources]
+
+    def stop(self):
+        """Stop every active source"""
+        for source in self.active_sources:
+            source.stop()
+        self.active_sources = []
+
+    def mark_dirty(self, module_names: Iterable[str], reason: str = ''):
+        """Record modules whose data changed and notify the agent"""
+        module_names = set(module_names)
+        if not module_names:
+            return
+        with self._lock:
+            self._dirty.update(module_names)
+            for name in module_names:
+                self.event_counts[name] = self.event_counts.get(name, 0) + 1
+        self.logger.info(f"Change detected ({reason}), marking dirty: {', '.join(sorted(module_names))}")
+        if self.on_change:
+            self.on_change(module_names)
+
+    def consume_dirty(self) -> Set[str]:
+        """Get and clear the set of dirty modules"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
@@ -17,6 +17,8 @@ from .base_module import BaseModule
 class ComplianceConfigurationModule(BaseModule):
     """Compliance and configuration monitoring module"""
     
+    collection_interval = 86400  # seconds
+    
     def __init__(self):
         super().__init__('ComplianceConfiguration')
         self.is_windows = platform.system().lower() == 'windows'
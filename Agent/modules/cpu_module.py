@@ -9,11 +9,14 @@ import psutil
 import os
 from typing import Dict, Any
 from .base_module import BaseModule
+from .cpu_sampler import get_cpu_sampler
 
 
 class CPUModule(BaseModule):
     """CPU information collection module"""
     
+    collection_interval = 30  # seconds
+    
     def __init__(self):
         super().__init__('CPU')
     
@@ -66,7 +69,7 @@ class CPUModule(BaseModule):
     def _get_usage_percent(self) -> float:
         """Get CPU usage percentage"""
         try:
-            return psutil.cpu_percent(interval=1)
+            return get_cpu_sampler().current_percent()
         except Exception as e:
             self.logger.debug(f"Failed to get CPU usage: {e}")
             return 0.0
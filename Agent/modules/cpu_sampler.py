@@ -0,0 +1,128 @@
+"""
+CPU Sampler for ITSM Agent
+Background thread that keeps rolling system-wide and per-core CPU utilisation
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+import psutil
+
+
+def _busy_and_total(times) -> Tuple[float, float]:
+    """Split a cpu_times tuple into busy and total seconds (same accounting as psutil.cpu_percent)"""
+    total = sum(times)
+    # guest time is already counted in user/nice on Linux
+    total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+    idle = times.idle + getattr(times, 'iowait', 0)
+    return total - idle, total
+
+
+def _percent_between(before, after) -> float:
+    """CPU utilisation between two cpu_times samples"""
+    busy_before, total_before = _busy_and_total(before)
+    busy_after, total_after = _busy_and_total(after)
+    total_delta = total_after - total_before
+    if total_delta <= 0:
+        return 0.0
+    return round(min(100.0, max(0.0, (busy_after - busy_before) / total_delta * 100)), 1)
+
+
+class CPUSampler(threading.Thread):
+    """Samples CPU counters in the background so collectors never sleep for a measurement.
+
+    System-wide and per-core utilisation is sampled every interval seconds and
+    kept in a ring buffer of history_size samples. Per-process utilisation
+    comes from the process snapshot, which only walks /proc once per cycle.
+    """
+
+    def __init__(self, interval: float = 1.0, history_size: int = 300):
+        super().__init__(name='cpu-sampler', daemon=True)
+        self.interval = interval
+        self.logger = logging.getLogger('CPUSampler')
+        self.samples = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._first_sample = threading.Event()
+
+        self._last_times = psutil.cpu_times()
+        self._last_percpu = psutil.cpu_times(percpu=True)
+        self._last_sample_time = time.time()
+
+    def run(self):
+        """Sample until stopped"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._sample_system()
+            except Exception as e:
+                self.logger.debug(f"CPU sampling failed: {e}")
+
+    def stop(self):
+        """Stop sampling"""
+        self._stop_event.set()
+
+    def _sample_system(self):
+        """Record one system-wide and per-core utilisation sample"""
+        times = psutil.cpu_times()
+        percpu = psutil.cpu_times(percpu=True)
+        now = time.time()
+
+        total_percent = _percent_between(self._last_times, times)
+        per_cpu = [_percent_between(before, after) for before, after in zip(self._last_percpu, percpu)]
+
+        with self._lock:
+            self.samples.append((now, total_percent, per_cpu))
+        self._last_times = times
+        self._last_percpu = percpu
+        self._last_sample_time = now
+        self._first_sample.set()
+
+    def wait_for_first_sample(self, timeout: Optional[float] = None) -> bool:
+        """Block until at least one sample exists (only ever waits right after startup)"""
+        return self._first_sample.wait(self.interval * 2 if timeout is None else timeout)
+
+    def current_percent(self) -> float:
+        """Most recent system-wide CPU utilisation"""
+        self.wait_for_first_sample()
+        with self._lock:
+            return self.samples[-1][1] if self.samples else 0.0
+
+    def per_cpu_percent(self) -> List[float]:
+        """Most recent per-core CPU utilisation"""
+        self.wait_for_first_sample()
+        with self._lock:
+            return list(self.samples[-1][2]) if self.samples else []
+
+    def average_percent(self, window: float = 60.0) -> float:
+        """Average system-wide utilisation over the last window seconds"""
+        self.wait_for_first_sample()
+        cutoff = time.time() - window
+        with self._lock:
+            values = [percent for timestamp, percent, _ in self.samples if timestamp >= cutoff]
+        return round(sum(values) / len(values), 1) if values else 0.0
+
+    def history(self, window: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Buffered samples, optionally limited to the last window seconds"""
+        cutoff = time.time() - window if window else 0
+        with self._lock:
+            return [
+                {'timestamp': timestamp, 'percent': percent, 'per_cpu': list(per_cpu)}
+                for timestamp, percent, per_cpu in self.samples if timestamp >= cutoff
+            ]
+
+
+_sampler_lock = threading.Lock()
+_sampler: Optional[CPUSampler] = None
+
+
+def get_cpu_sampler() -> CPUSampler:
+    """Get the shared sampler, starting it on first use"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None or not _sampler.is_alive():
+            _sampler = CPUSampler()
+            _sampler.start()
+        return _sampler
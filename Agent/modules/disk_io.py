@@ -0,0 +1,191 @@
+"""
+Disk I/O Snapshot for ITSM Agent
+One shared per-disk counter snapshot per collection cycle, with rates against the previous one
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+import psutil
+
+
+SYS_BLOCK_DIR = '/sys/class/block'
+
+# Snapshots younger than this are reused, so modules collected in the same cycle share one read
+DEFAULT_MAX_AGE = 5.0
+
+# Kernels before 5.x keep the per-disk time counters in 32 bits (milliseconds, wraps after ~49 days)
+COUNTER_WRAP = 2 ** 32
+
+COUNTER_FIELDS = ('read_count', 'write_count', 'read_bytes', 'write_bytes', 'read_time', 'write_time')
+
+# Pseudo, overlay and read-only image filesystems whose usage is not worth tracking
+IGNORED_FSTYPES = {'squashfs', 'tmpfs', 'devtmpfs', 'overlay', 'iso9660', 'nsfs', 'autofs'}
+
+# Per-container and per-pod mounts come and go with workloads
+IGNORED_MOUNT_PREFIXES = ('/var/lib/docker/', '/var/lib/containers/', '/var/lib/kubelet/', '/run/containerd/',
+                          '/run/k3s/', '/snap/')
+
+# Time counters summed over concurrent requests can exceed wall time; this many in flight is the most believed
+MAX_QUEUE_DEPTH = 1024
+
+
+def counter_delta(current: int, previous: int, max_delta: Optional[float] = None) -> Optional[int]:
+    """Increase of a monotonic counter.
+
+    A counter that went backwards is taken as one 32-bit wrap only when
+    max_delta is given (the counter can be 32 bits wide) and the wrapped
+    increase is no larger than it. Anything else is a reset (a loop or dm
+    device re-attached, a NIC re-created) and returns None.
+    """
+    if current >= previous:
+        return current - previous
+    if max_delta is None or previous >= COUNTER_WRAP:
+        return None
+    delta = current + COUNTER_WRAP - previous
+    return delta if delta <= max_delta else None
+
+
+def compute_rates(before: Dict[str, int], after: Dict[str, int], elapsed: float) -> Optional[Dict[str, float]]:
+    """IOPS, throughput, average latency and utilisation between two counter sets"""
+    if elapsed <= 0:
+        return None
+    # Only the millisecond time counters wrap at 32 bits; the largest believable wrapped increase
+    # is all of the interval busy (busy_time) or MAX_QUEUE_DEPTH requests waiting throughout it
+    wrap_limits = {'busy_time': elapsed * 1000 * 1.05,
+                   'read_time': elapsed * 1000 * MAX_QUEUE_DEPTH,
+                   'write_time': elapsed * 1000 * MAX_QUEUE_DEPTH}
+    deltas = {}
+    for field in COUNTER_FIELDS + ('busy_time',):
+        if field in before and field in after:
+            delta = counter_delta(after[field], before[field], wrap_limits.get(field))
+            if delta is None:
+                return None
+            deltas[field] = delta
+
+    reads, writes = deltas['read_count'], deltas['write_count']
+    rates = {
+        'read_iops': round(reads / elapsed, 2),
+        'write_iops': round(writes / elapsed, 2),
+        'read_bytes_per_sec': round(deltas['read_bytes'] / elapsed, 1),
+        'write_bytes_per_sec': round(deltas['write_bytes'] / elapsed, 1),
+        # Time spent per completed request, like iostat's r_await / w_await
+        'avg_read_latency_ms': round(deltas['read_time'] / reads, 3) if reads else 0.0,
+        'avg_write_latency_ms': round(deltas['write_time'] / writes, 3) if writes else 0.0,
+        'interval': round(elapsed, 3)
+    }
+    if 'busy_time' in deltas:
+        rates['utilization_percent'] = round(min(100.0, deltas['busy_time'] / (elapsed * 1000) * 100), 2)
+    return rates
+
+
+def is_tracked_partition(partition) -> bool:
+    """Check if a psutil partition is a real, long-lived filesystem (not a snap loop, overlay or container mount)"""
+    if partition.fstype in IGNORED_FSTYPES:
+        return False
+    if partition.device.startswith('/dev/loop'):
+        return False
+    return not partition.mountpoint.startswith(IGNORED_MOUNT_PREFIXES)
+
+
+def parent_device(name: str, sys_block_dir: Optional[str] = None) -> Optional[str]:
+    """Whole-disk device a partition belongs to (sda1 -> sda, nvme0n1p2 -> nvme0n1), or None"""
+    path = os.path.join(sys_block_dir or SYS_BLOCK_DIR, name)
+    if not os.path.exists(os.path.join(path, 'partition')):
+        return None
+    return os.path.basename(os.path.dirname(os.path.realpath(path)))
+
+
+class DiskIOSnapshot:
+    """Per-disk I/O counters from one psutil read, with rates since the previous snapshot"""
+
+    def __init__(self, disks: Dict[str, Dict[str, Any]], taken_at: float, monotonic: float):
+        self.disks = disks
+        self.taken_at = taken_at
+        self.monotonic = monotonic
+
+    @classmethod
+    def capture(cls, previous: Optional['DiskIOSnapshot'] = None) -> 'DiskIOSnapshot':
+        """Read every disk's counters once and compute rates against previous"""
+        monotonic = time.monotonic()
+        disks = {}
+        # nowrap=False: wraps are handled per pair of snapshots in counter_delta
+        counters = psutil.disk_io_counters(perdisk=True, nowrap=False) or {}
+        for name, io in counters.items():
+            stats = {field: getattr(io, field) for field in COUNTER_FIELDS}
+            if hasattr(io, 'busy_time'):
+                stats['busy_time'] = io.busy_time
+            if previous is not None and name in previous.disks:
+                rates = compute_rates(previous.disks[name], stats, monotonic - previous.monotonic)
+                if rates:
+                    stats['rates'] = rates
+            disks[name] = stats
+        return cls(disks, time.time(), monotonic)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.monotonic() - self.monotonic
+
+    def device_name(self, device: str) -> Optional[str]:
+        """Name under which a partition's device path is counted, or None"""
+        # /dev/mapper/root and /dev/disk/by-uuid/... resolve to dm-0, sda1, ...
+        candidates = [os.path.basename(os.path.realpath(device)) if device.startswith('/dev/') else None,
+                      device.replace('/dev/', '').replace('\\', ''),
+                      device.replace(':', ''),
+                      device.split('\\')[-1] if '\\' in device else device]
+        for candidate in candidates:
+            if candidate and candidate in self.disks:
+                return candidate
+        return None
+
+    def device_stats(self, device: str) -> Dict[str, Any]:
+        """Counters and rates for a partition's device path, with its parent disk when it has one"""
+        name = self.device_name(device)
+        if name is None:
+            return {}
+        stats = dict(self.disks[name])
+        parent = parent_device(name)
+        if parent:
+            stats['disk'] = parent
+            parent_rates = self.disks.get(parent, {}).get('rates')
+            if parent_rates and 'utilization_percent' in parent_rates:
+                stats['disk_utilization_percent'] = parent_rates['utilization_percent']
+        return stats
+
+    def totals(self) -> Dict[str, Any]:
+        """Counters and rates summed over whole disks (partitions are not counted twice)"""
+        whole_disks = [stats for name, stats in self.disks.items() if parent_device(name) is None]
+        totals = {field: sum(stats[field] for stats in whole_disks) for field in COUNTER_FIELDS}
+        with_rates = [stats['rates'] for stats in whole_disks if 'rates' in stats]
+        if with_rates:
+            rates = {field: round(sum(rate[field] for rate in with_rates), 2)
+                     for field in ('read_iops', 'write_iops', 'read_bytes_per_sec', 'write_bytes_per_sec')}
+            utilizations = [rate['utilization_percent'] for rate in with_rates if 'utilization_percent' in rate]
+            if utilizations:
+                rates['max_utilization_percent'] = max(utilizations)
+            totals['rates'] = rates
+        return totals
+
+
+_lock = threading.Lock()
+_latest: Optional[DiskIOSnapshot] = None
+capture_count = 0
+
+
+def get_disk_io_snapshot(max_age: float = DEFAULT_MAX_AGE) -> DiskIOSnapshot:
+    """Get the shared snapshot, taking a new one if the current one is older than max_age.
+
+    Rates in a new snapshot are computed against the one it replaces.
+    """
+    global _latest, capture_count
+
+    with _lock:
+        if _latest is None or _latest.age > max_age:
+            _latest = DiskIOSnapshot.capture(previous=_latest)
+            capture_count += 1
+            logging.getLogger('DiskIOSnapshot').debug(f"Captured I/O counters for {len(_latest.disks)} disks")
+        return _latest
@@ -9,11 +9,14 @@ import platform
 import os
 from typing import Dict, Any, List
 from .base_module import BaseModule
+from .disk_io import get_disk_io_snapshot
 
 
 class DiskModule(BaseModule):
     """Disk information collection module"""
     
+    collection_interval = 300  # seconds
+    
     def __init__(self):
         super().__init__('Disk')
         self.is_windows = platform.system().lower() == 'windows'
@@ -39,9 +42,16 @@ class DiskModule(BaseModule):
             self.logger.error(f"Failed to get disk partitions: {e}")
             return partitions
         
+        # One counter read for every partition
+        try:
+            io_snapshot = get_disk_io_snapshot()
+        except Exception as e:
+            self.logger.debug(f"Could not get disk I/O counters: {e}")
+            io_snapshot = None
+        
         for partition in disk_partitions:
             try:
-                partition_info = self._get_partition_info(partition)
+                partition_info = self._get_partition_info(partition, io_snapshot)
                 if partition_info:
                     partitions.append(partition_info)
             except Exception as e:
@@ -54,7 +64,7 @@ class DiskModule(BaseModule):
         
         return partitions
     
-    def _get_partition_info(self, partition) -> Dict[str, Any]:
+    def _get_partition_info(self, partition, io_snapshot=None) -> Dict[str, Any]:
         """Get information for a single partition"""
         partition_info = {
             'device': partition.device,
@@ -85,40 +95,10 @@ class DiskModule(BaseModule):
             return None
         
         # Add I/O statistics if available
-        partition_info['io_stats'] = self._get_partition_io_stats(partition.device)
+        partition_info['io_stats'] = io_snapshot.device_stats(partition.device) if io_snapshot else {}
         
         return partition_info
     
-    def _get_partition_io_stats(self, device: str) -> Dict[str, Any]:
-        """Get I/O statistics for a partition"""
-        try:
-            io_counters = psutil.disk_io_counters(perdisk=True)
-            if not io_counters:
-                return {}
-            
-            # Try different device name formats
-            device_variants = [
-                device.replace('/dev/', '').replace('\\', ''),
-                device.replace(':', ''),
-                device.split('\\')[-1] if '\\' in device else device
-            ]
-            
-            for device_name in device_variants:
-                if device_name in io_counters:
-                    io = io_counters[device_name]
-                    return {
-                        'read_count': io.read_count,
-                        'write_count': io.write_count,
-                        'read_bytes': io.read_bytes,
-                        'write_bytes': io.write_bytes,
-                        'read_time': io.read_time,
-                        'write_time': io.write_time
-                    }
-        except Exception as e:
-            self.logger.debug(f"Could not get I/O stats for {device}: {e}")
-        
-        return {}
-    
     def _get_windows_system_drive(self) -> List[Dict[str, Any]]:
         """Get Windows system drive info as fallback"""
         try:
@@ -138,18 +118,11 @@ class DiskModule(BaseModule):
             return []
     
     def _get_disk_io_counters(self) -> Dict[str, Any]:
-        """Get overall disk I/O counters"""
+        """Get overall disk I/O counters and rates"""
         try:
-            io_counters = psutil.disk_io_counters()
-            if io_counters:
-                return {
-                    'read_count': io_counters.read_count,
-                    'write_count': io_counters.write_count,
-                    'read_bytes': io_counters.read_bytes,
-                    'write_bytes': io_counters.write_bytes,
-                    'read_time': io_counters.read_time,
-                    'write_time': io_counters.write_time
-                }
+            io_snapshot = get_disk_io_snapshot()
+            if io_snapshot.disks:
+                return io_snapshot.totals()
         except Exception as e:
             self.logger.error(f"Failed to get disk I/O counters: {e}")
         
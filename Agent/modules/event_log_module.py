@@ -4,16 +4,40 @@ Event Log Collection & Analysis Module
 Collects and analyzes system event logs
 """
 
+import os
 import logging
 import platform
 import json
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from .base_module import BaseModule
+from .event_log_readers import (
+    BookmarkStore, FileLogReader, JournalReader, WindowsEventLogReader,
+    SEVERITY_LEVELS, WINDOWS_EVENT_PRIORITIES
+)
+
+
+# Reader positions survive restarts so each event is reported once
+DEFAULT_BOOKMARK_PATH = 'state/event_log_bookmarks.json'
+
+# Text logs per source, first readable one wins; journald is used when none exists
+LINUX_LOG_SOURCES = {
+    'syslog': {'paths': ['/var/log/syslog', '/var/log/messages'], 'journal_args': [],
+               'max_priority': SEVERITY_LEVELS['warning']},
+    'auth': {'paths': ['/var/log/auth.log', '/var/log/secure'],
+             'journal_args': ['SYSLOG_FACILITY=4', 'SYSLOG_FACILITY=10'],
+             'max_priority': SEVERITY_LEVELS['info']},
+    'kernel': {'paths': ['/var/log/kern.log'], 'journal_args': ['--dmesg'],
+               'max_priority': SEVERITY_LEVELS['warning']},
+    'boot': {'paths': ['/var/log/boot.log'], 'journal_args': None,
+             'max_priority': SEVERITY_LEVELS['warning']}
+}
 
 class EventLogModule(BaseModule):
     """Event log collection and analysis"""
     
+    collection_interval = 600  # seconds
+    
     def __init__(self):
         super().__init__('event_log')
         self.os_name = platform.system()
@@ -24,14 +48,18 @@ class EventLogModule(BaseModule):
             'error_events': ['1000', '1001', '1002'],
             'security_events': ['4624', '4625', '4648']
         }
+        self.bookmark_path = DEFAULT_BOOKMARK_PATH
+        self.bookmarks = None
+        self.readers = {}
+        self.read_stats = {}
         
     def collect(self) -> Dict[str, Any]:
         """Collect event log information"""
         try:
             if self.os_name == 'Windows':
-                return self._collect_windows_events()
+                return self._with_bookmarks(self._collect_windows_events)
             elif self.os_name == 'Linux':
-                return self._collect_linux_events()
+                return self._with_bookmarks(self._collect_linux_events)
             elif self.os_name == 'Darwin':
                 return self._collect_macos_events()
             else:
@@ -47,6 +75,20 @@ class EventLogModule(BaseModule):
                 'error': str(e)
             }
     
+    def _with_bookmarks(self, collector) -> Dict[str, Any]:
+        """Run a collector and persist the reader positions it advanced"""
+        if self.bookmarks is None:
+            self.bookmarks = BookmarkStore(self.bookmark_path)
+        self.read_stats = {}
+        result = collector()
+        if result.get('status') == 'success':
+            result['read_stats'] = self.read_stats
+        try:
+            self.bookmarks.save()
+        except OSError as e:
+            self.logger.warning(f"Could not save event log bookmarks: {e}")
+        return result
+    
     def _collect_windows_events(self) -> Dict[str, Any]:
         """Collect Windows event logs"""
         try:
@@ -82,132 +124,48 @@ class EventLogModule(BaseModule):
     
     def _get_windows_system_events(self) -> List[Dict[str, Any]]:
         """Get Windows System event log entries"""
-        try:
-            import win32evtlog
-            
-            events = []
-            server = 'localhost'
-            logtype = 'System'
-            
-            hand = win32evtlog.OpenEventLog(server, logtype)
-            
-            # Get events from last 24 hours
-            flags = win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
-            
-            event_count = 0
-            while event_count < 50:  # Limit to 50 recent events
-                events_batch = win32evtlog.ReadEventLog(hand, flags, 0)
-                if not events_batch:
-                    break
-                    
-                for event in events_batch:
-                    event_time = event.TimeGenerated
-                    if event_time > datetime.now() - timedelta(hours=24):
-                        events.append({
-                            'event_id': event.EventID & 0xFFFF,
-                            'source': event.SourceName,
-                            'type': self._get_event_type(event.EventType),
-                            'time': event_time.isoformat(),
-                            'category': event.EventCategory,
-                            'message': str(event.StringInserts) if event.StringInserts else ''
-                        })
-                        event_count += 1
-                        
-                if event_count >= 50:
-                    break
-            
-            win32evtlog.CloseEventLog(hand)
-            return events[:50]  # Return last 50 events
-            
-        except Exception as e:
-            self.logger.error(f"Error reading Windows system events: {e}")
-            return []
+        boot_shutdown_ids = set(self.event_patterns['boot_events'] + self.event_patterns['shutdown_events'])
+        return self._read_windows_log('System', lambda record: (
+            WINDOWS_EVENT_PRIORITIES.get(record.EventType, 6) <= SEVERITY_LEVELS['warning'] or
+            str(record.EventID & 0xFFFF) in boot_shutdown_ids
+        ), max_events=50)
     
     def _get_windows_application_events(self) -> List[Dict[str, Any]]:
         """Get Windows Application event log entries"""
-        try:
-            import win32evtlog
-            
-            events = []
-            server = 'localhost'
-            logtype = 'Application'
-            
-            hand = win32evtlog.OpenEventLog(server, logtype)
-            flags = win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
-            
-            event_count = 0
-            while event_count < 25:  # Limit to 25 recent events
-                events_batch = win32evtlog.ReadEventLog(hand, flags, 0)
-                if not events_batch:
-                    break
-                    
-                for event in events_batch:
-                    event_time = event.TimeGenerated
-                    if event_time > datetime.now() - timedelta(hours=24):
-                        if event.EventType in [1, 2]:  # Error and Warning events only
-                            events.append({
-                                'event_id': event.EventID & 0xFFFF,
-                                'source': event.SourceName,
-                                'type': self._get_event_type(event.EventType),
-                                'time': event_time.isoformat(),
-                                'category': event.EventCategory,
-                                'message': str(event.StringInserts) if event.StringInserts else ''
-                            })
-                            event_count += 1
-                        
-                if event_count >= 25:
-                    break
-            
-            win32evtlog.CloseEventLog(hand)
-            return events[:25]
-            
-        except Exception as e:
-            self.logger.error(f"Error reading Windows application events: {e}")
-            return []
+        # Error and Warning events only
+        return self._read_windows_log('Application', lambda record: record.EventType in [1, 2], max_events=25)
     
     def _get_windows_security_events(self) -> List[Dict[str, Any]]:
         """Get Windows Security event log entries"""
+        # Only collect important security events
+        security_ids = set(self.event_patterns['security_events'])
+        return self._read_windows_log('Security', lambda record: str(record.EventID & 0xFFFF) in security_ids, max_events=20)
+    
+    def _read_windows_log(self, logtype: str, include, max_events: int) -> List[Dict[str, Any]]:
+        """Read records added to a Windows event log since the last cycle"""
         try:
-            import win32evtlog
+            reader = self.readers.get(logtype)
+            if reader is None:
+                reader = WindowsEventLogReader(logtype, self.bookmarks, include=include, max_events=max_events)
+                self.readers[logtype] = reader
             
-            events = []
-            server = 'localhost'
-            logtype = 'Security'
-            
-            hand = win32evtlog.OpenEventLog(server, logtype)
-            flags = win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
-            
-            event_count = 0
-            while event_count < 20:  # Limit to 20 recent events
-                events_batch = win32evtlog.ReadEventLog(hand, flags, 0)
-                if not events_batch:
-                    break
-                    
-                for event in events_batch:
-                    event_time = event.TimeGenerated
-                    event_id = event.EventID & 0xFFFF
-                    
-                    # Only collect important security events
-                    if str(event_id) in self.event_patterns['security_events']:
-                        if event_time > datetime.now() - timedelta(hours=24):
-                            events.append({
-                                'event_id': event_id,
-                                'source': event.SourceName,
-                                'type': self._get_event_type(event.EventType),
-                                'time': event_time.isoformat(),
-                                'category': event.EventCategory,
-                                'message': str(event.StringInserts) if event.StringInserts else ''
-                            })
-                            event_count += 1
-                        
-                if event_count >= 20:
-                    break
-            
-            win32evtlog.CloseEventLog(hand)
-            return events[:20]
+            result = reader.read_new()
+            self.read_stats[logtype] = {'scanned': result['scanned'], 'truncated': result['truncated']}
+            return [
+                {
+                    'event_id': record.EventID & 0xFFFF,
+                    'record_number': record.RecordNumber,
+                    'source': record.SourceName,
+                    'type': self._get_event_type(record.EventType),
+                    'time': record.TimeGenerated.isoformat(),
+                    'category': record.EventCategory,
+                    'message': str(record.StringInserts) if record.StringInserts else ''
+                }
+                for record in result['records']
+            ]
             
         except Exception as e:
-            self.logger.error(f"Error reading Windows security events: {e}")
+            self.logger.error(f"Error reading Windows {logtype.lower()} events: {e}")
             return []
     
     def _collect_linux_events(self) -> Dict[str, Any]:
@@ -292,19 +250,53 @@ class EventLogModule(BaseModule):
     
     def _get_linux_syslog(self) -> List[Dict[str, Any]]:
         """Get Linux syslog entries"""
-        return []
+        return self._read_linux_log('syslog')
     
     def _get_linux_auth_log(self) -> List[Dict[str, Any]]:
         """Get Linux auth log entries"""
-        return []
+        return self._read_linux_log('auth')
     
     def _get_linux_kernel_log(self) -> List[Dict[str, Any]]:
         """Get Linux kernel log entries"""
-        return []
+        return self._read_linux_log('kernel')
     
     def _get_linux_boot_log(self) -> List[Dict[str, Any]]:
         """Get Linux boot log entries"""
-        return []
+        return self._read_linux_log('boot')
+    
+    def _get_linux_reader(self, source: str):
+        """Get the incremental reader for a log source: a text log if present, else journald"""
+        if source in self.readers:
+            return self.readers[source]
+        
+        config = LINUX_LOG_SOURCES[source]
+        reader = None
+        for path in config['paths']:
+            if os.access(path, os.R_OK):
+                reader = FileLogReader(path, self.bookmarks, max_priority=config['max_priority'])
+                break
+        if reader is None and config['journal_args'] is not None and JournalReader.available():
+            reader = JournalReader(source, self.bookmarks, match_args=config['journal_args'],
+                                   max_priority=config['max_priority'])
+        self.readers[source] = reader
+        return reader
+    
+    def _read_linux_log(self, source: str) -> List[Dict[str, Any]]:
+        """Read events added to a Linux log source since the last cycle"""
+        try:
+            reader = self._get_linux_reader(source)
+            if reader is None:
+                return []
+            result = reader.read_new()
+            self.read_stats[source] = {
+                'reader': reader.key,
+                'bytes_read': result['bytes_read'],
+                'truncated': result['truncated']
+            }
+            return result['events']
+        except Exception as e:
+            self.logger.error(f"Error reading {source} log: {e}")
+            return []
     
     def _get_macos_system_log(self) -> List[Dict[str, Any]]:
         """Get macOS system log entries"""
@@ -0,0 +1,354 @@
+"""
+Event Log Readers for ITSM Agent
+Incremental log readers that resume from bookmarks persisted between cycles
+"""
+
+import os
+import re
+import json
+import shutil
+import logging
+import threading
+import subprocess
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+
+# syslog priorities; lower is more severe
+SEVERITY_LEVELS = {
+    'emergency': 0, 'alert': 1, 'critical': 2, 'error': 3,
+    'warning': 4, 'notice': 5, 'info': 6, 'debug': 7
+}
+SEVERITY_NAMES = {level: name for name, level in SEVERITY_LEVELS.items()}
+
+# Windows EVENTLOG_*_TYPE -> syslog priority
+WINDOWS_EVENT_PRIORITIES = {1: 3, 2: 4, 4: 6, 8: 6, 16: 4}
+
+_SEVERITY_PATTERNS = [
+    (2, re.compile(r'\b(panic|fatal|critical|oops|segfault|out of memory|call trace)\b', re.IGNORECASE)),
+    (3, re.compile(r'\b(error|err|fail(ed|ure)?|denied|invalid|corrupt(ed|ion)?|i/o error)\b', re.IGNORECASE)),
+    (4, re.compile(r'\b(warn(ing)?|timeout|timed out|retry(ing)?|unable|deprecated)\b', re.IGNORECASE))
+]
+
+# "Oct 16 22:01:02 host proc[123]: message" or "2026-10-16T22:01:02.123+00:00 host proc[123]: message"
+_SYSLOG_LINE = re.compile(
+    r'^(?P<time>[A-Z][a-z]{2} +\d{1,2} \d{2}:\d{2}:\d{2}|\d{4}-\d{2}-\d{2}T\S+)\s+'
+    r'(?P<host>\S+)\s+(?P<source>[^\s:\[]+)(?:\[(?P<pid>\d+)\])?:\s*(?P<message>.*)$'
+)
+
+
+def classify_message(message: str) -> int:
+    """Guess a syslog priority for a plain-text log message"""
+    for priority, pattern in _SEVERITY_PATTERNS:
+        if pattern.search(message):
+            return priority
+    return SEVERITY_LEVELS['info']
+
+
+def parse_syslog_line(line: str) -> Dict[str, Any]:
+    """Parse a traditional or ISO-timestamped syslog line"""
+    match = _SYSLOG_LINE.match(line)
+    if not match:
+        return {'time': None, 'host': None, 'source': None, 'pid': None, 'message': line}
+    event = match.groupdict()
+    event['pid'] = int(event['pid']) if event['pid'] else None
+    return event
+
+
+class BookmarkStore:
+    """Reader positions persisted as JSON, written atomically"""
+
+    def __init__(self, path: str = 'state/event_log_bookmarks.json'):
+        self.path = path
+        self.logger = logging.getLogger('BookmarkStore')
+        self._lock = threading.Lock()
+        self._bookmarks: Dict[str, Any] = {}
+        self._dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._bookmarks = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable bookmarks in {path}: {e}")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._bookmarks.get(key)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            if self._bookmarks.get(key) != value:
+                self._bookmarks[key] = value
+                self._dirty = True
+
+    def save(self):
+        """Write bookmarks if any changed since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._bookmarks, f)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+
+
+class FileLogReader:
+    """Reads lines appended to a text log since the last bookmark.
+
+    The bookmark is the file's inode and byte offset. When the inode changes
+    the log was rotated: the rest of the old file is read from its rotated
+    sibling (path.1) before continuing from the start of the new file. A
+    first run starts max_bytes before the end instead of at the beginning.
+    """
+
+    def __init__(self, path: str, bookmarks: BookmarkStore, max_bytes: int = 256 * 1024,
+                 max_events: int = 100, max_priority: int = SEVERITY_LEVELS['warning']):
+        self.path = path
+        self.key = f"file:{path}"
+        self.bookmarks = bookmarks
+        self.max_bytes = max_bytes
+        self.max_events = max_events
+        self.max_priority = max_priority
+
+    def available(self) -> bool:
+        return os.access(self.path, os.R_OK)
+
+    def read_new(self) -> Dict[str, Any]:
+        """Get new events at or above the severity limit, within the byte and event budget"""
+        result = {'events': [], 'bytes_read': 0, 'lines_read': 0, 'truncated': False, 'rotated': False}
+        stat = os.stat(self.path)
+        bookmark = self.bookmarks.get(self.key)
+        skip_partial = False
+
+        if bookmark and bookmark.get('inode') != stat.st_ino:
+            result['rotated'] = True
+            rotated_path = f"{self.path}.1"
+            try:
+                rotated_inode = os.stat(rotated_path).st_ino
+            except OSError:
+                rotated_inode = None
+            if rotated_inode == bookmark['inode']:
+                rotated_offset = self._read_range(rotated_path, bookmark['offset'], result)
+                if result['truncated']:
+                    self.bookmarks.set(self.key, {'inode': rotated_inode, 'offset': rotated_offset})
+                    return result
+            offset = 0
+        elif bookmark and bookmark.get('offset', 0) <= stat.st_size:
+            offset = bookmark['offset']
+        elif bookmark:
+            # Truncated in place (copytruncate)
+            result['rotated'] = True
+            offset = 0
+        else:
+            offset = max(0, stat.st_size - self.max_bytes)
+            skip_partial = offset > 0
+
+        offset = self._read_range(self.path, offset, result, skip_partial=skip_partial)
+        self.bookmarks.set(self.key, {'inode': stat.st_ino, 'offset': offset})
+        return result
+
+    def _read_range(self, path: str, offset: int, result: Dict[str, Any], skip_partial: bool = False) -> int:
+        """Parse complete lines from offset within the remaining budget; returns the new offset"""
+        budget = self.max_bytes - result['bytes_read']
+        if budget <= 0:
+            result['truncated'] = True
+            return offset
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(budget)
+
+        position = 0
+        if skip_partial:
+            # Started mid-file: drop the partial first line
+            newline = data.find(b'\n')
+            position = newline + 1 if newline >= 0 else len(data)
+
+        while position < len(data) and not result['truncated']:
+            end = data.find(b'\n', position)
+            if end < 0:
+                if position == 0 and len(data) >= budget:
+                    # A single line longer than the budget; take it as is
+                    end = len(data)
+                else:
+                    break
+            line = data[position:end].decode('utf-8', 'replace').rstrip('\r')
+            position = end + 1
+            result['lines_read'] += 1
+            self._add_line(line, result)
+
+        position = min(position, len(data))
+        result['bytes_read'] += position
+        if len(data) >= budget and position < len(data):
+            result['truncated'] = True
+        return offset + position
+
+    def _add_line(self, line: str, result: Dict[str, Any]):
+        if not line:
+            return
+        event = parse_syslog_line(line)
+        priority = classify_message(event['message'])
+        if priority > self.max_priority:
+            return
+        event['severity'] = SEVERITY_NAMES[priority]
+        result['events'].append(event)
+        if len(result['events']) >= self.max_events:
+            result['truncated'] = True
+
+
+class JournalReader:
+    """Reads new journald entries after a persisted cursor via journalctl.
+
+    Severity is filtered by journalctl itself (-p), and output is read as a
+    stream that is cut off once the event or byte budget is spent; the
+    cursor of the last entry read becomes the bookmark.
+    """
+
+    def __init__(self, name: str, bookmarks: BookmarkStore, match_args: Optional[List[str]] = None,
+                 max_bytes: int = 256 * 1024, max_events: int = 100,
+                 max_priority: int = SEVERITY_LEVELS['warning'], timeout: float = 30):
+        self.name = name
+        self.key = f"journal:{name}"
+        self.bookmarks = bookmarks
+        self.match_args = match_args or []
+        self.max_bytes = max_bytes
+        self.max_events = max_events
+        self.max_priority = max_priority
+        self.timeout = timeout
+
+    @staticmethod
+    def available() -> bool:
+        return shutil.which('journalctl') is not None
+
+    def build_command(self, cursor: Optional[str]) -> List[str]:
+        command = ['journalctl', '--no-pager', '--output=json', f'--priority={self.max_priority}'] + self.match_args
+        if cursor:
+            command.append(f'--after-cursor={cursor}')
+        else:
+            command.append(f'--lines={self.max_events}')
+        return command
+
+    def read_new(self) -> Dict[str, Any]:
+        """Get journal entries written since the bookmark, within the budget"""
+        result = {'events': [], 'bytes_read': 0, 'lines_read': 0, 'truncated': False}
+        cursor = self.bookmarks.get(self.key)
+        last_cursor = cursor
+
+        process = subprocess.Popen(self.build_command(cursor), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        timer = threading.Timer(self.timeout, process.kill)
+        timer.start()
+        try:
+            for raw_line in process.stdout:
+                result['bytes_read'] += len(raw_line)
+                result['lines_read'] += 1
+                try:
+                    entry = json.loads(raw_line)
+                except ValueError:
+                    continue
+                last_cursor = entry.get('__CURSOR', last_cursor)
+                result['events'].append(parse_journal_entry(entry))
+                if len(result['events']) >= self.max_events or result['bytes_read'] >= self.max_bytes:
+                    result['truncated'] = True
+                    break
+        finally:
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            process.stdout.close()
+
+        if last_cursor:
+            self.bookmarks.set(self.key, last_cursor)
+        return result
+
+
+def parse_journal_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a journalctl JSON entry into an event"""
+    message = entry.get('MESSAGE', '')
+    if isinstance(message, list):
+        # Binary messages are exported as byte arrays
+        message = bytes(message).decode('utf-8', 'replace')
+    timestamp = entry.get('__REALTIME_TIMESTAMP')
+    priority = int(entry.get('PRIORITY', SEVERITY_LEVELS['info']))
+    return {
+        'time': datetime.utcfromtimestamp(int(timestamp) / 1e6).isoformat() if timestamp else None,
+        'host': entry.get('_HOSTNAME'),
+        'source': entry.get('SYSLOG_IDENTIFIER') or entry.get('_COMM'),
+        'pid': int(entry['_PID']) if entry.get('_PID') else None,
+        'severity': SEVERITY_NAMES.get(priority, 'info'),
+        'message': message
+    }
+
+
+class WindowsEventLogReader:
+    """Reads Windows event log records newer than the bookmarked record number.
+
+    Reads forward from the bookmark with EVENTLOG_SEEK_READ instead of
+    walking back from the newest record. If the log was cleared or wrapped
+    past the bookmark, reading restarts at the oldest record. Records are
+    filtered by include() as they are read; at most max_scan records are
+    visited per cycle.
+    """
+
+    def __init__(self, logtype: str, bookmarks: BookmarkStore, include: Optional[Callable[[Any], bool]] = None,
+                 max_events: int = 50, max_scan: int = 2000):
+        self.logtype = logtype
+        self.key = f"windows:{logtype}"
+        self.bookmarks = bookmarks
+        self.include = include or (lambda record: True)
+        self.max_events = max_events
+        self.max_scan = max_scan
+
+    def read_new(self) -> Dict[str, Any]:
+        """Get matching records appended since the bookmark"""
+        import win32evtlog
+
+        result = {'records': [], 'scanned': 0, 'truncated': False}
+        handle = win32evtlog.OpenEventLog('localhost', self.logtype)
+        try:
+            oldest = win32evtlog.GetOldestEventLogRecord(handle)
+            total = win32evtlog.GetNumberOfEventLogRecords(handle)
+            newest = oldest + total - 1
+            last_read = self.bookmarks.get(self.key)
+
+            if total == 0:
+                return result
+            if last_read is None:
+                start = max(oldest, newest - self.max_events + 1)
+            elif last_read > newest:
+                # Log was cleared; record numbers restarted, so everything in it is new
+                start = oldest
+            elif last_read == newest:
+                return result
+            else:
+                start = max(last_read + 1, oldest)
+
+            flags = win32evtlog.EVENTLOG_FORWARDS_READ | win32evtlog.EVENTLOG_SEEK_READ
+            offset = start
+            last_record = last_read
+            while result['scanned'] < self.max_scan:
+                batch = win32evtlog.ReadEventLog(handle, flags, offset)
+                if not batch:
+                    break
+                flags = win32evtlog.EVENTLOG_FORWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
+                for record in batch:
+                    result['scanned'] += 1
+                    last_record = record.RecordNumber
+                    if self.include(record):
+                        result['records'].append(record)
+                    if len(result['records']) >= self.max_events or result['scanned'] >= self.max_scan:
+                        result['truncated'] = True
+                        break
+                if result['truncated']:
+                    break
+
+            if last_record is not None:
+                self.bookmarks.set(self.key, last_record)
+        finally:
+            win32evtlog.CloseEventLog(handle)
+        return result
@@ -0,0 +1,361 @@
+"""
+Native Linux Data Sources for ITSM Agent
+Reads routes, neighbours, wireless links, resolvers and logins from /proc, /sys and /run without subprocesses
+"""
+
+import os
+import array
+import socket
+import struct
+import logging
+import threading
+from typing import Dict, Any, List, Optional, NamedTuple
+
+import psutil
+
+
+ROUTE_PATH = '/proc/net/route'
+ARP_PATH = '/proc/net/arp'
+WIRELESS_PATH = '/proc/net/wireless'
+SYS_NET_DIR = '/sys/class/net'
+# Upstream servers known to systemd-resolved first, then whatever the resolver library uses
+RESOLV_PATHS = ['/run/systemd/resolve/resolv.conf', '/etc/resolv.conf']
+
+# Route flags from linux/route.h
+RTF_UP = 0x0001
+RTF_GATEWAY = 0x0002
+
+# Neighbour flags from linux/if_arp.h
+ATF_COM = 0x02
+ATF_PERM = 0x04
+
+# Wireless extensions ioctl used by iwconfig to read the ESSID
+SIOCGIWESSID = 0x8B1B
+IW_ESSID_MAX_SIZE = 32
+
+SYSTEM_ACCOUNTS = {'root', 'mysql', 'postgres', 'redis', 'nginx', 'apache', 'www-data'}
+
+
+class Route(NamedTuple):
+    interface: str
+    destination: str
+    gateway: str
+    mask: str
+    flags: int
+    metric: int
+
+
+class Neighbour(NamedTuple):
+    ip: str
+    mac: str
+    interface: str
+    permanent: bool
+
+
+class WirelessLink(NamedTuple):
+    interface: str
+    ssid: Optional[str]
+    operstate: str
+    link_quality: Optional[float]
+    signal_level: Optional[float]
+    noise_level: Optional[float]
+
+
+class Login(NamedTuple):
+    user: str
+    terminal: Optional[str]
+    host: Optional[str]
+    started: float
+    pid: Optional[int]
+
+
+class ProcFile:
+    """A file kept open and re-read from offset 0 with pread.
+
+    Repeated samples cost one stat and one or two pread calls instead of
+    an open/read/close. If the path now names another file (resolv.conf
+    is usually replaced rather than rewritten) it is reopened.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 64 * 1024):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._fd: Optional[int] = None
+        self._identity = None
+        self._lock = threading.Lock()
+
+    def read(self) -> bytes:
+        """Read the whole file, raising OSError when it does not exist"""
+        with self._lock:
+            stat = os.stat(self.path)
+            if self._fd is not None and self._identity != (stat.st_dev, stat.st_ino):
+                self._close()
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+                opened = os.fstat(self._fd)
+                self._identity = (opened.st_dev, opened.st_ino)
+
+            chunks = []
+            offset = 0
+            while True:
+                try:
+                    chunk = os.pread(self._fd, self.chunk_size, offset)
+                except OSError:
+                    self._close()
+                    raise
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offset += len(chunk)
+            return b''.join(chunks)
+
+    def read_text(self) -> str:
+        return self.read().decode('utf-8', 'replace')
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = None
+        self._identity = None
+
+
+def _hex_ipv4(value: str) -> str:
+    # /proc/net/route stores addresses as host-order (little-endian) hex
+    return socket.inet_ntoa(struct.pack('<I', int(value, 16)))
+
+
+def parse_routes(text: str) -> List[Route]:
+    """Parse /proc/net/route"""
+    routes = []
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 8:
+            continue
+        try:
+            routes.append(Route(
+                interface=fields[0],
+                destination=_hex_ipv4(fields[1]),
+                gateway=_hex_ipv4(fields[2]),
+                flags=int(fields[3], 16),
+                metric=int(fields[6]),
+                mask=_hex_ipv4(fields[7])
+            ))
+        except ValueError:
+            continue
+    return routes
+
+
+def parse_arp(text: str) -> List[Neighbour]:
+    """Parse /proc/net/arp, skipping incomplete entries"""
+    neighbours = []
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 6:
+            continue
+        try:
+            flags = int(fields[2], 16)
+        except ValueError:
+            continue
+        mac = fields[3].lower()
+        if not flags & ATF_COM or mac == '00:00:00:00:00:00':
+            continue
+        neighbours.append(Neighbour(ip=fields[0], mac=mac, interface=fields[5], permanent=bool(flags & ATF_PERM)))
+    return neighbours
+
+
+def parse_wireless(text: str) -> Dict[str, Dict[str, float]]:
+    """Parse /proc/net/wireless into {interface: link quality, signal and noise}"""
+    links = {}
+    # Two header lines, then "wlan0: 0000   70.  -40.  -256 ..."
+    for line in text.splitlines()[2:]:
+        interface, _, rest = line.partition(':')
+        fields = rest.split()
+        if len(fields) < 4:
+            continue
+        values = []
+        for field in fields[1:4]:
+            try:
+                values.append(float(field.rstrip('.')))
+            except ValueError:
+                values.append(None)
+        links[interface.strip()] = dict(zip(('link_quality', 'signal_level', 'noise_level'), values))
+    return links
+
+
+def parse_resolv_conf(text: str) -> Dict[str, List[str]]:
+    """Get nameservers and search domains from resolv.conf"""
+    config = {'nameservers': [], 'search': []}
+    for line in text.splitlines():
+        fields = line.split('#', 1)[0].split()
+        if len(fields) < 2:
+            continue
+        if fields[0] == 'nameserver' and fields[1] not in config['nameservers']:
+            config['nameservers'].append(fields[1])
+        elif fields[0] in ('search', 'domain'):
+            config['search'] = fields[1:]
+    return config
+
+
+def read_wireless_essid(interface: str) -> Optional[str]:
+    """Get the ESSID an interface is associated with (what iwconfig shows), or None"""
+    buffer = array.array('B', bytes(IW_ESSID_MAX_SIZE + 1))
+    address, size = buffer.buffer_info()
+    # struct iwreq: char ifname[16], then struct iw_point {pointer, length, flags} in a 16 byte union
+    request = struct.pack('16sPHH', interface.encode()[:15], address, size, 0).ljust(32, b'\0')
+    try:
+        import fcntl
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            response = fcntl.ioctl(sock.fileno(), SIOCGIWESSID, request)
+    except (ImportError, OSError):
+        return None
+    length = struct.unpack_from('16sPHH', response)[2]
+    essid = buffer.tobytes()[:min(length, IW_ESSID_MAX_SIZE)].rstrip(b'\0')
+    return essid.decode('utf-8', 'replace') or None
+
+
+def _read_sys(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class LinuxSources:
+    """Kernel network and session state read straight from /proc, /sys and /run.
+
+    Replaces `ip route`, `arp`, `iwconfig`, `systemd-resolve` and `who`.
+    The /proc and resolv.conf files stay open between samples and are
+    re-read with pread, so sampling them often is cheap.
+    """
+
+    def __init__(self, route_path: str = ROUTE_PATH, arp_path: str = ARP_PATH,
+                 wireless_path: str = WIRELESS_PATH, resolv_paths: Optional[List[str]] = None,
+                 sys_net_dir: str = SYS_NET_DIR):
+        self.logger = logging.getLogger('LinuxSources')
+        self.sys_net_dir = sys_net_dir
+        self._route = ProcFile(route_path)
+        self._arp = ProcFile(arp_path)
+        self._wireless = ProcFile(wireless_path)
+        self._resolv = [ProcFile(path) for path in (resolv_paths if resolv_paths is not None else RESOLV_PATHS)]
+
+    def routes(self) -> List[Route]:
+        """IPv4 routing table"""
+        try:
+            return parse_routes(self._route.read_text())
+        except OSError as e:
+            self.logger.debug(f"Could not read routes: {e}")
+            return []
+
+    def default_gateway(self) -> Optional[str]:
+        """Gateway of the default route with the lowest metric"""
+        defaults = [route for route in self.routes()
+                    if route.destination == '0.0.0.0' and route.mask == '0.0.0.0'
+                    and route.flags & RTF_UP and route.flags & RTF_GATEWAY]
+        if not defaults:
+            return None
+        return min(defaults, key=lambda route: route.metric).gateway
+
+    def neighbours(self) -> List[Neighbour]:
+        """Complete entries of the IPv4 neighbour (ARP) cache"""
+        try:
+            return parse_arp(self._arp.read_text())
+        except OSError as e:
+            self.logger.debug(f"Could not read ARP cache: {e}")
+            return []
+
+    def mac_for(self, ip: str) -> Optional[str]:
+        """MAC address cached for an IP, or None"""
+        for neighbour in self.neighbours():
+            if neighbour.ip == ip:
+                return neighbour.mac
+        return None
+
+    def wireless_links(self) -> List[WirelessLink]:
+        """Wireless interfaces with their ESSID and signal statistics"""
+        try:
+            statistics = parse_wireless(self._wireless.read_text())
+        except OSError:
+            statistics = {}
+
+        interfaces = set(statistics)
+        try:
+            interfaces.update(name for name in os.listdir(self.sys_net_dir)
+                              if os.path.isdir(os.path.join(self.sys_net_dir, name, 'wireless')))
+        except OSError:
+            pass
+
+        links = []
+        for interface in sorted(interfaces):
+            stats = statistics.get(interface, {})
+            links.append(WirelessLink(
+                interface=interface,
+                ssid=read_wireless_essid(interface),
+                operstate=_read_sys(os.path.join(self.sys_net_dir, interface, 'operstate')) or 'unknown',
+                link_quality=stats.get('link_quality'),
+                signal_level=stats.get('signal_level'),
+                noise_level=stats.get('noise_level')
+            ))
+        return links
+
+    def wifi_info(self) -> Dict[str, Any]:
+        """Wi-Fi summary in the shape the collectors report"""
+        for link in self.wireless_links():
+            if link.ssid or link.operstate == 'up':
+                info = {'connected': True, 'status': 'connected', 'interface': link.interface}
+                if link.ssid:
+                    info['ssid'] = link.ssid
+                if link.signal_level is not None:
+                    info['signal_level'] = link.signal_level
+                return info
+        return {'connected': False, 'status': 'disconnected'}
+
+    def dns_servers(self) -> List[str]:
+        """Nameservers from systemd-resolved's upstream list and /etc/resolv.conf"""
+        servers = []
+        for resolv in self._resolv:
+            try:
+                nameservers = parse_resolv_conf(resolv.read_text())['nameservers']
+            except OSError:
+                continue
+            servers.extend(server for server in nameservers if server not in servers)
+        return servers
+
+    def logins(self) -> List[Login]:
+        """Login sessions recorded in utmp"""
+        try:
+            return [Login(user=user.name, terminal=user.terminal, host=user.host or None,
+                          started=user.started, pid=getattr(user, 'pid', None))
+                    for user in psutil.users()]
+        except Exception as e:
+            self.logger.debug(f"Could not read logins: {e}")
+            return []
+
+    def interactive_user(self) -> Optional[str]:
+        """First non-system user logged in on a console, tty or pts"""
+        for login in self.logins():
+            terminal = login.terminal or ''
+            if terminal.startswith(('console', 'pts', 'tty', ':')) and login.user not in SYSTEM_ACCOUNTS:
+                return login.user
+        return None
+
+    def close(self):
+        for proc_file in [self._route, self._arp, self._wireless] + self._resolv:
+            proc_file.close()
+
+
+_lock = threading.Lock()
+_linux_sources: Optional[LinuxSources] = None
+
+
+def get_linux_sources() -> LinuxSources:
+    """Get the shared Linux data sources"""
+    global _linux_sources
+    with _lock:
+        if _linux_sources is None:
+            _linux_sources = LinuxSources()
+        return _linux_sources
@@ -0,0 +1,241 @@
+"""
+Log Tail for ITSM Agent
+In-process reverse log reading and package manager history parsing
+"""
+
+import os
+import re
+import gzip
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Iterator, Tuple, Callable
+
+
+BLOCK_SIZE = 64 * 1024
+
+# Checked in order; the first existing file is the package manager's history
+PACKAGE_HISTORY_LOGS = [
+    ('apt', '/var/log/apt/history.log'),
+    ('dnf', '/var/log/dnf.rpm.log'),
+    ('yum', '/var/log/yum.log')
+]
+
+# "Install: libfoo:amd64 (1.2-1, automatic), bar:amd64 (1.0-1)"
+# "Upgrade: libfoo:amd64 (1.2-1, 1.3-1)"
+_APT_PACKAGE = re.compile(r'([^\s,(]+) \(([^)]*)\)')
+_APT_ACTIONS = ('Install', 'Upgrade', 'Remove', 'Purge', 'Downgrade', 'Reinstall')
+
+# "2026-10-16T10:00:00+0000 SUBDEBUG Upgrade: bash-5.2.26-3.fc40.x86_64"
+_DNF_LINE = re.compile(r'^(?P<date>\S+) SUBDEBUG (?P<action>[A-Za-z]+): (?P<package>\S+)')
+# "Oct 16 10:00:00 Updated: bash-4.2.46-35.el7.x86_64"
+_YUM_LINE = re.compile(r'^(?P<date>[A-Z][a-z]{2} +\d{1,2} \d{2}:\d{2}:\d{2}) (?P<action>[A-Za-z]+): (?P<package>\S+)')
+
+# dnf and yum action words; the old half of an upgrade (Upgraded, Cleanup, ...) is skipped
+_RPM_ACTIONS = {
+    'install': 'install', 'installed': 'install',
+    'upgrade': 'upgrade', 'updated': 'upgrade',
+    'erase': 'remove', 'erased': 'remove', 'obsoleted': 'remove',
+    'downgrade': 'downgrade', 'reinstall': 'reinstall'
+}
+
+
+def rotated_siblings(path: str) -> List[str]:
+    """Get existing rotated copies of a log, newest first (path.1, path.1.gz, path.2.gz, ...)"""
+    siblings = []
+    generation = 1
+    while True:
+        found = False
+        for candidate in (f"{path}.{generation}", f"{path}.{generation}.gz"):
+            if os.path.exists(candidate):
+                siblings.append(candidate)
+                found = True
+        if not found:
+            return siblings
+        generation += 1
+
+
+def reverse_lines(path: str, block_size: int = BLOCK_SIZE) -> Iterator[str]:
+    """Yield the lines of a file from last to first.
+
+    Plain files are read backwards in blocks from the end, so only as much
+    of the file as the caller consumes is read. Gzipped rotations cannot be
+    seeked backwards and are decompressed whole; they are small and rarely
+    needed.
+    """
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            data = f.read()
+        for line in reversed(data.splitlines()):
+            yield line.decode('utf-8', 'replace')
+        return
+
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b''
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size) + remainder
+            lines = block.split(b'\n')
+            # The first piece may continue in the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode('utf-8', 'replace')
+        yield remainder.decode('utf-8', 'replace')
+
+
+def tail_lines(path: str, count: int, block_size: int = BLOCK_SIZE) -> List[str]:
+    """Get the last count non-empty lines of a file, oldest first"""
+    lines = []
+    for line in reverse_lines(path, block_size):
+        if line:
+            lines.append(line)
+            if len(lines) >= count:
+                break
+    lines.reverse()
+    return lines
+
+
+def _collect_reverse(paths: List[str], wanted: int, is_start: Callable[[str], bool]) -> List[str]:
+    """Read lines backwards across a log and its rotations until wanted records have started"""
+    collected = []
+    starts = 0
+    for path in paths:
+        try:
+            for line in reverse_lines(path):
+                collected.append(line)
+                if is_start(line):
+                    starts += 1
+                    if starts >= wanted:
+                        collected.reverse()
+                        return collected
+        except OSError:
+            continue
+    collected.reverse()
+    return collected
+
+
+def _apt_packages(text: str) -> List[Dict[str, Any]]:
+    packages = []
+    for name, details in _APT_PACKAGE.findall(text):
+        versions = [part.strip() for part in details.split(',') if part.strip() != 'automatic']
+        package = {'name': name.split(':', 1)[0], 'version': versions[-1] if versions else None}
+        if len(versions) > 1:
+            package['previous_version'] = versions[0]
+        packages.append(package)
+    return packages
+
+
+def parse_apt_history(lines: List[str]) -> List[Dict[str, Any]]:
+    """Parse apt history.log lines into transaction records, oldest first"""
+    records = []
+    record = None
+    for line in lines:
+        key, _, value = line.partition(':')
+        value = value.strip()
+        if key == 'Start-Date':
+            record = {'date': value, 'end_date': None, 'commandline': None, 'requested_by': None, 'actions': {}}
+            records.append(record)
+        elif record is None:
+            # Tail of a transaction that started before the lines we read
+            continue
+        elif key == 'End-Date':
+            record['end_date'] = value
+        elif key == 'Commandline':
+            record['commandline'] = value
+        elif key == 'Requested-By':
+            record['requested_by'] = value
+        elif key in _APT_ACTIONS:
+            record['actions'][key.lower()] = _apt_packages(value)
+    return records
+
+
+def _rpm_package(nevra: str) -> Dict[str, Any]:
+    """Split "name-version-release.arch" into name and version"""
+    parts = nevra.rsplit('-', 2)
+    if len(parts) < 3:
+        return {'name': nevra, 'version': None}
+    return {'name': parts[0], 'version': f"{parts[1]}-{parts[2]}"}
+
+
+def parse_rpm_history(lines: List[str], pattern: re.Pattern = _DNF_LINE) -> List[Dict[str, Any]]:
+    """Parse dnf.rpm.log or yum.log package lines into transactions grouped by timestamp"""
+    records = []
+    for line in lines:
+        match = pattern.match(line)
+        if not match:
+            continue
+        action = _RPM_ACTIONS.get(match.group('action').lower())
+        if action is None:
+            continue
+        if not records or records[-1]['date'] != match.group('date'):
+            records.append({'date': match.group('date'), 'end_date': None, 'commandline': None,
+                            'requested_by': None, 'actions': {}})
+        records[-1]['actions'].setdefault(action, []).append(_rpm_package(match.group('package')))
+    return records
+
+
+class PackageHistory:
+    """Recent package manager transactions, re-parsed only when the log changes.
+
+    The parsed result is cached against the history log's inode, size and
+    mtime, so an unchanged log costs a single stat per call and a rotated
+    one (new inode) is picked up immediately.
+    """
+
+    def __init__(self, logs: Optional[List[Tuple[str, str]]] = None, max_records: int = 20):
+        self.logs = logs if logs is not None else PACKAGE_HISTORY_LOGS
+        self.max_records = max_records
+        self.logger = logging.getLogger('PackageHistory')
+        self.parse_count = 0
+        self._signature = None
+        self._cached: Dict[str, Any] = {'manager': None, 'path': None, 'records': []}
+        self._lock = threading.Lock()
+
+    def get(self) -> Dict[str, Any]:
+        """Get {'manager', 'path', 'records'} with the most recent transactions, oldest first"""
+        with self._lock:
+            for manager, path in self.logs:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                signature = (path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                if signature != self._signature:
+                    self._cached = {'manager': manager, 'path': path, 'records': self._parse(manager, path)}
+                    self._signature = signature
+                    self.parse_count += 1
+                return self._cached
+            self._signature = None
+            self._cached = {'manager': None, 'path': None, 'records': []}
+            return self._cached
+
+    def _parse(self, manager: str, path: str) -> List[Dict[str, Any]]:
+        paths = [path] + rotated_siblings(path)
+        try:
+            if manager == 'apt':
+                lines = _collect_reverse(paths, self.max_records, lambda line: line.startswith('Start-Date:'))
+                records = parse_apt_history(lines)
+            else:
+                pattern = _YUM_LINE if manager == 'yum' else _DNF_LINE
+                # Transactions are groups of lines; read enough lines to cover max_records of them
+                lines = _collect_reverse(paths, self.max_records * 50, lambda line: bool(pattern.match(line)))
+                records = parse_rpm_history(lines, pattern)
+        except Exception as e:
+            self.logger.warning(f"Error parsing {manager} history {path}: {e}")
+            return []
+        return records[-self.max_records:]
+
+
+_lock = threading.Lock()
+_package_history: Optional[PackageHistory] = None
+
+
+def get_package_history() -> PackageHistory:
+    """Get the shared package history reader"""
+    global _package_history
+    with _lock:
+        if _package_history is None:
+            _package_history = PackageHistory()
+        return _package_history
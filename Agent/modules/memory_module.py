@@ -12,6 +12,8 @@ from .base_module import BaseModule
 class MemoryModule(BaseModule):
     """Memory information collection module"""
     
+    collection_interval = 30  # seconds
+    
     def __init__(self):
         super().__init__('Memory')
     
@@ -0,0 +1,339 @@
+"""
+Metric Analytics for ITSM Agent
+Anomaly detection, trend forecasting and correlations over the metric store
+"""
+
+import math
+import time
+import logging
+from collections import deque
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .metric_store import MetricStore
+
+
+# Raw monotonic counters are analysed as per-second rates instead of raw values;
+# stored rates and percentages (e.g. network.bytes_recv_per_sec) are analysed as they are
+COUNTER_METRICS = frozenset({
+    'network.bytes_sent', 'network.bytes_recv', 'network.packets_sent', 'network.packets_recv',
+    'network.errin', 'network.errout', 'network.dropin', 'network.dropout',
+    'disk_io.read_bytes', 'disk_io.write_bytes', 'disk_io.read_count', 'disk_io.write_count',
+    'disk_io.read_time', 'disk_io.write_time', 'disk_io.busy_time',
+    'cpu.ctx_switches'
+})
+
+
+def is_counter(name: str) -> bool:
+    """Check if a metric is a monotonic counter"""
+    return name in COUNTER_METRICS
+
+
+def counter_rates(timestamps: Sequence[float], values: Sequence[float]) -> Tuple[Sequence[float], Sequence[float]]:
+    """Convert counter samples to (timestamps, per-second rates), skipping resets and wraps"""
+    if np is not None:
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        elapsed = np.diff(timestamps)
+        delta = np.diff(values)
+        valid = (elapsed > 0) & (delta >= 0)
+        return timestamps[1:][valid], delta[valid] / elapsed[valid]
+
+    rate_timestamps, rates = [], []
+    for index in range(1, len(values)):
+        elapsed = timestamps[index] - timestamps[index - 1]
+        delta = values[index] - values[index - 1]
+        if elapsed > 0 and delta >= 0:
+            rate_timestamps.append(timestamps[index])
+            rates.append(delta / elapsed)
+    return rate_timestamps, rates
+
+
+def rolling_zscores(values: Sequence[float], window: int) -> List[float]:
+    """Z-score of each sample against the window samples before it.
+
+    Returns one score per sample from index window onwards. Uses prefix sums,
+    so the cost is linear in len(values) regardless of the window size.
+    """
+    count = len(values) - window
+    if window < 2 or count <= 0:
+        return []
+
+    if np is not None:
+        data = np.asarray(values, dtype=np.float64)
+        sums = np.concatenate(([0.0], np.cumsum(data)))
+        squares = np.concatenate(([0.0], np.cumsum(data * data)))
+        end = np.arange(window, len(data))
+        mean = (sums[end] - sums[end - window]) / window
+        variance = np.maximum((squares[end] - squares[end - window]) / window - mean * mean, 0.0)
+        std = np.sqrt(variance)
+        scores = np.zeros(count)
+        nonzero = std > 1e-9
+        scores[nonzero] = (data[window:][nonzero] - mean[nonzero]) / std[nonzero]
+        return scores.tolist()
+
+    scores = []
+    total = sum(values[:window])
+    total_squares = sum(value * value for value in values[:window])
+    for index in range(window, len(values)):
+        mean = total / window
+        std = math.sqrt(max(total_squares / window - mean * mean, 0.0))
+        scores.append((values[index] - mean) / std if std > 1e-9 else 0.0)
+        old, new = values[index - window], values[index]
+        total += new - old
+        total_squares += new * new - old * old
+    return scores
+
+
+def linear_trend(timestamps: Sequence[float], values: Sequence[float]) -> Optional[Dict[str, float]]:
+    """Least-squares fit of values over time: slope per second, value at the last sample and r²"""
+    if len(values) < 2:
+        return None
+
+    if np is not None:
+        t = np.asarray(timestamps, dtype=np.float64)
+        y = np.asarray(values, dtype=np.float64)
+        t_centered = t - t.mean()
+        y_centered = y - y.mean()
+        denominator = float(np.dot(t_centered, t_centered))
+        if denominator == 0:
+            return None
+        slope = float(np.dot(t_centered, y_centered)) / denominator
+        fitted_last = float(y.mean() + slope * t_centered[-1])
+        total_ss = float(np.dot(y_centered, y_centered))
+        residual_ss = float(np.sum((y_centered - slope * t_centered) ** 2))
+    else:
+        n = len(values)
+        t_mean = sum(timestamps) / n
+        y_mean = sum(values) / n
+        denominator = sum((t - t_mean) ** 2 for t in timestamps)
+        if denominator == 0:
+            return None
+        slope = sum((t - t_mean) * (y - y_mean) for t, y in zip(timestamps, values)) / denominator
+        fitted_last = y_mean + slope * (timestamps[-1] - t_mean)
+        total_ss = sum((y - y_mean) ** 2 for y in values)
+        residual_ss = sum((y - y_mean - slope * (t - t_mean)) ** 2 for t, y in zip(timestamps, values))
+
+    r_squared = 1 - residual_ss / total_ss if total_ss > 0 else 0.0
+    return {'slope_per_second': slope, 'fitted_last': fitted_last, 'r_squared': r_squared}
+
+
+def correlation_matrix(columns: Dict[str, Sequence[float]]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Pearson correlation between equally long columns; None where a column is constant"""
+    names = list(columns)
+    if np is not None and names:
+        data = np.array([np.asarray(columns[name], dtype=np.float64) for name in names])
+        centered = data - data.mean(axis=1, keepdims=True)
+        norms = np.sqrt(np.einsum('ij,ij->i', centered, centered))
+        products = centered @ centered.T
+        matrix = {}
+        for i, a in enumerate(names):
+            matrix[a] = {}
+            for j, b in enumerate(names):
+                denominator = norms[i] * norms[j]
+                matrix[a][b] = round(float(products[i, j] / denominator), 3) if denominator > 1e-9 else None
+        return matrix
+
+    centered = {}
+    norms = {}
+    for name in names:
+        column = columns[name]
+        mean = sum(column) / len(column) if column else 0.0
+        centered[name] = [value - mean for value in column]
+        norms[name] = math.sqrt(sum(value * value for value in centered[name]))
+
+    matrix = {}
+    for a in names:
+        matrix[a] = {}
+        for b in names:
+            denominator = norms[a] * norms[b]
+            if denominator <= 1e-9:
+                matrix[a][b] = None
+            else:
+                matrix[a][b] = round(sum(x * y for x, y in zip(centered[a], centered[b])) / denominator, 3)
+    return matrix
+
+
+class MetricState:
+    """Incremental baseline for one metric: EWMA mean/variance and Holt level/trend"""
+
+    def __init__(self):
+        self.cursor = 0
+        self.count = 0
+        self.mean = None
+        self.variance = 0.0
+        self.level = None
+        self.trend = 0.0
+        self.last_timestamp = None
+        self.last_value = None
+        self.anomalies = deque(maxlen=20)
+
+    def update(self, timestamp: float, value: float, alpha: float, beta: float):
+        """Fold one sample into the EWMA and Holt state"""
+        if self.mean is None:
+            self.mean = value
+            self.level = value
+        else:
+            diff = value - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.variance = (1 - alpha) * (self.variance + diff * increment)
+
+            elapsed = timestamp - self.last_timestamp
+            if elapsed > 0:
+                previous_level = self.level
+                self.level = alpha * value + (1 - alpha) * (self.level + self.trend * elapsed)
+                self.trend = beta * (self.level - previous_level) / elapsed + (1 - beta) * self.trend
+        self.count += 1
+        self.last_timestamp = timestamp
+        self.last_value = value
+
+
+class AnalyticsEngine:
+    """Anomaly detection and forecasting over a MetricStore.
+
+    update() only folds in samples appended since the previous call, so a
+    cycle costs O(new samples + zscore_window) per metric. Counters are
+    converted to per-second rates first.
+    """
+
+    def __init__(self, store: MetricStore, threshold: float = 2.0, zscore_window: int = 60,
+                 warmup: int = 30, alpha: float = 0.1, beta: float = 0.05):
+        self.store = store
+        self.threshold = threshold
+        self.zscore_window = zscore_window
+        self.warmup = warmup
+        self.alpha = alpha
+        self.beta = beta
+        self.logger = logging.getLogger('AnalyticsEngine')
+        self.states: Dict[str, MetricState] = {}
+
+    def update(self) -> int:
+        """Process new samples for every metric; returns the number processed"""
+        processed = 0
+        for name in self.store.names():
+            series = self.store.series(name)
+            state = self.states.setdefault(name, MetricState())
+            new_samples = min(series.total_appended - state.cursor, len(series))
+            if new_samples <= 0:
+                continue
+            state.cursor = series.total_appended
+
+            counter = is_counter(name)
+            timestamps, values = series.window(last=new_samples + self.zscore_window + (1 if counter else 0))
+            if counter:
+                timestamps, values = counter_rates(timestamps, values)
+                new_samples = min(new_samples, len(values))
+            processed += self._process(name, state, list(timestamps), list(values), new_samples)
+        return processed
+
+    def _process(self, name: str, state: MetricState, timestamps: List[float], values: List[float], new_samples: int) -> int:
+        if new_samples <= 0:
+            return 0
+
+        history = len(values) - new_samples
+        window = min(self.zscore_window, history)
+        scores = rolling_zscores(values[history - window:], window) if window >= 2 else []
+        offset = len(values) - len(scores)
+
+        for index in range(history, len(values)):
+            score_index = index - offset
+            if state.count >= self.warmup and 0 <= score_index < len(scores) and abs(scores[score_index]) > self.threshold:
+                state.anomalies.append({
+                    'metric': name,
+                    'timestamp': timestamps[index],
+                    'value': round(values[index], 3),
+                    'zscore': round(scores[score_index], 2),
+                    'baseline': round(state.mean, 3) if state.mean is not None else None
+                })
+            state.update(timestamps[index], values[index], self.alpha, self.beta)
+        return new_samples
+
+    def baseline(self, name: str) -> Optional[Dict[str, float]]:
+        """Get the EWMA baseline of a metric once it has warmed up"""
+        state = self.states.get(name)
+        if not state or state.count < self.warmup:
+            return None
+        return {'mean': state.mean, 'std': math.sqrt(state.variance), 'samples': state.count}
+
+    def anomalies(self, prefix: str, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Get recent anomalies for metrics starting with prefix, newest first"""
+        found = [
+            anomaly
+            for name, state in self.states.items() if name.startswith(prefix)
+            for anomaly in state.anomalies
+            if since is None or anomaly['timestamp'] >= since
+        ]
+        return sorted(found, key=lambda anomaly: anomaly['timestamp'], reverse=True)
+
+    def forecast(self, name: str, horizon_seconds: float) -> Optional[Dict[str, Any]]:
+        """Project a metric horizon_seconds ahead with a linear fit and Holt's trend"""
+        timestamps, values = self.store.window(name)
+        if is_counter(name):
+            timestamps, values = counter_rates(timestamps, values)
+        state = self.states.get(name)
+        if len(values) < self.warmup or not state or state.level is None:
+            return None
+
+        linear = linear_trend(timestamps, values)
+        if linear is None:
+            return None
+        return {
+            'current': state.last_value,
+            'linear': linear['fitted_last'] + linear['slope_per_second'] * horizon_seconds,
+            'holt': state.level + state.trend * horizon_seconds,
+            'slope_per_day': linear['slope_per_second'] * 86400,
+            'holt_slope_per_day': state.trend * 86400,
+            'r_squared': round(linear['r_squared'], 3),
+            'samples': len(values),
+            'history_hours': round((timestamps[-1] - timestamps[0]) / 3600, 2)
+        }
+
+    def time_until(self, name: str, limit: float) -> Optional[Dict[str, Any]]:
+        """Estimate seconds until a growing metric reaches limit, by linear fit and Holt's trend"""
+        timestamps, values = self.store.window(name)
+        state = self.states.get(name)
+        if len(values) < self.warmup or not state or state.level is None:
+            return None
+
+        linear = linear_trend(timestamps, values)
+        linear_eta = None
+        if linear and linear['slope_per_second'] > 0:
+            linear_eta = max((limit - linear['fitted_last']) / linear['slope_per_second'], 0.0)
+        holt_eta = max((limit - state.level) / state.trend, 0.0) if state.trend > 0 else None
+        return {
+            'linear_eta_seconds': linear_eta,
+            'holt_eta_seconds': holt_eta,
+            'r_squared': round(linear['r_squared'], 3) if linear else None
+        }
+
+    def correlations(self, names: List[str], last: Optional[int] = None) -> Dict[str, Dict[str, Optional[float]]]:
+        """Correlate metrics over their newest common number of samples"""
+        columns = {}
+        for name in names:
+            timestamps, values = self.store.window(name, last=last)
+            if is_counter(name):
+                timestamps, values = counter_rates(timestamps, values)
+            if len(values) >= 2:
+                columns[name] = list(values)
+        if len(columns) < 2:
+            return {}
+
+        length = min(len(column) for column in columns.values())
+        if length < self.warmup:
+            return {}
+        return correlation_matrix({name: column[-length:] for name, column in columns.items()})
+
+    def hourly_profile(self, name: str) -> Dict[int, float]:
+        """Mean value of a metric per local hour of day"""
+        timestamps, values = self.store.window(name)
+        totals, counts = {}, {}
+        for timestamp, value in zip(timestamps, values):
+            hour = time.localtime(timestamp).tm_hour
+            totals[hour] = totals.get(hour, 0.0) + value
+            counts[hour] = counts.get(hour, 0) + 1
+        return {hour: totals[hour] / counts[hour] for hour in sorted(totals)}
@@ -0,0 +1,245 @@
+"""
+Metric Store for ITSM Agent
+Fixed-size columnar ring buffers for numeric metric history, optionally persisted with mmap
+"""
+
+import os
+import mmap
+import time
+import struct
+import bisect
+import logging
+import threading
+from array import array
+from urllib.parse import quote, unquote
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DEFAULT_CAPACITY = 1000
+
+SERIES_MAGIC = b'ITSMRING'
+SERIES_VERSION = 1
+SERIES_SUFFIX = '.ring'
+
+# magic, version, capacity, total samples appended
+SERIES_HEADER = struct.Struct('<8sIIQ')
+HEADER_SIZE = 32
+
+
+class MetricSeries:
+    """Ring buffer of (timestamp, value) float64 pairs for one metric.
+
+    Each sample is written twice, at slot and slot + capacity, so the newest
+    n samples always form one contiguous slice and windows are returned as
+    views without copying. Views stay valid until capacity more samples are
+    appended or the series is closed.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, path: Optional[str] = None):
+        self.capacity = capacity
+        self.path = path
+        self._mmap = None
+        self._file = None
+
+        if path:
+            self._open_file(path)
+        else:
+            self._buffer = array('d', bytes(32 * capacity))
+            self._total = 0
+            doubles = memoryview(self._buffer)
+            self._timestamps = doubles[:2 * capacity]
+            self._values = doubles[2 * capacity:]
+
+    def _open_file(self, path: str):
+        """Map the series file, creating it or resetting it if the layout does not match"""
+        size = HEADER_SIZE + 32 * self.capacity
+        self._total = 0
+        exists = os.path.exists(path) and os.path.getsize(path) == size
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        if not exists:
+            self._file.truncate(size)
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+
+        magic, version, capacity, total = SERIES_HEADER.unpack_from(self._mmap, 0)
+        if magic == SERIES_MAGIC and version == SERIES_VERSION and capacity == self.capacity:
+            self._total = total
+        else:
+            self._mmap[:size] = bytes(size)
+            SERIES_HEADER.pack_into(self._mmap, 0, SERIES_MAGIC, SERIES_VERSION, self.capacity, 0)
+
+        doubles = memoryview(self._mmap)[HEADER_SIZE:].cast('d')
+        self._timestamps = doubles[:2 * self.capacity]
+        self._values = doubles[2 * self.capacity:]
+
+    def __len__(self) -> int:
+        return min(self._total, self.capacity)
+
+    @property
+    def total_appended(self) -> int:
+        """Samples appended over the lifetime of the series, including overwritten ones"""
+        return self._total
+
+    def append(self, value: float, timestamp: Optional[float] = None):
+        """Add a sample, overwriting the oldest once the buffer is full"""
+        timestamp = time.time() if timestamp is None else timestamp
+        slot = self._total % self.capacity
+        for index in (slot, slot + self.capacity):
+            self._timestamps[index] = timestamp
+            self._values[index] = value
+        self._total += 1
+        if self._mmap is not None:
+            struct.pack_into('<Q', self._mmap, 16, self._total)
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        """Get the newest (timestamp, value), or None when empty"""
+        if not self._total:
+            return None
+        slot = (self._total - 1) % self.capacity
+        return self._timestamps[slot], self._values[slot]
+
+    def _bounds(self, count: int) -> Tuple[int, int]:
+        end = (self._total - 1) % self.capacity + 1 + self.capacity if self._total else self.capacity
+        return end - count, end
+
+    def window(self, last: Optional[int] = None, since: Optional[float] = None):
+        """Get (timestamps, values) for the newest samples, oldest first.
+
+        last limits the number of samples and since drops samples older than
+        that timestamp. Results are NumPy arrays when NumPy is installed and
+        memoryviews otherwise; both share memory with the buffer.
+        """
+        count = len(self) if last is None else max(0, min(last, len(self)))
+        start, end = self._bounds(count)
+        if since is not None:
+            start = bisect.bisect_left(self._timestamps, since, start, end)
+
+        timestamps, values = self._timestamps[start:end], self._values[start:end]
+        if np is not None:
+            return np.frombuffer(timestamps, dtype=np.float64), np.frombuffer(values, dtype=np.float64)
+        return timestamps, values
+
+    def values(self, last: Optional[int] = None, since: Optional[float] = None) -> List[float]:
+        """Get the window values as a plain list"""
+        return list(self.window(last=last, since=since)[1])
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes used by the sample buffers"""
+        return 32 * self.capacity
+
+    def flush(self):
+        """Write pending changes of a persisted series to disk"""
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self):
+        """Flush and unmap a persisted series"""
+        if self._mmap is None:
+            return
+        self._mmap.flush()
+        self._timestamps.release()
+        self._values.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a window view; the map is released with it
+            pass
+        self._file.close()
+        self._mmap = None
+
+
+class MetricStore:
+    """Named metric series with a shared capacity.
+
+    With a path, every series is kept in its own memory-mapped file in that
+    directory so history survives agent restarts.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, path: Optional[str] = None):
+        self.capacity = capacity
+        self.path = path
+        self.logger = logging.getLogger('MetricStore')
+        self._series: Dict[str, MetricSeries] = {}
+        self._lock = threading.Lock()
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            for filename in os.listdir(path):
+                if filename.endswith(SERIES_SUFFIX):
+                    self._open_series(unquote(filename[:-len(SERIES_SUFFIX)]))
+
+    def _open_series(self, name: str) -> MetricSeries:
+        series_path = os.path.join(self.path, quote(name, safe='') + SERIES_SUFFIX) if self.path else None
+        series = MetricSeries(self.capacity, series_path)
+        self._series[name] = series
+        return series
+
+    def record(self, metrics: Dict[str, Optional[float]], timestamp: Optional[float] = None):
+        """Append one sample per metric; None values are skipped"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for name, value in metrics.items():
+                if value is None:
+                    continue
+                series = self._series.get(name)
+                if series is None:
+                    try:
+                        series = self._open_series(name)
+                    except OSError as e:
+                        self.logger.warning(f"Cannot persist metric {name}, keeping it in memory: {e}")
+                        series = MetricSeries(self.capacity)
+                        self._series[name] = series
+                series.append(float(value), timestamp)
+
+    def series(self, name: str) -> Optional[MetricSeries]:
+        """Get a metric series by name"""
+        return self._series.get(name)
+
+    def window(self, name: str, last: Optional[int] = None, since: Optional[float] = None):
+        """Get (timestamps, values) for a metric; empty when it was never recorded"""
+        series = self._series.get(name)
+        if series is None:
+            empty = np.empty(0) if np is not None else memoryview(array('d'))
+            return empty, empty
+        return series.window(last=last, since=since)
+
+    def names(self, prefix: str = '') -> List[str]:
+        """Get recorded metric names, optionally filtered by prefix"""
+        return sorted(name for name in self._series if name.startswith(prefix))
+
+    def remove(self, names: Iterable[str]):
+        """Drop metrics, deleting their files when persisted"""
+        with self._lock:
+            for name in names:
+                series = self._series.pop(name, None)
+                if series is None:
+                    continue
+                series.close()
+                if series.path and os.path.exists(series.path):
+                    os.remove(series.path)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get series count, stored samples and buffer size"""
+        series = list(self._series.values())
+        return {
+            'series': len(series),
+            'samples': sum(len(s) for s in series),
+            'memory_bytes': sum(s.memory_bytes for s in series),
+            'persistent': bool(self.path)
+        }
+
+    def flush(self):
+        """Write all persisted series to disk"""
+        for series in list(self._series.values()):
+            series.flush()
+
+    def close(self):
+        """Flush and close all series"""
+        with self._lock:
+            for series in self._series.values():
+                series.close()
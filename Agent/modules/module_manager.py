@@ -6,6 +6,7 @@ Coordinates and manages all agent modules
 
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from .base_module import BaseModule
@@ -28,17 +29,36 @@ from .compliance_configuration_module import ComplianceConfigurationModule
 from .predictive_analytics_module import PredictiveAnalyticsModule
 from .remote_management_module import RemoteManagementModule
 
+# A failed or timed-out module is retried after this many seconds, doubling per consecutive failure
+RETRY_DELAY = 60
+
 
 class ModuleManager:
     """Manages all agent modules and coordinates data collection"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 6, module_timeout: float = 60.0,
+                 collection_timeout: float = 180.0, module_timeouts: Optional[Dict[str, float]] = None,
+                 module_intervals: Optional[Dict[str, int]] = None):
         self.logger = logging.getLogger(__name__)
         self.modules = {}
         self.module_status = {}
         self.collection_stats = {}
         self.last_collection_time = None
         
+        # Concurrent collection settings
+        self.max_workers = max_workers
+        self.module_timeout = module_timeout
+        self.collection_timeout = collection_timeout
+        self.module_timeouts = module_timeouts or {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='module-collector')
+        self._in_flight = {}
+        
+        # Per-module scheduling state
+        self.module_intervals = module_intervals or {}
+        self._cached_results = {}
+        self._last_attempt = {}
+        self._failures = {}
+        
         # Initialize all modules
         self._initialize_modules()
     
@@ -72,6 +92,7 @@ class ModuleManager:
                     'last_run': None,
                     'last_duration': 0,
                     'error_count': 0,
+                    'timeout_count': 0,
                     'last_error': None
                 }
             
@@ -80,80 +101,144 @@ class ModuleManager:
         except Exception as e:
             self.logger.error(f"Error initializing modules: {e}")
     
-    def collect_all_data(self) -> Dict[str, Any]:
-        """Collect data from all modules"""
+    def collect_all_data(self, module_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Collect data from all modules (or the given subset) concurrently"""
+        if module_names is None:
+            module_names = list(self.modules.keys())
+        
         collection_start = time.time()
         collected_data = {
             'timestamp': datetime.utcnow().isoformat() + 'Z',
             '_module_status': {},
             '_collection_metadata': {
                 'total_modules': len(self.modules),
-                'collection_start': collection_start
+                'collected_modules': len(module_names),
+                'collection_start': collection_start,
+                'max_workers': self.max_workers
             }
         }
         
         successful_collections = 0
         failed_collections = 0
+        succeeded = set()
+        timed_out_modules = []
+        summed_module_duration = 0.0
         
-        # Collect from each module
-        for module_name, module in self.modules.items():
-            module_start = time.time()
+        # Submit each module to the worker pool
+        futures = {}
+        started_at = {}
+        for module_name in module_names:
+            module = self.modules[module_name]
+            self._last_attempt[module_name] = collection_start
+            in_flight = self._in_flight.get(module_name)
+            if in_flight is not None and not in_flight.done():
+                # A previous run is still blocked, don't stack another one behind it
+                self.logger.warning(f"Module {module_name} is still running from a previous cycle, skipping")
+                timed_out_modules.append(module_name)
+                collected_data[module_name] = self._record_timeout(module_name, 0.0, still_running=True)
+                continue
             
-            try:
-                self.logger.debug(f"Collecting data from {module_name} module")
-                
-                # Collect data from module
-                module_data = module.collect()
-                
-                # Store module data
-                collected_data[module_name] = module_data
-                
-                # Update module status
-                module_duration = time.time() - module_start
-                self.module_status[module_name].update({
-                    'status': 'success',
-                    'last_run': datetime.utcnow().isoformat() + 'Z',
-                    'last_duration': round(module_duration, 3),
-                    'last_error': None
-                })
-                
-                successful_collections += 1
-                
-                self.logger.debug(f"Successfully collected data from {module_name} in {module_duration:.3f}s")
-                
-            except Exception as e:
-                # Handle module collection error
-                module_duration = time.time() - module_start
-                error_msg = str(e)
-                
-                self.module_status[module_name].update({
-                    'status': 'error',
-                    'last_run': datetime.utcnow().isoformat() + 'Z',
-                    'last_duration': round(module_duration, 3),
-                    'last_error': error_msg,
-                    'error_count': self.module_status[module_name].get('error_count', 0) + 1
-                })
-                
-                failed_collections += 1
-                
-                self.logger.error(f"Error collecting data from {module_name}: {error_msg}")
+            self.logger.debug(f"Collecting data from {module_name} module")
+            future = self._executor.submit(self._run_module, module_name, module, started_at)
+            futures[future] = module_name
+            self._in_flight[module_name] = future
+        
+        # Wait for results, expiring modules that exceed their deadline
+        pending = set(futures)
+        while pending:
+            now = time.time()
+            deadlines = {}
+            for future in pending:
+                module_name = futures[future]
+                module_start = started_at.get(module_name)
+                if module_start is None:
+                    # Still queued behind other modules, bound by the cycle deadline
+                    deadlines[future] = collection_start + self.collection_timeout
+                else:
+                    deadlines[future] = module_start + self._get_module_timeout(module_name)
+            
+            expired = [future for future, deadline in deadlines.items() if deadline <= now]
+            for future in expired:
+                pending.discard(future)
+                module_name = futures[future]
+                module_duration = now - started_at.get(module_name, now)
+                summed_module_duration += module_duration
+                timed_out_modules.append(module_name)
+                collected_data[module_name] = self._record_timeout(module_name, module_duration)
+            
+            if not pending:
+                break
+            
+            next_deadline = min(deadlines[future] for future in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                pending.discard(future)
+                module_name = futures[future]
+                module_data, module_duration, error_msg = future.result()
+                summed_module_duration += module_duration
                 
-                # Store error information in collected data
-                collected_data[module_name] = {
-                    'error': error_msg,
-                    'timestamp': datetime.utcnow().isoformat() + 'Z'
-                }
+                if error_msg is None:
+                    # Store module data
+                    collected_data[module_name] = module_data
+                    
+                    # Update module status
+                    self.module_status[module_name].update({
+                        'status': 'success',
+                        'last_run': datetime.utcnow().isoformat() + 'Z',
+                        'last_duration': round(module_duration, 3),
+                        'last_error': None
+                    })
+                    
+                    successful_collections += 1
+                    succeeded.add(module_name)
+                    
+                    self.logger.debug(f"Successfully collected data from {module_name} in {module_duration:.3f}s")
+                else:
+                    # Handle module collection error
+                    self.module_status[module_name].update({
+                        'status': 'error',
+                        'last_run': datetime.utcnow().isoformat() + 'Z',
+                        'last_duration': round(module_duration, 3),
+                        'last_error': error_msg,
+                        'error_count': self.module_status[module_name].get('error_count', 0) + 1
+                    })
+                    
+                    failed_collections += 1
+                    
+                    self.logger.error(f"Error collecting data from {module_name}: {error_msg}")
+                    
+                    # Store error information in collected data
+                    collected_data[module_name] = {
+                        'error': error_msg,
+                        'timestamp': datetime.utcnow().isoformat() + 'Z'
+                    }
+        
+        # Remember the last good section of each module; failed ones are retried soon
+        for module_name in module_names:
+            module_data = collected_data.get(module_name)
+            if module_name in succeeded and BaseModule._is_cacheable(module_data):
+                self._cached_results[module_name] = module_data
+                self._failures.pop(module_name, None)
+            else:
+                self._failures[module_name] = self._failures.get(module_name, 0) + 1
         
         # Finalize collection metadata
         collection_end = time.time()
         total_duration = collection_end - collection_start
+        failed_collections += len(timed_out_modules)
+        parallel_speedup = summed_module_duration / total_duration if total_duration > 0 else 1.0
         
         collected_data['_module_status'] = self.module_status.copy()
         collected_data['_collection_metadata'].update({
             'collection_end': collection_end,
             'total_duration': round(total_duration, 3),
+            'wall_clock_duration': round(total_duration, 3),
+            'summed_module_duration': round(summed_module_duration, 3),
+            'parallel_speedup': round(parallel_speedup, 2),
             'successful_modules': successful_collections,
             'failed_modules': failed_collections,
+            'timed_out_modules': timed_out_modules,
             'collection_timestamp': datetime.utcnow().isoformat() + 'Z'
         })
         
@@ -161,8 +246,13 @@ class ModuleManager:
         self.collection_stats = {
             'last_collection': datetime.utcnow().isoformat() + 'Z',
             'total_duration': round(total_duration, 3),
+            'wall_clock_duration': round(total_duration, 3),
+            'summed_module_duration': round(summed_module_duration, 3),
+            'parallel_speedup': round(parallel_speedup, 2),
             'successful_modules': successful_collections,
             'failed_modules': failed_collections,
+            'timed_out_modules': len(timed_out_modules),
+            'collected_modules': len(module_names),
             'total_modules': len(self.modules)
         }
         
@@ -170,11 +260,123 @@ class ModuleManager:
         
         self.logger.info(
             f"Data collection completed: {successful_collections} successful, "
-            f"{failed_collections} failed, total time: {total_duration:.3f}s"
+            f"{failed_collections} failed ({len(timed_out_modules)} timed out), "
+            f"wall time: {total_duration:.3f}s, summed module time: {summed_module_duration:.3f}s"
         )
         
         return collected_data
     
+    def collect_due_data(self) -> Dict[str, Any]:
+        """Collect only the modules whose interval has elapsed and merge in cached sections"""
+        due_modules = self.get_due_modules()
+        
+        collected_data = self.collect_all_data(due_modules)
+        
+        cached_modules = []
+        for module_name in self.modules:
+            if module_name not in self._cached_results:
+                continue
+            # Modules that just failed report their last good section until a retry succeeds
+            if module_name not in due_modules or self._failures.get(module_name):
+                collected_data[module_name] = self._cached_results[module_name]
+                cached_modules.append(module_name)
+        
+        for module_name in self.modules:
+            next_due = datetime.utcfromtimestamp(self._get_next_due(module_name))
+            self.module_status[module_name]['next_due'] = next_due.isoformat() + 'Z'
+        
+        collected_data['_module_status'] = self.module_status.copy()
+        collected_data['_collection_metadata'].update({
+            'fresh_modules': [name for name in due_modules if name not in cached_modules],
+            'cached_modules': cached_modules
+        })
+        
+        return collected_data
+    
+    def get_due_modules(self, now: Optional[float] = None) -> List[str]:
+        """Get names of modules whose collection interval has elapsed"""
+        now = time.time() if now is None else now
+        return [
+            module_name for module_name in self.modules
+            if self.modules[module_name].enabled and self._get_next_due(module_name) <= now
+        ]
+    
+    def get_seconds_until_next_due(self, now: Optional[float] = None) -> float:
+        """Get the number of seconds until the next module becomes due"""
+        now = time.time() if now is None else now
+        next_due = [
+            self._get_next_due(module_name) for module_name, module in self.modules.items()
+            if module.enabled
+        ]
+        if not next_due:
+            return float(BaseModule.collection_interval)
+        return max(0.0, min(next_due) - now)
+    
+    def mark_dirty(self, module_names: List[str]) -> List[str]:
+        """Make modules due immediately and drop their cached results"""
+        marked = []
+        for module_name in module_names:
+            if module_name not in self.modules:
+                continue
+            self.modules[module_name].invalidate_cache()
+            self._last_attempt.pop(module_name, None)
+            marked.append(module_name)
+        return marked
+    
+    def _get_module_interval(self, module_name: str) -> int:
+        """Get the collection interval in seconds for a module"""
+        return self.module_intervals.get(module_name, self.modules[module_name].collection_interval)
+    
+    def _get_next_due(self, module_name: str) -> float:
+        """Get the timestamp when a module is next due for collection"""
+        last_attempt = self._last_attempt.get(module_name)
+        if last_attempt is None:
+            return 0.0
+        interval = self._get_module_interval(module_name)
+        failures = self._failures.get(module_name, 0)
+        if failures:
+            interval = min(interval, RETRY_DELAY * 2 ** (failures - 1))
+        return last_attempt + interval
+    
+    def _run_module(self, module_name: str, module: BaseModule, started_at: Dict[str, float]):
+        """Run a single module collection inside a worker thread"""
+        module_start = time.time()
+        started_at[module_name] = module_start
+        
+        try:
+            module_data = module.cached_collect()
+            return module_data, time.time() - module_start, None
+        except Exception as e:
+            return None, time.time() - module_start, str(e)
+    
+    def _get_module_timeout(self, module_name: str) -> float:
+        """Get the collection deadline in seconds for a module"""
+        return self.module_timeouts.get(module_name, self.module_timeout)
+    
+    def _record_timeout(self, module_name: str, module_duration: float, still_running: bool = False) -> Dict[str, Any]:
+        """Update status for a module that missed its deadline and return its placeholder data"""
+        if still_running:
+            error_msg = 'Previous collection still running'
+        else:
+            error_msg = f'Collection exceeded {self._get_module_timeout(module_name)}s deadline'
+        
+        self.module_status[module_name].update({
+            'status': 'timeout',
+            'last_run': datetime.utcnow().isoformat() + 'Z',
+            'last_duration': round(module_duration, 3),
+            'last_error': error_msg,
+            'error_count': self.module_status[module_name].get('error_count', 0) + 1,
+            'timeout_count': self.module_status[module_name].get('timeout_count', 0) + 1
+        })
+        
+        self.logger.warning(f"Module {module_name} timed out: {error_msg}")
+        
+        return {
+            'error': error_msg,
+            'status': 'timeout',
+            'timestamp': datetime.utcnow().isoformat() + 'Z'
+        }
+    
     def get_module_status(self) -> Dict[str, Any]:
         """Get status of all modules"""
         return {
@@ -195,7 +397,7 @@ class ModuleManager:
         
         try:
             module_start = time.time()
-            data = self.modules[module_name].collect()
+            data = self.modules[module_name].cached_collect()
             module_duration = time.time() - module_start
             
             # Update module status
@@ -229,7 +431,12 @@ class ModuleManager:
         try:
             # Reinitialize the module
             module_class = type(self.modules[module_name])
+            enabled = self.modules[module_name].enabled
             self.modules[module_name] = module_class()
+            self.modules[module_name].enabled = enabled
+            self._in_flight.pop(module_name, None)
+            self._last_attempt.pop(module_name, None)
+            self._failures.pop(module_name, None)
             
             # Reset status
             self.module_status[module_name] = {
@@ -237,6 +444,7 @@ class ModuleManager:
                 'last_run': None,
                 'last_duration': 0,
                 'error_count': 0,
+                'timeout_count': 0,
                 'last_error': None,
                 'restart_time': datetime.utcnow().isoformat() + 'Z'
             }
@@ -264,7 +472,7 @@ class ModuleManager:
         """Get list of modules that have failed"""
         failed = []
         for module_name, status in self.module_status.items():
-            if status.get('status') == 'error':
+            if status.get('status') in ['error', 'timeout']:
                 failed.append(module_name)
         return failed
     
@@ -327,6 +535,7 @@ class ModuleManager:
             for module_name, module in self.modules.items():
                 if hasattr(module, 'cleanup'):
                     module.cleanup()
+            self._executor.shutdown(wait=False, cancel_futures=True)
             self.logger.info("Module manager cleanup completed")
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
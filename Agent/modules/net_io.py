@@ -0,0 +1,137 @@
+"""
+Network I/O Snapshot for ITSM Agent
+One shared per-interface counter snapshot, with rates and link utilisation against the previous one
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+import psutil
+
+from .disk_io import counter_delta
+
+
+# Snapshots younger than this are reused, so every consumer in a cycle shares one read
+DEFAULT_MAX_AGE = 5.0
+
+COUNTER_FIELDS = ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv', 'errin', 'errout', 'dropin', 'dropout')
+
+
+def compute_rates(before: Dict[str, int], after: Dict[str, int], elapsed: float,
+                  speed_mbps: int = 0) -> Optional[Dict[str, float]]:
+    """Per-second traffic, error and drop rates between two counter sets.
+
+    With a link speed, utilisation is the busier direction's share of it
+    (links are full duplex, so each direction has the whole speed).
+    """
+    if elapsed <= 0:
+        return None
+    # A backwards byte counter is a 32-bit wrap only if the wrapped increase fits through the link;
+    # without a known speed, and for packet counters, it is a reset (interface re-created)
+    max_bytes = speed_mbps * 1_000_000 / 8 * elapsed if speed_mbps else None
+    deltas = {}
+    for field in COUNTER_FIELDS:
+        delta = counter_delta(after[field], before[field], max_bytes if field.startswith('bytes_') else None)
+        if delta is None:
+            return None
+        deltas[field] = delta
+
+    packets = deltas['packets_sent'] + deltas['packets_recv']
+    errors = deltas['errin'] + deltas['errout']
+    rates = {
+        'bytes_sent_per_sec': round(deltas['bytes_sent'] / elapsed, 1),
+        'bytes_recv_per_sec': round(deltas['bytes_recv'] / elapsed, 1),
+        'packets_sent_per_sec': round(deltas['packets_sent'] / elapsed, 2),
+        'packets_recv_per_sec': round(deltas['packets_recv'] / elapsed, 2),
+        'errors_per_sec': round(errors / elapsed, 3),
+        'drops_per_sec': round((deltas['dropin'] + deltas['dropout']) / elapsed, 3),
+        'error_rate_percent': round(errors / packets * 100, 2) if packets else 0.0,
+        'interval': round(elapsed, 3)
+    }
+    if speed_mbps:
+        capacity = speed_mbps * 1_000_000 / 8
+        rates['tx_utilization_percent'] = round(min(100.0, rates['bytes_sent_per_sec'] / capacity * 100), 2)
+        rates['rx_utilization_percent'] = round(min(100.0, rates['bytes_recv_per_sec'] / capacity * 100), 2)
+        rates['utilization_percent'] = max(rates['tx_utilization_percent'], rates['rx_utilization_percent'])
+    return rates
+
+
+class NetIOSnapshot:
+    """Per-interface counters and link state from one psutil read, with rates since the previous snapshot"""
+
+    def __init__(self, interfaces: Dict[str, Dict[str, Any]], taken_at: float, monotonic: float):
+        self.interfaces = interfaces
+        self.taken_at = taken_at
+        self.monotonic = monotonic
+
+    @classmethod
+    def capture(cls, previous: Optional['NetIOSnapshot'] = None) -> 'NetIOSnapshot':
+        """Read every interface's counters and link state once and compute rates against previous"""
+        monotonic = time.monotonic()
+        # nowrap=False: wraps are handled per pair of snapshots in counter_delta
+        counters = psutil.net_io_counters(pernic=True, nowrap=False) or {}
+        try:
+            link_stats = psutil.net_if_stats()
+        except Exception:
+            link_stats = {}
+
+        interfaces = {}
+        for name, io in counters.items():
+            stats = {field: getattr(io, field) for field in COUNTER_FIELDS}
+            link = link_stats.get(name)
+            stats['isup'] = link.isup if link else None
+            stats['speed'] = link.speed if link else 0
+            stats['mtu'] = link.mtu if link else 0
+            if previous is not None and name in previous.interfaces:
+                rates = compute_rates(previous.interfaces[name], stats, monotonic - previous.monotonic, stats['speed'])
+                if rates:
+                    stats['rates'] = rates
+            interfaces[name] = stats
+        return cls(interfaces, time.time(), monotonic)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.monotonic() - self.monotonic
+
+    def interface(self, name: str) -> Dict[str, Any]:
+        """Counters, link state and rates of one interface ({} when unknown)"""
+        return self.interfaces.get(name, {})
+
+    def totals(self) -> Dict[str, Any]:
+        """Counters and rates summed over all interfaces, like psutil.net_io_counters()"""
+        totals = {field: sum(stats[field] for stats in self.interfaces.values()) for field in COUNTER_FIELDS}
+        with_rates = [stats['rates'] for stats in self.interfaces.values() if 'rates' in stats]
+        if with_rates:
+            rates = {field: round(sum(rate[field] for rate in with_rates), 3)
+                     for field in ('bytes_sent_per_sec', 'bytes_recv_per_sec', 'packets_sent_per_sec',
+                                   'packets_recv_per_sec', 'errors_per_sec', 'drops_per_sec')}
+            packets = rates['packets_sent_per_sec'] + rates['packets_recv_per_sec']
+            rates['error_rate_percent'] = round(rates['errors_per_sec'] / packets * 100, 2) if packets else 0.0
+            utilizations = [rate['utilization_percent'] for rate in with_rates if 'utilization_percent' in rate]
+            if utilizations:
+                rates['max_utilization_percent'] = max(utilizations)
+            totals['rates'] = rates
+        return totals
+
+
+_lock = threading.Lock()
+_latest: Optional[NetIOSnapshot] = None
+capture_count = 0
+
+
+def get_net_io_snapshot(max_age: float = DEFAULT_MAX_AGE) -> NetIOSnapshot:
+    """Get the shared snapshot, taking a new one if the current one is older than max_age.
+
+    Rates in a new snapshot are computed against the one it replaces.
+    """
+    global _latest, capture_count
+
+    with _lock:
+        if _latest is None or _latest.age > max_age:
+            _latest = NetIOSnapshot.capture(previous=_latest)
+            capture_count += 1
+            logging.getLogger('NetIOSnapshot').debug(f"Captured I/O counters for {len(_latest.interfaces)} interfaces")
+        return _latest
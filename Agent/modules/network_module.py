@@ -9,11 +9,17 @@ import psutil
 import subprocess
 from typing import Dict, Any, List
 from .base_module import BaseModule
+from .public_ip_resolver import get_public_ip_resolver
+from .linux_sources import get_linux_sources
+from .net_io import get_net_io_snapshot
+from .ping_sweep import PingSweeper, parse_targets, read_arp_cache, resolve_hostnames, guess_os_from_ttl
 
 
 class NetworkModule(BaseModule):
     """Network information collection module"""
 
+    collection_interval = 300  # seconds
+
     def __init__(self):
         super().__init__('Network')
         self.is_windows = platform.system().lower() == 'windows'
@@ -80,8 +86,7 @@ class NetworkModule(BaseModule):
 
         try:
             net_if_addrs = psutil.net_if_addrs()
-            net_if_stats = psutil.net_if_stats()
-            net_io_counters = psutil.net_io_counters(pernic=True)
+            net_io = get_net_io_snapshot()
         except Exception as e:
             self.logger.error(f"Failed to get network interface data: {e}")
             return interfaces
@@ -94,16 +99,14 @@ class NetworkModule(BaseModule):
             if any(keyword.lower() in interface_name.lower() for keyword in virtual_keywords):
                 continue
 
-            interface_info = self._get_interface_info(
-                interface_name, addresses, net_if_stats, net_io_counters
-            )
+            interface_info = self._get_interface_info(interface_name, addresses, net_io.interface(interface_name))
 
             if interface_info:
                 interfaces.append(interface_info)
 
         return interfaces
 
-    def _get_interface_info(self, name: str, addresses, stats_dict, io_dict) -> Dict[str, Any]:
+    def _get_interface_info(self, name: str, addresses, io: Dict[str, Any]) -> Dict[str, Any]:
         """Get information for a single network interface"""
         interface_info = {
             'name': name,
@@ -121,23 +124,20 @@ class NetworkModule(BaseModule):
         }
 
         # Get interface statistics
-        if name in stats_dict:
-            stats = stats_dict[name]
-            interface_info['status'] = 'up' if stats.isup else 'down'
-            interface_info['speed'] = getattr(stats, 'speed', 0)
-            interface_info['mtu'] = getattr(stats, 'mtu', 0)
+        if io.get('isup') is not None:
+            interface_info['status'] = 'up' if io['isup'] else 'down'
+            interface_info['speed'] = io['speed']
+            interface_info['mtu'] = io['mtu']
 
             # Skip interfaces that are down
-            if not stats.isup:
+            if not io['isup']:
                 return None
 
-        # Get I/O counters
-        if name in io_dict:
-            io = io_dict[name]
-            interface_info['bytes_sent'] = getattr(io, 'bytes_sent', 0)
-            interface_info['bytes_recv'] = getattr(io, 'bytes_recv', 0)
-            interface_info['packets_sent'] = getattr(io, 'packets_sent', 0)
-            interface_info['packets_recv'] = getattr(io, 'packets_recv', 0)
+        # Get I/O counters and rates since the previous snapshot
+        for field in ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv'):
+            interface_info[field] = io.get(field, 0)
+        if 'rates' in io:
+            interface_info['rates'] = io['rates']
 
         # Process addresses
         for addr in addresses:
@@ -180,24 +180,7 @@ class NetworkModule(BaseModule):
     def _get_public_ip(self) -> str:
         """Get public IP address"""
         try:
-            import requests
-
-            services = [
-                'https://api.ipify.org',
-                'https://icanhazip.com',
-                'https://checkip.amazonaws.com'
-            ]
-
-            for service in services:
-                try:
-                    response = requests.get(service, timeout=10)
-                    if response.status_code == 200:
-                        return response.text.strip()
-                except Exception as e:
-                    self.logger.debug(f"Failed to get IP from {service}: {e}")
-                    continue
-        except ImportError:
-            self.logger.debug("requests module not available for public IP lookup")
+            return get_public_ip_resolver().resolve()['public_ip'] or "unknown"
         except Exception as e:
             self.logger.debug(f"Error getting public IP: {e}")
 
@@ -235,17 +218,7 @@ class NetworkModule(BaseModule):
 
     def _get_linux_dns_servers(self) -> List[str]:
         """Get DNS servers on Linux"""
-        dns_servers = []
-        try:
-            with open('/etc/resolv.conf', 'r') as f:
-                for line in f:
-                    if line.startswith('nameserver'):
-                        dns_ip = line.split()[1]
-                        if dns_ip not in dns_servers:
-                            dns_servers.append(dns_ip)
-        except Exception:
-            pass
-        return dns_servers
+        return get_linux_sources().dns_servers()
 
     def _get_default_gateway(self) -> str:
         """Get default gateway"""
@@ -275,33 +248,12 @@ class NetworkModule(BaseModule):
 
     def _get_linux_gateway(self) -> str:
         """Get default gateway on Linux"""
-        try:
-            result = subprocess.run(['ip', 'route', 'show', 'default'],
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'default via' in line:
-                        parts = line.split()
-                        if len(parts) >= 3:
-                            return parts[2]
-        except Exception:
-            pass
-        return None
+        return get_linux_sources().default_gateway()
 
     def _get_network_io_counters(self) -> Dict[str, Any]:
-        """Get network I/O statistics"""
+        """Get network I/O statistics and rates"""
         try:
-            io_counters = psutil.net_io_counters()
-            return {
-                'bytes_sent': io_counters.bytes_sent,
-                'bytes_recv': io_counters.bytes_recv,
-                'packets_sent': io_counters.packets_sent,
-                'packets_recv': io_counters.packets_recv,
-                'errin': io_counters.errin,
-                'errout': io_counters.errout,
-                'dropin': io_counters.dropin,
-                'dropout': io_counters.dropout
-            }
+            return get_net_io_snapshot().totals()
         except Exception as e:
             self.logger.error(f"Error getting network I/O counters: {e}")
             return {}
@@ -341,71 +293,29 @@ class NetworkModule(BaseModule):
     def _get_linux_wifi_info(self) -> Dict[str, Any]:
         """Get Wi-Fi information on Linux"""
         try:
-            result = subprocess.run(['iwconfig'], capture_output=True, text=True, timeout=10)
-            if 'ESSID:' in result.stdout:
-                wifi_info = {'connected': True, 'status': 'connected'}
-                # Extract SSID
-                for line in result.stdout.split('\n'):
-                    if 'ESSID:' in line:
-                        ssid = line.split('ESSID:')[-1].split()[0].strip('"')
-                        if ssid != 'off/any':
-                            wifi_info['ssid'] = ssid
-                        break
-                return wifi_info
-            else:
-                return {'connected': False, 'status': 'disconnected'}
+            return get_linux_sources().wifi_info()
         except Exception:
             return {'connected': False, 'status': 'unknown'}
 
     def _get_geolocation(self) -> Dict[str, Any]:
         """Get geolocation information based on public IP"""
         try:
-            import requests
-
-            public_ip = self._get_public_ip()
-            if public_ip == "unknown":
+            resolved = get_public_ip_resolver().resolve()
+            public_ip = resolved['public_ip']
+            if not public_ip:
                 return {'location': 'Unknown', 'error': 'Could not determine public IP'}
 
-            geo_services = [
-                f'https://ipapi.co/{public_ip}/json/',
-                f'http://ip-api.com/json/{public_ip}',
-                f'https://ipinfo.io/{public_ip}/json'
-            ]
-
-            for geo_url in geo_services:
-                try:
-                    geo_response = requests.get(geo_url, timeout=10)
-                    if geo_response.status_code == 200:
-                        geo_data = geo_response.json()
-
-                        # Extract location information
-                        location_parts = []
-                        city = geo_data.get('city') or geo_data.get('cityName')
-                        region = geo_data.get('region') or geo_data.get('region_name') or geo_data.get('stateProv')
-                        country = geo_data.get('country') or geo_data.get('country_name') or geo_data.get('countryName')
-
-                        if city:
-                            location_parts.append(city)
-                        if region and region != city:
-                            location_parts.append(region)
-                        if country:
-                            location_parts.append(country)
-
-                        return {
-                            'location': ', '.join(location_parts) if location_parts else 'Unknown',
-                            'isp': geo_data.get('isp') or geo_data.get('org') or geo_data.get('as'),
-                            'timezone': geo_data.get('timezone') or geo_data.get('timeZone'),
-                            'coordinates': f"{geo_data.get('lat', geo_data.get('latitude', ''))},{geo_data.get('lon', geo_data.get('longitude', ''))}" if geo_data.get('lat') or geo_data.get('latitude') else None
-                        }
-                except Exception as e:
-                    self.logger.debug(f"Failed to get geolocation from {geo_url}: {e}")
-                    continue
+            geo = resolved['geo']
+            if not geo:
+                return {'location': f'IP: {public_ip} (Location lookup failed)'}
 
-            return {'location': f'IP: {public_ip} (Location lookup failed)'}
+            return {
+                'location': geo['location'],
+                'isp': geo['isp'],
+                'timezone': geo['timezone'],
+                'coordinates': f"{geo['latitude']},{geo['longitude']}" if geo['latitude'] else None
+            }
 
-        except ImportError:
-            self.logger.debug("requests module not available for geolocation lookup")
-            return {'location': 'Geolocation unavailable (requests module missing)'}
         except Exception as e:
             self.logger.debug(f"Error getting geolocation: {e}")
             return {'location': 'Location detection failed'}
@@ -439,38 +349,23 @@ class NetworkModule(BaseModule):
             ip_list = self._parse_ip_range(subnet)
             self.logger.info(f"Ping scanning {len(ip_list)} IPs in range: {subnet}")
 
-            # Use threading for faster scanning
-            import threading
-            import concurrent.futures
-
-            def scan_ip(ip):
-                try:
-                    if self._ping_host(ip):
-                        device_info = {
-                            'ip': ip,
-                            'hostname': self._get_hostname_from_ip(ip),
-                            'status': 'online',
-                            'mac_address': self._get_mac_from_ip(ip),
-                            'response_time': self._get_ping_time(ip),
-                            'device_type': self._guess_device_type(ip),
-                            'os': self._detect_os_simple(ip)
-                        }
-                        return device_info
-                except Exception as e:
-                    self.logger.debug(f"Error scanning IP {ip}: {e}")
-                return None
-
-            # Scan with thread pool for better performance
-            with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-                # Limit to reasonable number for testing
-                scan_ips = ip_list[:100] if len(ip_list) > 100 else ip_list
-                future_to_ip = {executor.submit(scan_ip, ip): ip for ip in scan_ips}
-
-                for future in concurrent.futures.as_completed(future_to_ip):
-                    result = future.result()
-                    if result:
-                        discovered_devices.append(result)
-                        self.logger.info(f"Found device: {result['ip']} ({result['hostname']})")
+            # Sweep all addresses asynchronously, then resolve names and MACs in bulk
+            alive = PingSweeper().sweep(ip_list)
+            arp_cache = read_arp_cache()
+            hostnames = resolve_hostnames(list(alive))
+
+            for ip, probe in alive.items():
+                device_info = {
+                    'ip': ip,
+                    'hostname': hostnames.get(ip) or f"device-{ip.split('.')[-1]}",
+                    'status': 'online',
+                    'mac_address': arp_cache.get(ip, 'Unknown'),
+                    'response_time': probe['response_time'],
+                    'device_type': self._guess_device_type(ip),
+                    'os': guess_os_from_ttl(probe.get('ttl'))
+                }
+                discovered_devices.append(device_info)
+                self.logger.info(f"Found device: {device_info['ip']} ({device_info['hostname']})")
 
         except Exception as e:
             self.logger.error(f"Error in ping scan: {e}")
@@ -504,51 +399,12 @@ class NetworkModule(BaseModule):
         ip_list = []
 
         try:
-            if '/' in ip_range:
-                # CIDR notation
-                import ipaddress
-                network = ipaddress.ip_network(ip_range, strict=False)
-                ip_list = [str(ip) for ip in network.hosts()]
-
-            elif '-' in ip_range:
-                # Range notation
-                start_ip, end_ip = ip_range.split('-')
-                start_parts = list(map(int, start_ip.strip().split('.')))
-                end_parts = list(map(int, end_ip.strip().split('.')))
-
-                # Simple range implementation for last octet
-                if start_parts[:3] == end_parts[:3]:
-                    for i in range(start_parts[3], end_parts[3] + 1):
-                        ip = f"{start_parts[0]}.{start_parts[1]}.{start_parts[2]}.{i}"
-                        ip_list.append(ip)
-
-            elif '*' in ip_range:
-                # Wildcard notation
-                base = ip_range.replace('*', '')
-                if base.endswith('.'):
-                    base = base[:-1]
-                for i in range(1, 255):
-                    ip = f"{base}.{i}"
-                    ip_list.append(ip)
-
+            ip_list = parse_targets(ip_range)
         except Exception as e:
             self.logger.error(f"Error parsing IP range {ip_range}: {e}")
 
         return ip_list
 
-    def _ping_host(self, ip: str) -> bool:
-        """Ping a single host"""
-        try:
-            if self.is_windows:
-                result = subprocess.run(['ping', '-n', '1', '-w', '1000', ip],
-                                      capture_output=True, text=True, timeout=3)
-            else:
-                result = subprocess.run(['ping', '-c', '1', '-W', '1', ip],
-                                      capture_output=True, text=True, timeout=3)
-            return result.returncode == 0
-        except Exception:
-            return False
-
     def _get_hostname_from_ip(self, ip: str) -> str:
         """Get hostname from IP address"""
         try:
@@ -569,6 +425,8 @@ class NetworkModule(BaseModule):
                         for part in parts:
                             if '-' in part and len(part) == 17:
                                 return part.replace('-', ':')
+            elif self.is_linux:
+                return get_linux_sources().mac_for(ip) or "Unknown"
             else:
                 result = subprocess.run(['arp', '-n', ip], capture_output=True, text=True, timeout=5)
                 for line in result.stdout.split('\n'):
@@ -606,6 +464,18 @@ class NetworkModule(BaseModule):
                                     'discovery_method': 'ARP Table'
                                 }
                                 discovered_devices.append(device_info)
+            elif self.is_linux:
+                for neighbour in get_linux_sources().neighbours():
+                    discovered_devices.append({
+                        'ip': neighbour.ip,
+                        'hostname': self._get_hostname_from_ip(neighbour.ip),
+                        'status': 'online',
+                        'mac_address': neighbour.mac,
+                        'response_time': 0,
+                        'device_type': self._guess_device_type(neighbour.ip),
+                        'os': 'Unknown',
+                        'discovery_method': 'ARP Table'
+                    })
             else:
                 result = subprocess.run(['arp', '-a'], capture_output=True, text=True, timeout=10)
                 for line in result.stdout.split('\n'):
@@ -645,54 +515,6 @@ class NetworkModule(BaseModule):
         import re
         return bool(re.match(r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$', mac))
 
-    def _detect_os_simple(self, ip: str) -> str:
-        """Simple OS detection based on ping TTL"""
-        try:
-            if self.is_windows:
-                result = subprocess.run(['ping', '-n', '1', ip], capture_output=True, text=True, timeout=3)
-                for line in result.stdout.split('\n'):
-                    if 'TTL=' in line:
-                        ttl = int(line.split('TTL=')[1].split()[0])
-                        if ttl <= 64:
-                            return 'Linux/Unix'
-                        elif ttl <= 128:
-                            return 'Windows'
-                        else:
-                            return 'Network Device'
-            else:
-                result = subprocess.run(['ping', '-c', '1', ip], capture_output=True, text=True, timeout=3)
-                for line in result.stdout.split('\n'):
-                    if 'ttl=' in line:
-                        ttl = int(line.split('ttl=')[1].split()[0])
-                        if ttl <= 64:
-                            return 'Linux/Unix'
-                        elif ttl <= 128:
-                            return 'Windows'
-                        else:
-                            return 'Network Device'
-        except:
-            pass
-        return 'Unknown'
-
-    def _get_ping_time(self, ip: str) -> int:
-        """Get ping response time"""
-        try:
-            if self.is_windows:
-                result = subprocess.run(['ping', '-n', '1', ip], capture_output=True, text=True, timeout=3)
-                for line in result.stdout.split('\n'):
-                    if 'time=' in line.lower():
-                        time_part = line.split('time=')[1].split('ms')[0].strip()
-                        return int(float(time_part.replace('<', '')))
-            else:
-                result = subprocess.run(['ping', '-c', '1', ip], capture_output=True, text=True, timeout=3)
-                for line in result.stdout.split('\n'):
-                    if 'time=' in line:
-                        time_part = line.split('time=')[1].split()[0]
-                        return int(float(time_part))
-        except Exception:
-            pass
-        return 0
-
     def _guess_device_type(self, ip: str) -> str:
         """Guess device type based on IP pattern"""
         last_octet = int(ip.split('.')[-1])
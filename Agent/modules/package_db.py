@@ -0,0 +1,273 @@
+"""
+Package Database for ITSM Agent
+Reads installed packages straight from package manager databases, memoized on file mtimes
+"""
+
+import os
+import re
+import glob
+import struct
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+
+DPKG_STATUS_PATH = '/var/lib/dpkg/status'
+RPM_SQLITE_PATH = '/var/lib/rpm/rpmdb.sqlite'
+SNAP_MOUNT_DIR = '/snap'
+SNAP_BLOBS_DIR = '/var/lib/snapd/snaps'
+FLATPAK_DIRS = ['/var/lib/flatpak']
+
+# dpkg status fields kept per package
+_DPKG_FIELDS = {
+    'Package': 'name', 'Version': 'version', 'Architecture': 'architecture',
+    'Maintainer': 'maintainer', 'Installed-Size': 'installed_size', 'Source': 'source'
+}
+
+# rpm header tags and data types
+RPMTAG_NAME = 1000
+RPMTAG_VERSION = 1001
+RPMTAG_RELEASE = 1002
+RPMTAG_EPOCH = 1003
+RPMTAG_INSTALLTIME = 1008
+RPMTAG_SIZE = 1009
+RPMTAG_VENDOR = 1011
+RPMTAG_ARCH = 1022
+_RPM_INT32 = 4
+_RPM_STRING = 6
+_RPM_STRING_ARRAY = 8
+_RPM_I18NSTRING = 9
+
+_RELEASE_VERSION = re.compile(rb'<release[^>]*\sversion="([^"]+)"')
+
+
+def parse_dpkg_status(path: str = DPKG_STATUS_PATH) -> List[Dict[str, Any]]:
+    """Stream the dpkg status file and return the installed packages.
+
+    The file is a sequence of RFC 822 style stanzas separated by blank
+    lines. Only the fields in _DPKG_FIELDS are kept, so continuation lines
+    (descriptions, conffiles) are skipped without being assembled.
+    """
+    packages = []
+    stanza: Dict[str, Any] = {}
+    installed = False
+
+    def finish():
+        if installed and 'name' in stanza:
+            if stanza.get('installed_size', '').isdigit():
+                stanza['installed_size'] = int(stanza['installed_size']) * 1024
+            packages.append(stanza)
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line == '\n':
+                finish()
+                stanza, installed = {}, False
+                continue
+            if line[0] in ' \t':
+                continue
+            field, _, value = line.partition(':')
+            if field == 'Status':
+                # "install ok installed", "hold ok installed", "deinstall ok config-files", ...
+                installed = value.split()[-1:] == ['installed']
+            elif field in _DPKG_FIELDS:
+                stanza[_DPKG_FIELDS[field]] = value.strip()
+    finish()
+    return packages
+
+
+def parse_rpm_header(blob: bytes) -> Dict[str, Any]:
+    """Decode the tags we need from an rpm header blob.
+
+    Layout: big-endian index count and data length, then one 16 byte
+    (tag, type, offset, count) entry per tag, then the data store.
+    """
+    index_count, data_length = struct.unpack_from('>II', blob, 0)
+    data_start = 8 + index_count * 16
+    wanted = {RPMTAG_NAME: 'name', RPMTAG_VERSION: 'version', RPMTAG_RELEASE: 'release', RPMTAG_EPOCH: 'epoch',
+              RPMTAG_INSTALLTIME: 'install_time', RPMTAG_SIZE: 'installed_size', RPMTAG_VENDOR: 'vendor',
+              RPMTAG_ARCH: 'architecture'}
+    header = {}
+    for entry in range(index_count):
+        tag, kind, offset, count = struct.unpack_from('>IIII', blob, 8 + entry * 16)
+        if tag not in wanted or offset >= data_length:
+            continue
+        position = data_start + offset
+        if kind == _RPM_INT32:
+            header[wanted[tag]] = struct.unpack_from('>i', blob, position)[0]
+        elif kind in (_RPM_STRING, _RPM_STRING_ARRAY, _RPM_I18NSTRING):
+            end = blob.index(b'\0', position)
+            header[wanted[tag]] = blob[position:end].decode('utf-8', 'replace')
+    return header
+
+
+def rpm_version(version: str, release: Any = None, epoch: Any = None) -> str:
+    """Format an rpm version as [epoch:]version-release, omitting an unset or zero epoch and an unset release"""
+    unset = (None, '', '(none)')
+    if release not in unset:
+        version = f"{version}-{release}"
+    if epoch not in unset and str(epoch) != '0':
+        version = f"{epoch}:{version}"
+    return version
+
+
+def read_rpm_sqlite(path: str = RPM_SQLITE_PATH) -> List[Dict[str, Any]]:
+    """Read installed packages from the rpm sqlite database (rpm 4.16+)"""
+    packages = []
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        for (blob,) in connection.execute('SELECT blob FROM Packages'):
+            header = parse_rpm_header(bytes(blob))
+            # gpg-pubkey pseudo packages carry no architecture
+            if 'name' not in header or header['name'] == 'gpg-pubkey':
+                continue
+            header['version'] = rpm_version(header.get('version', ''), header.get('release'), header.get('epoch'))
+            packages.append(header)
+    finally:
+        connection.close()
+    return packages
+
+
+def _read_simple_yaml(path: str, keys: Tuple[str, ...]) -> Dict[str, str]:
+    """Get top-level scalar keys from a small YAML file without a YAML parser"""
+    values = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line[:1] in (' ', '\t', '#', '-'):
+                continue
+            key, _, value = line.partition(':')
+            if key in keys:
+                values[key] = value.strip().strip('\'"')
+    return values
+
+
+def read_snaps(mount_dir: str = SNAP_MOUNT_DIR) -> List[Dict[str, Any]]:
+    """Read installed snaps from their mounted meta/snap.yaml"""
+    packages = []
+    for current in sorted(glob.glob(os.path.join(mount_dir, '*', 'current'))):
+        name = os.path.basename(os.path.dirname(current))
+        revision = os.path.basename(os.path.realpath(current))
+        package = {'name': name, 'version': revision, 'revision': revision}
+        try:
+            meta = _read_simple_yaml(os.path.join(current, 'meta', 'snap.yaml'), ('version', 'summary'))
+            package['version'] = meta.get('version', revision)
+        except OSError:
+            pass
+        packages.append(package)
+    return packages
+
+
+def read_flatpaks(installations: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Read installed flatpak applications from installation directories"""
+    packages = []
+    for installation in installations if installations is not None else FLATPAK_DIRS:
+        # app/<id>/<arch>/<branch>/active -> deployed commit
+        for active in sorted(glob.glob(os.path.join(installation, 'app', '*', '*', '*', 'active'))):
+            branch_dir = os.path.dirname(active)
+            app_id = os.path.basename(os.path.dirname(os.path.dirname(branch_dir)))
+            package = {
+                'name': app_id,
+                'version': None,
+                'architecture': os.path.basename(os.path.dirname(branch_dir)),
+                'branch': os.path.basename(branch_dir),
+                'commit': os.path.basename(os.path.realpath(active))
+            }
+            metainfo = os.path.join(active, 'files', 'share', 'metainfo', f"{app_id}.metainfo.xml")
+            try:
+                with open(metainfo, 'rb') as f:
+                    match = _RELEASE_VERSION.search(f.read(64 * 1024))
+                if match:
+                    package['version'] = match.group(1).decode('utf-8', 'replace')
+            except OSError:
+                pass
+            packages.append(package)
+    return packages
+
+
+def _stat_signature(*paths: str) -> Optional[Tuple]:
+    """Identity of a set of files; None when the first (the database) is missing"""
+    signature = []
+    for index, path in enumerate(paths):
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            if index == 0:
+                return None
+            signature.append((path, None))
+    return tuple(signature)
+
+
+def _snap_signature() -> Optional[Tuple]:
+    # Installs, refreshes and removals add or delete blobs here
+    return _stat_signature(SNAP_BLOBS_DIR)
+
+
+def _flatpak_signature() -> Optional[Tuple]:
+    # Deploying a new commit rewrites the branch directory's active link
+    branches = []
+    for installation in FLATPAK_DIRS:
+        branches.extend(glob.glob(os.path.join(installation, 'app', '*', '*', '*')))
+    if not branches:
+        return None
+    return _stat_signature(*sorted(branches))
+
+
+class PackageDatabase:
+    """Installed packages per package manager, memoized on database mtimes.
+
+    Each source is re-read only when its signature (inode, size and mtime of
+    the files the package manager rewrites on every transaction) changes, so
+    an unchanged system costs a few stat calls. Returned lists are shared
+    between callers and must not be modified.
+    """
+
+    def __init__(self, sources: Optional[Dict[str, Tuple[Callable[[], Optional[Tuple]], Callable[[], List]]]] = None):
+        self.sources = sources if sources is not None else {
+            'dpkg': (lambda: _stat_signature(DPKG_STATUS_PATH), parse_dpkg_status),
+            'rpm': (lambda: _stat_signature(RPM_SQLITE_PATH, f"{RPM_SQLITE_PATH}-wal"), read_rpm_sqlite),
+            'snap': (_snap_signature, read_snaps),
+            'flatpak': (_flatpak_signature, read_flatpaks)
+        }
+        self.logger = logging.getLogger('PackageDatabase')
+        self.read_count = 0
+        self._cache: Dict[str, Tuple[Tuple, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def available(self, source: str) -> bool:
+        """Check if a source's database exists on this system"""
+        return self.sources[source][0]() is not None
+
+    def packages(self, source: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a source's installed packages, or None when its database is not present or unreadable"""
+        signature_of, reader = self.sources[source]
+        with self._lock:
+            signature = signature_of()
+            if signature is None:
+                self._cache.pop(source, None)
+                return None
+            cached = self._cache.get(source)
+            if cached and cached[0] == signature:
+                return cached[1]
+            try:
+                packages = reader()
+            except Exception as e:
+                self.logger.warning(f"Error reading {source} package database: {e}")
+                return None
+            self._cache[source] = (signature, packages)
+            self.read_count += 1
+            return packages
+
+
+_lock = threading.Lock()
+_package_database: Optional[PackageDatabase] = None
+
+
+def get_package_database() -> PackageDatabase:
+    """Get the shared package database reader"""
+    global _package_database
+    with _lock:
+        if _package_database is None:
+            _package_database = PackageDatabase()
+        return _package_database
@@ -7,14 +7,18 @@ Handles patch status, compliance, and update management
 import logging
 import platform
 import json
+import shutil
 import subprocess
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from .base_module import BaseModule
+from .shell_broker import run_powershell
 
 class PatchManagementModule(BaseModule):
     """Patch management and update compliance"""
     
+    collection_interval = 21600  # seconds
+    
     def __init__(self):
         super().__init__('patch_management')
         self.os_name = platform.system()
@@ -125,12 +129,7 @@ class PatchManagementModule(BaseModule):
             Get-WUList | Select-Object Title, Size, @{Name="Severity";Expression={$_.MsrcSeverity}}
             """
             
-            result = subprocess.run(
-                ['powershell', '-Command', ps_script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = run_powershell(ps_script, timeout=30)
             
             # Parse PowerShell output (simplified)
             updates = []
@@ -518,11 +517,7 @@ class PatchManagementModule(BaseModule):
     
     def _command_exists(self, command: str) -> bool:
         """Check if a command exists"""
-        try:
-            subprocess.run(['which', command], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return shutil.which(command) is not None
     
     def _file_exists(self, filepath: str) -> bool:
         """Check if a file exists"""
@@ -0,0 +1,387 @@
+"""
+Ping Sweep Engine for ITSM Agent
+Asynchronous ICMP/TCP host discovery with rate limiting and a single ARP cache read
+"""
+
+import os
+import re
+import sys
+import time
+import errno
+import socket
+import struct
+import asyncio
+import logging
+import ipaddress
+import subprocess
+import threading
+from typing import Dict, Any, List, Optional
+
+from .linux_sources import ARP_PATH, get_linux_sources
+
+
+logger = logging.getLogger('PingSweep')
+
+# Ports used for TCP connect probes; a refused connection still proves the host is up
+TCP_PROBE_PORTS = (445, 80, 443, 22, 3389, 135)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+MAC_PATTERN = re.compile(r'([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}')
+
+
+def parse_targets(spec: str, max_hosts: int = 65536) -> List[str]:
+    """Expand a CIDR, range (a.b.c.d-e.f.g.h or a.b.c.d-h), wildcard or single IP into host addresses"""
+    spec = spec.strip()
+    addresses = []
+
+    if '/' in spec:
+        network = ipaddress.ip_network(spec, strict=False)
+        for address in network.hosts():
+            addresses.append(str(address))
+            if len(addresses) >= max_hosts:
+                break
+
+    elif '-' in spec:
+        start_text, end_text = [part.strip() for part in spec.split('-', 1)]
+        start = ipaddress.IPv4Address(start_text)
+        if '.' not in end_text:
+            end_text = start_text.rsplit('.', 1)[0] + '.' + end_text
+        end = ipaddress.IPv4Address(end_text)
+        current = int(start)
+        while current <= int(end) and len(addresses) < max_hosts:
+            addresses.append(str(ipaddress.IPv4Address(current)))
+            current += 1
+
+    elif '*' in spec:
+        base = spec.replace('*', '').rstrip('.')
+        addresses = [f'{base}.{i}' for i in range(1, 255)][:max_hosts]
+
+    elif spec:
+        addresses = [str(ipaddress.ip_address(spec))]
+
+    return addresses
+
+
+def parse_proc_arp(text: str) -> Dict[str, str]:
+    """Parse /proc/net/arp into {ip: mac}, skipping incomplete entries"""
+    entries = {}
+    for line in text.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) >= 4 and parts[2] != '0x0' and parts[3] != '00:00:00:00:00:00':
+            entries[parts[0]] = parts[3].lower()
+    return entries
+
+
+def parse_arp_output(text: str) -> Dict[str, str]:
+    """Parse `arp -a` output (Windows, macOS/BSD or Linux net-tools) into {ip: mac}"""
+    entries = {}
+    for line in text.splitlines():
+        mac_match = MAC_PATTERN.search(line)
+        if not mac_match:
+            continue
+        ip_match = re.search(r'\(?(\d{1,3}(?:\.\d{1,3}){3})\)?', line)
+        if not ip_match:
+            continue
+        mac = mac_match.group(0).replace('-', ':').lower()
+        if mac in ('ff:ff:ff:ff:ff:ff', '00:00:00:00:00:00'):
+            continue
+        entries[ip_match.group(1)] = mac
+    return entries
+
+
+def read_arp_cache() -> Dict[str, str]:
+    """Read the whole neighbour cache once, returning {ip: mac}"""
+    try:
+        if os.path.exists(ARP_PATH):
+            return {neighbour.ip: neighbour.mac for neighbour in get_linux_sources().neighbours()}
+
+        result = subprocess.run(['arp', '-a'], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            return parse_arp_output(result.stdout)
+    except Exception as e:
+        logger.debug(f"Could not read ARP cache: {e}")
+    return {}
+
+
+def guess_os_from_ttl(ttl: Optional[int]) -> str:
+    """Guess an OS family from the TTL of a reply"""
+    if not ttl:
+        return 'Unknown'
+    if ttl <= 64:
+        return 'Linux/Unix'
+    if ttl <= 128:
+        return 'Windows'
+    return 'Network Device'
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """Internet checksum of an ICMP message"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def _build_echo_request(identifier: int, sequence: int) -> bytes:
+    """Build an ICMP echo request packet"""
+    payload = b'itsm-agent-sweep'
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    checksum = _icmp_checksum(header + payload)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, identifier, sequence) + payload
+
+
+def _parse_echo_reply(packet: bytes):
+    """Return (sequence, ttl) for an echo reply, or None.
+
+    Raw sockets (and datagram sockets on macOS) include the IP header; Linux
+    datagram ICMP sockets deliver the bare ICMP message.
+    """
+    ttl = None
+    if len(packet) >= 20 and packet[0] >> 4 == 4:
+        header_length = (packet[0] & 0x0f) * 4
+        ttl = packet[8]
+        packet = packet[header_length:]
+    if len(packet) < 8:
+        return None
+    icmp_type, _, _, _, sequence = struct.unpack('!BBHHH', packet[:8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return sequence, ttl
+
+
+def _open_icmp_socket():
+    """Open an unprivileged datagram ICMP socket, falling back to a raw socket"""
+    for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            sock.setblocking(False)
+            return sock
+        except (PermissionError, OSError):
+            continue
+    return None
+
+
+class PingSweeper:
+    """Sweeps many hosts concurrently with ICMP echo or TCP connect probes.
+
+    rate caps probes sent per second; concurrency caps the number of TCP
+    sockets open at once.
+    """
+
+    def __init__(self, method: str = 'auto', timeout: float = 1.0, rate: int = 10000,
+                 concurrency: int = 512, tcp_ports=TCP_PROBE_PORTS):
+        self.method = method
+        self.timeout = timeout
+        self.rate = rate
+        self.concurrency = concurrency
+        self.tcp_ports = tuple(tcp_ports)
+        self.stats = {}
+
+    def sweep(self, targets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Probe targets and return {ip: {'response_time', 'ttl', 'method'}} for live hosts.
+
+        Safe to call from a thread that already runs an event loop; the sweep
+        then runs on a private loop in a helper thread.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.sweep_async(targets))
+
+        result = {}
+        worker = threading.Thread(target=lambda: result.update(asyncio.run(self.sweep_async(targets))))
+        worker.start()
+        worker.join()
+        return result
+
+    async def sweep_async(self, targets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Probe targets from within an event loop"""
+        start = time.perf_counter()
+        alive = {}
+        method = self.method
+
+        if method in ('auto', 'icmp') and sys.platform != 'win32':
+            sock = _open_icmp_socket()
+            if sock is not None:
+                try:
+                    alive = await self._icmp_sweep(sock, targets)
+                    method = 'icmp'
+                finally:
+                    sock.close()
+            elif method == 'icmp':
+                logger.warning("ICMP sockets not permitted, falling back to TCP probes")
+                method = 'tcp'
+            else:
+                method = 'tcp'
+        elif method == 'auto':
+            method = 'tcp'
+
+        if method == 'tcp':
+            alive = await self._tcp_sweep(targets)
+        elif method == 'icmp' and self.method == 'auto':
+            # Hosts that drop ICMP may still answer TCP
+            silent = [ip for ip in targets if ip not in alive]
+            if silent and len(silent) <= 256:
+                alive.update(await self._tcp_sweep(silent))
+
+        self.stats = {
+            'method': method,
+            'targets': len(targets),
+            'alive': len(alive),
+            'duration_seconds': round(time.perf_counter() - start, 3)
+        }
+        logger.info(f"Swept {len(targets)} hosts via {method} in {self.stats['duration_seconds']}s, {len(alive)} alive")
+        return alive
+
+    async def _pace(self, index: int, start: float):
+        """Sleep as needed to keep probes under the configured rate"""
+        if self.rate and self.rate > 0:
+            delay = start + index / self.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def _icmp_sweep(self, sock, targets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Send echo requests on one socket and collect replies as they arrive"""
+        loop = asyncio.get_running_loop()
+        identifier = os.getpid() & 0xffff
+        pending = {}
+        sent_at = {}
+        alive = {}
+        all_sent = False
+        done = loop.create_future()
+
+        def on_readable():
+            while True:
+                try:
+                    packet, address = sock.recvfrom(1024)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    break
+                reply = _parse_echo_reply(packet)
+                if not reply:
+                    continue
+                sequence, ttl = reply
+                ip = pending.get(sequence)
+                if ip is None or ip != address[0] or ip in alive:
+                    continue
+                alive[ip] = {
+                    'response_time': round((time.perf_counter() - sent_at[ip]) * 1000, 2),
+                    'ttl': ttl,
+                    'method': 'icmp'
+                }
+                if all_sent and len(alive) == len(targets) and not done.done():
+                    done.set_result(True)
+
+        loop.add_reader(sock.fileno(), on_readable)
+        try:
+            start = time.perf_counter()
+            for index, ip in enumerate(targets):
+                await self._pace(index, start)
+                sequence = index & 0xffff
+                pending[sequence] = ip
+                sent_at[ip] = time.perf_counter()
+                packet = _build_echo_request(identifier, sequence)
+                while True:
+                    try:
+                        sock.sendto(packet, (ip, 0))
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(0.001)
+                    except OSError as e:
+                        if e.errno in (errno.ENOBUFS, errno.EAGAIN):
+                            await asyncio.sleep(0.005)
+                            continue
+                        logger.debug(f"ICMP send to {ip} failed: {e}")
+                        break
+                # Yield so replies are drained while sending
+                if index % 64 == 63:
+                    await asyncio.sleep(0)
+
+            all_sent = True
+            if len(alive) < len(targets):
+                try:
+                    await asyncio.wait_for(done, timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            loop.remove_reader(sock.fileno())
+
+        return alive
+
+    async def _tcp_sweep(self, targets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Probe hosts with TCP connects inside a bounded concurrency window"""
+        window = asyncio.Semaphore(max(1, self.concurrency // max(1, len(self.tcp_ports))))
+        alive = {}
+        start = time.perf_counter()
+
+        async def probe(index, ip):
+            await self._pace(index, start)
+            async with window:
+                result = await self._tcp_probe(ip)
+                if result:
+                    alive[ip] = result
+
+        await asyncio.gather(*(probe(index, ip) for index, ip in enumerate(targets)))
+        return alive
+
+    async def _tcp_probe(self, ip: str) -> Optional[Dict[str, Any]]:
+        """Connect to the probe ports in parallel; any answer (even a refusal) means alive"""
+        probe_start = time.perf_counter()
+
+        async def connect(port):
+            try:
+                _, writer = await asyncio.open_connection(ip, port)
+                writer.close()
+                return port
+            except ConnectionRefusedError:
+                return 0
+            except (OSError, asyncio.CancelledError):
+                return None
+
+        tasks = [asyncio.ensure_future(connect(port)) for port in self.tcp_ports]
+        try:
+            for finished in asyncio.as_completed(tasks, timeout=self.timeout):
+                try:
+                    port = await finished
+                except asyncio.TimeoutError:
+                    return None
+                if port is not None:
+                    return {
+                        'response_time': round((time.perf_counter() - probe_start) * 1000, 2),
+                        'ttl': None,
+                        'method': 'tcp',
+                        'open_port': port or None
+                    }
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def resolve_hostnames(ips: List[str], timeout: float = 2.0, workers: int = 32) -> Dict[str, Optional[str]]:
+    """Reverse-resolve many addresses concurrently, returning {ip: hostname or None}"""
+    from concurrent.futures import ThreadPoolExecutor, wait
+
+    def lookup(ip):
+        try:
+            return socket.gethostbyaddr(ip)[0]
+        except Exception:
+            return None
+
+    names = {ip: None for ip in ips}
+    if not ips:
+        return names
+
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(ips)), thread_name_prefix='rdns')
+    futures = {executor.submit(lookup, ip): ip for ip in ips}
+    done, _ = wait(futures, timeout=timeout)
+    for future in done:
+        names[futures[future]] = future.result()
+    executor.shutdown(wait=False, cancel_futures=True)
+    return names
@@ -13,23 +13,52 @@ import os
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from .base_module import BaseModule
+from .process_snapshot import get_process_snapshot
+from .cpu_sampler import get_cpu_sampler
+from .disk_io import get_disk_io_snapshot, is_tracked_partition
+from .net_io import get_net_io_snapshot
+from .metric_store import MetricStore
+from .metric_analytics import AnalyticsEngine
+
+
+# Samples kept per metric; at the 60 second collection interval this is about 16 hours
+HISTORY_CAPACITY = 1000
+
+FORECAST_HORIZON_DAYS = 30
+
+# Anomalies newer than this are reported each cycle
+ANOMALY_REPORT_WINDOW = 3600
+
+CORRELATED_METRICS = [
+    'cpu.percent', 'memory.percent', 'swap.percent', 'process.count',
+    'network.connections', 'network.bytes_recv_per_sec', 'network.bytes_sent_per_sec',
+    'disk_io.read_bytes_per_sec', 'disk_io.write_bytes_per_sec'
+]
 
 
 class PredictiveAnalyticsModule(BaseModule):
     """Predictive analytics data collection module"""
     
+    collection_interval = 60  # seconds
+    
     def __init__(self):
         super().__init__('PredictiveAnalytics')
-        self.historical_data = {}
+        # Numeric history per metric (e.g. 'cpu.percent', 'disk./.percent') in fixed-size ring buffers
+        self.history_capacity = HISTORY_CAPACITY
+        self.metric_store = MetricStore(capacity=self.history_capacity)
         self.trend_data = {}
         self.baseline_metrics = {}
         self.anomaly_threshold = 2.0  # Standard deviations
+        self.analytics = AnalyticsEngine(self.metric_store, threshold=self.anomaly_threshold)
         
     def collect(self) -> Dict[str, Any]:
         """Collect predictive analytics data"""
+        performance_trends = self._collect_performance_trends()
+        self.analytics.update()
+        self._update_baseline()
         analytics_data = {
             'timestamp': datetime.utcnow().isoformat() + 'Z',
-            'performance_trends': self._collect_performance_trends(),
+            'performance_trends': performance_trends,
             'resource_utilization_patterns': self._analyze_resource_patterns(),
             'system_health_indicators': self._collect_health_indicators(),
             'failure_predictors': self._identify_failure_predictors(),
@@ -37,7 +66,7 @@ class PredictiveAnalyticsModule(BaseModule):
             'anomaly_detection': self._detect_anomalies(),
             'baseline_comparisons': self._compare_with_baseline(),
             'predictive_scores': self._calculate_predictive_scores(),
-            'maintenance_recommendations': self._generate_maintenance_recommendations()
+            'maintenance_recommendations': self._generate_maintenance_recommendations(performance_trends)
         }
         
         return analytics_data
@@ -59,13 +88,14 @@ class PredictiveAnalyticsModule(BaseModule):
         cpu_data = {}
         
         try:
-            # Current CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Current CPU metrics from the background sampler
+            sampler = get_cpu_sampler()
+            cpu_percent = sampler.current_percent()
             cpu_freq = psutil.cpu_freq()
             cpu_stats = psutil.cpu_stats()
             
             # Per-CPU metrics
-            per_cpu_percent = psutil.cpu_percent(percpu=True)
+            per_cpu_percent = sampler.per_cpu_percent()
             
             cpu_data = {
                 'current_usage': cpu_percent,
@@ -143,6 +173,9 @@ class PredictiveAnalyticsModule(BaseModule):
             # Disk usage for each partition
             partitions = []
             for partition in psutil.disk_partitions():
+                # Each tracked mountpoint gets its own history files
+                if not is_tracked_partition(partition):
+                    continue
                 try:
                     partition_usage = psutil.disk_usage(partition.mountpoint)
                     partition_info = {
@@ -158,21 +191,14 @@ class PredictiveAnalyticsModule(BaseModule):
                 except (PermissionError, OSError):
                     continue
             
-            # Disk I/O statistics
-            disk_io = psutil.disk_io_counters()
-            disk_io_per_disk = psutil.disk_io_counters(perdisk=True)
+            # Disk I/O statistics and rates from the cycle's shared snapshot
+            io_snapshot = get_disk_io_snapshot()
+            disk_io = io_snapshot.totals()
             
             disk_data = {
                 'partitions': partitions,
-                'io_counters': {
-                    'read_count': disk_io.read_count if disk_io else 0,
-                    'write_count': disk_io.write_count if disk_io else 0,
-                    'read_bytes': disk_io.read_bytes if disk_io else 0,
-                    'write_bytes': disk_io.write_bytes if disk_io else 0,
-                    'read_time': disk_io.read_time if disk_io else 0,
-                    'write_time': disk_io.write_time if disk_io else 0
-                },
-                'per_disk_io': disk_io_per_disk,
+                'io_counters': disk_io,
+                'per_disk_io': io_snapshot.disks,
                 'disk_health_indicators': self._assess_disk_health(partitions, disk_io)
             }
             
@@ -189,27 +215,18 @@ class PredictiveAnalyticsModule(BaseModule):
         network_data = {}
         
         try:
-            # Network I/O statistics
-            net_io = psutil.net_io_counters()
-            net_io_per_nic = psutil.net_io_counters(pernic=True)
+            # Network I/O statistics and rates from the shared snapshot
+            net_snapshot = get_net_io_snapshot()
+            net_io = net_snapshot.totals()
             
             # Network connections
             connections = len(psutil.net_connections())
             
             network_data = {
-                'io_counters': {
-                    'bytes_sent': net_io.bytes_sent,
-                    'bytes_recv': net_io.bytes_recv,
-                    'packets_sent': net_io.packets_sent,
-                    'packets_recv': net_io.packets_recv,
-                    'errin': net_io.errin,
-                    'errout': net_io.errout,
-                    'dropin': net_io.dropin,
-                    'dropout': net_io.dropout
-                },
-                'per_interface_io': net_io_per_nic,
+                'io_counters': net_io,
+                'per_interface_io': net_snapshot.interfaces,
                 'connection_count': connections,
-                'bandwidth_utilization': self._calculate_bandwidth_utilization(net_io)
+                'bandwidth_utilization': self._calculate_bandwidth_utilization(net_snapshot)
             }
             
             # Store for trend analysis
@@ -231,17 +248,10 @@ class PredictiveAnalyticsModule(BaseModule):
             # Top processes by memory
             top_memory_processes = []
             
-            # Process count
-            process_count = len(psutil.pids())
-            
-            # Collect top processes
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    pinfo = proc.info
-                    processes.append(pinfo)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            # Collect top processes from the shared per-cycle snapshot
+            snapshot = get_process_snapshot()
+            process_count = len(snapshot)
+            processes = snapshot.records(['pid', 'name', 'cpu_percent', 'memory_percent'])
             
             # Sort by CPU usage
             top_cpu_processes = sorted(processes, key=lambda x: x['cpu_percent'] or 0, reverse=True)[:10]
@@ -372,7 +382,7 @@ class PredictiveAnalyticsModule(BaseModule):
             # Compare current metrics with baseline
             current_metrics = self._get_current_metrics()
             for metric, baseline_value in self.baseline_metrics.items():
-                if metric in current_metrics:
+                if metric in current_metrics and baseline_value:
                     deviation = abs(current_metrics[metric] - baseline_value) / baseline_value * 100
                     comparisons['current_vs_baseline'][metric] = {
                         'current': current_metrics[metric],
@@ -400,13 +410,15 @@ class PredictiveAnalyticsModule(BaseModule):
         
         return scores
     
-    def _generate_maintenance_recommendations(self) -> List[Dict[str, Any]]:
+    def _generate_maintenance_recommendations(self, performance_trends: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Generate maintenance recommendations"""
         recommendations = []
+        # Reuse this cycle's trends so samples are not collected and stored twice
+        performance_trends = performance_trends or self._collect_performance_trends()
         
         try:
             # CPU-based recommendations
-            cpu_trends = self._collect_cpu_trends()
+            cpu_trends = performance_trends.get('cpu_trends', {})
             if cpu_trends.get('current_usage', 0) > 80:
                 recommendations.append({
                     'type': 'performance',
@@ -417,7 +429,7 @@ class PredictiveAnalyticsModule(BaseModule):
                 })
             
             # Memory-based recommendations
-            memory_trends = self._collect_memory_trends()
+            memory_trends = performance_trends.get('memory_trends', {})
             memory_percent = memory_trends.get('virtual_memory', {}).get('percent', 0)
             if memory_percent > 85:
                 recommendations.append({
@@ -429,7 +441,7 @@ class PredictiveAnalyticsModule(BaseModule):
                 })
             
             # Disk-based recommendations
-            disk_trends = self._collect_disk_trends()
+            disk_trends = performance_trends.get('disk_trends', {})
             for partition in disk_trends.get('partitions', []):
                 if partition.get('percent', 0) > 90:
                     recommendations.append({
@@ -507,23 +519,44 @@ class PredictiveAnalyticsModule(BaseModule):
             'io_load': 'normal'
         }
         
-        if disk_io:
-            # Simple I/O load assessment (would need historical data for better analysis)
-            total_io = disk_io.read_bytes + disk_io.write_bytes
-            if total_io > 1e9:  # 1GB
+        rates = (disk_io or {}).get('rates')
+        if rates:
+            # Busiest disk when utilisation is known, otherwise combined throughput
+            utilization = rates.get('max_utilization_percent')
+            throughput = rates['read_bytes_per_sec'] + rates['write_bytes_per_sec']
+            if utilization is not None:
+                if utilization > 80:
+                    health['io_load'] = 'high'
+                elif utilization > 50:
+                    health['io_load'] = 'medium'
+            elif throughput > 1e8:  # 100MB/s
                 health['io_load'] = 'high'
-            elif total_io > 1e8:  # 100MB
+            elif throughput > 1e7:  # 10MB/s
                 health['io_load'] = 'medium'
         
         return health
     
-    def _calculate_bandwidth_utilization(self, net_io) -> Dict[str, Any]:
-        """Calculate network bandwidth utilization"""
-        # This would need historical data for proper calculation
-        return {
-            'total_bytes': net_io.bytes_sent + net_io.bytes_recv,
-            'utilization_estimate': 'unknown'  # Would need interface speed information
+    def _calculate_bandwidth_utilization(self, net_snapshot) -> Dict[str, Any]:
+        """Calculate network bandwidth utilization against each interface's link speed"""
+        totals = net_snapshot.totals()
+        utilization = {
+            'total_bytes': totals['bytes_sent'] + totals['bytes_recv'],
+            'utilization_estimate': 'unknown',
+            'interfaces': {}
         }
+        for name, stats in net_snapshot.interfaces.items():
+            rates = stats.get('rates', {})
+            if 'utilization_percent' in rates:
+                utilization['interfaces'][name] = {
+                    'speed_mbps': stats['speed'],
+                    'rx_utilization_percent': rates['rx_utilization_percent'],
+                    'tx_utilization_percent': rates['tx_utilization_percent']
+                }
+        if 'rates' in totals:
+            utilization['bytes_per_second'] = totals['rates']['bytes_sent_per_sec'] + totals['rates']['bytes_recv_per_sec']
+            if 'max_utilization_percent' in totals['rates']:
+                utilization['utilization_estimate'] = totals['rates']['max_utilization_percent']
+        return utilization
     
     def _identify_resource_intensive_processes(self, processes: List[Dict]) -> List[Dict[str, Any]]:
         """Identify resource-intensive processes"""
@@ -544,146 +577,295 @@ class PredictiveAnalyticsModule(BaseModule):
         
         return intensive_processes
     
+    def enable_history_persistence(self, path: str):
+        """Keep metric history in memory-mapped files under path so it survives restarts"""
+        try:
+            store = MetricStore(capacity=self.history_capacity, path=path)
+        except OSError as e:
+            self.logger.warning(f"Cannot persist metric history to {path}: {e}")
+            return
+        self.metric_store.close()
+        self.metric_store = store
+        self.analytics = AnalyticsEngine(store, threshold=self.anomaly_threshold)
+    
     def _store_cpu_historical_data(self, cpu_data: Dict[str, Any]):
         """Store CPU data for historical analysis"""
-        if 'cpu' not in self.historical_data:
-            self.historical_data['cpu'] = []
-        
-        self.historical_data['cpu'].append({
-            'timestamp': datetime.utcnow().isoformat(),
-            'data': cpu_data
+        load_average = cpu_data.get('load_average', {})
+        self.metric_store.record({
+            'cpu.percent': cpu_data.get('current_usage'),
+            'cpu.frequency': cpu_data.get('frequency', {}).get('current'),
+            'cpu.load_1min': load_average.get('load_1min'),
+            'cpu.load_5min': load_average.get('load_5min'),
+            'cpu.ctx_switches': cpu_data.get('stats', {}).get('ctx_switches')
         })
-        
-        # Keep only last 1000 entries
-        if len(self.historical_data['cpu']) > 1000:
-            self.historical_data['cpu'] = self.historical_data['cpu'][-1000:]
     
     def _store_memory_historical_data(self, memory_data: Dict[str, Any]):
         """Store memory data for historical analysis"""
-        if 'memory' not in self.historical_data:
-            self.historical_data['memory'] = []
-        
-        self.historical_data['memory'].append({
-            'timestamp': datetime.utcnow().isoformat(),
-            'data': memory_data
+        vmem = memory_data.get('virtual_memory', {})
+        swap = memory_data.get('swap_memory', {})
+        self.metric_store.record({
+            'memory.percent': vmem.get('percent'),
+            'memory.used': vmem.get('used'),
+            'memory.available': vmem.get('available'),
+            'memory.total': vmem.get('total'),
+            'swap.percent': swap.get('percent'),
+            'swap.used': swap.get('used')
         })
-        
-        # Keep only last 1000 entries
-        if len(self.historical_data['memory']) > 1000:
-            self.historical_data['memory'] = self.historical_data['memory'][-1000:]
     
     def _store_disk_historical_data(self, disk_data: Dict[str, Any]):
         """Store disk data for historical analysis"""
-        if 'disk' not in self.historical_data:
-            self.historical_data['disk'] = []
-        
-        self.historical_data['disk'].append({
-            'timestamp': datetime.utcnow().isoformat(),
-            'data': disk_data
-        })
-        
-        # Keep only last 1000 entries
-        if len(self.historical_data['disk']) > 1000:
-            self.historical_data['disk'] = self.historical_data['disk'][-1000:]
+        metrics = {}
+        for partition in disk_data.get('partitions', []):
+            mountpoint = partition['mountpoint']
+            metrics[f"disk.{mountpoint}.percent"] = partition.get('percent')
+            metrics[f"disk.{mountpoint}.used"] = partition.get('used')
+            metrics[f"disk.{mountpoint}.total"] = partition.get('total')
+        
+        # Drop the history of mountpoints that have been unmounted
+        gone = [mountpoint for mountpoint in self._disk_mountpoints()
+                if f"disk.{mountpoint}.used" not in metrics]
+        if gone and metrics:
+            self.metric_store.remove(f"disk.{mountpoint}.{field}" for mountpoint in gone
+                                     for field in ('percent', 'used', 'total'))
+        
+        io_counters = disk_data.get('io_counters', {})
+        metrics['disk_io.read_bytes'] = io_counters.get('read_bytes')
+        metrics['disk_io.write_bytes'] = io_counters.get('write_bytes')
+        for name, value in io_counters.get('rates', {}).items():
+            metrics[f"disk_io.{name}"] = value
+        self.metric_store.record(metrics)
     
     def _store_network_historical_data(self, network_data: Dict[str, Any]):
         """Store network data for historical analysis"""
-        if 'network' not in self.historical_data:
-            self.historical_data['network'] = []
-        
-        self.historical_data['network'].append({
-            'timestamp': datetime.utcnow().isoformat(),
-            'data': network_data
-        })
-        
-        # Keep only last 1000 entries
-        if len(self.historical_data['network']) > 1000:
-            self.historical_data['network'] = self.historical_data['network'][-1000:]
+        io_counters = dict(network_data.get('io_counters', {}))
+        rates = io_counters.pop('rates', {})
+        metrics = {f"network.{name}": value for name, value in io_counters.items()}
+        metrics.update({f"network.{name}": value for name, value in rates.items()})
+        metrics['network.connections'] = network_data.get('connection_count')
+        self.metric_store.record(metrics)
     
     def _store_process_historical_data(self, process_data: Dict[str, Any]):
         """Store process data for historical analysis"""
-        if 'process' not in self.historical_data:
-            self.historical_data['process'] = []
-        
-        self.historical_data['process'].append({
-            'timestamp': datetime.utcnow().isoformat(),
-            'data': process_data
+        self.metric_store.record({
+            'process.count': process_data.get('total_processes'),
+            'process.resource_intensive': len(process_data.get('resource_intensive_processes', []))
         })
-        
-        # Keep only last 1000 entries
-        if len(self.historical_data['process']) > 1000:
-            self.historical_data['process'] = self.historical_data['process'][-1000:]
     
-    # Placeholder methods for advanced analytics (would be implemented with more sophisticated algorithms)
+    def cleanup(self):
+        """Flush and close the metric history"""
+        self.metric_store.close()
+    
+    # Analytics over the metric history
+    
+    def _update_baseline(self):
+        """Refresh baseline metrics from the EWMA baselines"""
+        root = 'C:\\' if platform.system() == 'Windows' else '/'
+        for metric, name in (('cpu_percent', 'cpu.percent'), ('memory_percent', 'memory.percent'),
+                             ('disk_percent', f'disk.{root}.percent')):
+            baseline = self.analytics.baseline(name)
+            if baseline:
+                self.baseline_metrics[metric] = round(baseline['mean'], 2)
+    
+    def _forecast(self, metric: str, clamp_percent: bool = False) -> Dict[str, Any]:
+        """Forecast a metric over the forecast horizon"""
+        forecast = self.analytics.forecast(metric, FORECAST_HORIZON_DAYS * 86400)
+        if not forecast:
+            return {'forecast_horizon_days': FORECAST_HORIZON_DAYS, 'status': 'insufficient_data'}
+        
+        predicted, predicted_holt = forecast['linear'], forecast['holt']
+        if clamp_percent:
+            predicted = min(max(predicted, 0.0), 100.0)
+            predicted_holt = min(max(predicted_holt, 0.0), 100.0)
+        return {
+            'forecast_horizon_days': FORECAST_HORIZON_DAYS,
+            'status': 'ok',
+            'current': round(forecast['current'], 2),
+            'predicted': round(predicted, 2),
+            'predicted_holt': round(predicted_holt, 2),
+            'trend_per_day': round(forecast['slope_per_day'], 4),
+            'r_squared': forecast['r_squared'],
+            'history_hours': forecast['history_hours']
+        }
+    
+    def _days_until(self, metric: str, limit: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Estimate days until a metric reaches limit"""
+        if not limit:
+            return None
+        eta = self.analytics.time_until(metric, limit)
+        if not eta:
+            return None
+        to_days = lambda seconds: round(seconds / 86400, 2) if seconds is not None else None
+        return {
+            'days_linear': to_days(eta['linear_eta_seconds']),
+            'days_holt': to_days(eta['holt_eta_seconds']),
+            'r_squared': eta['r_squared']
+        }
+    
+    def _latest(self, metric: str) -> Optional[float]:
+        """Get the newest stored value of a metric"""
+        series = self.metric_store.series(metric)
+        latest = series.latest() if series else None
+        return latest[1] if latest else None
+    
+    def _disk_mountpoints(self) -> List[str]:
+        """Get mountpoints with stored usage history"""
+        return [name[len('disk.'):-len('.used')] for name in self.metric_store.names('disk.') if name.endswith('.used')]
     
     def _identify_peak_usage_times(self) -> Dict[str, Any]:
         """Identify peak usage time patterns"""
-        return {'status': 'Peak usage analysis not yet implemented'}
+        peaks = {}
+        for label, metric in (('cpu', 'cpu.percent'), ('memory', 'memory.percent')):
+            profile = self.analytics.hourly_profile(metric)
+            if not profile:
+                continue
+            busiest = sorted(profile, key=profile.get, reverse=True)[:3]
+            peaks[label] = {
+                'peak_hours': busiest,
+                'hourly_average': {hour: round(value, 2) for hour, value in profile.items()}
+            }
+        return peaks or {'status': 'insufficient_data'}
     
     def _analyze_resource_correlations(self) -> Dict[str, Any]:
         """Analyze correlations between different resources"""
-        return {'status': 'Resource correlation analysis not yet implemented'}
+        matrix = self.analytics.correlations(CORRELATED_METRICS)
+        if not matrix:
+            return {'status': 'insufficient_data'}
+        
+        strong = []
+        names = list(matrix)
+        for i, a in enumerate(names):
+            for b in names[i + 1:]:
+                value = matrix[a][b]
+                if value is not None and abs(value) >= 0.7:
+                    strong.append({'metrics': [a, b], 'correlation': value})
+        return {'matrix': matrix, 'strong_correlations': strong}
     
     def _detect_usage_seasonality(self) -> Dict[str, Any]:
         """Detect seasonal usage patterns"""
-        return {'status': 'Seasonality detection not yet implemented'}
+        timestamps, values = self.metric_store.window('cpu.percent')
+        history_hours = (timestamps[-1] - timestamps[0]) / 3600 if len(timestamps) > 1 else 0
+        if history_hours < 48:
+            # A daily pattern needs at least two days of history
+            return {'status': 'insufficient_history', 'history_hours': round(history_hours, 2)}
+        
+        profile = self.analytics.hourly_profile('cpu.percent')
+        mean = sum(values) / len(values)
+        total_variance = sum((value - mean) ** 2 for value in values) / len(values)
+        hourly_variance = sum((value - mean) ** 2 for value in profile.values()) / len(profile)
+        strength = hourly_variance / total_variance if total_variance > 0 else 0.0
+        return {
+            'status': 'ok',
+            'daily_pattern_strength': round(min(strength, 1.0), 3),
+            'daily_pattern': strength >= 0.3
+        }
     
     def _analyze_growth_patterns(self) -> Dict[str, Any]:
         """Analyze resource growth patterns"""
-        return {'status': 'Growth pattern analysis not yet implemented'}
+        growth = {}
+        metrics = ['memory.used', 'swap.used', 'process.count'] + [f'disk.{mount}.used' for mount in self._disk_mountpoints()]
+        for metric in metrics:
+            forecast = self.analytics.forecast(metric, 86400)
+            if forecast:
+                growth[metric] = {
+                    'change_per_day': round(forecast['slope_per_day'], 2),
+                    'r_squared': forecast['r_squared']
+                }
+        return growth or {'status': 'insufficient_data'}
+    
+    def _risk(self, score: float) -> Dict[str, Any]:
+        """Build a risk result from a 0-1 score"""
+        status = 'high_risk' if score > 0.7 else 'medium_risk' if score > 0.4 else 'low_risk'
+        return {'risk_score': round(score, 2), 'status': status}
     
     def _assess_disk_failure_risk(self) -> Dict[str, Any]:
         """Assess disk failure risk"""
-        return {'risk_score': 0.2, 'status': 'low_risk'}
+        days = [
+            eta['days_linear'] for mount in self._disk_mountpoints()
+            for eta in [self._days_until(f'disk.{mount}.used', self._latest(f'disk.{mount}.total'))]
+            if eta and eta['days_linear'] is not None and (eta['r_squared'] or 0) >= 0.5
+        ]
+        if not days:
+            return self._risk(0.1)
+        soonest = min(days)
+        result = self._risk(0.9 if soonest < 7 else 0.6 if soonest < 30 else 0.2)
+        result['days_until_full'] = soonest
+        return result
     
     def _assess_memory_degradation_risk(self) -> Dict[str, Any]:
         """Assess memory degradation risk"""
-        return {'risk_score': 0.1, 'status': 'low_risk'}
+        eta = self._days_until('memory.used', self._latest('memory.total'))
+        swap_anomalies = len(self.analytics.anomalies('swap.', since=time.time() - ANOMALY_REPORT_WINDOW))
+        score = 0.1
+        if eta and eta['days_linear'] is not None and (eta['r_squared'] or 0) >= 0.5:
+            score = 0.9 if eta['days_linear'] < 1 else 0.6 if eta['days_linear'] < 7 else 0.2
+        result = self._risk(min(score + 0.1 * swap_anomalies, 1.0))
+        result['days_until_exhaustion'] = eta['days_linear'] if eta else None
+        return result
     
     def _assess_cpu_stress_indicators(self) -> Dict[str, Any]:
         """Assess CPU stress indicators"""
-        return {'risk_score': 0.3, 'status': 'low_risk'}
+        baseline = self.analytics.baseline('cpu.percent')
+        if not baseline:
+            return self._risk(0.1)
+        anomalies = len(self.analytics.anomalies('cpu.percent', since=time.time() - ANOMALY_REPORT_WINDOW))
+        result = self._risk(min(baseline['mean'] / 100 + 0.05 * anomalies, 1.0))
+        result['baseline_percent'] = round(baseline['mean'], 2)
+        return result
     
     def _assess_network_degradation(self) -> Dict[str, Any]:
         """Assess network performance degradation"""
-        return {'risk_score': 0.15, 'status': 'low_risk'}
+        since = time.time() - ANOMALY_REPORT_WINDOW
+        anomalies = sum(len(self.analytics.anomalies(prefix, since=since)) for prefix in ('network.err', 'network.drop'))
+        return self._risk(min(0.1 + 0.15 * anomalies, 1.0))
     
     def _forecast_cpu_capacity(self) -> Dict[str, Any]:
         """Forecast CPU capacity needs"""
-        return {'forecast_horizon_days': 30, 'predicted_growth': '5%'}
+        return self._forecast('cpu.percent', clamp_percent=True)
     
     def _forecast_memory_capacity(self) -> Dict[str, Any]:
         """Forecast memory capacity needs"""
-        return {'forecast_horizon_days': 30, 'predicted_growth': '8%'}
+        forecast = self._forecast('memory.percent', clamp_percent=True)
+        forecast['time_to_exhaustion'] = self._days_until('memory.used', self._latest('memory.total'))
+        return forecast
     
     def _forecast_disk_capacity(self) -> Dict[str, Any]:
         """Forecast disk capacity needs"""
-        return {'forecast_horizon_days': 30, 'predicted_growth': '12%'}
+        partitions = {}
+        for mount in self._disk_mountpoints():
+            forecast = self._forecast(f'disk.{mount}.percent', clamp_percent=True)
+            forecast['time_to_full'] = self._days_until(f'disk.{mount}.used', self._latest(f'disk.{mount}.total'))
+            partitions[mount] = forecast
+        return {'forecast_horizon_days': FORECAST_HORIZON_DAYS, 'partitions': partitions}
     
     def _forecast_network_capacity(self) -> Dict[str, Any]:
         """Forecast network capacity needs"""
-        return {'forecast_horizon_days': 30, 'predicted_growth': '3%'}
+        return {
+            'forecast_horizon_days': FORECAST_HORIZON_DAYS,
+            'receive_bytes_per_second': self._forecast('network.bytes_recv_per_sec'),
+            'send_bytes_per_second': self._forecast('network.bytes_sent_per_sec')
+        }
     
     def _detect_cpu_anomalies(self) -> List[Dict[str, Any]]:
         """Detect CPU anomalies"""
-        return []
+        return self.analytics.anomalies('cpu.', since=time.time() - ANOMALY_REPORT_WINDOW)
     
     def _detect_memory_anomalies(self) -> List[Dict[str, Any]]:
         """Detect memory anomalies"""
-        return []
+        since = time.time() - ANOMALY_REPORT_WINDOW
+        return self.analytics.anomalies('memory.', since=since) + self.analytics.anomalies('swap.', since=since)
     
     def _detect_disk_anomalies(self) -> List[Dict[str, Any]]:
         """Detect disk anomalies"""
-        return []
+        return self.analytics.anomalies('disk', since=time.time() - ANOMALY_REPORT_WINDOW)
     
     def _detect_network_anomalies(self) -> List[Dict[str, Any]]:
         """Detect network anomalies"""
-        return []
+        return self.analytics.anomalies('network.', since=time.time() - ANOMALY_REPORT_WINDOW)
     
     def _get_current_metrics(self) -> Dict[str, float]:
         """Get current system metrics"""
         return {
-            'cpu_percent': psutil.cpu_percent(),
+            'cpu_percent': get_cpu_sampler().current_percent(),
             'memory_percent': psutil.virtual_memory().percent,
             'disk_percent': psutil.disk_usage('/').percent if platform.system() != 'Windows' else psutil.disk_usage('C:\\').percent
         }
@@ -691,7 +873,7 @@ class PredictiveAnalyticsModule(BaseModule):
     def _calculate_system_health_score(self) -> float:
         """Calculate system health score (0-100)"""
         try:
-            cpu_score = 100 - psutil.cpu_percent()
+            cpu_score = 100 - get_cpu_sampler().current_percent()
             memory_score = 100 - psutil.virtual_memory().percent
             
             # Simple average for now
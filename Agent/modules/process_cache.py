@@ -0,0 +1,183 @@
+"""
+Process Metadata Cache for ITSM Agent
+PID to process name/user lookups keyed by (pid, create_time), and per-process connection summaries
+"""
+
+import re
+import time
+import threading
+from typing import Dict, Any, List, Optional, NamedTuple, Iterable, Pattern
+
+import psutil
+
+
+# Browser and OS processes whose connections are not worth reporting
+IGNORED_CONNECTION_PROCESSES = re.compile(
+    r'^(chrome|msedge|brave|explorer|svchost|Idle|System|'
+    r'WindowsPackageManagerServer|msedgewebview2|ms-teams)$',
+    re.IGNORECASE
+)
+
+# Entries checked more recently than this are trusted without reading /proc again
+DEFAULT_REVALIDATE_AFTER = 5.0
+
+# Entries not looked up for this long are dropped
+DEFAULT_EXPIRE_AFTER = 600.0
+
+
+class ProcessMetadata(NamedTuple):
+    pid: int
+    create_time: float
+    name: str
+    username: Optional[str]
+
+
+class ProcessMetadataCache:
+    """Name and user of each PID, re-read only when the PID is reused by a new process.
+
+    A hit within revalidate_after costs nothing; after that one create_time
+    read confirms the PID still belongs to the same process.
+    """
+
+    def __init__(self, revalidate_after: float = DEFAULT_REVALIDATE_AFTER,
+                 expire_after: float = DEFAULT_EXPIRE_AFTER):
+        self.revalidate_after = revalidate_after
+        self.expire_after = expire_after
+        self._lock = threading.Lock()
+        # pid -> (metadata, monotonic time of the last create_time check)
+        self._entries: Dict[int, tuple] = {}
+        self.stats = {'hits': 0, 'revalidations': 0, 'misses': 0, 'pid_reuses': 0, 'expired': 0}
+
+    def get(self, pid: Optional[int]) -> Optional[ProcessMetadata]:
+        """Get a process's metadata, or None if it has exited or cannot be read"""
+        if pid is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(pid)
+            if cached and now - cached[1] <= self.revalidate_after:
+                self.stats['hits'] += 1
+                return cached[0]
+
+        try:
+            # Process() reads create_time itself to identify the process
+            proc = psutil.Process(pid)
+            create_time = proc.create_time()
+            if cached and cached[0].create_time == create_time:
+                with self._lock:
+                    self._entries[pid] = (cached[0], now)
+                    self.stats['revalidations'] += 1
+                return cached[0]
+
+            with proc.oneshot():
+                name = proc.name()
+                try:
+                    username = proc.username()
+                except (psutil.AccessDenied, KeyError):
+                    username = None
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            with self._lock:
+                self._entries.pop(pid, None)
+            return None
+
+        metadata = ProcessMetadata(pid, create_time, name, username)
+        with self._lock:
+            self._entries[pid] = (metadata, now)
+            self.stats['misses'] += 1
+            if cached:
+                self.stats['pid_reuses'] += 1
+        return metadata
+
+    def prune(self) -> int:
+        """Drop entries not looked up within expire_after, returning how many were dropped"""
+        cutoff = time.monotonic() - self.expire_after
+        with self._lock:
+            expired = [pid for pid, (_, checked_at) in self._entries.items() if checked_at < cutoff]
+            for pid in expired:
+                del self._entries[pid]
+            self.stats['expired'] += len(expired)
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the number of cached PIDs"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+
+def summarize_connections(connections: Iterable, cache: Optional[ProcessMetadataCache] = None,
+                          ignore_pattern: Optional[Pattern] = IGNORED_CONNECTION_PROCESSES,
+                          max_processes: int = 100, max_remotes: int = 20) -> List[Dict[str, Any]]:
+    """Aggregate established TCP connections by owning process and remote endpoint.
+
+    Each process appears once with its connection count and its busiest
+    remote endpoints, so thousands of sockets to one upstream become one
+    line. Connections whose PID is hidden (no privileges) are grouped
+    under pid None.
+    """
+    cache = cache or get_process_cache()
+    processes: Dict[Any, Dict[str, Any]] = {}
+    skipped = set()
+
+    for conn in connections:
+        if conn.status != psutil.CONN_ESTABLISHED or not conn.raddr:
+            continue
+        if conn.pid in skipped:
+            continue
+        key, metadata = None, None
+        if conn.pid is not None:
+            metadata = cache.get(conn.pid)
+            if metadata is None or (ignore_pattern and ignore_pattern.match(metadata.name)):
+                skipped.add(conn.pid)
+                continue
+            key = (metadata.pid, metadata.create_time)
+
+        summary = processes.get(key)
+        if summary is None:
+            summary = processes[key] = {
+                'pid': metadata.pid if metadata else None,
+                'process_name': metadata.name if metadata else 'unknown',
+                'username': metadata.username if metadata else None,
+                'connection_count': 0,
+                'local_ports': set(),
+                'remotes': {}
+            }
+        summary['connection_count'] += 1
+        summary['local_ports'].add(conn.laddr.port)
+        remote = (conn.raddr.ip, conn.raddr.port)
+        summary['remotes'][remote] = summary['remotes'].get(remote, 0) + 1
+
+    cache.prune()
+    summaries = []
+    for summary in sorted(processes.values(), key=lambda s: s['connection_count'], reverse=True)[:max_processes]:
+        remotes = sorted(summary['remotes'].items(), key=lambda item: item[1], reverse=True)
+        summaries.append({
+            'pid': summary['pid'],
+            'process_name': summary['process_name'],
+            'username': summary['username'],
+            'connection_count': summary['connection_count'],
+            'local_ports': sorted(summary['local_ports'])[:max_remotes],
+            'remote_endpoint_count': len(remotes),
+            'remote_endpoints': [
+                {'remote_address': f"{ip}:{port}", 'connections': count}
+                for (ip, port), count in remotes[:max_remotes]
+            ]
+        })
+    return summaries
+
+
+_lock = threading.Lock()
+_cache: Optional[ProcessMetadataCache] = None
+
+
+def get_process_cache() -> ProcessMetadataCache:
+    """Get the shared process metadata cache"""
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = ProcessMetadataCache()
+        return _cache
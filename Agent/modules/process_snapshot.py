@@ -0,0 +1,161 @@
+"""
+Process Snapshot for ITSM Agent
+One shared process table per collection cycle, queried by every module
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable
+
+import psutil
+
+
+# Union of the attributes any collector needs; psutil reads them in one pass per PID
+SNAPSHOT_ATTRS = [
+    'pid', 'name', 'username', 'cpu_percent', 'memory_percent',
+    'create_time', 'status', 'num_threads', 'cmdline'
+]
+
+# Snapshots younger than this are reused, so modules collected in the same cycle share one scan
+DEFAULT_MAX_AGE = 5.0
+
+
+class ProcessSnapshot:
+    """Columnar table of process attributes taken from a single process_iter walk"""
+
+    def __init__(self, columns: Dict[str, List[Any]], taken_at: float, scan_duration: float,
+                 cpu_seconds: Optional[Dict[tuple, float]] = None, monotonic: Optional[float] = None):
+        self.columns = columns
+        self.taken_at = taken_at
+        self.scan_duration = scan_duration
+        # (pid, create_time) -> user + system CPU seconds, the baseline for the next snapshot
+        self.cpu_seconds = cpu_seconds or {}
+        self.monotonic = time.monotonic() if monotonic is None else monotonic
+
+    @classmethod
+    def capture(cls, attrs=SNAPSHOT_ATTRS, previous: Optional['ProcessSnapshot'] = None) -> 'ProcessSnapshot':
+        """Walk the process table once and store each attribute as a column.
+
+        cpu_percent is computed from cpu_times in the same walk: against
+        previous for processes it also saw (keyed by (pid, create_time), so
+        reused PIDs start afresh), otherwise averaged since the process
+        started. psutil's own cpu_percent reports 0 on the first call per process.
+        """
+        start = time.perf_counter()
+        columns = {attr: [] for attr in attrs}
+        with_cpu = 'cpu_percent' in attrs
+        read_attrs = [attr for attr in attrs if attr != 'cpu_percent']
+        if with_cpu:
+            read_attrs += [attr for attr in ('create_time', 'cpu_times') if attr not in read_attrs]
+        monotonic, now = time.monotonic(), time.time()
+        elapsed = monotonic - previous.monotonic if previous is not None else 0
+        cpu_seconds = {}
+
+        for proc in psutil.process_iter(read_attrs, ad_value=None):
+            try:
+                info = proc.info
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            if with_cpu:
+                info['cpu_percent'] = None
+                times, create_time = info.get('cpu_times'), info.get('create_time')
+                if times is not None and create_time is not None:
+                    key = (info.get('pid'), create_time)
+                    cpu_seconds[key] = times.user + times.system
+                    before = previous.cpu_seconds.get(key) if previous is not None else None
+                    if before is not None and elapsed > 0:
+                        info['cpu_percent'] = round(max(0.0, (cpu_seconds[key] - before) / elapsed * 100), 1)
+                    elif now > create_time:
+                        info['cpu_percent'] = round(cpu_seconds[key] / (now - create_time) * 100, 1)
+            for attr in attrs:
+                columns[attr].append(info.get(attr))
+
+        return cls(columns, now, time.perf_counter() - start, cpu_seconds, monotonic)
+
+    def __len__(self) -> int:
+        return len(self.columns['pid'])
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.time() - self.taken_at
+
+    def column(self, attr: str) -> List[Any]:
+        """Get one attribute for every process"""
+        return self.columns[attr]
+
+    def records(self, attrs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get processes as dicts with the requested attributes"""
+        attrs = attrs or list(self.columns)
+        selected = [self.columns[attr] for attr in attrs]
+        return [dict(zip(attrs, row)) for row in zip(*selected)]
+
+    def filter_by_name(self, predicate: Callable[[str], bool], attrs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get processes whose name satisfies predicate"""
+        attrs = attrs or list(self.columns)
+        names = self.columns['name']
+        return [
+            {attr: self.columns[attr][index] for attr in attrs}
+            for index, name in enumerate(names)
+            if name and predicate(name)
+        ]
+
+    def top(self, attr: str, limit: int, attrs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get the processes with the highest values of attr"""
+        values = self.columns[attr]
+        order = sorted(range(len(values)), key=lambda index: values[index] or 0, reverse=True)[:limit]
+        attrs = attrs or list(self.columns)
+        return [{name: self.columns[name][index] for name in attrs} for index in order]
+
+    def count_by(self, attr: str) -> Dict[Any, int]:
+        """Count processes per value of attr"""
+        counts = {}
+        for value in self.columns[attr]:
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def total(self, attr: str) -> float:
+        """Sum a numeric attribute across all processes"""
+        return sum(value or 0 for value in self.columns[attr])
+
+    def has_name_containing(self, fragments: List[str]) -> bool:
+        """Check if any process name contains one of the fragments (case-insensitive)"""
+        return any(
+            fragment in name.lower()
+            for name in self.columns['name'] if name
+            for fragment in fragments
+        )
+
+
+_lock = threading.Lock()
+_latest: Optional[ProcessSnapshot] = None
+# Last snapshot taken, kept across invalidation as the CPU baseline
+_baseline: Optional[ProcessSnapshot] = None
+scan_count = 0
+
+
+def get_process_snapshot(max_age: float = DEFAULT_MAX_AGE) -> ProcessSnapshot:
+    """Get the shared snapshot, taking a new one if the current one is older than max_age.
+
+    Concurrent callers wait for a single scan instead of each walking /proc.
+    Per-process CPU is measured against the previous snapshot, so it is the
+    average over one collection cycle.
+    """
+    global _latest, _baseline, scan_count
+
+    with _lock:
+        if _latest is None or _latest.age > max_age:
+            _latest = _baseline = ProcessSnapshot.capture(previous=_baseline)
+            scan_count += 1
+            logging.getLogger('ProcessSnapshot').debug(
+                f"Captured {len(_latest)} processes in {_latest.scan_duration * 1000:.1f}ms"
+            )
+        return _latest
+
+
+def invalidate_process_snapshot():
+    """Force the next caller to take a fresh snapshot"""
+    global _latest
+    with _lock:
+        _latest = None
@@ -0,0 +1,257 @@
+"""
+Public IP Resolver for ITSM Agent
+Races public IP and geolocation services and caches the answer per network attachment
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+import ipaddress
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Optional, List
+
+import psutil
+
+from .linux_sources import ROUTE_PATH, get_linux_sources
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+
+IP_SERVICES = [
+    'https://api.ipify.org?format=json',
+    'https://api.ip.sb/jsonip',
+    'https://api.myip.com',
+    'https://icanhazip.com',
+    'https://checkip.amazonaws.com',
+    'https://httpbin.org/ip'
+]
+
+GEO_SERVICES = [
+    'https://ipapi.co/{ip}/json/',
+    'http://ip-api.com/json/{ip}',
+    'https://ipinfo.io/{ip}/json'
+]
+
+
+def parse_ip_response(text: str) -> Optional[str]:
+    """Extract a valid IP address from a JSON or plain-text service response"""
+    candidate = None
+    text = (text or '').strip()
+    if text.startswith('{'):
+        try:
+            data = json.loads(text)
+            candidate = data.get('ip') or data.get('origin') or data.get('query')
+        except ValueError:
+            return None
+    else:
+        candidate = text
+
+    if not candidate:
+        return None
+    # httpbin may return "client, proxy"
+    candidate = str(candidate).split(',')[0].strip()
+    try:
+        return str(ipaddress.ip_address(candidate))
+    except ValueError:
+        return None
+
+
+def normalize_geo(geo_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Normalize a geolocation service response into one shape"""
+    if not isinstance(geo_data, dict) or geo_data.get('error') or geo_data.get('status') == 'fail':
+        return None
+
+    city = geo_data.get('city') or geo_data.get('cityName')
+    region = geo_data.get('region') or geo_data.get('region_name') or geo_data.get('regionName') or geo_data.get('stateProv')
+    country = geo_data.get('country_name') or geo_data.get('country') or geo_data.get('countryName')
+    latitude = geo_data.get('lat') or geo_data.get('latitude')
+    longitude = geo_data.get('lon') or geo_data.get('longitude')
+    if latitude is None and isinstance(geo_data.get('loc'), str) and ',' in geo_data['loc']:
+        latitude, longitude = geo_data['loc'].split(',', 1)
+
+    location_parts = []
+    if city:
+        location_parts.append(city)
+    if region and region != city:
+        location_parts.append(region)
+    if country:
+        location_parts.append(country)
+    if not location_parts:
+        return None
+
+    return {
+        'location': ', '.join(location_parts),
+        'city': city,
+        'region': region,
+        'country': country,
+        'country_code': geo_data.get('country_code') or geo_data.get('countryCode'),
+        'postal_code': geo_data.get('postal') or geo_data.get('zip'),
+        'latitude': latitude,
+        'longitude': longitude,
+        'isp': geo_data.get('isp') or geo_data.get('org') or geo_data.get('as'),
+        'timezone': geo_data.get('timezone') or geo_data.get('timeZone')
+    }
+
+
+def get_network_fingerprint() -> tuple:
+    """Identify the current network attachment by local addresses and default gateway"""
+    addresses = []
+    try:
+        for interface, addrs in psutil.net_if_addrs().items():
+            for addr in addrs:
+                if addr.family in (socket.AF_INET, socket.AF_INET6) and not addr.address.startswith(('127.', '::1', 'fe80')):
+                    addresses.append(addr.address)
+    except Exception:
+        pass
+
+    gateway = None
+    try:
+        if os.path.exists(ROUTE_PATH):
+            gateway = get_linux_sources().default_gateway()
+    except Exception:
+        pass
+
+    return tuple(sorted(addresses)), gateway
+
+
+class PublicIPResolver:
+    """Resolves the public IP and geolocation with hedged requests and caching.
+
+    All services are queried at once and the first valid answer wins, so a
+    lookup costs one timeout at most. Answers are cached for ttl seconds and
+    failures for negative_ttl seconds; both are dropped as soon as a local
+    address or the default gateway changes.
+    """
+
+    def __init__(self, ttl: float = 3600, negative_ttl: float = 300, timeout: float = 5,
+                 ip_services: Optional[List[str]] = None, geo_services: Optional[List[str]] = None):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.ip_services = ip_services or IP_SERVICES
+        self.geo_services = geo_services or GEO_SERVICES
+        self.logger = logging.getLogger('PublicIPResolver')
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(self.ip_services), len(self.geo_services)),
+            thread_name_prefix='public-ip'
+        )
+        self._entry = None
+        self.stats = {'lookups': 0, 'cache_hits': 0, 'negative_hits': 0, 'invalidations': 0}
+
+    def resolve(self, include_geo: bool = True) -> Dict[str, Any]:
+        """Get {'public_ip', 'geo', 'source', 'resolved_at', 'cached'}; public_ip is None on failure"""
+        with self._lock:
+            fingerprint = get_network_fingerprint()
+            entry = self._entry
+            now = time.time()
+
+            if entry and entry['fingerprint'] != fingerprint:
+                self.logger.info("Network attachment changed, dropping cached public IP")
+                self.stats['invalidations'] += 1
+                entry = None
+
+            if entry:
+                if entry['public_ip'] is None and now - entry['resolved_at'] < self.negative_ttl:
+                    self.stats['negative_hits'] += 1
+                    return self._result(entry, cached=True)
+                if entry['public_ip'] and now - entry['resolved_at'] < self.ttl:
+                    geo_fresh = entry['geo'] is not None or now - entry['geo_attempted_at'] < self.negative_ttl
+                    if geo_fresh or not include_geo:
+                        self.stats['cache_hits'] += 1
+                        return self._result(entry, cached=True)
+                    entry['geo'], entry['geo_source'] = self._race(
+                        [url.format(ip=entry['public_ip']) for url in self.geo_services], self._parse_geo
+                    )
+                    entry['geo_attempted_at'] = time.time()
+                    return self._result(entry, cached=True)
+
+            self.stats['lookups'] += 1
+            public_ip, source = self._race(self.ip_services, parse_ip_response)
+            geo, geo_source = None, None
+            if public_ip and include_geo:
+                geo, geo_source = self._race(
+                    [url.format(ip=public_ip) for url in self.geo_services], self._parse_geo
+                )
+
+            self._entry = {
+                'fingerprint': fingerprint,
+                'public_ip': public_ip,
+                'source': source,
+                'geo': geo,
+                'geo_source': geo_source,
+                'resolved_at': now,
+                'geo_attempted_at': time.time() if include_geo else 0
+            }
+            if not public_ip:
+                self.logger.warning(f"Public IP lookup failed, retrying in {self.negative_ttl}s")
+            return self._result(self._entry, cached=False)
+
+    def invalidate(self):
+        """Drop the cached answer"""
+        with self._lock:
+            self._entry = None
+
+    def _result(self, entry: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        return {
+            'public_ip': entry['public_ip'],
+            'geo': entry['geo'],
+            'source': entry['source'],
+            'geo_source': entry['geo_source'],
+            'resolved_at': entry['resolved_at'],
+            'cached': cached
+        }
+
+    def _parse_geo(self, text: str) -> Optional[Dict[str, Any]]:
+        try:
+            return normalize_geo(json.loads(text))
+        except ValueError:
+            return None
+
+    def _race(self, urls: List[str], parser):
+        """Query all urls concurrently and return (first parsed answer, url)"""
+        if requests is None:
+            self.logger.debug("requests module not available for public IP lookup")
+            return None, None
+
+        def fetch(url):
+            response = requests.get(url, timeout=self.timeout, headers={'Accept': 'application/json'})
+            if response.status_code != 200:
+                return None
+            return parser(response.text)
+
+        futures = {self._executor.submit(fetch, url): url for url in urls}
+        try:
+            for future in as_completed(futures, timeout=self.timeout + 1):
+                try:
+                    value = future.result()
+                except Exception as e:
+                    self.logger.debug(f"Lookup via {futures[future]} failed: {e}")
+                    continue
+                if value:
+                    return value, futures[future]
+        except FutureTimeoutError:
+            self.logger.debug(f"No lookup service answered within {self.timeout}s")
+        finally:
+            for future in futures:
+                future.cancel()
+        return None, None
+
+
+_resolver_lock = threading.Lock()
+_resolver: Optional[PublicIPResolver] = None
+
+
+def get_public_ip_resolver() -> PublicIPResolver:
+    """Get the shared resolver so every collector uses the same cache"""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = PublicIPResolver()
+        return _resolver
@@ -13,12 +13,16 @@ import tempfile
 import socket
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from .base_module import BaseModule
+from .base_module import BaseModule, cached_result
+from .process_snapshot import get_process_snapshot
+from .shell_broker import run_command, run_powershell
 
 
 class RemoteManagementModule(BaseModule):
     """Remote management capabilities module"""
     
+    collection_interval = 86400  # seconds
+    
     def __init__(self):
         super().__init__('RemoteManagement')
         self.is_windows = platform.system().lower() == 'windows'
@@ -175,26 +179,13 @@ class RemoteManagementModule(BaseModule):
         status = {}
         
         try:
-            # Check SSH
-            result = subprocess.run(['systemctl', 'is-active', 'ssh'], 
-                                  capture_output=True, text=True, timeout=30)
-            status['ssh_enabled'] = result.stdout.strip() == 'active'
-            
-            if not status['ssh_enabled']:
-                # Try sshd
-                result = subprocess.run(['systemctl', 'is-active', 'sshd'], 
-                                      capture_output=True, text=True, timeout=30)
-                status['ssh_enabled'] = result.stdout.strip() == 'active'
-            
-            # Check VNC
-            result = subprocess.run(['systemctl', 'is-active', 'vncserver'], 
-                                  capture_output=True, text=True, timeout=30)
-            status['vnc_enabled'] = result.stdout.strip() == 'active'
-            
-            # Check Telnet
-            result = subprocess.run(['systemctl', 'is-active', 'telnet'], 
-                                  capture_output=True, text=True, timeout=30)
-            status['telnet_enabled'] = result.stdout.strip() == 'active'
+            # One systemctl call prints a state line per unit, in order
+            units = ['ssh', 'sshd', 'vncserver', 'telnet']
+            result = run_command(['systemctl', 'is-active'] + units, timeout=30)
+            states = dict(zip(units, result.stdout.split()))
+            status['ssh_enabled'] = states.get('ssh') == 'active' or states.get('sshd') == 'active'
+            status['vnc_enabled'] = states.get('vncserver') == 'active'
+            status['telnet_enabled'] = states.get('telnet') == 'active'
             
         except Exception as e:
             self.logger.debug(f"Error checking Linux remote access: {e}")
@@ -221,6 +212,7 @@ class RemoteManagementModule(BaseModule):
         
         return status
     
+    @cached_result(ttl=86400)
     def _check_wmi_capabilities(self) -> Dict[str, Any]:
         """Check WMI capabilities (Windows only)"""
         capabilities = {
@@ -245,8 +237,7 @@ class RemoteManagementModule(BaseModule):
             capabilities['wmic_available'] = result.returncode == 0
             
             # Check PowerShell WMI
-            result = subprocess.run(['powershell', '-Command', 'Get-WmiObject -Class Win32_OperatingSystem'], 
-                                  capture_output=True, text=True, timeout=30)
+            result = run_powershell('Get-WmiObject -Class Win32_OperatingSystem', timeout=30)
             capabilities['powershell_wmi_available'] = result.returncode == 0
             
             capabilities['wmi_available'] = any([
@@ -259,6 +250,7 @@ class RemoteManagementModule(BaseModule):
         
         return capabilities
     
+    @cached_result(ttl=86400)
     def _check_powershell_capabilities(self) -> Dict[str, Any]:
         """Check PowerShell capabilities"""
         capabilities = {
@@ -270,8 +262,7 @@ class RemoteManagementModule(BaseModule):
         
         try:
             # Check Windows PowerShell
-            result = subprocess.run(['powershell', '-Command', '$PSVersionTable'], 
-                                  capture_output=True, text=True, timeout=30)
+            result = run_powershell('$PSVersionTable', timeout=30)
             if result.returncode == 0:
                 capabilities['powershell_available'] = True
                 capabilities['version'] = 'Windows PowerShell'
@@ -286,8 +277,7 @@ class RemoteManagementModule(BaseModule):
             
             # Check execution policy (Windows only)
             if self.is_windows and capabilities['powershell_available']:
-                result = subprocess.run(['powershell', '-Command', 'Get-ExecutionPolicy'], 
-                                      capture_output=True, text=True, timeout=30)
+                result = run_powershell('Get-ExecutionPolicy', timeout=30)
                 if result.returncode == 0:
                     capabilities['execution_policy'] = result.stdout.strip()
             
@@ -296,6 +286,7 @@ class RemoteManagementModule(BaseModule):
         
         return capabilities
     
+    @cached_result(ttl=3600)
     def _check_ssh_capabilities(self) -> Dict[str, Any]:
         """Check SSH capabilities"""
         capabilities = {
@@ -321,14 +312,8 @@ class RemoteManagementModule(BaseModule):
             
             # Check SSH server status
             if self.is_linux:
-                result = subprocess.run(['systemctl', 'is-active', 'ssh'], 
-                                      capture_output=True, text=True, timeout=30)
-                capabilities['ssh_server_running'] = result.stdout.strip() == 'active'
-                
-                if not capabilities['ssh_server_running']:
-                    result = subprocess.run(['systemctl', 'is-active', 'sshd'], 
-                                          capture_output=True, text=True, timeout=30)
-                    capabilities['ssh_server_running'] = result.stdout.strip() == 'active'
+                result = run_command(['systemctl', 'is-active', 'ssh', 'sshd'], timeout=30)
+                capabilities['ssh_server_running'] = 'active' in result.stdout.split()
             
             # Check SSH keys
             ssh_dir = os.path.expanduser('~/.ssh')
@@ -343,6 +328,7 @@ class RemoteManagementModule(BaseModule):
         
         return capabilities
     
+    @cached_result(ttl=86400)
     def _check_file_transfer_capabilities(self) -> Dict[str, Any]:
         """Check file transfer capabilities"""
         capabilities = {
@@ -382,6 +368,7 @@ class RemoteManagementModule(BaseModule):
         
         return capabilities
     
+    @cached_result(ttl=86400)
     def _check_registry_access_capabilities(self) -> Dict[str, Any]:
         """Check registry access capabilities (Windows only)"""
         capabilities = {
@@ -400,8 +387,7 @@ class RemoteManagementModule(BaseModule):
             capabilities['reg_command_available'] = result.returncode == 0
             
             # Check PowerShell registry access
-            result = subprocess.run(['powershell', '-Command', 'Get-Item HKLM:\\'], 
-                                  capture_output=True, text=True, timeout=30)
+            result = run_powershell('Get-Item HKLM:\\', timeout=30)
             capabilities['powershell_registry_available'] = result.returncode == 0
             
             capabilities['registry_access_available'] = any([
@@ -423,6 +409,7 @@ class RemoteManagementModule(BaseModule):
         
         return capabilities
     
+    @cached_result(ttl=86400)
     def _check_service_management_capabilities(self) -> Dict[str, Any]:
         """Check service management capabilities"""
         capabilities = {
@@ -442,8 +429,7 @@ class RemoteManagementModule(BaseModule):
                 capabilities['service_control_available'] = capabilities['service_query_available']
                 
                 # Check PowerShell service management
-                result = subprocess.run(['powershell', '-Command', 'Get-Service'], 
-                                      capture_output=True, text=True, timeout=30)
+                result = run_powershell('Get-Service', timeout=30)
                 if result.returncode == 0:
                     capabilities['service_query_available'] = True
                     capabilities['service_control_available'] = True
@@ -467,6 +453,7 @@ class RemoteManagementModule(BaseModule):
         
         return capabilities
     
+    @cached_result(ttl=86400)
     def _check_process_management_capabilities(self) -> Dict[str, Any]:
         """Check process management capabilities"""
         capabilities = {
@@ -479,9 +466,7 @@ class RemoteManagementModule(BaseModule):
         
         try:
             # Check if we can list processes (should always work with psutil)
-            import psutil
-            processes = list(psutil.process_iter(['pid', 'name']))
-            capabilities['process_list_available'] = len(processes) > 0
+            capabilities['process_list_available'] = len(get_process_snapshot()) > 0
             
             # Check process priority control
             if self.is_windows:
@@ -502,6 +487,7 @@ class RemoteManagementModule(BaseModule):
         
         return capabilities
     
+    @cached_result(ttl=86400)
     def _check_network_management_capabilities(self) -> Dict[str, Any]:
         """Check network management capabilities"""
         capabilities = {
@@ -560,6 +546,7 @@ class RemoteManagementModule(BaseModule):
         
         return capabilities
     
+    @cached_result(ttl=86400)
     def _check_system_config_capabilities(self) -> Dict[str, Any]:
         """Check system configuration capabilities"""
         capabilities = {
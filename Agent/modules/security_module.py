@@ -5,18 +5,22 @@ Collects security-related system information
 """
 
 import platform
+import shutil
 import subprocess
 import json
 import re
-import psutil
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 from .base_module import BaseModule
+from .process_snapshot import get_process_snapshot
+from .shell_broker import run_powershell
 
 
 class SecurityModule(BaseModule):
     """Security information collection module"""
     
+    collection_interval = 3600  # seconds
+    
     def __init__(self):
         super().__init__('Security')
         self.is_windows = platform.system().lower() == 'windows'
@@ -53,10 +57,7 @@ class SecurityModule(BaseModule):
     def _get_windows_firewall_status(self) -> str:
         """Get Windows firewall status"""
         try:
-            result = subprocess.run([
-                "powershell", "-Command", 
-                "Get-NetFirewallProfile | Select-Object -ExpandProperty Enabled"
-            ], capture_output=True, text=True, timeout=10)
+            result = run_powershell("Get-NetFirewallProfile | Select-Object -ExpandProperty Enabled", timeout=10)
             
             if result.returncode == 0:
                 return "enabled" if "True" in result.stdout else "disabled"
@@ -119,8 +120,7 @@ class SecurityModule(BaseModule):
                 "Get-MpComputerStatus | "
                 "Select-Object -Property AntivirusEnabled | ConvertTo-Json"
             )
-            result = subprocess.run(["powershell", "-Command", ps_command],
-                                  capture_output=True, text=True, timeout=10)
+            result = run_powershell(ps_command, timeout=10)
             
             if result.returncode == 0 and result.stdout:
                 status = json.loads(result.stdout.strip())
@@ -135,12 +135,8 @@ class SecurityModule(BaseModule):
         av_processes = ['clamav', 'rkhunter', 'chkrootkit', 'sophos', 'avast', 'avg', 'norton', 'mcafee']
         
         try:
-            for proc in psutil.process_iter(['name']):
-                try:
-                    if any(av in proc.info['name'].lower() for av in av_processes):
-                        return 'enabled'
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            if get_process_snapshot().has_name_containing(av_processes):
+                return 'enabled'
         except Exception as e:
             self.logger.debug(f"Unix antivirus check failed: {e}")
         
@@ -163,8 +159,7 @@ class SecurityModule(BaseModule):
                 "Get-MpComputerStatus | "
                 "Select-Object -Property QuickScanStartTime,FullScanStartTime | ConvertTo-Json"
             )
-            result = subprocess.run(["powershell", "-Command", ps_command],
-                                  capture_output=True, text=True, timeout=10)
+            result = run_powershell(ps_command, timeout=10)
             
             if result.returncode == 0 and result.stdout:
                 status = json.loads(result.stdout.strip())
@@ -193,8 +188,7 @@ class SecurityModule(BaseModule):
         try:
             # Last update check
             ps = "(New-Object -ComObject Microsoft.Update.AutoUpdate).Results.LastSearchSuccessDate"
-            result = subprocess.run(["powershell", "-Command", ps],
-                                  capture_output=True, text=True, timeout=5)
+            result = run_powershell(ps, timeout=5)
             if result.returncode == 0 and result.stdout.strip():
                 update_info["last_check"] = result.stdout.strip()
             else:
@@ -205,13 +199,11 @@ class SecurityModule(BaseModule):
         try:
             # Automatic updates status
             ps_policy = "(Get-ItemProperty 'HKLM:\\SOFTWARE\\Policies\\Microsoft\\Windows\\WindowsUpdate\\AU' -ErrorAction SilentlyContinue).AUOptions"
-            result = subprocess.run(["powershell", "-Command", ps_policy],
-                                  capture_output=True, text=True, timeout=5)
+            result = run_powershell(ps_policy, timeout=5)
             
             if not result.stdout.strip():
                 ps_default = "(Get-ItemProperty 'HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\WindowsUpdate\\Auto Update' -ErrorAction SilentlyContinue).AUOptions"
-                result = subprocess.run(["powershell", "-Command", ps_default],
-                                      capture_output=True, text=True, timeout=5)
+                result = run_powershell(ps_default, timeout=5)
             
             if result.returncode == 0 and result.stdout.strip().isdigit():
                 au = int(result.stdout.strip())
@@ -318,8 +310,7 @@ class SecurityModule(BaseModule):
                 "Get-WinEvent -FilterHashtable @{LogName='Security'; StartTime=(Get-Date).AddDays(-1)} "
                 "-MaxEvents 10 | Select-Object TimeCreated, Id, LevelDisplayName, Message | ConvertTo-Json"
             )
-            result = subprocess.run(["powershell", "-Command", ps_command],
-                                  capture_output=True, text=True, timeout=30)
+            result = run_powershell(ps_command, timeout=30)
             
             if result.returncode == 0 and result.stdout:
                 events_data = json.loads(result.stdout.strip())
@@ -353,9 +344,4 @@ class SecurityModule(BaseModule):
     
     def _command_exists(self, command: str) -> bool:
         """Check if a command exists in the system"""
-        try:
-            result = subprocess.run(['which', command], 
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except Exception:
-            return False
+        return shutil.which(command) is not None
@@ -6,15 +6,18 @@ Collects running processes and services information
 
 import psutil
 import platform
-import re
 from typing import Dict, Any, List
 from datetime import datetime
 from .base_module import BaseModule
+from .process_snapshot import get_process_snapshot
+from .process_cache import summarize_connections
 
 
 class ServicesModule(BaseModule):
     """Services and processes information collection module"""
     
+    collection_interval = 300  # seconds
+    
     def __init__(self):
         super().__init__('Services')
         self.is_windows = platform.system().lower() == 'windows'
@@ -36,10 +39,11 @@ class ServicesModule(BaseModule):
         processes = []
         
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 
-                                           'memory_percent', 'create_time', 'status']):
+            # Top 50 by CPU usage from the shared per-cycle snapshot
+            snapshot = get_process_snapshot()
+            for proc_info in snapshot.top('cpu_percent', 50, ['pid', 'name', 'username', 'cpu_percent',
+                                                              'memory_percent', 'create_time', 'status']):
                 try:
-                    proc_info = proc.info
                     processes.append({
                         'pid': proc_info['pid'],
                         'name': proc_info['name'],
@@ -49,15 +53,11 @@ class ServicesModule(BaseModule):
                         'status': proc_info['status'],
                         'create_time': datetime.fromtimestamp(proc_info['create_time']).isoformat() if proc_info['create_time'] else None
                     })
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
                 except Exception as e:
                     self.logger.debug(f"Error processing process: {e}")
                     continue
             
-            # Sort by CPU usage and limit to top 50
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-            return processes[:50]
+            return processes
             
         except Exception as e:
             self.logger.error(f"Error getting running processes: {e}")
@@ -117,47 +117,9 @@ class ServicesModule(BaseModule):
         return services
     
     def _get_active_connections(self) -> List[Dict[str, Any]]:
-        """Get active network connections"""
-        connections = []
-        
-        # Process name filter pattern
-        ignore_pattern = re.compile(
-            r'^(chrome|msedge|brave|explorer|svchost|Idle|System|'
-            r'WindowsPackageManagerServer|msedgewebview2|ms-teams)$', 
-            re.IGNORECASE
-        )
-        
+        """Get established connections summarised per process and remote endpoint"""
         try:
-            for conn in psutil.net_connections(kind='tcp'):
-                if conn.status != psutil.CONN_ESTABLISHED or not conn.raddr:
-                    continue
-                
-                try:
-                    proc = psutil.Process(conn.pid)
-                    proc_name = proc.name()
-                    
-                    # Skip browser and system processes
-                    if ignore_pattern.match(proc_name):
-                        continue
-                    
-                    connections.append({
-                        'pid': conn.pid,
-                        'process_name': proc_name,
-                        'local_address': f"{conn.laddr.ip}:{conn.laddr.port}",
-                        'remote_address': f"{conn.raddr.ip}:{conn.raddr.port}",
-                        'status': conn.status,
-                        'family': conn.family.name if hasattr(conn.family, 'name') else str(conn.family)
-                    })
-                    
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-                except Exception as e:
-                    self.logger.debug(f"Error processing connection: {e}")
-                    continue
-            
-            # Limit to top 100 connections
-            return connections[:100]
-            
+            return summarize_connections(psutil.net_connections(kind='tcp'))
         except Exception as e:
             self.logger.error(f"Failed to get active connections: {e}")
             return []
@@ -206,15 +168,16 @@ class ServicesModule(BaseModule):
     def _get_process_summary(self) -> Dict[str, Any]:
         """Get process summary statistics"""
         try:
-            all_processes = list(psutil.process_iter(['pid', 'name', 'status', 'cpu_percent', 'memory_percent']))
+            snapshot = get_process_snapshot()
+            status_counts = snapshot.count_by('status')
             
-            total_processes = len(all_processes)
-            running_processes = len([p for p in all_processes if p.info['status'] == psutil.STATUS_RUNNING])
-            sleeping_processes = len([p for p in all_processes if p.info['status'] == psutil.STATUS_SLEEPING])
+            total_processes = len(snapshot)
+            running_processes = status_counts.get(psutil.STATUS_RUNNING, 0)
+            sleeping_processes = status_counts.get(psutil.STATUS_SLEEPING, 0)
             
             # Calculate total CPU and memory usage
-            total_cpu = sum(p.info['cpu_percent'] or 0 for p in all_processes)
-            total_memory = sum(p.info['memory_percent'] or 0 for p in all_processes)
+            total_cpu = snapshot.total('cpu_percent')
+            total_memory = snapshot.total('memory_percent')
             
             return {
                 'total_processes': total_processes,
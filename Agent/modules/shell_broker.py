@@ -0,0 +1,458 @@
+"""
+Shell Broker for ITSM Agent
+Long-lived bash and PowerShell sessions that run probe commands without a new interpreter per call
+"""
+
+import os
+import time
+import queue
+import signal
+import shlex
+import base64
+import shutil
+import secrets
+import logging
+import platform
+import threading
+import subprocess
+from typing import Dict, Any, List, Optional, Union
+
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_OUTPUT = 1024 * 1024
+DEFAULT_MAX_COMMANDS = 500
+DEFAULT_MAX_AGE = 900  # seconds
+
+STDOUT = 0
+STDERR = 1
+
+
+class ShellSessionError(RuntimeError):
+    """The shell session died or could not be started"""
+
+
+class BashDialect:
+    """Frames commands for a bash session reading its script from stdin.
+
+    Each command is passed through a quoted here-document into a variable
+    and evaluated in a subshell, so syntax errors, exit and cd cannot break
+    the framing or leak into later commands. The exit status follows an
+    end marker on stdout; stderr gets its own marker.
+    """
+
+    name = 'bash'
+    prelude = ''
+
+    @staticmethod
+    def argv() -> Optional[List[str]]:
+        path = shutil.which('bash')
+        return [path, '--noprofile', '--norc'] if path else None
+
+    @staticmethod
+    def wrap(command: str, marker: str) -> str:
+        return (
+            f"IFS= read -r -d '' __itsm_cmd <<'{marker}'\n"
+            f"{command}\n"
+            f"{marker}\n"
+            f"( eval \"$__itsm_cmd\" ) </dev/null\n"
+            f"printf '\\n{marker} %d\\n' \"$?\"\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+
+
+class PowerShellDialect:
+    """Frames commands for a PowerShell session started with -Command -.
+
+    Commands are sent base64 encoded on a single line, because the stdin
+    host runs each line as it arrives, and executed as a script block.
+    """
+
+    name = 'powershell'
+    prelude = ("[Console]::OutputEncoding = [Text.Encoding]::UTF8; "
+               "$ProgressPreference = 'SilentlyContinue'\n")
+
+    @staticmethod
+    def argv() -> Optional[List[str]]:
+        for executable in ('powershell', 'pwsh'):
+            path = shutil.which(executable)
+            if path:
+                return [path, '-NoLogo', '-NoProfile', '-NonInteractive', '-Command', '-']
+        return None
+
+    @staticmethod
+    def wrap(command: str, marker: str) -> str:
+        encoded = base64.b64encode(command.encode('utf-8')).decode('ascii')
+        return (
+            f"$__itsm = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('{encoded}')); "
+            "$global:LASTEXITCODE = 0; $__errors = $Error.Count; $__code = 0; "
+            "try { & ([scriptblock]::Create($__itsm)) | Out-String -Stream -Width 4096 | "
+            "ForEach-Object { [Console]::Out.WriteLine($_) } } "
+            "catch { $__code = 1; [Console]::Error.WriteLine($_.ToString()) }; "
+            "if ($LASTEXITCODE) { $__code = $LASTEXITCODE } elseif ($Error.Count -gt $__errors) { $__code = 1 }; "
+            f"[Console]::Out.Write(\"`n{marker} $__code`n\"); [Console]::Out.Flush(); "
+            f"[Console]::Error.Write(\"`n{marker}`n\"); [Console]::Error.Flush()\n"
+        )
+
+
+DIALECTS = {dialect.name: dialect for dialect in (BashDialect, PowerShellDialect)}
+
+
+class _StreamCapture:
+    """Collects one command's output from a stream up to its end marker, keeping at most cap bytes"""
+
+    def __init__(self, marker: bytes, cap: int):
+        self.marker = marker
+        self.cap = cap
+        self.output = bytearray()
+        self.truncated = False
+        self.trailer = b''
+        self.done = False
+        self._window = bytearray()
+
+    def feed(self, data: bytes) -> bytes:
+        """Consume data; returns whatever follows this command's marker line"""
+        self._window += data
+        index = self._window.find(self.marker)
+        if index >= 0:
+            end = self._window.find(b'\n', index + len(self.marker))
+            if end < 0:
+                # Rest of the marker line has not arrived yet
+                return b''
+            self._keep(self._window[:index])
+            self.trailer = bytes(self._window[index + len(self.marker):end]).strip()
+            leftover = bytes(self._window[end + 1:])
+            self._window = bytearray()
+            self.done = True
+            return leftover
+
+        # Hold back only what could be the start of a marker split across reads
+        hold = len(self.marker)
+        if len(self._window) > hold:
+            self._keep(self._window[:-hold])
+            del self._window[:-hold]
+        return b''
+
+    def _keep(self, data):
+        room = self.cap - len(self.output)
+        if room > 0:
+            self.output += data[:room]
+        if len(data) > max(room, 0):
+            self.truncated = True
+
+    def text(self) -> str:
+        return self.output.decode('utf-8', 'replace').replace('\r\n', '\n')
+
+
+class ShellSession:
+    """One long-lived shell process and its framed command channel"""
+
+    def __init__(self, dialect):
+        argv = dialect.argv()
+        if not argv:
+            raise ShellSessionError(f"{dialect.name} is not available")
+        self.dialect = dialect
+        self.token = secrets.token_hex(8)
+        self.sequence = 0
+        self.commands = 0
+        self.started = time.monotonic()
+        try:
+            # Own process group, so a timed-out command's children can be killed with the shell
+            if platform.system() == 'Windows':
+                group = {'creationflags': subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP}
+            else:
+                group = {'start_new_session': True}
+            self.process = subprocess.Popen(
+                argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **group
+            )
+        except OSError as e:
+            raise ShellSessionError(f"Could not start {dialect.name}: {e}")
+        self._chunks = queue.Queue()
+        self._leftover = {STDOUT: b'', STDERR: b''}
+        for stream_id, stream in ((STDOUT, self.process.stdout), (STDERR, self.process.stderr)):
+            threading.Thread(target=self._pump, args=(stream_id, stream), daemon=True,
+                             name=f"shell-{dialect.name}-{stream_id}").start()
+        if dialect.prelude:
+            self._write(dialect.prelude)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.started
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _pump(self, stream_id: int, stream):
+        try:
+            while True:
+                data = stream.read1(65536)
+                if not data:
+                    break
+                self._chunks.put((stream_id, data))
+        except (OSError, ValueError):
+            pass
+        self._chunks.put((stream_id, None))
+
+    def _write(self, text: str):
+        try:
+            self.process.stdin.write(text.encode('utf-8'))
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise ShellSessionError(f"{self.dialect.name} session closed: {e}")
+
+    def run_batch(self, commands: List[str], timeout: float, max_output: int,
+                  results: List[subprocess.CompletedProcess]):
+        """Send all commands in one write and append their results to results in order.
+
+        timeout applies to each command from the moment the previous one
+        finished. Raises subprocess.TimeoutExpired for the first command that
+        overruns; the session must then be discarded.
+        """
+        markers = []
+        script = []
+        for command in commands:
+            self.sequence += 1
+            marker = f"__ITSM_{self.token}_{self.sequence}__"
+            markers.append(marker)
+            script.append(self.dialect.wrap(command, marker))
+        self._write(''.join(script))
+
+        for command, marker in zip(commands, markers):
+            results.append(self._collect(command, marker.encode('ascii'), timeout, max_output))
+            self.commands += 1
+
+    def _collect(self, command: str, marker: bytes, timeout: float, max_output: int) -> subprocess.CompletedProcess:
+        captures = {STDOUT: _StreamCapture(b'\n' + marker, max_output), STDERR: _StreamCapture(b'\n' + marker, max_output)}
+        for stream_id, capture in captures.items():
+            leftover, self._leftover[stream_id] = self._leftover[stream_id], b''
+            if leftover:
+                self._leftover[stream_id] = capture.feed(leftover)
+
+        deadline = time.monotonic() + timeout
+        while not all(capture.done for capture in captures.values()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(command, timeout)
+            try:
+                # Wake up periodically: children of a dead shell can hold the pipes open long after it exits
+                stream_id, data = self._chunks.get(timeout=min(remaining, 0.5))
+            except queue.Empty:
+                if not self.alive():
+                    raise ShellSessionError(f"{self.dialect.name} session exited with {self.process.returncode}")
+                continue
+            if data is None:
+                raise ShellSessionError(f"{self.dialect.name} session exited with {self.process.wait()}")
+            capture = captures[stream_id]
+            if capture.done:
+                self._leftover[stream_id] += data
+            else:
+                self._leftover[stream_id] = capture.feed(data)
+
+        trailer = captures[STDOUT].trailer
+        returncode = int(trailer) if trailer.lstrip(b'-').isdigit() else -1
+        result = subprocess.CompletedProcess(command, returncode, captures[STDOUT].text(), captures[STDERR].text())
+        result.truncated = captures[STDOUT].truncated or captures[STDERR].truncated
+        return result
+
+    def kill(self):
+        """Kill the shell and everything it started.
+
+        Killing only the shell would orphan a running command's subshell,
+        which keeps the output pipes (and the pump threads) alive.
+        """
+        if platform.system() == 'Windows':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(self.process.pid)], capture_output=True,
+                           creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        else:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+        self.kill()
+
+
+class ShellBroker:
+    """Pool of long-lived shell sessions per dialect.
+
+    Sessions are reused across probes and recycled after max_commands
+    commands, after max_age seconds, or as soon as a command times out or
+    the shell dies. At most pool_size sessions per dialect run at once;
+    further callers wait for a free one.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_commands: int = DEFAULT_MAX_COMMANDS,
+                 max_age: float = DEFAULT_MAX_AGE, max_output: int = DEFAULT_MAX_OUTPUT):
+        self.pool_size = pool_size
+        self.max_commands = max_commands
+        self.max_age = max_age
+        self.max_output = max_output
+        self.logger = logging.getLogger('ShellBroker')
+        self._idle: Dict[str, List[ShellSession]] = {}
+        self._busy: Dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self.stats = {'sessions_started': 0, 'sessions_recycled': 0, 'commands': 0, 'timeouts': 0}
+
+    def available(self, shell: str) -> bool:
+        """Check if the shell can be started on this system"""
+        return self.pool_size > 0 and DIALECTS[shell].argv() is not None
+
+    def run(self, command: str, shell: str = 'bash', timeout: float = 30,
+            max_output: Optional[int] = None) -> subprocess.CompletedProcess:
+        """Run one command, raising subprocess.TimeoutExpired like subprocess.run.
+
+        Raises ShellSessionError if the session died under the command, so
+        callers can fall back to running it as its own process.
+        """
+        result = self.run_batch([command], shell=shell, timeout=timeout, max_output=max_output)[0]
+        if getattr(result, 'timed_out', False):
+            raise subprocess.TimeoutExpired(command, timeout)
+        if getattr(result, 'session_failed', False):
+            raise ShellSessionError(result.stderr)
+        return result
+
+    def run_batch(self, commands: List[str], shell: str = 'bash', timeout: float = 30,
+                  max_output: Optional[int] = None) -> List[subprocess.CompletedProcess]:
+        """Run several commands in one round trip on the same session.
+
+        A command that times out or loses its session, and every command
+        after it, gets returncode -1 with the reason in stderr (and
+        timed_out or session_failed set on the one that failed).
+        """
+        dialect = DIALECTS[shell]
+        max_output = max_output or self.max_output
+        session = self._acquire(dialect)
+        healthy = False
+        results: List[subprocess.CompletedProcess] = []
+        try:
+            session.run_batch(commands, timeout, max_output, results)
+            healthy = True
+        except subprocess.TimeoutExpired:
+            with self._condition:
+                self.stats['timeouts'] += 1
+            self._fail_remaining(results, commands, f"timed out after {timeout}s", timed_out=True)
+        except ShellSessionError as e:
+            self._fail_remaining(results, commands, str(e), session_failed=True)
+        finally:
+            self._release(session, healthy)
+        with self._condition:
+            self.stats['commands'] += len(commands)
+        return results
+
+    @staticmethod
+    def _fail_remaining(results: List[subprocess.CompletedProcess], commands: List[str], reason: str,
+                        timed_out: bool = False, session_failed: bool = False):
+        """Fill in results for the command that failed and the ones that never ran"""
+        for index, command in enumerate(commands[len(results):]):
+            result = subprocess.CompletedProcess(command, -1, '', reason if index == 0 else 'not run')
+            result.timed_out = timed_out and index == 0
+            result.session_failed = session_failed and index == 0
+            results.append(result)
+
+    def _acquire(self, dialect) -> ShellSession:
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ShellSessionError("shell broker is closed")
+                idle = self._idle.setdefault(dialect.name, [])
+                while idle:
+                    session = idle.pop()
+                    if session.alive():
+                        self._busy[dialect.name] = self._busy.get(dialect.name, 0) + 1
+                        return session
+                    self._retire(session)
+                if self._busy.get(dialect.name, 0) < self.pool_size:
+                    self._busy[dialect.name] = self._busy.get(dialect.name, 0) + 1
+                    break
+                self._condition.wait()
+
+        try:
+            session = ShellSession(dialect)
+        except Exception:
+            with self._condition:
+                self._busy[dialect.name] -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.stats['sessions_started'] += 1
+        self.logger.debug(f"Started {dialect.name} session (pid {session.process.pid})")
+        return session
+
+    def _release(self, session: ShellSession, healthy: bool):
+        recycle = (not healthy or not session.alive() or self._closed or
+                   session.commands >= self.max_commands or session.age >= self.max_age)
+        with self._condition:
+            self._busy[session.dialect.name] -= 1
+            if recycle:
+                self._retire(session)
+            else:
+                self._idle.setdefault(session.dialect.name, []).append(session)
+            self._condition.notify()
+
+    def _retire(self, session: ShellSession):
+        self.stats['sessions_recycled'] += 1
+        session.kill()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get session and command counters"""
+        with self._condition:
+            stats = dict(self.stats)
+            stats['idle_sessions'] = {name: len(sessions) for name, sessions in self._idle.items()}
+        return stats
+
+    def close(self):
+        """Stop all idle sessions; busy ones are stopped when released"""
+        with self._condition:
+            self._closed = True
+            for sessions in self._idle.values():
+                for session in sessions:
+                    session.close()
+            self._idle = {}
+            self._condition.notify_all()
+
+
+_lock = threading.Lock()
+_broker: Optional[ShellBroker] = None
+
+
+def get_shell_broker() -> ShellBroker:
+    """Get the shared shell broker"""
+    global _broker
+    with _lock:
+        if _broker is None:
+            _broker = ShellBroker()
+        return _broker
+
+
+def run_command(args: Union[str, List[str]], timeout: float = 30) -> subprocess.CompletedProcess:
+    """Run a probe command through the shared bash session, or as its own process when bash is unavailable"""
+    broker = get_shell_broker()
+    if platform.system() != 'Windows' and broker.available('bash'):
+        try:
+            return broker.run(args if isinstance(args, str) else shlex.join(args), shell='bash', timeout=timeout)
+        except ShellSessionError:
+            pass
+    return subprocess.run(args, capture_output=True, text=True, timeout=timeout, shell=isinstance(args, str))
+
+
+def run_powershell(script: str, timeout: float = 30) -> subprocess.CompletedProcess:
+    """Run a PowerShell script through the shared PowerShell session, or as its own process"""
+    broker = get_shell_broker()
+    if broker.available('powershell'):
+        try:
+            return broker.run(script, shell='powershell', timeout=timeout)
+        except ShellSessionError:
+            pass
+    return subprocess.run(['powershell', '-Command', script], capture_output=True, text=True, timeout=timeout)
@@ -10,12 +10,16 @@ import getpass
 import psutil
 from typing import Dict, Any
 from datetime import datetime
-from .base_module import BaseModule
+from .base_module import BaseModule, cached_result
+from .cpu_sampler import get_cpu_sampler
+from .linux_sources import get_linux_sources
 
 
 class SystemModule(BaseModule):
     """System information collection module"""
     
+    collection_interval = 600  # seconds
+    
     def __init__(self):
         super().__init__('System')
     
@@ -42,6 +46,7 @@ class SystemModule(BaseModule):
             self.logger.error(f"Error getting hostname: {e}")
             return "unknown"
     
+    @cached_result(ttl=86400)
     def _get_os_info(self) -> Dict[str, Any]:
         """Get operating system information"""
         try:
@@ -66,19 +71,10 @@ class SystemModule(BaseModule):
             # First try to get the actual logged-in user (not service accounts)
             if platform.system().lower() == 'linux':
                 try:
-                    import subprocess
-                    # Try to get the user who is actually logged in to the desktop session
-                    result = subprocess.run(['who'], capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0 and result.stdout.strip():
-                        lines = result.stdout.strip().split('\n')
-                        # Look for users on console or pts (actual login sessions)
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) >= 2 and ('console' in line or 'pts' in line or 'tty' in line):
-                                username = parts[0]
-                                # Skip system accounts
-                                if username not in ['root', 'mysql', 'postgres', 'redis', 'nginx', 'apache', 'www-data']:
-                                    return username
+                    # The user logged in on a console or pts, skipping system accounts
+                    username = get_linux_sources().interactive_user()
+                    if username:
+                        return username
                 except Exception as e:
                     self.logger.debug(f"Failed to get logged-in user: {e}")
             
@@ -119,6 +115,7 @@ class SystemModule(BaseModule):
             self.logger.error(f"Error getting boot time: {e}")
             return datetime.utcnow().isoformat()
     
+    @cached_result(ttl=86400)
     def _get_virtualization_info(self) -> Dict[str, Any]:
         """Detect if running in a virtual machine"""
         try:
@@ -290,7 +287,7 @@ class SystemModule(BaseModule):
                 pass
             
             try:
-                cpu_percent = psutil.cpu_percent(interval=1)
+                cpu_percent = get_cpu_sampler().current_percent()
                 if cpu_percent > 90:
                     health['alerts'].append('Critical CPU usage')
                     health['status'] = 'critical'
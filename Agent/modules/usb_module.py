@@ -4,17 +4,21 @@ Collects USB device information from the system
 """
 
 import platform
+import shutil
 import subprocess
 import json
 import re
 import os
 from typing import Dict, Any, List
 from .base_module import BaseModule
+from .shell_broker import run_powershell
 
 
 class USBModule(BaseModule):
     """USB device detection module"""
 
+    collection_interval = 300  # seconds
+
     def __init__(self):
         super().__init__('USB')
         self.is_windows = platform.system().lower() == 'windows'
@@ -163,9 +167,7 @@ class USBModule(BaseModule):
             $USBDevices | ConvertTo-Json -Depth 3
             """
 
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=45)
+            result = run_powershell(ps_command, timeout=45)
 
             if result.returncode == 0 and result.stdout.strip():
                 try:
@@ -221,9 +223,7 @@ class USBModule(BaseModule):
             ConvertTo-Json
             """
 
-            result = subprocess.run([
-                "powershell", "-Command", ps_command
-            ], capture_output=True, text=True, timeout=10)
+            result = run_powershell(ps_command, timeout=10)
 
             if result.returncode == 0 and result.stdout.strip():
                 try:
@@ -454,12 +454,7 @@ class USBModule(BaseModule):
 
     def _command_exists(self, command: str) -> bool:
         """Check if a command exists in the system"""
-        try:
-            result = subprocess.run(['which', command], 
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except Exception:
-            return False
+        return shutil.which(command) is not None
 
     def _get_linux_device_connection_time(self, bus: str, device_num: str) -> str:
         """Get device connection time on Linux systems"""
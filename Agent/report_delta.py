@@ -0,0 +1,138 @@
+"""
+Report Delta Encoding for ITSM Agent
+Computes JSON-patch style differences between report snapshots
+"""
+
+import copy
+import json
+
+
+def normalize_snapshot(document):
+    """Return a JSON-equivalent deep copy of a report document"""
+    return json.loads(json.dumps(document, default=str))
+
+
+def compute_delta(old, new, path=''):
+    """Compute a list of JSON patch operations that turn old into new.
+
+    Dicts are diffed key by key. Lists are diffed after trimming their common
+    prefix and suffix, so a single inserted or removed entry in a long
+    inventory produces a single operation instead of a full replacement.
+    """
+    if type(old) is not type(new):
+        return [{'op': 'replace', 'path': path, 'value': new}]
+
+    if isinstance(old, dict):
+        return _diff_dicts(old, new, path)
+
+    if isinstance(old, list):
+        return _diff_lists(old, new, path)
+
+    if old != new:
+        return [{'op': 'replace', 'path': path, 'value': new}]
+
+    return []
+
+
+def apply_delta(document, operations):
+    """Apply JSON patch operations produced by compute_delta to a copy of document"""
+    result = copy.deepcopy(document)
+
+    for operation in operations:
+        op = operation['op']
+        tokens = _parse_pointer(operation['path'])
+
+        if not tokens:
+            if op == 'remove':
+                result = None
+            else:
+                result = copy.deepcopy(operation['value'])
+            continue
+
+        parent = result
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+
+        if isinstance(parent, list):
+            index = len(parent) if last == '-' else int(last)
+            if op == 'add':
+                parent.insert(index, copy.deepcopy(operation['value']))
+            elif op == 'remove':
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(operation['value'])
+        else:
+            if op == 'remove':
+                del parent[last]
+            else:
+                parent[last] = copy.deepcopy(operation['value'])
+
+    return result
+
+
+def _diff_dicts(old, new, path):
+    """Diff two dicts key by key"""
+    operations = []
+
+    for key in old:
+        if key not in new:
+            operations.append({'op': 'remove', 'path': _join_pointer(path, key)})
+
+    for key, value in new.items():
+        child_path = _join_pointer(path, key)
+        if key not in old:
+            operations.append({'op': 'add', 'path': child_path, 'value': value})
+        else:
+            operations.extend(compute_delta(old[key], value, child_path))
+
+    return operations
+
+
+def _diff_lists(old, new, path):
+    """Diff two lists by trimming the common prefix and suffix"""
+    prefix = 0
+    max_prefix = min(len(old), len(new))
+    while prefix < max_prefix and old[prefix] == new[prefix]:
+        prefix += 1
+
+    suffix = 0
+    max_suffix = min(len(old), len(new)) - prefix
+    while suffix < max_suffix and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]:
+        suffix += 1
+
+    old_middle = old[prefix:len(old) - suffix]
+    new_middle = new[prefix:len(new) - suffix]
+    operations = []
+
+    # Diff the overlapping positions in place
+    for offset in range(min(len(old_middle), len(new_middle))):
+        index_path = _join_pointer(path, prefix + offset)
+        operations.extend(compute_delta(old_middle[offset], new_middle[offset], index_path))
+
+    # Remove surplus old entries from the back so indexes stay valid
+    for offset in range(len(old_middle) - 1, len(new_middle) - 1, -1):
+        operations.append({'op': 'remove', 'path': _join_pointer(path, prefix + offset)})
+
+    # Insert surplus new entries in order
+    for offset in range(len(old_middle), len(new_middle)):
+        operations.append({
+            'op': 'add',
+            'path': _join_pointer(path, prefix + offset),
+            'value': new_middle[offset]
+        })
+
+    return operations
+
+
+def _join_pointer(path, token):
+    """Append a token to a JSON pointer, escaping '~' and '/'"""
+    token = str(token).replace('~', '~0').replace('/', '~1')
+    return f'{path}/{token}'
+
+
+def _parse_pointer(path):
+    """Split a JSON pointer into unescaped tokens"""
+    if not path:
+        return []
+    return [token.replace('~1', '/').replace('~0', '~') for token in path.split('/')[1:]]
@@ -0,0 +1,117 @@
+"""
+Report Encoding for ITSM Agent
+Serializes and compresses report payloads for transport
+"""
+
+import gzip
+import json
+import time
+
+# Optional encoders, used only when installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'msgpack': 'application/msgpack',
+    'cbor': 'application/cbor'
+}
+
+
+def available_formats():
+    """Get the body formats that can be produced on this host"""
+    formats = ['json']
+    if msgpack is not None:
+        formats.append('msgpack')
+    if cbor2 is not None:
+        formats.append('cbor')
+    return formats
+
+
+def available_compressions():
+    """Get the content codings that can be produced on this host"""
+    compressions = ['identity', 'gzip']
+    if zstandard is not None:
+        compressions.append('zstd')
+    return compressions
+
+
+def encode_payload(payload, body_format='json', compression='identity', min_compress_size=1024):
+    """Encode a payload, returning (body, headers, metrics).
+
+    Unavailable formats or codings fall back to JSON and identity. Bodies
+    smaller than min_compress_size are sent uncompressed.
+    """
+    encode_start = time.perf_counter()
+
+    if body_format not in available_formats():
+        body_format = 'json'
+    if compression not in available_compressions():
+        compression = 'identity'
+
+    raw_json = json.dumps(payload, default=str, separators=(',', ':')).encode('utf-8')
+
+    if body_format == 'msgpack':
+        body = msgpack.packb(json.loads(raw_json), use_bin_type=True)
+    elif body_format == 'cbor':
+        body = cbor2.dumps(json.loads(raw_json))
+    else:
+        body = raw_json
+    serialized_size = len(body)
+
+    if len(body) < min_compress_size:
+        compression = 'identity'
+    if compression == 'gzip':
+        body = gzip.compress(body, compresslevel=6)
+    elif compression == 'zstd':
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+
+    headers = {'Content-Type': CONTENT_TYPES[body_format]}
+    if compression != 'identity':
+        headers['Content-Encoding'] = compression
+
+    metrics = {
+        'format': body_format,
+        'compression': compression,
+        'raw_bytes': len(raw_json),
+        'serialized_bytes': serialized_size,
+        'encoded_bytes': len(body),
+        'ratio': round(len(body) / len(raw_json), 4) if raw_json else 1.0,
+        'encode_ms': round((time.perf_counter() - encode_start) * 1000, 3)
+    }
+
+    return body, headers, metrics
+
+
+def parse_accept_encoding(header_value):
+    """Parse an Accept-Encoding style header into a list of accepted codings"""
+    accepted = []
+    for item in (header_value or '').split(','):
+        parts = item.strip().split(';')
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.append(coding)
+    return accepted
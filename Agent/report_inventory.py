@@ -0,0 +1,188 @@
+"""
+Report Inventory Diffing for ITSM Agent
+Fingerprints software inventories and replaces unchanged or slightly changed ones with change sets
+"""
+
+import json
+import hashlib
+
+
+# Inventory lists inside a report, as JSON pointers
+INVENTORY_PATHS = ['/software', '/modules/application_discovery/discovered_applications']
+
+# Fields that identify a package; anything else changing is a version change
+KEY_FIELDS = ('package_manager', 'name', 'architecture')
+
+
+def _canonical(entry):
+    return json.dumps(entry, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def _digest(parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()[:32]
+
+
+def package_key(entry):
+    """Identity of an inventory entry"""
+    return tuple(str(entry.get(field) or '') for field in KEY_FIELDS)
+
+
+def sort_inventory(entries):
+    """Sort entries by identity, numbering duplicates so every key is unique.
+
+    Returns a list of (key, canonical JSON, entry) tuples.
+    """
+    ordered = sorted(((package_key(entry), _canonical(entry), entry) for entry in entries),
+                     key=lambda item: (item[0], item[1]))
+    result = []
+    previous, ordinal = None, 0
+    for key, canonical, entry in ordered:
+        ordinal = ordinal + 1 if key == previous else 0
+        previous = key
+        result.append((key + (ordinal,), canonical, entry))
+    return result
+
+
+def fingerprint_inventory(sorted_entries):
+    """Fingerprint a sorted inventory as a whole and per package set.
+
+    Returns (fingerprint, {set name: fingerprint}); a set is every entry
+    with the same package_manager (or vendor when there is none).
+    """
+    sets = {}
+    for key, canonical, entry in sorted_entries:
+        set_name = entry.get('package_manager') or entry.get('vendor') or 'default'
+        sets.setdefault(str(set_name), []).append(canonical)
+    set_fingerprints = {name: _digest(lines) for name, lines in sorted(sets.items())}
+    return _digest(f"{name}={value}" for name, value in set_fingerprints.items()), set_fingerprints
+
+
+def diff_inventory(old_sorted, new_sorted):
+    """Sorted-merge diff of two sorted inventories.
+
+    Returns {'added': [entry], 'removed': [identity], 'changed': [...]}
+    where changed entries carry the old and new version and the new entry.
+    """
+    added, removed, changed = [], [], []
+    old_index = new_index = 0
+    while old_index < len(old_sorted) or new_index < len(new_sorted):
+        if new_index >= len(new_sorted) or (old_index < len(old_sorted) and old_sorted[old_index][0] < new_sorted[new_index][0]):
+            removed.append(_identity(old_sorted[old_index][2]))
+            old_index += 1
+        elif old_index >= len(old_sorted) or new_sorted[new_index][0] < old_sorted[old_index][0]:
+            added.append(new_sorted[new_index][2])
+            new_index += 1
+        else:
+            old_key, old_canonical, old_entry = old_sorted[old_index]
+            new_key, new_canonical, new_entry = new_sorted[new_index]
+            if old_canonical != new_canonical:
+                change = _identity(new_entry)
+                change.update({
+                    'old_version': old_entry.get('version'),
+                    'new_version': new_entry.get('version'),
+                    'entry': new_entry
+                })
+                changed.append(change)
+            old_index += 1
+            new_index += 1
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def _identity(entry):
+    return {field: entry[field] for field in KEY_FIELDS if entry.get(field) is not None}
+
+
+def _get_pointer(document, path):
+    value = document
+    for token in path.split('/')[1:]:
+        if not isinstance(value, dict) or token not in value:
+            return None
+        value = value[token]
+    return value
+
+
+class InventoryTracker:
+    """Replaces report inventories with fingerprints or change sets.
+
+    The last acknowledged inventory per path is the diff base. compact()
+    prepares a report against it and keeps the new inventories pending;
+    acknowledge() promotes them once the server has accepted the report,
+    and reset() drops the base so the next report carries full lists.
+    """
+
+    def __init__(self, paths=None):
+        self.paths = list(paths) if paths is not None else list(INVENTORY_PATHS)
+        self.acked = {}
+        self.pending = {}
+
+    def compact(self, snapshot):
+        """Return a copy of snapshot with inventories compacted against the acknowledged base.
+
+        An 'inventory' section is added with each path's fingerprint, its
+        per-set fingerprints, entry count and how it was sent ('full',
+        'unchanged' or 'changes'), plus a fingerprint over all of them.
+        """
+        report = dict(snapshot)
+        sections = {}
+        self.pending = {}
+
+        for path in self.paths:
+            entries = _get_pointer(snapshot, path)
+            if not isinstance(entries, list):
+                continue
+
+            sorted_entries = sort_inventory(entries)
+            fingerprint, set_fingerprints = fingerprint_inventory(sorted_entries)
+            self.pending[path] = (fingerprint, sorted_entries)
+            section = {'fingerprint': fingerprint, 'sets': set_fingerprints, 'count': len(entries)}
+
+            base = self.acked.get(path)
+            if base is None:
+                section['sent'] = 'full'
+            elif base[0] == fingerprint:
+                section['sent'] = 'unchanged'
+                report = _replace_pointer(report, path, {'fingerprint': fingerprint, 'unchanged': True})
+            else:
+                changes = diff_inventory(base[1], sorted_entries)
+                changes.update({'fingerprint': fingerprint, 'base_fingerprint': base[0]})
+                section['sent'] = 'changes'
+                report = _replace_pointer(report, path, changes)
+            sections[path] = section
+
+        if sections:
+            report['inventory'] = {
+                'fingerprint': _digest(f"{path}={section['fingerprint']}" for path, section in sorted(sections.items())),
+                'sections': sections
+            }
+        return report
+
+    def is_compacted(self, report):
+        """Check whether a compacted report relies on the acknowledged base"""
+        sections = report.get('inventory', {}).get('sections', {})
+        return any(section['sent'] != 'full' for section in sections.values())
+
+    def acknowledge(self):
+        """Make the inventories of the last compacted report the new base"""
+        self.acked.update(self.pending)
+        self.pending = {}
+
+    def reset(self):
+        """Forget the base so the next report sends full inventories"""
+        self.acked = {}
+        self.pending = {}
+
+
+def _replace_pointer(document, path, value):
+    """Copy the dicts along path and set the value at its end"""
+    tokens = path.split('/')[1:]
+    root = dict(document)
+    parent = root
+    for token in tokens[:-1]:
+        parent[token] = dict(parent[token])
+        parent = parent[token]
+    parent[tokens[-1]] = value
+    return root
@@ -0,0 +1,195 @@
+"""
+Report Outbox for ITSM Agent
+Durable on-disk queue of report payloads with a background sender
+"""
+
+import json
+import time
+import random
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+
+class ReportOutbox:
+    """Append-only, size-capped SQLite queue of pending report payloads"""
+
+    def __init__(self, path='outbox/reports.db', max_bytes=50 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger('ReportOutbox')
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS outbox ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'created_at REAL NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, '
+            'size INTEGER NOT NULL, '
+            'payload TEXT NOT NULL)'
+        )
+
+    def enqueue(self, payload):
+        """Append a payload, dropping the oldest entries if the queue is over its cap"""
+        data = json.dumps(payload, default=str)
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO outbox (created_at, size, payload) VALUES (?, ?, ?)',
+                (time.time(), len(data), data)
+            )
+            self._enforce_cap()
+            return cursor.lastrowid
+
+    def peek_batch(self, limit=10):
+        """Get up to limit of the oldest entries as (id, payload, attempts) tuples"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, payload, attempts FROM outbox ORDER BY id LIMIT ?', (limit,)
+            ).fetchall()
+        return [(row_id, json.loads(payload), attempts) for row_id, payload, attempts in rows]
+
+    def remove(self, entry_id):
+        """Remove an entry once it has been delivered or given up on"""
+        with self._lock:
+            self._conn.execute('DELETE FROM outbox WHERE id = ?', (entry_id,))
+
+    def mark_attempt(self, entry_id):
+        """Record a failed delivery attempt for an entry"""
+        with self._lock:
+            self._conn.execute('UPDATE outbox SET attempts = attempts + 1 WHERE id = ?', (entry_id,))
+
+    def get_stats(self):
+        """Get queue depth, payload bytes and age of the oldest entry"""
+        with self._lock:
+            count, total_bytes, oldest = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created_at) FROM outbox'
+            ).fetchone()
+        return {
+            'pending': count,
+            'bytes': total_bytes,
+            'oldest_age_seconds': round(time.time() - oldest, 1) if oldest else 0
+        }
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _enforce_cap(self):
+        """Delete the oldest entries until the payload total is within max_bytes"""
+        total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM outbox').fetchone()[0]
+        if total_bytes <= self.max_bytes:
+            return
+
+        dropped = 0
+        rows = self._conn.execute('SELECT id, size FROM outbox ORDER BY id').fetchall()
+        # Always keep the newest entry, even if it alone exceeds the cap
+        for row_id, size in rows[:-1]:
+            if total_bytes <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM outbox WHERE id = ?', (row_id,))
+            total_bytes -= size
+            dropped += 1
+
+        if dropped:
+            self.logger.warning(f"Outbox over {self.max_bytes} bytes, dropped {dropped} oldest reports")
+
+
+class OutboxSender(threading.Thread):
+    """Background thread that drains the outbox in batches with jittered backoff"""
+
+    # HTTP statuses that mean the payload itself will never be accepted
+    PERMANENT_FAILURES = (400, 413, 422)
+
+    def __init__(self, outbox, api_client, batch_size=10, base_delay=5, max_delay=600, max_attempts=50):
+        super().__init__(name='outbox-sender', daemon=True)
+        self.outbox = outbox
+        self.api_client = api_client
+        self.batch_size = batch_size
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger('OutboxSender')
+        self.consecutive_failures = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+
+    def notify(self):
+        """Wake the sender when a new report has been queued"""
+        self._wakeup.set()
+
+    def stop(self):
+        """Stop the sender; queued reports stay on disk"""
+        self._stop_event.set()
+        self._wakeup.set()
+
+    def run(self):
+        """Drain the outbox until stopped"""
+        while not self._stop_event.is_set():
+            try:
+                drained = self.drain_once()
+            except Exception as e:
+                self.logger.error(f"Error draining outbox: {e}", exc_info=True)
+                drained = False
+
+            if drained is None:
+                # Queue is empty, sleep until something is queued
+                self._wakeup.wait()
+            elif not drained:
+                self._wakeup.wait(timeout=self._next_delay())
+            self._wakeup.clear()
+
+    def drain_once(self):
+        """Send one batch of queued reports.
+
+        Returns None when the outbox is empty, True when the whole batch was
+        delivered and False when a delivery failed and the sender should back off.
+        """
+        batch = self.outbox.peek_batch(self.batch_size)
+        if not batch:
+            return None
+
+        for entry_id, payload, attempts in batch:
+            if self._stop_event.is_set():
+                return True
+
+            if self.api_client.report_system_info(payload):
+                self.outbox.remove(entry_id)
+                self.delivered += 1
+                self.consecutive_failures = 0
+                continue
+
+            status_code = getattr(self.api_client, 'last_status_code', None)
+            if status_code in self.PERMANENT_FAILURES or attempts + 1 >= self.max_attempts:
+                self.logger.error(f"Dropping queued report {entry_id} after {attempts + 1} attempts (status {status_code})")
+                self.outbox.remove(entry_id)
+                self.dropped += 1
+                continue
+
+            self.outbox.mark_attempt(entry_id)
+            self.consecutive_failures += 1
+            return False
+
+        return True
+
+    def get_stats(self):
+        """Get sender and queue statistics"""
+        stats = self.outbox.get_stats()
+        stats.update({
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'consecutive_failures': self.consecutive_failures
+        })
+        return stats
+
+    def _next_delay(self):
+        """Full-jitter exponential backoff based on consecutive failures"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** min(self.consecutive_failures, 16)))
+        return random.uniform(self.base_delay / 2, max(ceiling, self.base_delay))
@@ -6,6 +6,7 @@ Gathers comprehensive system information across platforms
 import os
 import sys
 import json
+import time
 import socket
 import platform
 import subprocess
@@ -13,7 +14,6 @@ import psutil
 import logging
 from datetime import datetime
 from pathlib import Path
-import requests
 import getpass
 import csv
 import io
@@ -31,6 +31,15 @@ except ImportError as e:
     ModuleManager = None
     MODULAR_AVAILABLE = False
 
+from modules.ping_sweep import PingSweeper, parse_targets, read_arp_cache, resolve_hostnames, guess_os_from_ttl
+from modules.process_snapshot import get_process_snapshot
+from modules.cpu_sampler import get_cpu_sampler
+from modules.public_ip_resolver import get_public_ip_resolver
+from modules.linux_sources import get_linux_sources
+from modules.disk_io import get_disk_io_snapshot
+from modules.net_io import get_net_io_snapshot
+from modules.process_cache import get_process_cache, IGNORED_CONNECTION_PROCESSES
+
 # Import OS-specific collectors for backward compatibility
 try:
     from windows_collector import WindowsCollector
@@ -62,6 +71,36 @@ except ImportError as e:
     SystemModule, CPUModule, MemoryModule, DiskModule, NetworkModule, ServicesModule, SecurityModule, USBModule = [None] * 8
 
 
+# Seconds between refreshes of each report section; 0 refreshes it for every report.
+# Slow-changing, expensive sections (installed software, updates, security) are reused in between.
+REPORT_SECTION_INTERVALS = {
+    'os_info': 3600,
+    'network': 300,
+    'hardware': 0,
+    'storage': 300,
+    'software': 21600,
+    'processes': 0,
+    'usb_devices': 300,
+    'virtualization': 86400,
+    'system_health': 0,
+    'security': 3600,
+    'assigned_user': 300,
+    'active_ports': 300,
+    'windows_updates': 21600
+}
+
+# Change-event module names -> report sections they invalidate
+MODULE_REPORT_SECTIONS = {
+    'usb': ['usb_devices', 'storage'],
+    'disk': ['storage'],
+    'network': ['network'],
+    'services': ['processes', 'active_ports']
+}
+
+# Model, serial and BIOS details from the OS collector are re-read this often
+OS_HARDWARE_INTERVAL = 86400
+
+
 class SystemCollector:
     """Main system information collector that delegates to OS-specific collectors"""
 
@@ -71,6 +110,16 @@ class SystemCollector:
         self.is_linux = platform.system().lower() == 'linux'
         self.is_macos = platform.system().lower() == 'darwin'
 
+        # Start background CPU sampling so collection never sleeps for a measurement
+        self.cpu_sampler = get_cpu_sampler()
+
+        # Report sections from the last collection and when each was collected
+        self.section_intervals = dict(REPORT_SECTION_INTERVALS)
+        self._sections = {}
+        self._section_collected = {}
+        self._os_hardware = None
+        self._os_hardware_collected = 0.0
+
         # Initialize OS-specific collector
         if self.is_windows:
             self.os_collector = WindowsCollector()
@@ -154,28 +203,114 @@ class SystemCollector:
 
     def collect_all(self):
         """Collect all available system information"""
+        return self._build_report(list(self.section_intervals))
+
+    def collect_report(self):
+        """Collect the report sections that are due and reuse the others from earlier reports"""
+        now = time.time()
+        due = [name for name in self.section_intervals if self._get_section_next_due(name) <= now]
+        info = self._build_report(due)
+        info['_collection_status'] = {
+            'fresh_sections': due,
+            'cached_sections': [name for name in self.section_intervals if name not in due]
+        }
+        return info
+
+    def _build_report(self, sections):
+        """Refresh the given sections and assemble a report from all of them"""
+        collectors = {
+            'os_info': self._get_os_info,
+            'network': self._get_network_info,
+            'hardware': self._get_hardware_info,
+            'storage': self._get_storage_info,
+            'software': self._get_software_info,
+            'processes': self._get_running_processes,
+            'usb_devices': self._get_usb_devices,
+            'virtualization': self._get_virtualization_info,
+            'system_health': self._get_system_health,
+            'security': self._get_security_info,
+            'assigned_user': self._get_current_user,
+            'active_ports': self._get_filtered_tcp_ports,
+            'windows_updates': lambda: self._get_windows_updates() if self.is_windows else None
+        }
+        for name in sections:
+            self._sections[name] = collectors[name]()
+            self._section_collected[name] = time.time()
+
         info = {
             'timestamp': datetime.utcnow().isoformat() + 'Z',
-            'hostname': socket.gethostname(),
-            'os_info': self._get_os_info(),
-            'network': self._get_network_info(),
-            'hardware': self._get_hardware_info(),
-            'storage': self._get_storage_info(),
-            'software': self._get_software_info(),
-            'processes': self._get_running_processes(),
-            'usb_devices': self._get_usb_devices(),
-            'virtualization': self._get_virtualization_info(),
-            'system_health': self._get_system_health(),
-            'security': self._get_security_info(),
-            'assigned_user': self._get_current_user(),
-            "active_ports": self._get_filtered_tcp_ports(),
-            'windows_updates': self._get_windows_updates() if self.is_windows else None,
+            'hostname': socket.gethostname()
         }
+        info.update({name: self._sections.get(name) for name in collectors})
 
         # Network topology scan is now on-demand only via networkScan command
         # This prevents resource-intensive scanning during regular data collection
         return info
 
+    def _get_section_next_due(self, name):
+        """Get the timestamp when a report section is next refreshed"""
+        collected = self._section_collected.get(name)
+        if collected is None:
+            return 0.0
+        return collected + self.section_intervals[name]
+
+    def set_section_interval(self, name, interval):
+        """Override how often a report section is refreshed"""
+        self.section_intervals[name] = interval
+
+    def set_report_modules(self, module_names):
+        """Run only the given collection modules on their schedules (none by default)"""
+        if not self.use_modular:
+            return []
+        enabled = []
+        for name, module in self.module_manager.modules.items():
+            module.enabled = name in module_names
+            if module.enabled:
+                enabled.append(name)
+        return enabled
+
+    def collect_due_modules(self):
+        """Run the modules whose schedule is due and return fresh plus cached sections"""
+        if not self.use_modular:
+            return None
+        try:
+            return self.module_manager.collect_due_data()
+        except Exception as e:
+            self.logger.error(f"Error collecting scheduled module data: {e}")
+            return None
+
+    def mark_modules_dirty(self, module_names):
+        """Force the given modules and their report sections to be collected on the next tick"""
+        module_names = list(module_names)
+        for module_name in module_names:
+            for section in MODULE_REPORT_SECTIONS.get(module_name, []):
+                self._section_collected.pop(section, None)
+        if not self.use_modular:
+            return []
+        return self.module_manager.mark_dirty(module_names)
+
+    def set_module_interval(self, module_name, interval):
+        """Override the collection interval of a module"""
+        if self.use_modular:
+            self.module_manager.module_intervals[module_name] = interval
+
+    def set_metrics_history_path(self, path):
+        """Persist predictive analytics metric history under path"""
+        if self.use_modular and 'predictive_analytics' in self.module_manager.modules:
+            self.module_manager.modules['predictive_analytics'].enable_history_persistence(path)
+
+    def get_seconds_until_next_module_due(self):
+        """Get seconds until the next scheduled module collection"""
+        if not self.use_modular:
+            return None
+        return self.module_manager.get_seconds_until_next_due()
+
+    def get_module_status(self):
+        """Get status information for each collection module"""
+        if not self.use_modular:
+            return {}
+        return {name: module.get_status() for name, module in self.module_manager.modules.items()}
+
     def _get_hostname(self, ip=None):
         """Get system hostname or hostname for given IP"""
         try:
@@ -237,18 +372,15 @@ class SystemCollector:
             # Get network interfaces with enhanced data
             try:
                 net_if_addrs = psutil.net_if_addrs()
-                net_if_stats = psutil.net_if_stats()
-                net_io_counters = psutil.net_io_counters(pernic=True)
+                net_io = get_net_io_snapshot()
             except Exception as e:
                 self.logger.error(f"Failed to get network interface data: {e}")
                 net_if_addrs = {}
-                net_if_stats = {}
-                net_io_counters = {}
+                net_io = None
 
             for interface_name, interface_addresses in net_if_addrs.items():
                 try:
-                    interface_stats = net_if_stats.get(interface_name)
-                    interface_io = net_io_counters.get(interface_name)
+                    interface_io = net_io.interface(interface_name) if net_io else {}
 
                     interface_data = {
                         'name': interface_name,
@@ -266,17 +398,17 @@ class SystemCollector:
                     }
 
                     # Set interface stats safely
-                    if interface_stats:
-                        interface_data['status'] = 'Up' if interface_stats.isup else 'Down'
-                        interface_data['speed'] = getattr(interface_stats, 'speed', 0)
-                        interface_data['mtu'] = getattr(interface_stats, 'mtu', 0)
+                    if interface_io.get('isup') is not None:
+                        interface_data['status'] = 'Up' if interface_io['isup'] else 'Down'
+                        interface_data['speed'] = interface_io['speed']
+                        interface_data['mtu'] = interface_io['mtu']
 
-                    # Set interface I/O stats safely
+                    # Set interface I/O stats and rates safely
                     if interface_io:
-                        interface_data['bytes_sent'] = getattr(interface_io, 'bytes_sent', 0)
-                        interface_data['bytes_recv'] = getattr(interface_io, 'bytes_recv', 0)
-                        interface_data['packets_sent'] = getattr(interface_io, 'packets_sent', 0)
-                        interface_data['packets_recv'] = getattr(interface_io, 'packets_recv', 0)
+                        for field in ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv'):
+                            interface_data[field] = interface_io[field]
+                        if 'rates' in interface_io:
+                            interface_data['rates'] = interface_io['rates']
 
                     # Determine interface type based on name
                     name_lower = interface_name.lower()
@@ -344,7 +476,9 @@ class SystemCollector:
                             if len(parts) >= 3:
                                 network_info['gateway'] = parts[2]
                                 break
-                else:  # Linux/Mac
+                elif self.is_linux:
+                    network_info['gateway'] = get_linux_sources().default_gateway()
+                else:  # Mac
                     result = subprocess.run(['ip', 'route', 'show', 'default'],
                                           capture_output=True, text=True, timeout=10)
                     if result.returncode == 0:
@@ -358,89 +492,29 @@ class SystemCollector:
                 self.logger.debug(f"Could not determine default gateway: {e}")
                 pass
 
-            # Enhanced public IP and geolocation collection
+            # Public IP and geolocation from the shared, cached resolver
             try:
-                import requests
-
-                # Get public IP with multiple fallback services
-                public_ip = None
-                ip_services = [
-                    'https://api.ipify.org?format=json',
-                    'https://httpbin.org/ip',
-                    'https://api.myip.com',
-                    'https://ipapi.co/json/',
-                    'https://api.ip.sb/jsonip'
-                ]
-
-                for url in ip_services:
-                    try:
-                        response = requests.get(url, timeout=10)
-                        if response.status_code == 200:
-                            data = response.json()
-                            public_ip = data.get('ip') or data.get('origin') or data.get('query')
-                            if public_ip:
-                                network_info['public_ip'] = public_ip
-                                break
-                    except Exception as e:
-                        self.logger.debug(f"Failed to get IP from {url}: {e}")
-                        continue
+                resolved = get_public_ip_resolver().resolve()
+                public_ip = resolved['public_ip']
+                geo = resolved['geo']
 
-                # Get enhanced geolocation data
                 if public_ip:
-                    geo_services = [
-                        f'https://ipapi.co/{public_ip}/json/',
-                        f'https://api.ipgeolocation.io/ipgeo?apiKey=free&ip={public_ip}',
-                        f'http://ip-api.com/json/{public_ip}',
-                        f'https://ipinfo.io/{public_ip}/json'
-                    ]
-
-                    for geo_url in geo_services:
-                        try:
-                            geo_response = requests.get(geo_url, timeout=10)
-                            if geo_response.status_code == 200:
-                                geo_data = geo_response.json()
-
-                                # Extract location information
-                                location_parts = []
-                                city = geo_data.get('city') or geo_data.get('cityName')
-                                region = geo_data.get('region') or geo_data.get('region_name') or geo_data.get('stateProv')
-                                country = geo_data.get('country') or geo_data.get('country_name') or geo_data.get('countryName')
-
-                                if city:
-                                    location_parts.append(city)
-                                if region and region != city:
-                                    location_parts.append(region)
-                                if country:
-                                    location_parts.append(country)
-
-                                if location_parts:
-                                    network_info['location'] = ', '.join(location_parts)
-                                    network_info['geo_location'] = ', '.join(location_parts)
-
-                                # Additional geo data
-                                network_info['isp'] = geo_data.get('isp') or geo_data.get('org') or geo_data.get('as')
-                                network_info['timezone'] = geo_data.get('timezone') or geo_data.get('timeZone')
-                                network_info['coordinates'] = f"{geo_data.get('lat', geo_data.get('latitude', ''))},{geo_data.get('lon', geo_data.get('longitude', ''))}" if geo_data.get('lat') or geo_data.get('latitude') else None
-
-                                # Store detailed geo data for reporting
-                                network_info['geo_details'] = {
-                                    'city': city,
-                                    'region': region,
-                                    'country': country,
-                                    'country_code': geo_data.get('country_code') or geo_data.get('countryCode'),
-                                    'postal_code': geo_data.get('postal') or geo_data.get('zip'),
-                                    'latitude': geo_data.get('lat') or geo_data.get('latitude'),
-                                    'longitude': geo_data.get('lon') or geo_data.get('longitude'),
-                                    'isp': geo_data.get('isp') or geo_data.get('org'),
-                                    'timezone': geo_data.get('timezone') or geo_data.get('timeZone')
-                                }
-
-                                self.logger.info(f"Successfully collected geolocation: {network_info.get('location')}")
-                                break
-
-                        except Exception as e:
-                            self.logger.debug(f"Failed to get geolocation from {geo_url}: {e}")
-                            continue
+                    network_info['public_ip'] = public_ip
+
+                if geo:
+                    network_info['location'] = geo['location']
+                    network_info['geo_location'] = geo['location']
+                    network_info['isp'] = geo['isp']
+                    network_info['timezone'] = geo['timezone']
+                    network_info['coordinates'] = f"{geo['latitude']},{geo['longitude']}" if geo['latitude'] else None
+                    network_info['geo_details'] = {
+                        key: geo[key] for key in (
+                            'city', 'region', 'country', 'country_code', 'postal_code',
+                            'latitude', 'longitude', 'isp', 'timezone'
+                        )
+                    }
+                    if not resolved['cached']:
+                        self.logger.info(f"Successfully collected geolocation: {network_info.get('location')}")
 
                 # Fallback location if geo services fail
                 if not network_info.get('location') and public_ip:
@@ -467,7 +541,12 @@ class SystemCollector:
                             dns_ip = line.split(':')[-1].strip()
                             if dns_ip and dns_ip not in network_info['dns_servers']:
                                 network_info['dns_servers'].append(dns_ip)
-                else:  # Linux/Mac
+                elif self.is_linux:
+                    # resolv.conf plus systemd-resolved's upstream servers
+                    for dns_ip in get_linux_sources().dns_servers():
+                        if dns_ip not in network_info['dns_servers']:
+                            network_info['dns_servers'].append(dns_ip)
+                else:  # Mac
                     try:
                         with open('/etc/resolv.conf', 'r') as f:
                             for line in f:
@@ -479,19 +558,6 @@ class SystemCollector:
                         self.logger.debug(f"Error reading /etc/resolv.conf: {e}")
                         pass
 
-                    # Also try systemd-resolve
-                    try:
-                        import subprocess
-                        result = subprocess.run(['systemd-resolve', '--status'],
-                                              capture_output=True, text=True, timeout=10)
-                        for line in result.stdout.split('\n'):
-                            if 'DNS Servers:' in line:
-                                dns_ip = line.split(':')[-1].strip()
-                                if dns_ip and dns_ip not in network_info['dns_servers']:
-                                    network_info['dns_servers'].append(dns_ip)
-                    except Exception as e:
-                        self.logger.debug(f"Error checking systemd-resolve: {e}")
-                        pass
             except Exception as e:
                 self.logger.debug(f"DNS detection error: {e}")
 
@@ -516,21 +582,9 @@ class SystemCollector:
                                     break
                         else:
                             network_info['wifi_info'] = {'connected': False, 'status': 'disconnected'}
-                else:  # Linux
+                elif self.is_linux:
                     try:
-                        import subprocess
-                        result = subprocess.run(['iwconfig'], capture_output=True, text=True, timeout=10)
-                        if 'ESSID:' in result.stdout:
-                            network_info['wifi_info'] = {'connected': True, 'status': 'connected'}
-                            # Extract SSID
-                            for line in result.stdout.split('\n'):
-                                if 'ESSID:' in line:
-                                    ssid = line.split('ESSID:')[-1].split()[0].strip('"')
-                                    if ssid != 'off/any':
-                                        network_info['wifi_info']['ssid'] = ssid
-                                    break
-                        else:
-                            network_info['wifi_info'] = {'connected': False, 'status': 'disconnected'}
+                        network_info['wifi_info'] = get_linux_sources().wifi_info()
                     except Exception as e:
                         self.logger.debug(f"Error getting Wi-Fi info on Linux: {e}")
                         network_info['wifi_info'] = {'connected': False, 'status': 'unknown'}
@@ -540,29 +594,22 @@ class SystemCollector:
 
             # Get network statistics
             try:
-                net_io = psutil.net_io_counters()
+                net_io = get_net_io_snapshot().totals()
                 network_info['network_stats'] = {
-                    'bytes_sent': self._format_bytes(net_io.bytes_sent),
-                    'bytes_recv': self._format_bytes(net_io.bytes_recv),
-                    'packets_sent': net_io.packets_sent,
-                    'packets_recv': net_io.packets_recv,
-                    'errin': net_io.errin,
-                    'errout': net_io.errout,
-                    'dropin': net_io.dropin,
-                    'dropout': net_io.dropout
+                    'bytes_sent': self._format_bytes(net_io['bytes_sent']),
+                    'bytes_recv': self._format_bytes(net_io['bytes_recv']),
+                    'packets_sent': net_io['packets_sent'],
+                    'packets_recv': net_io['packets_recv'],
+                    'errin': net_io['errin'],
+                    'errout': net_io['errout'],
+                    'dropin': net_io['dropin'],
+                    'dropout': net_io['dropout']
                 }
+                if 'rates' in net_io:
+                    network_info['network_stats']['rates'] = net_io['rates']
 
                 # Also store raw I/O counters for metrics extraction
-                network_info['io_counters'] = {
-                    'bytes_sent': net_io.bytes_sent,
-                    'bytes_recv': net_io.bytes_recv,
-                    'packets_sent': net_io.packets_sent,
-                    'packets_recv': net_io.packets_recv,
-                    'errin': net_io.errin,
-                    'errout': net_io.errout,
-                    'dropin': net_io.dropin,
-                    'dropout': net_io.dropout
-                }
+                network_info['io_counters'] = net_io
             except Exception as e:
                 self.logger.debug(f"Network stats error: {e}")
                 network_info['io_counters'] = {}
@@ -616,41 +663,15 @@ class SystemCollector:
     def _get_public_ip(self):
         """Get public IP address"""
         try:
-            # Try multiple services for reliability
-            services = [
-                'https://api.ipify.org',
-                'https://icanhazip.com',
-                'https://checkip.amazonaws.com'
-            ]
-
-            for service in services:
-                try:
-                    response = requests.get(service, timeout=10)
-                    if response.status_code == 200:
-                        return response.text.strip()
-                except Exception as e:
-                    self.logger.debug(f"Failed to get IP from {service}: {e}")
-                    continue
-
-            return "unknown"
+            return get_public_ip_resolver().resolve(include_geo=False)['public_ip'] or "unknown"
         except Exception as e:
             self.logger.error(f"Error in _get_public_ip: {e}")
             return "unknown"
 
     def _get_network_io_counters(self):
-        """Get network I/O statistics"""
+        """Get network I/O statistics and rates"""
         try:
-            io_counters = psutil.net_io_counters()
-            return {
-                'bytes_sent': io_counters.bytes_sent,
-                'bytes_recv': io_counters.bytes_recv,
-                'packets_sent': io_counters.packets_sent,
-                'packets_recv': io_counters.packets_recv,
-                'errin': io_counters.errin,
-                'errout': io_counters.errout,
-                'dropin': io_counters.dropin,
-                'dropout': io_counters.dropout
-            }
+            return get_net_io_snapshot().totals()
         except Exception as e:
             self.logger.error(f"Error in _get_network_io_counters: {e}")
             return {}
@@ -664,10 +685,12 @@ class SystemCollector:
                 'system': {}
             }
 
-            # Get OS-specific hardware information
+            # Get OS-specific hardware information; model and BIOS details rarely change
             if self.os_collector:
-                os_specific_hw = self.os_collector.get_hardware_info()
-                info['system'].update(os_specific_hw)
+                if self._os_hardware is None or time.time() - self._os_hardware_collected >= OS_HARDWARE_INTERVAL:
+                    self._os_hardware = self.os_collector.get_hardware_info()
+                    self._os_hardware_collected = time.time()
+                info['system'].update(self._os_hardware)
 
             return info
         except Exception as e:
@@ -682,7 +705,7 @@ class SystemCollector:
                 'logical_cores': psutil.cpu_count(logical=True),
                 'current_freq': psutil.cpu_freq().current if psutil.cpu_freq() else None,
                 'max_freq': psutil.cpu_freq().max if psutil.cpu_freq() else None,
-                'usage_percent': psutil.cpu_percent(interval=1),
+                'usage_percent': self.cpu_sampler.current_percent(),
                 'load_average': list(os.getloadavg()) if hasattr(os, 'getloadavg') else None
             }
 
@@ -759,29 +782,11 @@ class SystemCollector:
                         self.logger.warning(f"Error getting disk usage for {partition.mountpoint}: {e}")
                         continue
 
-                    # Get disk I/O statistics
+                    # Get disk I/O statistics from the cycle's shared snapshot
                     try:
-                        io_counters = psutil.disk_io_counters(perdisk=True)
-                        if io_counters:
-                            # Try different device name formats
-                            device_variants = [
-                                partition.device.replace('/dev/', '').replace('\\', ''),
-                                partition.device.replace(':', ''),
-                                partition.device.split('\\')[-1] if '\\' in partition.device else partition.device
-                            ]
-
-                            for device_name in device_variants:
-                                if device_name in io_counters:
-                                    io = io_counters[device_name]
-                                    disk_info['io_counters'] = {
-                                        'read_count': io.read_count,
-                                        'write_count': io.write_count,
-                                        'read_bytes': io.read_bytes,
-                                        'write_bytes': io.write_bytes,
-                                        'read_time': io.read_time,
-                                        'write_time': io.write_time
-                                    }
-                                    break
+                        io_stats = get_disk_io_snapshot().device_stats(partition.device)
+                        if io_stats:
+                            disk_info['io_counters'] = io_stats
                     except Exception as e:
                         self.logger.debug(f"Could not get I/O stats for {partition.device}: {e}")
 
@@ -837,23 +842,19 @@ class SystemCollector:
         try:
             processes = []
 
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'create_time']):
-                try:
-                    proc_info = proc.info
-                    processes.append({
-                        'pid': proc_info['pid'],
-                        'name': proc_info['name'],
-                        'username': proc_info['username'],
-                        'cpu_percent': proc_info['cpu_percent'],
-                        'memory_percent': proc_info['memory_percent'],
-                        'create_time': datetime.fromtimestamp(proc_info['create_time']).isoformat() if proc_info['create_time'] else None
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            # Top 20 by CPU usage from the shared per-cycle snapshot
+            snapshot = get_process_snapshot()
+            for proc_info in snapshot.top('cpu_percent', 20, ['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'create_time']):
+                processes.append({
+                    'pid': proc_info['pid'],
+                    'name': proc_info['name'],
+                    'username': proc_info['username'],
+                    'cpu_percent': proc_info['cpu_percent'],
+                    'memory_percent': proc_info['memory_percent'],
+                    'create_time': datetime.fromtimestamp(proc_info['create_time']).isoformat() if proc_info['create_time'] else None
+                })
 
-            # Sort by CPU usage and limit to top 20
-            processes.sort(key=lambda x: x['cpu_percent'] or 0, reverse=True)
-            return processes[:20]
+            return processes
         except Exception as e:
             self.logger.error(f"Error getting process info: {e}")
             return []
@@ -903,18 +904,10 @@ class SystemCollector:
             # First try to get the actual logged-in user (not service accounts)
             if self.is_linux:
                 try:
-                    # Try to get the user who is actually logged in to the desktop session
-                    result = subprocess.run(['who'], capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0 and result.stdout.strip():
-                        lines = result.stdout.strip().split('\n')
-                        # Look for users on console or pts (actual login sessions)
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) >= 2 and ('console' in line or 'pts' in line or 'tty' in line):
-                                username = parts[0]
-                                # Skip system accounts
-                                if username not in ['root', 'mysql', 'postgres', 'redis', 'nginx', 'apache', 'www-data']:
-                                    return username
+                    # The user logged in on a console or pts, skipping system accounts
+                    username = get_linux_sources().interactive_user()
+                    if username:
+                        return username
 
                     # Fallback: check for users with home directories in /home
                     if os.path.exists('/home'):
@@ -1007,7 +1000,9 @@ class SystemCollector:
             return {}
 
     def _get_filtered_tcp_ports(self):
-        ignore_pattern = re.compile(r'^(chrome|msedge|brave|explorer|svchost|Idle|System|WindowsPackageManagerServer|msedgewebview2|ms-teams)$', re.IGNORECASE)
+        """Get the distinct local/remote port pairs of established TCP connections"""
+        process_cache = get_process_cache()
+        seen = set()
         result = []
 
         try:
@@ -1017,14 +1012,16 @@ class SystemCollector:
                 if not conn.raddr:
                     continue
 
-                try:
-                    proc = psutil.Process(conn.pid)
-                    pname = proc.name().lower()
-                    if ignore_pattern.match(pname):
+                # One cached lookup per PID instead of a Process() per connection
+                if conn.pid is not None:
+                    metadata = process_cache.get(conn.pid)
+                    if metadata is None or IGNORED_CONNECTION_PROCESSES.match(metadata.name):
                         continue
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
 
+                pair = (conn.laddr.port, conn.raddr.port)
+                if pair in seen:
+                    continue
+                seen.add(pair)
                 result.append({
                     "LocalPort": conn.laddr.port,
                     "RemotePort": conn.raddr.port
@@ -1307,8 +1304,23 @@ class SystemCollector:
                                     unique_devices[device_key] = device_info
                                     discovered_count += 1
 
+            elif self.is_linux:
+                for neighbour in get_linux_sources().neighbours():
+                    if neighbour.ip not in unique_devices:
+                        unique_devices[neighbour.ip] = {
+                            'ip': neighbour.ip,
+                            'mac_address': neighbour.mac,
+                            'hostname': self._safe_hostname_lookup(neighbour.ip),
+                            'status': 'connected',
+                            'discovery_method': 'ARP_Enhanced',
+                            'device_type': self._classify_device_by_ip(neighbour.ip),
+                            'os': 'Unknown',
+                            'response_time': 0
+                        }
+                        discovered_count += 1
+
             else:
-                # Linux/Unix ARP table parsing
+                # macOS/BSD ARP table parsing
                 result = subprocess.run(['arp', '-a'], capture_output=True, text=True, timeout=15)
                 for line in result.stdout.split('\n'):
                     # Parse format: hostname (ip) at mac [ether] on interface
@@ -1379,6 +1391,8 @@ class SystemCollector:
                         gateway = line.split(':')[1].strip()
                         if gateway and gateway != '':
                             return gateway
+            elif self.is_linux:
+                return get_linux_sources().default_gateway()
             else:
                 result = subprocess.run(['ip', 'route', 'show', 'default'], capture_output=True, text=True, timeout=10)
                 if result.returncode == 0:
@@ -1401,6 +1415,8 @@ class SystemCollector:
                         parts = line.split()
                         if len(parts) >= 2:
                             return parts[1].replace('-', ':')
+            elif self.is_linux:
+                return get_linux_sources().mac_for(ip) or 'Unknown'
             else:
                 result = subprocess.run(['arp', ip], capture_output=True, text=True, timeout=5)
                 for line in result.stdout.split('\n'):
@@ -1539,6 +1555,8 @@ class SystemCollector:
     def _get_mac_address(self, ip):
         """Get MAC address for a given IP from ARP table."""
         try:
+            if self.is_linux:
+                return get_linux_sources().mac_for(ip)
             if self._is_windows():
                 result = subprocess.run(['arp', '-a', ip], capture_output=True, text=True, timeout=5)
             else:
@@ -1558,22 +1576,6 @@ class SystemCollector:
             self.logger.debug(f"Could not get MAC for {ip} from ARP: {e}")
         return None
 
-    def _extract_ping_time(self, ping_output):
-        """Extract response time from ping command output."""
-        try:
-            import re
-            if self._is_windows():
-                match = re.search(r'time[<=](\d+)ms', ping_output)
-                if match:
-                    return int(match.group(1))
-            else:
-                match = re.search(r'time=(\d+\.?\d*)', ping_output)
-                if match:
-                    return float(match.group(1))
-        except Exception:
-            pass
-        return 1 # Default response time
-
     def _infer_device_type(self, ip, hostname=None):
         """Infer device type from IP, hostname, and potentially MAC vendor."""
         if hostname is None:
@@ -1601,64 +1603,41 @@ class SystemCollector:
 
 
     def _discover_devices_ping_sweep(self, subnet, unique_devices):
-        """Discover devices using ping sweep"""
+        """Discover devices using an asynchronous ICMP/TCP ping sweep"""
         devices_found = 0
         try:
             self.logger.info(f"Starting ping sweep for subnet: {subnet}")
 
-            if '/' in subnet:
-                # CIDR notation
-                network = ipaddress.IPv4Network(subnet, strict=False)
-                ip_list = list(network.hosts())[:50]  # Limit for performance
-                self.logger.info(f"CIDR subnet scan: checking {len(ip_list)} IPs")
-            elif '-' in subnet:
-                # Range notation: 192.168.1.1-192.168.1.100
-                start_ip, end_ip = subnet.split('-')
-                start = ipaddress.IPv4Address(start_ip.strip())
-                end = ipaddress.IPv4Address(end_ip.strip())
-                ip_list = []
-                current = start
-                while current <= end and len(ip_list) < 100:  # Limit for performance
-                    ip_list.append(current)
-                    current += 1
-                self.logger.info(f"IP range scan: checking {len(ip_list)} IPs from {start} to {end}")
-            else:
-                # Single IP
-                ip_list = [ipaddress.IPv4Address(subnet)]
-                self.logger.info(f"Single IP scan: checking {subnet}")
-
-            # Ping each IP
-            for ip in ip_list:
-                try:
-                    if self._is_windows():
-                        result = subprocess.run(['ping', '-n', '1', '-w', '1000', str(ip)],
-                                              capture_output=True, text=True, timeout=3)
-                    else:
-                        result = subprocess.run(['ping', '-c', '1', '-W', '1', str(ip)],
-                                              capture_output=True, text=True, timeout=3)
-
-                    if result.returncode == 0:
-                        response_time = self._extract_ping_time(result.stdout)
-                        hostname = self._resolve_hostname(str(ip))
-                        mac_address = self._get_mac_address(str(ip))
-                        device_type = self._infer_device_type(str(ip))
-
-                        unique_devices[str(ip)] = {
-                            'ip': str(ip),
-                            'hostname': hostname,
-                            'mac_address': mac_address,
-                            'device_type': device_type,
-                            'status': 'online',
-                            'response_time': response_time,
-                            'ports_open': [],
-                            'discovery_method': 'ping',
-                            'os': 'Windows' if 'windows' in hostname.lower() else 'Unknown'
-                        }
-                        devices_found += 1
-                        self.logger.info(f"Found device: {ip} ({hostname}) - {device_type}")
-
-                except (subprocess.TimeoutExpired, Exception) as e:
-                    continue  # Skip unreachable IPs
+            ip_list = parse_targets(subnet)
+            self.logger.info(f"Ping sweep: checking {len(ip_list)} IPs")
+
+            sweeper = PingSweeper()
+            alive = sweeper.sweep(ip_list)
+
+            # One neighbour cache read and one concurrent reverse lookup pass for all hosts
+            arp_cache = read_arp_cache()
+            hostnames = resolve_hostnames(list(alive))
+
+            for ip, probe in alive.items():
+                hostname = hostnames.get(ip) or f"device-{ip.split('.')[-1]}"
+                device_type = self._infer_device_type(ip, hostname)
+                os_guess = guess_os_from_ttl(probe.get('ttl'))
+                if os_guess == 'Unknown' and 'windows' in hostname.lower():
+                    os_guess = 'Windows'
+
+                unique_devices[ip] = {
+                    'ip': ip,
+                    'hostname': hostname,
+                    'mac_address': arp_cache.get(ip),
+                    'device_type': device_type,
+                    'status': 'online',
+                    'response_time': probe['response_time'],
+                    'ports_open': [probe['open_port']] if probe.get('open_port') else [],
+                    'discovery_method': 'ping' if probe['method'] == 'icmp' else 'tcp_probe',
+                    'os': os_guess
+                }
+                devices_found += 1
+                self.logger.info(f"Found device: {ip} ({hostname}) - {device_type}")
 
         except Exception as e:
             self.logger.error(f"Ping sweep failed: {str(e)}")
@@ -1694,6 +1673,20 @@ class SystemCollector:
                                     }
                                     devices_found += 1
                                     self.logger.info(f"ARP found device: {ip} ({mac})")
+            elif self.is_linux:
+                for neighbour in get_linux_sources().neighbours():
+                    if neighbour.ip not in unique_devices and self._is_valid_ip(neighbour.ip):
+                        unique_devices[neighbour.ip] = {
+                            'ip': neighbour.ip,
+                            'hostname': self._resolve_hostname(neighbour.ip),
+                            'mac_address': neighbour.mac,
+                            'device_type': self._infer_device_type(neighbour.ip),
+                            'status': 'online',
+                            'discovery_method': 'arp',
+                            'os': 'Unknown'
+                        }
+                        devices_found += 1
+                        self.logger.info(f"ARP found device: {neighbour.ip} ({neighbour.mac})")
             else:
                 result = subprocess.run(['arp', '-a'], capture_output=True, text=True, timeout=10)
                 if result.returncode == 0:
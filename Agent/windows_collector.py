@@ -11,6 +11,7 @@ import logging
 from datetime import datetime
 import json
 import re
+from modules.shell_broker import run_powershell
 
 
 class WindowsCollector:
@@ -72,7 +73,7 @@ class WindowsCollector:
             # Last update time (latest patch)
             try:
                 ps_command = "Get-HotFix | Sort-Object InstalledOn -Descending | Select-Object -First 1 | ConvertTo-Json"
-                result = subprocess.run(["powershell", "-Command", ps_command], capture_output=True, text=True, timeout=30)
+                result = run_powershell(ps_command, timeout=30)
                 if result.returncode == 0 and result.stdout:
                     hotfix_info = json.loads(result.stdout.strip())
                     if isinstance(hotfix_info, dict) and 'InstalledOn' in hotfix_info:
@@ -83,7 +84,7 @@ class WindowsCollector:
             # Full list of installed patches
             try:
                 ps_command = "Get-HotFix | Select-Object HotFixID, InstalledOn | ConvertTo-Json"
-                result = subprocess.run(["powershell", "-Command", ps_command], capture_output=True, text=True, timeout=30)
+                result = run_powershell(ps_command, timeout=30)
                 if result.returncode == 0 and result.stdout:
                     patches = json.loads(result.stdout.strip())
                     if isinstance(patches, list):
@@ -382,9 +383,7 @@ class WindowsCollector:
 
             # Firewall Status
             try:
-                result = subprocess.run(
-                    ["powershell", "-Command", "Get-NetFirewallProfile | Select-Object -ExpandProperty Enabled"],
-                    capture_output=True, text=True, timeout=10)
+                result = run_powershell("Get-NetFirewallProfile | Select-Object -ExpandProperty Enabled", timeout=10)
                 if result.returncode == 0:
                     info['firewall_status'] = "enabled" if "True" in result.stdout else "disabled"
                 else:
@@ -398,8 +397,7 @@ class WindowsCollector:
                     "Get-MpComputerStatus | "
                     "Select-Object -Property AMServiceEnabled,AntivirusEnabled,QuickScanStartTime,FullScanStartTime | ConvertTo-Json"
                 )
-                result = subprocess.run(["powershell", "-Command", ps_command],
-                                        capture_output=True, text=True, timeout=10)
+                result = run_powershell(ps_command, timeout=10)
                 if result.returncode == 0 and result.stdout:
                     status = json.loads(result.stdout.strip())
                     if isinstance(status, dict):
@@ -415,8 +413,7 @@ class WindowsCollector:
             # Last Update Check
             try:
                 ps = "(New-Object -ComObject Microsoft.Update.AutoUpdate).Results.LastSearchSuccessDate"
-                result = subprocess.run(["powershell", "-Command", ps],
-                                        capture_output=True, text=True, timeout=5)
+                result = run_powershell(ps, timeout=5)
                 if result.returncode == 0 and result.stdout.strip():
                     info["last_update_check"] = result.stdout.strip()
                 else:
@@ -427,13 +424,11 @@ class WindowsCollector:
             # Automatic Updates Status
             try:
                 ps_policy = "(Get-ItemProperty 'HKLM:\\SOFTWARE\\Policies\\Microsoft\\Windows\\WindowsUpdate\\AU' -ErrorAction SilentlyContinue).AUOptions"
-                result = subprocess.run(["powershell", "-Command", ps_policy],
-                                        capture_output=True, text=True, timeout=5)
+                result = run_powershell(ps_policy, timeout=5)
 
                 if not result.stdout.strip():
                     ps_default = "(Get-ItemProperty 'HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\WindowsUpdate\\Auto Update' -ErrorAction SilentlyContinue).AUOptions"
-                    result = subprocess.run(["powershell", "-Command", ps_default],
-                                            capture_output=True, text=True, timeout=5)
+                    result = run_powershell(ps_default, timeout=5)
 
                 if result.returncode == 0 and result.stdout.strip().isdigit():
                     au = int(result.stdout.strip())
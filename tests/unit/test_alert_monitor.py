@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Alert Monitor
+Tests sustained conditions, hysteresis and rate-of-change rules
+"""
+
+import unittest
+import sys
+import os
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.alert_monitor import AlertMonitor, AlertRule, build_default_rules
+
+
+class TestAlertMonitor(unittest.TestCase):
+    """Test streaming rule evaluation"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.events = []
+        self.monitor = AlertMonitor(rules=[
+            AlertRule('CPU_CRITICAL', 'cpu.percent', 90, 'critical', duration=120, clear_threshold=85,
+                      message='CPU usage at {value}%')
+        ])
+        self.monitor.add_listener(lambda event, alert: self.events.append((event, alert)))
+
+    def test_fires_only_when_sustained(self):
+        """Test a condition must hold for the whole duration"""
+        self.monitor.evaluate({'cpu.percent': 95}, timestamp=0)
+        self.monitor.evaluate({'cpu.percent': 50}, timestamp=60)
+        self.monitor.evaluate({'cpu.percent': 95}, timestamp=65)
+        self.monitor.evaluate({'cpu.percent': 96}, timestamp=150)
+        self.assertEqual(self.events, [])
+
+        self.monitor.evaluate({'cpu.percent': 97}, timestamp=185)
+
+        self.assertEqual(len(self.events), 1)
+        event, alert = self.events[0]
+        self.assertEqual(event, 'fired')
+        self.assertEqual(alert['message'], 'CPU usage at 97%')
+        self.assertEqual(len(self.monitor.active_alerts()), 1)
+
+    def test_hysteresis(self):
+        """Test an alert clears only below the clear threshold"""
+        self.monitor.rules[0].duration = 0
+        self.monitor.evaluate({'cpu.percent': 92}, timestamp=0)
+        self.monitor.evaluate({'cpu.percent': 88}, timestamp=5)
+        self.monitor.evaluate({'cpu.percent': 91}, timestamp=10)
+        self.assertEqual([event for event, _ in self.events], ['fired'])
+
+        self.monitor.evaluate({'cpu.percent': 80}, timestamp=15)
+
+        self.assertEqual([event for event, _ in self.events], ['fired', 'resolved'])
+        self.assertEqual(self.monitor.active_alerts(), [])
+
+    def test_rate_of_change_rule(self):
+        """Test rate rules fire on growth per minute, per matching metric"""
+        self.monitor.set_rules([
+            AlertRule('DISK_GROWTH', 'disk.*.percent', 2, 'warning', clear_threshold=1, rate_window=60,
+                      message='Disk {label} filling {value} points per minute')
+        ])
+        for second in range(0, 121, 5):
+            self.monitor.evaluate({'disk./.percent': 50 + second * 0.05, 'disk./home.percent': 40}, timestamp=second)
+
+        self.assertEqual(len(self.events), 1)
+        alert = self.events[0][1]
+        self.assertEqual(alert['metric'], 'disk./.percent')
+        self.assertEqual(alert['message'], 'Disk / filling 3.0 points per minute')
+
+    def test_default_rules_follow_thresholds(self):
+        """Test thresholds and hysteresis are applied to the default rules"""
+        rules = {rule.alert_type: rule for rule in build_default_rules({'cpu_critical': 95})}
+        self.assertEqual(rules['CPU_CRITICAL'].threshold, 95)
+        self.assertEqual(rules['CPU_CRITICAL'].clear_threshold, 90)
+        self.assertEqual(rules['CPU_CRITICAL'].duration, 120)
+
+
+if __name__ == '__main__':
+    unittest.main()
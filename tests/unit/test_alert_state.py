@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Alert State
+Tests alert deduplication, suppression expiry and flap detection
+"""
+
+import unittest
+import sys
+import os
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.alert_state import AlertTracker, SuppressionIndex, alert_fingerprint, ACKNOWLEDGED, RESOLVED
+
+
+def cpu_alert(value):
+    return {'type': 'CPU_CRITICAL', 'severity': 'critical', 'metric': 'cpu.percent', 'value': value,
+            'message': f'CPU usage at {value}%'}
+
+
+class TestSuppressionIndex(unittest.TestCase):
+    """Test heap-ordered suppression expiry"""
+
+    def test_expires_in_deadline_order(self):
+        """Test only ended windows expire and replaced deadlines are skipped"""
+        index = SuppressionIndex()
+        index.suppress('a', 100)
+        index.suppress('b', 50)
+        index.suppress('a', 200)
+
+        self.assertEqual(index.expire(120), ['b'])
+        self.assertTrue(index.is_suppressed('a', 120))
+        self.assertEqual(index.expire(250), ['a'])
+        self.assertEqual(len(index), 0)
+
+
+class TestAlertTracker(unittest.TestCase):
+    """Test the alert lifecycle"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tracker = AlertTracker(flap_threshold=4, flap_window=600)
+
+    def test_sustained_condition_is_one_alert(self):
+        """Test repeated observations update a single record"""
+        opened = self.tracker.observe([cpu_alert(95)], now=0)['opened']
+        for minute in range(1, 10):
+            changes = self.tracker.observe([cpu_alert(95 + minute * 0.1)], now=minute * 60)
+            self.assertEqual(changes['opened'], [])
+
+        active = self.tracker.active()
+        self.assertEqual(len(opened), 1)
+        self.assertEqual(len(active), 1)
+        self.assertEqual(active[0]['id'], f"{alert_fingerprint(cpu_alert(0))}-1")
+        self.assertEqual(active[0]['updates'], 9)
+        self.assertEqual(active[0]['value'], 95.9)
+
+    def test_acknowledge_and_resolve(self):
+        """Test open -> acknowledged -> resolved, then a new occurrence"""
+        alert_id = self.tracker.observe([cpu_alert(95)], now=0)['opened'][0]['id']
+        self.assertTrue(self.tracker.acknowledge(alert_id))
+        self.assertEqual(self.tracker.active()[0]['state'], ACKNOWLEDGED)
+
+        resolved = self.tracker.observe([], now=60)['resolved']
+        self.assertEqual(resolved[0]['state'], RESOLVED)
+        self.assertEqual(self.tracker.active(), [])
+
+        reopened = self.tracker.observe([cpu_alert(97)], now=4000)['opened']
+        self.assertEqual(reopened[0]['occurrence'], 2)
+
+    def test_flapping_condition_is_held_open(self):
+        """Test a toggling condition stops opening new alerts"""
+        opened = 0
+        for step in range(10):
+            alerts = [cpu_alert(95)] if step % 2 == 0 else []
+            opened += len(self.tracker.observe(alerts, now=step * 30)['opened'])
+
+        self.assertEqual(opened, 2)
+        self.assertTrue(self.tracker.active()[0]['flapping'])
+
+        # Resolves once the condition stays clear for a whole window
+        self.assertEqual(self.tracker.observe([], now=2000)['resolved'][0]['occurrence'], 2)
+
+    def test_suppression_by_type_and_severity(self):
+        """Test records matching a suppression key are reported as suppressed"""
+        record = self.tracker.observe([cpu_alert(95)], now=0)['opened'][0]
+        self.tracker.suppress('CPU_CRITICAL_critical', until=300)
+
+        self.assertTrue(self.tracker.is_suppressed(record, now=100))
+        self.tracker.observe([cpu_alert(95)], now=400)
+        self.assertFalse(self.tracker.is_suppressed(record, now=400))
+
+
+if __name__ == '__main__':
+    unittest.main()
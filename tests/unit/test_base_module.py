@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Base Module
+Tests the TTL result cache, invalidation and cache statistics
+"""
+
+import unittest
+import sys
+import os
+import time
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.base_module import BaseModule, cached_result
+
+
+class ProbeModule(BaseModule):
+    """Test module that counts how often its probes run"""
+
+    def __init__(self):
+        super().__init__('probe')
+        self.probe_calls = 0
+        self.collect_calls = 0
+
+    def collect(self):
+        self.collect_calls += 1
+        return {'probe': self._probe('ssh')}
+
+    @cached_result(ttl=60)
+    def _probe(self, tool):
+        self.probe_calls += 1
+        return {'tool': tool, 'available': self.probe_calls > 0}
+
+    @cached_result(ttl=60)
+    def _empty_probe(self):
+        self.probe_calls += 1
+        return {}
+
+    @cached_result(ttl=60)
+    def _failing_probe(self):
+        self.probe_calls += 1
+        return {'error': 'WMI query timed out'}
+
+
+class TestBaseModuleCache(unittest.TestCase):
+    """Test result caching on BaseModule"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.module = ProbeModule()
+
+    def test_method_results_are_cached(self):
+        """Test repeated calls reuse the cached probe result"""
+        self.module.safe_collect()
+        self.module.safe_collect()
+
+        self.assertEqual(self.module.collect_calls, 2)
+        self.assertEqual(self.module.probe_calls, 1)
+
+        cache_status = self.module.get_status()['cache']
+        self.assertEqual(cache_status['hits'], 1)
+        self.assertEqual(cache_status['misses'], 1)
+        self.assertEqual(cache_status['entries'], 1)
+
+    def test_arguments_are_part_of_cache_key(self):
+        """Test different arguments are cached separately"""
+        self.module._probe('ssh')
+        self.module._probe('curl')
+        self.module._probe('ssh')
+
+        self.assertEqual(self.module.probe_calls, 2)
+
+    def test_expired_entries_are_reloaded(self):
+        """Test per-instance TTL overrides and expiry"""
+        self.module.cache_ttls['_probe'] = 0.05
+        self.module._probe('ssh')
+        time.sleep(0.1)
+        self.module._probe('ssh')
+
+        self.assertEqual(self.module.probe_calls, 2)
+
+    def test_empty_results_are_not_cached(self):
+        """Test failed probes are retried on the next call"""
+        self.module._empty_probe()
+        self.module._empty_probe()
+
+        self.assertEqual(self.module.probe_calls, 2)
+
+    def test_error_results_are_not_cached(self):
+        """Test a transient failure is not reported for the whole TTL"""
+        self.module._failing_probe()
+        self.module._failing_probe()
+
+        self.assertEqual(self.module.probe_calls, 2)
+        self.assertEqual(self.module.get_status()['cache']['entries'], 0)
+
+    def test_module_level_ttl(self):
+        """Test cache_ttl reuses the whole collect() result"""
+        self.module.cache_ttl = 60
+        self.module.safe_collect()
+        self.module.safe_collect()
+
+        self.assertEqual(self.module.collect_calls, 1)
+
+    def test_boot_time_change_invalidates_cache(self):
+        """Test a reboot drops every cached result"""
+        with mock.patch('modules.base_module.psutil.boot_time', return_value=1000.0):
+            self.module.safe_collect()
+        with mock.patch('modules.base_module.psutil.boot_time', return_value=2000.0):
+            self.module.safe_collect()
+
+        self.assertEqual(self.module.probe_calls, 2)
+        self.assertEqual(self.module.get_status()['cache']['invalidations'], 1)
+
+    def test_invalidate_single_method(self):
+        """Test explicit invalidation of one method"""
+        self.module._probe('ssh')
+        self.module.invalidate_cache('_probe')
+        self.module._probe('ssh')
+
+        self.assertEqual(self.module.probe_calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
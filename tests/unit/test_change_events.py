@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Change Events
+Tests netlink message parsing and event-driven module invalidation
+"""
+
+import unittest
+import sys
+import os
+import struct
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.base_module import BaseModule
+from modules.module_manager import ModuleManager
+from modules.change_events import ChangeMonitor, FakeEventSource, parse_uevent, parse_route_messages
+
+
+class CountingModule(BaseModule):
+    """Test module that counts collections"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.calls = 0
+
+    def collect(self):
+        self.calls += 1
+        return {'calls': self.calls}
+
+
+def route_message(message_type, payload=b'\x00' * 14):
+    """Build one netlink message with a payload that needs alignment padding"""
+    length = 16 + len(payload)
+    return struct.pack('=IHHII', length, message_type, 0, 0, 0) + payload + b'\x00' * (-length % 4)
+
+
+class TestParsing(unittest.TestCase):
+    """Test kernel message parsing"""
+
+    def test_parse_uevent(self):
+        """Test action, devpath and key/value fields"""
+        data = b'add@/devices/pci0000:00/usb1/1-1\x00ACTION=add\x00SUBSYSTEM=usb\x00PRODUCT=46d/c52b/1211\x00'
+        event = parse_uevent(data)
+
+        self.assertEqual(event['ACTION'], 'add')
+        self.assertEqual(event['DEVPATH'], '/devices/pci0000:00/usb1/1-1')
+        self.assertEqual(event['SUBSYSTEM'], 'usb')
+        self.assertEqual(event['PRODUCT'], '46d/c52b/1211')
+
+    def test_parse_route_messages(self):
+        """Test several aligned messages in one datagram, ignoring unknown types"""
+        data = route_message(16) + route_message(99) + route_message(21)
+        self.assertEqual(parse_route_messages(data), ['link_added', 'address_removed'])
+        self.assertEqual(parse_route_messages(b'\x01\x00'), [])
+
+
+class TestChangeMonitor(unittest.TestCase):
+    """Test dirty tracking and module invalidation"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.source = FakeEventSource()
+        self.notified = []
+        self.monitor = ChangeMonitor(sources=[self.source], on_change=self.notified.append)
+        self.assertEqual(self.monitor.start(), ['fake'])
+        self.addCleanup(self.monitor.stop)
+
+    def test_events_mark_modules_dirty(self):
+        """Test events accumulate until consumed and wake the agent"""
+        self.source.emit(['usb'], 'usb add')
+        self.source.emit(['disk', 'usb'], 'block add')
+
+        self.assertEqual(len(self.notified), 2)
+        self.assertEqual(self.monitor.consume_dirty(), {'usb', 'disk'})
+        self.assertEqual(self.monitor.consume_dirty(), set())
+        self.assertEqual(self.monitor.event_counts['usb'], 2)
+
+    def test_dirty_module_is_due_immediately(self):
+        """Test a dirty module skips the rest of its interval"""
+        modules = {'usb': CountingModule('usb'), 'disk': CountingModule('disk')}
+        manager = ModuleManager(module_intervals={'usb': 3600, 'disk': 3600})
+        manager.modules = modules
+        manager.module_status = {
+            name: {'status': 'initialized', 'last_run': None, 'last_duration': 0,
+                   'error_count': 0, 'timeout_count': 0, 'last_error': None}
+            for name in modules
+        }
+        self.addCleanup(manager.cleanup)
+
+        manager.collect_due_data()
+        self.assertEqual(manager.get_due_modules(), [])
+
+        self.source.emit(['usb', 'network'], 'usb remove')
+        marked = manager.mark_dirty(self.monitor.consume_dirty())
+
+        self.assertEqual(marked, ['usb'])
+        self.assertEqual(manager.get_due_modules(), ['usb'])
+        manager.collect_due_data()
+        self.assertEqual(modules['usb'].calls, 2)
+        self.assertEqual(modules['disk'].calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
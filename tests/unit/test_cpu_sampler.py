@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent CPU Sampler
+Tests background CPU sampling and delta calculations
+"""
+
+import unittest
+import sys
+import os
+import time
+from collections import namedtuple
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.cpu_sampler import CPUSampler, _percent_between
+
+CPUTimes = namedtuple('CPUTimes', ['user', 'system', 'idle', 'iowait', 'guest'])
+
+
+class TestPercentCalculation(unittest.TestCase):
+    """Test utilisation from cpu_times deltas"""
+
+    def test_busy_fraction(self):
+        """Test busy time over total time, excluding iowait and guest"""
+        before = CPUTimes(user=10, system=5, idle=80, iowait=5, guest=0)
+        after = CPUTimes(user=40, system=15, idle=130, iowait=15, guest=10)
+
+        # busy delta 40 (guest already counted in user), total delta 100
+        self.assertEqual(_percent_between(before, after), 40.0)
+
+    def test_no_elapsed_time(self):
+        """Test identical samples report zero"""
+        times = CPUTimes(user=1, system=1, idle=1, iowait=0, guest=0)
+        self.assertEqual(_percent_between(times, times), 0.0)
+
+
+class TestCPUSampler(unittest.TestCase):
+    """Test the background sampler thread"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.sampler = CPUSampler(interval=0.05, history_size=5)
+        self.sampler.start()
+
+    def tearDown(self):
+        self.sampler.stop()
+        self.sampler.join(timeout=2)
+
+    def test_reads_do_not_sleep(self):
+        """Test values are served from the buffer once sampling has started"""
+        self.assertTrue(self.sampler.wait_for_first_sample(timeout=2))
+
+        start = time.perf_counter()
+        percent = self.sampler.current_percent()
+        per_cpu = self.sampler.per_cpu_percent()
+
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(0 <= percent <= 100)
+        self.assertEqual(len(per_cpu), os.cpu_count() or len(per_cpu))
+
+    def test_ring_buffer_is_bounded(self):
+        """Test history keeps only the newest samples"""
+        time.sleep(0.5)
+        history = self.sampler.history()
+
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history, sorted(history, key=lambda sample: sample['timestamp']))
+        self.assertTrue(0 <= self.sampler.average_percent(window=10) <= 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
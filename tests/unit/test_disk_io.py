@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Disk I/O Snapshot
+Tests counter deltas, rate computation and partition to disk mapping
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+from collections import namedtuple
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules import disk_io
+from modules.disk_io import DiskIOSnapshot, counter_delta, compute_rates, parent_device, is_tracked_partition, COUNTER_WRAP
+
+
+sdiskpart = namedtuple('sdiskpart', ['device', 'mountpoint', 'fstype', 'opts'])
+sdiskio = namedtuple('sdiskio', ['read_count', 'write_count', 'read_bytes', 'write_bytes',
+                                 'read_time', 'write_time', 'busy_time'])
+
+
+def counters(reads=0, writes=0, read_bytes=0, write_bytes=0, read_time=0, write_time=0, busy_time=0):
+    return {'read_count': reads, 'write_count': writes, 'read_bytes': read_bytes, 'write_bytes': write_bytes,
+            'read_time': read_time, 'write_time': write_time, 'busy_time': busy_time}
+
+
+class TestRates(unittest.TestCase):
+    """Test rates computed from two counter sets"""
+
+    def test_counter_delta_wraps(self):
+        """Test a 32-bit counter that wrapped still gives the increase"""
+        self.assertEqual(counter_delta(150, 100), 50)
+        self.assertEqual(counter_delta(10, COUNTER_WRAP - 20, max_delta=1000), 30)
+        self.assertIsNone(counter_delta(10, COUNTER_WRAP + 5, max_delta=1000))
+
+    def test_counter_delta_reset(self):
+        """Test a counter that went back to near zero is a reset, not a wrap"""
+        self.assertIsNone(counter_delta(1024, 50_000_000))
+        self.assertIsNone(counter_delta(1024, 50_000_000, max_delta=1000))
+
+    def test_wrapped_busy_time(self):
+        """Test a wrapped 32-bit busy_time still gives utilisation"""
+        rates = compute_rates(counters(busy_time=COUNTER_WRAP - 400), counters(busy_time=600), elapsed=2.0)
+        self.assertEqual(rates['utilization_percent'], 50.0)
+
+    def test_compute_rates(self):
+        """Test IOPS, throughput, latency and utilisation over the interval"""
+        before = counters()
+        after = counters(reads=100, writes=50, read_bytes=4096 * 100, write_bytes=8192 * 50,
+                         read_time=200, write_time=500, busy_time=1000)
+        rates = compute_rates(before, after, elapsed=2.0)
+        self.assertEqual(rates['read_iops'], 50.0)
+        self.assertEqual(rates['write_iops'], 25.0)
+        self.assertEqual(rates['read_bytes_per_sec'], 204800.0)
+        self.assertEqual(rates['avg_read_latency_ms'], 2.0)
+        self.assertEqual(rates['avg_write_latency_ms'], 10.0)
+        self.assertEqual(rates['utilization_percent'], 50.0)
+
+    def test_idle_disk_has_zero_latency(self):
+        """Test no requests means zero latency rather than a division error"""
+        rates = compute_rates(counters(), counters(), elapsed=1.0)
+        self.assertEqual((rates['avg_read_latency_ms'], rates['read_iops']), (0.0, 0.0))
+
+    def test_reset_counters_give_no_rates(self):
+        """Test counters that went backwards (device re-attached) are not turned into rates"""
+        self.assertIsNone(compute_rates(counters(read_bytes=COUNTER_WRAP * 2), counters(), elapsed=1.0))
+        self.assertIsNone(compute_rates(counters(reads=5000, busy_time=90_000), counters(busy_time=10), elapsed=1.0))
+
+
+class TestDiskIOSnapshot(unittest.TestCase):
+    """Test snapshots, device lookup and totals"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.sys_block = tempfile.mkdtemp()
+        # /sys/class/block/sda1 -> .../sda/sda1, with a 'partition' file
+        devices = os.path.join(self.sys_block, 'devices')
+        os.makedirs(os.path.join(devices, 'sda', 'sda1'))
+        open(os.path.join(devices, 'sda', 'sda1', 'partition'), 'w').close()
+        os.symlink(os.path.join(devices, 'sda'), os.path.join(self.sys_block, 'sda'))
+        os.symlink(os.path.join(devices, 'sda', 'sda1'), os.path.join(self.sys_block, 'sda1'))
+        patcher = mock.patch.object(disk_io, 'SYS_BLOCK_DIR', self.sys_block)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.sys_block)
+
+    def _capture(self, values, previous=None, now=100.0):
+        with mock.patch.object(disk_io.psutil, 'disk_io_counters', return_value=values) as read, \
+                mock.patch.object(disk_io.time, 'monotonic', return_value=now):
+            snapshot = DiskIOSnapshot.capture(previous)
+        read.assert_called_once_with(perdisk=True, nowrap=False)
+        return snapshot
+
+    def test_parent_device(self):
+        """Test partitions map to their disk and disks to nothing"""
+        self.assertEqual(parent_device('sda1', self.sys_block), 'sda')
+        self.assertIsNone(parent_device('sda', self.sys_block))
+
+    def test_rates_against_previous_snapshot(self):
+        """Test one read per snapshot and rates from the previous one"""
+        first = self._capture({'sda': sdiskio(0, 0, 0, 0, 0, 0, 0), 'sda1': sdiskio(0, 0, 0, 0, 0, 0, 0)})
+        self.assertNotIn('rates', first.disks['sda'])
+
+        second = self._capture({'sda': sdiskio(100, 0, 409600, 0, 300, 0, 2500),
+                                'sda1': sdiskio(100, 0, 409600, 0, 300, 0, 2500)}, previous=first, now=110.0)
+        self.assertEqual(second.disks['sda']['rates']['read_iops'], 10.0)
+        self.assertEqual(second.disks['sda']['rates']['utilization_percent'], 25.0)
+
+        stats = second.device_stats('/dev/sda1')
+        self.assertEqual(stats['disk'], 'sda')
+        self.assertEqual(stats['disk_utilization_percent'], 25.0)
+        self.assertEqual(second.device_stats('/dev/sdz'), {})
+
+        # Partitions are not counted on top of their disk
+        totals = second.totals()
+        self.assertEqual(totals['read_count'], 100)
+        self.assertEqual(totals['rates']['read_bytes_per_sec'], 40960.0)
+
+    def test_tracked_partitions(self):
+        """Test snap loops, overlays and container mounts are not tracked"""
+        self.assertTrue(is_tracked_partition(sdiskpart('/dev/sda1', '/', 'ext4', 'rw')))
+        self.assertFalse(is_tracked_partition(sdiskpart('/dev/loop3', '/snap/core/1', 'squashfs', 'ro')))
+        self.assertFalse(is_tracked_partition(sdiskpart('/dev/loop7', '/mnt/image', 'ext4', 'rw')))
+        self.assertFalse(is_tracked_partition(sdiskpart('overlay', '/var/lib/docker/overlay2/x/merged', 'overlay', 'rw')))
+        self.assertFalse(is_tracked_partition(
+            sdiskpart('/dev/sdb', '/var/lib/kubelet/pods/1234/volumes/kubernetes.io~csi/pv/mount', 'ext4', 'rw')))
+
+    def test_shared_snapshot_is_reused(self):
+        """Test callers within max_age share one counter read"""
+        with mock.patch.object(disk_io, '_latest', None), mock.patch.object(disk_io.psutil, 'disk_io_counters',
+                                                                            return_value={}) as read:
+            first = disk_io.get_disk_io_snapshot(max_age=60)
+            self.assertIs(disk_io.get_disk_io_snapshot(max_age=60), first)
+            self.assertEqual(read.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Event Log Readers
+Tests bookmarked incremental reads, log rotation and read budgets
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.event_log_readers import (
+    BookmarkStore, FileLogReader, JournalReader, parse_journal_entry, parse_syslog_line
+)
+
+
+class TestFileLogReader(unittest.TestCase):
+    """Test incremental text log reads"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'syslog')
+        self.bookmarks = BookmarkStore(os.path.join(self.temp_dir, 'bookmarks.json'))
+        self.write('Oct 16 10:00:00 host kernel: old error before first run\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, text, path=None, mode='a'):
+        with open(path or self.log_path, mode) as f:
+            f.write(text)
+
+    def test_reads_only_new_complete_lines(self):
+        """Test each line is reported once and partial lines wait for their newline"""
+        reader = FileLogReader(self.log_path, self.bookmarks)
+        self.assertEqual(len(reader.read_new()['events']), 1)
+
+        self.write('Oct 16 10:01:00 host sshd[42]: Failed password for root\nOct 16 10:01:01 host cron: job ')
+        events = reader.read_new()['events']
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['source'], 'sshd')
+        self.assertEqual(events[0]['pid'], 42)
+        self.assertEqual(events[0]['severity'], 'error')
+
+        self.write('failed\n')
+        self.assertEqual(reader.read_new()['events'][0]['message'], 'job failed')
+        self.assertEqual(reader.read_new()['events'], [])
+
+    def test_rotation_finishes_old_file(self):
+        """Test lines written before rotation are read from path.1"""
+        reader = FileLogReader(self.log_path, self.bookmarks)
+        reader.read_new()
+        self.write('Oct 16 10:02:00 host app: error in old file\n')
+        os.rename(self.log_path, f"{self.log_path}.1")
+        self.write('Oct 16 10:03:00 host app: error in new file\n', mode='w')
+
+        result = reader.read_new()
+        self.assertTrue(result['rotated'])
+        self.assertEqual([event['message'] for event in result['events']],
+                         ['error in old file', 'error in new file'])
+
+    def test_budget_and_severity_filter(self):
+        """Test info lines are dropped and the event budget resumes next cycle"""
+        reader = FileLogReader(self.log_path, self.bookmarks, max_events=2)
+        reader.read_new()
+        self.write(''.join(f'Oct 16 10:04:0{i} host app: {"error" if i % 2 else "started"} {i}\n' for i in range(8)))
+
+        first = reader.read_new()
+        self.assertTrue(first['truncated'])
+        self.assertEqual([event['message'] for event in first['events']], ['error 1', 'error 3'])
+        second = reader.read_new()
+        self.assertEqual([event['message'] for event in second['events']], ['error 5', 'error 7'])
+
+    def test_bookmarks_survive_restart(self):
+        """Test a new store and reader resume where the previous ones stopped"""
+        FileLogReader(self.log_path, self.bookmarks).read_new()
+        self.bookmarks.save()
+        self.write('Oct 16 10:05:00 host app: error after restart\n')
+
+        restored = BookmarkStore(self.bookmarks.path)
+        events = FileLogReader(self.log_path, restored).read_new()['events']
+        self.assertEqual([event['message'] for event in events], ['error after restart'])
+
+
+class TestJournalParsing(unittest.TestCase):
+    """Test journald command construction and entry conversion"""
+
+    def test_build_command_resumes_after_cursor(self):
+        """Test the cursor replaces the first-run line window"""
+        bookmarks = BookmarkStore(os.path.join(tempfile.gettempdir(), 'missing', 'bookmarks.json'))
+        reader = JournalReader('auth', bookmarks, match_args=['SYSLOG_FACILITY=4'], max_events=10)
+        self.assertIn('--lines=10', reader.build_command(None))
+        command = reader.build_command('s=abc')
+        self.assertIn('--after-cursor=s=abc', command)
+        self.assertIn('SYSLOG_FACILITY=4', command)
+        self.assertNotIn('--lines=10', command)
+
+    def test_parse_journal_entry(self):
+        """Test journal fields map onto the event shape"""
+        event = parse_journal_entry({
+            '__REALTIME_TIMESTAMP': '1700000000000000', 'PRIORITY': '3', '_PID': '7',
+            'SYSLOG_IDENTIFIER': 'systemd', 'MESSAGE': [104, 105]
+        })
+        self.assertEqual(event['severity'], 'error')
+        self.assertEqual(event['message'], 'hi')
+        self.assertEqual(event['pid'], 7)
+        self.assertTrue(event['time'].startswith('2023-11-14'))
+
+    def test_parse_iso_syslog_line(self):
+        """Test ISO timestamped syslog lines are parsed"""
+        event = parse_syslog_line('2026-10-16T10:00:00.123+00:00 host nginx[9]: upstream timed out')
+        self.assertEqual(event['source'], 'nginx')
+        self.assertEqual(event['message'], 'upstream timed out')
+
+
+if __name__ == '__main__':
+    unittest.main()
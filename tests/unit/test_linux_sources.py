@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Linux Data Sources
+Tests /proc parsers, pread re-reads and resolver lookups without subprocesses
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.linux_sources import LinuxSources, ProcFile, parse_routes, parse_arp, parse_wireless, parse_resolv_conf
+
+
+ROUTE = """Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT
+wlan0\t00000000\t0101A8C0\t0003\t0\t0\t600\t00000000\t0\t0\t0
+eth0\t00000000\t010200C0\t0003\t0\t0\t100\t00000000\t0\t0\t0
+eth0\t000200C0\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0
+"""
+
+ARP = """IP address       HW type     Flags       HW address            Mask     Device
+192.0.2.1        0x1         0x2         02:FC:00:00:00:05     *        eth0
+192.0.2.9        0x1         0x0         00:00:00:00:00:00     *        eth0
+192.0.2.7        0x1         0x6         aa:bb:cc:dd:ee:ff     *        eth0
+"""
+
+WIRELESS = """Inter-| sta-|   Quality        |   Discarded packets               | Missed | WE
+ face | tus | link level noise |  nwid  crypt   frag  retry   misc | beacon | 22
+ wlan0: 0000   58.  -52.  -256        0      0      0      0     12        0
+"""
+
+
+class TestParsers(unittest.TestCase):
+    """Test parsing kernel tables"""
+
+    def test_parse_routes(self):
+        """Test hex addresses are decoded and flags kept"""
+        routes = parse_routes(ROUTE)
+        self.assertEqual(routes[1].gateway, '192.0.2.1')
+        self.assertEqual(routes[2].destination, '192.0.2.0')
+        self.assertEqual(routes[2].mask, '255.255.255.0')
+        self.assertEqual(routes[0].metric, 600)
+
+    def test_parse_arp_skips_incomplete(self):
+        """Test incomplete neighbours are dropped and MACs lowercased"""
+        neighbours = parse_arp(ARP)
+        self.assertEqual([n.ip for n in neighbours], ['192.0.2.1', '192.0.2.7'])
+        self.assertEqual(neighbours[0].mac, '02:fc:00:00:00:05')
+        self.assertTrue(neighbours[1].permanent)
+
+    def test_parse_wireless(self):
+        """Test link quality and levels are read per interface"""
+        self.assertEqual(parse_wireless(WIRELESS),
+                         {'wlan0': {'link_quality': 58.0, 'signal_level': -52.0, 'noise_level': -256.0}})
+
+    def test_parse_resolv_conf(self):
+        """Test nameservers are deduplicated and comments ignored"""
+        config = parse_resolv_conf("# generated\nnameserver 10.0.0.1\nnameserver 10.0.0.1\n"
+                                   "search corp.example # trailing\noptions edns0\n")
+        self.assertEqual(config, {'nameservers': ['10.0.0.1'], 'search': ['corp.example']})
+
+
+class TestLinuxSources(unittest.TestCase):
+    """Test reading sources from files kept open"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = {name: os.path.join(self.temp_dir, name)
+                      for name in ('route', 'arp', 'wireless', 'resolved.conf', 'resolv.conf')}
+        for name, text in (('route', ROUTE), ('arp', ARP), ('resolved.conf', 'nameserver 10.0.0.1\n'),
+                           ('resolv.conf', 'nameserver 127.0.0.53\nnameserver 10.0.0.1\n')):
+            self._write(name, text)
+        self.sources = LinuxSources(route_path=self.paths['route'], arp_path=self.paths['arp'],
+                                    wireless_path=self.paths['wireless'],
+                                    resolv_paths=[self.paths['resolved.conf'], self.paths['resolv.conf']],
+                                    sys_net_dir=self.temp_dir)
+
+    def tearDown(self):
+        self.sources.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, text):
+        with open(self.paths[name], 'w') as f:
+            f.write(text)
+
+    def test_default_gateway_lowest_metric(self):
+        """Test the default route with the lowest metric wins"""
+        self.assertEqual(self.sources.default_gateway(), '192.0.2.1')
+
+    def test_dns_servers_merged(self):
+        """Test upstream servers come first and duplicates are dropped"""
+        self.assertEqual(self.sources.dns_servers(), ['10.0.0.1', '127.0.0.53'])
+
+    def test_mac_for(self):
+        """Test neighbour lookups by IP"""
+        self.assertEqual(self.sources.mac_for('192.0.2.7'), 'aa:bb:cc:dd:ee:ff')
+        self.assertIsNone(self.sources.mac_for('192.0.2.9'))
+
+    def test_missing_sources(self):
+        """Test missing files give empty results rather than errors"""
+        os.remove(self.paths['route'])
+        self.assertIsNone(self.sources.default_gateway())
+        self.assertEqual(self.sources.wifi_info(), {'connected': False, 'status': 'disconnected'})
+
+
+class TestProcFile(unittest.TestCase):
+    """Test re-reading an open file with pread"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'resolv.conf')
+        with open(self.path, 'w') as f:
+            f.write('nameserver 10.0.0.1\n')
+        self.proc_file = ProcFile(self.path, chunk_size=8)
+
+    def tearDown(self):
+        self.proc_file.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_rewritten_in_place(self):
+        """Test the same descriptor sees changes written to the file"""
+        self.assertEqual(self.proc_file.read_text(), 'nameserver 10.0.0.1\n')
+        fd = self.proc_file._fd
+        with open(self.path, 'w') as f:
+            f.write('nameserver 10.0.0.2\n')
+        self.assertEqual(self.proc_file.read_text(), 'nameserver 10.0.0.2\n')
+        self.assertEqual(self.proc_file._fd, fd)
+
+    def test_replaced_file_is_reopened(self):
+        """Test a file renamed over the path is picked up"""
+        self.proc_file.read()
+        replacement = self.path + '.new'
+        with open(replacement, 'w') as f:
+            f.write('nameserver 10.0.0.3\n')
+        os.replace(replacement, self.path)
+        self.assertEqual(self.proc_file.read_text(), 'nameserver 10.0.0.3\n')
+
+    def test_reads_proc(self):
+        """Test procfs files read completely through pread"""
+        if not os.path.exists('/proc/self/status'):
+            self.skipTest("procfs is not mounted")
+        proc_file = ProcFile('/proc/self/status', chunk_size=64)
+        try:
+            self.assertIn('Name:', proc_file.read_text())
+            self.assertIn('Pid:', proc_file.read_text())
+        finally:
+            proc_file.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
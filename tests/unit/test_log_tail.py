@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Log Tail
+Tests reverse block reading, rotation fallback and package history caching
+"""
+
+import unittest
+import sys
+import os
+import gzip
+import tempfile
+import shutil
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.log_tail import (
+    PackageHistory, reverse_lines, tail_lines, rotated_siblings, parse_apt_history, parse_rpm_history
+)
+
+
+APT_TRANSACTION = """Start-Date: 2026-10-{day}  10:00:00
+Commandline: apt-get upgrade
+Upgrade: bash:amd64 (5.2-1, 5.2-2), libc6:amd64 (2.36-9, 2.36-10)
+Install: newdep:amd64 (1.0-1, automatic)
+End-Date: 2026-10-{day}  10:00:05
+
+"""
+
+
+class TestReverseReading(unittest.TestCase):
+    """Test reading files backwards in blocks"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'test.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_lines_spanning_blocks(self):
+        """Test lines longer than a block are reassembled"""
+        lines = [f"line {i} " + 'x' * (i * 7) for i in range(20)]
+        with open(self.path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+        self.assertEqual([line for line in reverse_lines(self.path, block_size=16) if line], lines[::-1])
+        self.assertEqual(tail_lines(self.path, 3, block_size=16), lines[-3:])
+
+    def test_rotated_siblings_order(self):
+        """Test .1 and .N.gz copies are listed newest first"""
+        for name in ('test.log.1', 'test.log.2.gz', 'test.log.3.gz', 'test.log.5.gz'):
+            open(os.path.join(self.temp_dir, name), 'w').close()
+        self.assertEqual([os.path.basename(path) for path in rotated_siblings(self.path)],
+                         ['test.log.1', 'test.log.2.gz', 'test.log.3.gz'])
+
+
+class TestHistoryParsing(unittest.TestCase):
+    """Test package manager history parsing"""
+
+    def test_parse_apt_history(self):
+        """Test apt transactions become structured records"""
+        lines = ('Upgrade: orphan:amd64 (1, 2)\n' + APT_TRANSACTION.format(day=16)).splitlines()
+        records = parse_apt_history(lines)
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['date'], '2026-10-16  10:00:00')
+        self.assertEqual(records[0]['actions']['upgrade'][0],
+                         {'name': 'bash', 'version': '5.2-2', 'previous_version': '5.2-1'})
+        self.assertEqual(records[0]['actions']['install'][0], {'name': 'newdep', 'version': '1.0-1'})
+
+    def test_parse_dnf_history(self):
+        """Test dnf lines are grouped by timestamp and the old half of upgrades is skipped"""
+        lines = [
+            '2026-10-16T10:00:00+0000 SUBDEBUG Upgrade: bash-5.2.26-3.fc40.x86_64',
+            '2026-10-16T10:00:00+0000 SUBDEBUG Upgraded: bash-5.2.26-1.fc40.x86_64',
+            '2026-10-16T10:00:00+0000 INFO some unrelated line',
+            '2026-10-16T11:00:00+0000 SUBDEBUG Erase: vim-9.1-1.fc40.x86_64'
+        ]
+        records = parse_rpm_history(lines)
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['actions'], {'upgrade': [{'name': 'bash', 'version': '5.2.26-3.fc40.x86_64'}]})
+        self.assertEqual(records[1]['actions']['remove'][0]['name'], 'vim')
+
+
+class TestPackageHistory(unittest.TestCase):
+    """Test mtime-cached package history"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'history.log')
+        with open(self.path, 'w') as f:
+            f.write(''.join(APT_TRANSACTION.format(day=day) for day in range(10, 14)))
+        self.history = PackageHistory(logs=[('apt', self.path)], max_records=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_unchanged_log_is_not_reparsed(self):
+        """Test repeated calls reuse the parsed records until the file changes"""
+        first = self.history.get()
+        self.history.get()
+        self.assertEqual(self.history.parse_count, 1)
+        self.assertEqual([record['date'][:10] for record in first['records']],
+                         ['2026-10-11', '2026-10-12', '2026-10-13'])
+
+        with open(self.path, 'a') as f:
+            f.write(APT_TRANSACTION.format(day=14))
+        self.assertEqual(self.history.get()['records'][-1]['date'][:10], '2026-10-14')
+        self.assertEqual(self.history.parse_count, 2)
+
+    def test_fresh_rotation_reads_compressed_sibling(self):
+        """Test an empty log after rotation falls back to the gzipped copy"""
+        with open(self.path, 'rb') as src, gzip.open(f"{self.path}.1.gz", 'wb') as dst:
+            dst.write(src.read())
+        os.remove(self.path)
+        open(self.path, 'w').close()
+
+        records = self.history.get()['records']
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[-1]['date'][:10], '2026-10-13')
+
+
+if __name__ == '__main__':
+    unittest.main()
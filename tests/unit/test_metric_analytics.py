@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Metric Analytics
+Tests anomaly detection, forecasting and correlations over stored metrics
+"""
+
+import unittest
+import sys
+import os
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.metric_store import MetricStore
+from modules.metric_analytics import AnalyticsEngine, rolling_zscores, linear_trend, counter_rates, correlation_matrix, is_counter
+
+
+class TestHelpers(unittest.TestCase):
+    """Test the vectorized helper functions"""
+
+    def test_rolling_zscores(self):
+        """Test each score uses only the preceding window"""
+        values = [10.0, 12.0, 10.0, 12.0, 10.0, 30.0]
+        scores = rolling_zscores(values, 4)
+
+        self.assertEqual(len(scores), 2)
+        self.assertAlmostEqual(scores[0], -1.0)
+        self.assertAlmostEqual(scores[1], 19.0)
+
+    def test_linear_trend(self):
+        """Test slope and fit on a perfect line"""
+        trend = linear_trend([0.0, 10.0, 20.0, 30.0], [5.0, 7.0, 9.0, 11.0])
+
+        self.assertAlmostEqual(trend['slope_per_second'], 0.2)
+        self.assertAlmostEqual(trend['fitted_last'], 11.0)
+        self.assertAlmostEqual(trend['r_squared'], 1.0)
+
+    def test_counter_rates_skip_resets(self):
+        """Test counter resets do not produce negative rates"""
+        timestamps, rates = counter_rates([0.0, 10.0, 20.0, 30.0], [0.0, 100.0, 50.0, 150.0])
+        self.assertEqual(list(timestamps), [10.0, 30.0])
+        self.assertEqual(list(rates), [10.0, 10.0])
+
+    def test_is_counter(self):
+        """Test only raw cumulative counters are treated as counters, not stored rates"""
+        self.assertTrue(is_counter('network.bytes_recv'))
+        self.assertTrue(is_counter('network.errin'))
+        self.assertTrue(is_counter('cpu.ctx_switches'))
+        for name in ('network.bytes_recv_per_sec', 'network.errors_per_sec', 'network.error_rate_percent',
+                     'network.max_utilization_percent', 'network.connections'):
+            self.assertFalse(is_counter(name), name)
+
+    def test_correlation_matrix(self):
+        """Test perfect, inverse and constant columns"""
+        matrix = correlation_matrix({'a': [1, 2, 3, 4], 'b': [2, 4, 6, 8], 'c': [4, 3, 2, 1], 'd': [5, 5, 5, 5]})
+        self.assertEqual(matrix['a']['b'], 1.0)
+        self.assertEqual(matrix['a']['c'], -1.0)
+        self.assertIsNone(matrix['a']['d'])
+
+
+class TestAnalyticsEngine(unittest.TestCase):
+    """Test incremental analysis over a metric store"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.store = MetricStore(capacity=500)
+        self.engine = AnalyticsEngine(self.store, threshold=3.0, zscore_window=20, warmup=10)
+        for i in range(100):
+            self.store.record({
+                'cpu.percent': 20.0 + (i % 5),
+                'disk./.used': 50e9 + i * 1e8,
+                'disk./.total': 100e9
+            }, timestamp=1000.0 + i * 60)
+
+    def test_update_is_incremental(self):
+        """Test only new samples are processed on later cycles"""
+        self.assertEqual(self.engine.update(), 300)
+        self.assertEqual(self.engine.update(), 0)
+
+        self.store.record({'cpu.percent': 22.0}, timestamp=7000.0)
+        self.assertEqual(self.engine.update(), 1)
+
+    def test_spike_is_reported_as_anomaly(self):
+        """Test a sample far outside the rolling window is flagged"""
+        self.engine.update()
+        self.store.record({'cpu.percent': 95.0}, timestamp=7000.0)
+        self.engine.update()
+
+        anomalies = self.engine.anomalies('cpu.')
+        self.assertEqual(len(anomalies), 1)
+        self.assertEqual(anomalies[0]['value'], 95.0)
+        self.assertGreater(anomalies[0]['zscore'], 3.0)
+
+    def test_time_until_disk_full(self):
+        """Test linear and Holt estimates for a steadily filling disk"""
+        self.engine.update()
+        eta = self.engine.time_until('disk./.used', 100e9)
+
+        # 40.1 GB left at 1e8 bytes per minute
+        self.assertAlmostEqual(eta['linear_eta_seconds'] / 60, 401, delta=1)
+        self.assertAlmostEqual(eta['holt_eta_seconds'] / 60, 401, delta=40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Metric Store
+Tests ring buffer windows and memory-mapped persistence
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.metric_store import MetricSeries, MetricStore
+
+
+class TestMetricSeries(unittest.TestCase):
+    """Test the in-memory ring buffer"""
+
+    def test_keeps_newest_samples(self):
+        """Test the buffer wraps and windows stay in time order"""
+        series = MetricSeries(capacity=5)
+        for i in range(12):
+            series.append(float(i), timestamp=100 + i)
+
+        timestamps, values = series.window()
+
+        self.assertEqual(len(series), 5)
+        self.assertEqual(series.total_appended, 12)
+        self.assertEqual(list(values), [7.0, 8.0, 9.0, 10.0, 11.0])
+        self.assertEqual(list(timestamps), [107.0, 108.0, 109.0, 110.0, 111.0])
+        self.assertEqual(series.latest(), (111.0, 11.0))
+
+    def test_window_limits(self):
+        """Test last and since select the newest samples"""
+        series = MetricSeries(capacity=10)
+        for i in range(6):
+            series.append(float(i), timestamp=float(i))
+
+        self.assertEqual(series.values(last=2), [4.0, 5.0])
+        self.assertEqual(series.values(since=3.5), [4.0, 5.0])
+        self.assertEqual(series.values(last=0), [])
+        self.assertIsNone(MetricSeries(capacity=3).latest())
+
+
+class TestMetricStore(unittest.TestCase):
+    """Test named series and persistence"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_history_survives_restart(self):
+        """Test persisted series are reloaded by name"""
+        store = MetricStore(capacity=4, path=self.temp_dir)
+        store.record({'cpu.percent': 12.5, 'disk./.percent': 40, 'cpu.frequency': None}, timestamp=1)
+        store.record({'cpu.percent': 30.0}, timestamp=2)
+        store.close()
+
+        reopened = MetricStore(capacity=4, path=self.temp_dir)
+        self.addCleanup(reopened.close)
+
+        self.assertEqual(reopened.names(), ['cpu.percent', 'disk./.percent'])
+        self.assertEqual(reopened.series('cpu.percent').values(), [12.5, 30.0])
+        self.assertEqual(reopened.get_stats()['samples'], 3)
+
+    def test_unknown_metric_window_is_empty(self):
+        """Test windows of unrecorded metrics are empty"""
+        store = MetricStore(capacity=4)
+        timestamps, values = store.window('memory.percent')
+        self.assertEqual(len(timestamps), 0)
+        self.assertEqual(len(values), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Module Manager
+Tests concurrent module collection, deadlines and collection metadata
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.base_module import BaseModule
+from modules.module_manager import ModuleManager
+
+
+class SleepyModule(BaseModule):
+    """Test module that sleeps before returning"""
+
+    def __init__(self, name, delay, fail=False):
+        super().__init__(name)
+        self.delay = delay
+        self.fail = fail
+
+    def collect(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.module_name} failed")
+        return {'value': self.module_name}
+
+
+class TestModuleManager(unittest.TestCase):
+    """Test concurrent collection engine"""
+
+    def _make_manager(self, modules, **kwargs):
+        """Create a manager that only runs the given test modules"""
+        manager = ModuleManager(**kwargs)
+        manager.modules = modules
+        manager.module_status = {
+            name: {'status': 'initialized', 'last_run': None, 'last_duration': 0,
+                   'error_count': 0, 'timeout_count': 0, 'last_error': None}
+            for name in modules
+        }
+        self.addCleanup(manager.cleanup)
+        return manager
+
+    def test_modules_run_concurrently(self):
+        """Test wall-clock time is below summed module time"""
+        modules = {f'mod{i}': SleepyModule(f'mod{i}', 0.3) for i in range(4)}
+        manager = self._make_manager(modules, max_workers=4)
+
+        data = manager.collect_all_data()
+        metadata = data['_collection_metadata']
+
+        self.assertEqual(metadata['successful_modules'], 4)
+        self.assertLess(metadata['wall_clock_duration'], 1.0)
+        self.assertGreaterEqual(metadata['summed_module_duration'], 1.2)
+        self.assertGreater(metadata['parallel_speedup'], 1.5)
+        self.assertEqual(data['mod0'], {'value': 'mod0'})
+
+    def test_slow_module_returns_partial_results(self):
+        """Test a module past its deadline does not block the cycle"""
+        modules = {
+            'fast': SleepyModule('fast', 0.0),
+            'slow': SleepyModule('slow', 2.0),
+        }
+        manager = self._make_manager(modules, max_workers=2, module_timeout=0.3)
+
+        start = time.time()
+        data = manager.collect_all_data()
+
+        self.assertLess(time.time() - start, 1.5)
+        self.assertEqual(data['fast'], {'value': 'fast'})
+        self.assertEqual(data['slow']['status'], 'timeout')
+        self.assertEqual(data['_collection_metadata']['timed_out_modules'], ['slow'])
+        self.assertEqual(manager.module_status['slow']['timeout_count'], 1)
+        self.assertIn('slow', manager.get_failed_modules())
+
+        # The hung module is not resubmitted while it is still running
+        data = manager.collect_all_data()
+        self.assertEqual(data['slow']['error'], 'Previous collection still running')
+
+    def test_module_errors_are_isolated(self):
+        """Test a failing module is reported without affecting others"""
+        modules = {
+            'good': SleepyModule('good', 0.0),
+            'bad': SleepyModule('bad', 0.0, fail=True),
+        }
+        manager = self._make_manager(modules)
+
+        data = manager.collect_all_data()
+
+        self.assertEqual(data['good'], {'value': 'good'})
+        self.assertEqual(data['bad']['error'], 'bad failed')
+        self.assertEqual(manager.module_status['bad']['status'], 'error')
+        self.assertEqual(data['_collection_metadata']['failed_modules'], 1)
+
+    def test_only_due_modules_are_collected(self):
+        """Test scheduled collection merges fresh and cached sections"""
+        modules = {
+            'fast_cadence': SleepyModule('fast_cadence', 0.0),
+            'slow_cadence': SleepyModule('slow_cadence', 0.0),
+        }
+        manager = self._make_manager(modules, module_intervals={'fast_cadence': 0, 'slow_cadence': 3600})
+
+        first = manager.collect_due_data()
+        self.assertEqual(sorted(first['_collection_metadata']['fresh_modules']), ['fast_cadence', 'slow_cadence'])
+
+        modules['slow_cadence'].collect = lambda: self.fail('slow_cadence should not be due yet')
+        second = manager.collect_due_data()
+
+        self.assertEqual(second['_collection_metadata']['fresh_modules'], ['fast_cadence'])
+        self.assertEqual(second['_collection_metadata']['cached_modules'], ['slow_cadence'])
+        self.assertEqual(second['slow_cadence'], {'value': 'slow_cadence'})
+        self.assertGreater(manager.get_seconds_until_next_due(), -1)
+        self.assertEqual(manager.get_due_modules(time.time() + 3601), ['fast_cadence', 'slow_cadence'])
+
+    def test_failed_module_is_retried_soon(self):
+        """Test a failure keeps the last good section and retries with backoff instead of the full interval"""
+        modules = {'daily': SleepyModule('daily', 0.0)}
+        manager = self._make_manager(modules, module_intervals={'daily': 86400})
+        manager.collect_due_data()
+
+        modules['daily'].fail = True
+        manager.mark_dirty(['daily'])
+        data = manager.collect_due_data()
+        self.assertEqual(data['daily'], {'value': 'daily'})
+        self.assertEqual(data['_collection_metadata']['cached_modules'], ['daily'])
+        self.assertEqual(manager.module_status['daily']['status'], 'error')
+
+        failed_at = manager._last_attempt['daily']
+        self.assertEqual(manager.get_due_modules(failed_at + 59), [])
+        self.assertEqual(manager.get_due_modules(failed_at + 60), ['daily'])
+
+        # A second failure doubles the delay, a success restores the normal interval
+        manager._last_attempt['daily'] = 0.0
+        manager.collect_due_data()
+        failed_at = manager._last_attempt['daily']
+        self.assertEqual(manager.get_due_modules(failed_at + 60), [])
+        self.assertEqual(manager.get_due_modules(failed_at + 120), ['daily'])
+
+        modules['daily'].fail = False
+        manager._last_attempt['daily'] = 0.0
+        manager.collect_due_data()
+        self.assertEqual(manager.get_due_modules(manager._last_attempt['daily'] + 3600), [])
+
+    def test_modules_declare_their_own_cadence(self):
+        """Test cheap modules refresh more often than expensive ones"""
+        manager = ModuleManager()
+        self.addCleanup(manager.cleanup)
+
+        self.assertEqual(manager.modules['cpu'].collection_interval, 30)
+        self.assertEqual(manager.modules['patch_management'].collection_interval, 21600)
+        self.assertEqual(manager.modules['compliance_configuration'].collection_interval, 86400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Network I/O Snapshot
+Tests traffic and error rates, link utilisation and the shared snapshot
+"""
+
+import unittest
+import sys
+import os
+from collections import namedtuple
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules import net_io
+from modules.net_io import NetIOSnapshot, compute_rates
+from modules.disk_io import COUNTER_WRAP
+
+
+snetio = namedtuple('snetio', ['bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+                               'errin', 'errout', 'dropin', 'dropout'])
+snicstats = namedtuple('snicstats', ['isup', 'duplex', 'speed', 'mtu', 'flags'])
+
+
+def counters(bytes_sent=0, bytes_recv=0, packets_sent=0, packets_recv=0, errin=0, errout=0, dropin=0, dropout=0):
+    return {'bytes_sent': bytes_sent, 'bytes_recv': bytes_recv, 'packets_sent': packets_sent,
+            'packets_recv': packets_recv, 'errin': errin, 'errout': errout, 'dropin': dropin, 'dropout': dropout}
+
+
+class TestRates(unittest.TestCase):
+    """Test rates computed from two counter sets"""
+
+    def test_compute_rates(self):
+        """Test throughput, packet and error rates over the interval"""
+        after = counters(bytes_sent=2_000_000, bytes_recv=500_000, packets_sent=600, packets_recv=400,
+                         errin=10, dropin=4)
+        rates = compute_rates(counters(), after, elapsed=2.0)
+        self.assertEqual(rates['bytes_sent_per_sec'], 1_000_000.0)
+        self.assertEqual(rates['packets_recv_per_sec'], 200.0)
+        self.assertEqual(rates['errors_per_sec'], 5.0)
+        self.assertEqual(rates['drops_per_sec'], 2.0)
+        self.assertEqual(rates['error_rate_percent'], 1.0)
+        self.assertNotIn('utilization_percent', rates)
+
+    def test_utilization_against_link_speed(self):
+        """Test utilisation is the busier direction's share of the link speed"""
+        # 100 Mbit/s is 12.5 MB/s in each direction
+        rates = compute_rates(counters(), counters(bytes_sent=1_250_000, bytes_recv=6_250_000), elapsed=1.0,
+                              speed_mbps=100)
+        self.assertEqual(rates['tx_utilization_percent'], 10.0)
+        self.assertEqual(rates['rx_utilization_percent'], 50.0)
+        self.assertEqual(rates['utilization_percent'], 50.0)
+
+    def test_idle_link_has_zero_error_rate(self):
+        """Test no packets means a zero error rate rather than a division error"""
+        self.assertEqual(compute_rates(counters(), counters(), elapsed=1.0)['error_rate_percent'], 0.0)
+
+    def test_wrapped_counter(self):
+        """Test a 32-bit byte counter that wrapped still gives the increase"""
+        rates = compute_rates(counters(bytes_recv=COUNTER_WRAP - 100), counters(bytes_recv=900), elapsed=1.0,
+                              speed_mbps=1000)
+        self.assertEqual(rates['bytes_recv_per_sec'], 1000.0)
+        self.assertIsNone(compute_rates(counters(bytes_recv=COUNTER_WRAP * 2), counters(), elapsed=1.0))
+
+    def test_reset_counter(self):
+        """Test a re-created interface's counters give no rates rather than a fake burst"""
+        # tun0 went from 50 MB to 1 KB received
+        before = counters(bytes_recv=50_000_000, packets_recv=40_000, errin=3)
+        after = counters(bytes_recv=1024, packets_recv=2)
+        self.assertIsNone(compute_rates(before, after, elapsed=5.0))
+        self.assertIsNone(compute_rates(before, after, elapsed=5.0, speed_mbps=10))
+
+
+class TestNetIOSnapshot(unittest.TestCase):
+    """Test snapshots, interface lookup and totals"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.link_stats = {'eth0': snicstats(True, 2, 1000, 1500, ''), 'lo': snicstats(True, 0, 0, 65536, '')}
+
+    def _capture(self, values, previous=None, now=100.0):
+        with mock.patch.object(net_io.psutil, 'net_io_counters', return_value=values) as read, \
+                mock.patch.object(net_io.psutil, 'net_if_stats', return_value=self.link_stats) as stats, \
+                mock.patch.object(net_io.time, 'monotonic', return_value=now):
+            snapshot = NetIOSnapshot.capture(previous)
+        read.assert_called_once_with(pernic=True, nowrap=False)
+        stats.assert_called_once_with()
+        return snapshot
+
+    def test_rates_against_previous_snapshot(self):
+        """Test one read per snapshot and per-interface rates from the previous one"""
+        first = self._capture({'eth0': snetio(0, 0, 0, 0, 0, 0, 0, 0), 'lo': snetio(0, 0, 0, 0, 0, 0, 0, 0)})
+        self.assertNotIn('rates', first.interface('eth0'))
+        self.assertEqual(first.interface('eth0')['speed'], 1000)
+
+        second = self._capture({'eth0': snetio(125_000_000, 12_500_000, 1000, 1000, 20, 0, 0, 0),
+                                'lo': snetio(5000, 5000, 10, 10, 0, 0, 0, 0)}, previous=first, now=110.0)
+        eth0 = second.interface('eth0')['rates']
+        self.assertEqual(eth0['bytes_sent_per_sec'], 12_500_000.0)
+        self.assertEqual(eth0['utilization_percent'], 10.0)
+        # Loopback has no link speed, so no utilisation
+        self.assertNotIn('utilization_percent', second.interface('lo')['rates'])
+        self.assertEqual(second.interface('wlan9'), {})
+
+        totals = second.totals()
+        self.assertEqual(totals['bytes_recv'], 12_505_000)
+        self.assertEqual(totals['rates']['bytes_recv_per_sec'], 1_250_500.0)
+        self.assertEqual(totals['rates']['errors_per_sec'], 2.0)
+        self.assertEqual(totals['rates']['max_utilization_percent'], 10.0)
+
+    def test_shared_snapshot_is_reused(self):
+        """Test callers within max_age share one counter read"""
+        with mock.patch.object(net_io, '_latest', None), \
+                mock.patch.object(net_io.psutil, 'net_io_counters', return_value={}) as read, \
+                mock.patch.object(net_io.psutil, 'net_if_stats', return_value={}):
+            first = net_io.get_net_io_snapshot(max_age=60)
+            self.assertIs(net_io.get_net_io_snapshot(max_age=60), first)
+            self.assertEqual(read.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Package Database
+Tests dpkg, rpm and flatpak database readers and mtime memoization
+"""
+
+import unittest
+import sys
+import os
+import struct
+import sqlite3
+import tempfile
+import shutil
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.package_db import (
+    PackageDatabase, parse_dpkg_status, parse_rpm_header, read_rpm_sqlite, read_flatpaks, rpm_version, _stat_signature,
+    RPMTAG_NAME, RPMTAG_VERSION, RPMTAG_RELEASE, RPMTAG_INSTALLTIME, RPMTAG_VENDOR
+)
+
+
+DPKG_STATUS = """Package: adduser
+Status: install ok installed
+Installed-Size: 686
+Maintainer: Debian Adduser Developers <adduser@packages.debian.org>
+Architecture: all
+Version: 3.134
+Conffiles:
+ /etc/adduser.conf cc3493ecd2d09837ffdcc3e25fdfff18
+Description: add and remove users and groups
+ This package includes the 'adduser' and 'deluser' commands.
+
+Package: removed-tool
+Status: deinstall ok config-files
+Version: 1.0
+
+Package: held-lib
+Status: hold ok installed
+Architecture: amd64
+Version: 2:1.2-3
+"""
+
+
+def rpm_header(tags):
+    """Build an rpm header blob from {tag: str or int}"""
+    index, data = b'', b''
+    for tag, value in tags.items():
+        if isinstance(value, int):
+            # INT32 data is 4 byte aligned
+            data += b'\0' * (-len(data) % 4)
+            index += struct.pack('>IIII', tag, 4, len(data), 1)
+            data += struct.pack('>i', value)
+        else:
+            index += struct.pack('>IIII', tag, 6, len(data), 1)
+            data += value.encode() + b'\0'
+    return struct.pack('>II', len(tags), len(data)) + index + data
+
+
+class TestPackageReaders(unittest.TestCase):
+    """Test reading package manager databases directly"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parse_dpkg_status(self):
+        """Test only installed stanzas are returned with their fields"""
+        path = os.path.join(self.temp_dir, 'status')
+        with open(path, 'w') as f:
+            f.write(DPKG_STATUS)
+
+        packages = parse_dpkg_status(path)
+        self.assertEqual([package['name'] for package in packages], ['adduser', 'held-lib'])
+        self.assertEqual(packages[0]['version'], '3.134')
+        self.assertEqual(packages[0]['installed_size'], 686 * 1024)
+        self.assertEqual(packages[1]['version'], '2:1.2-3')
+
+    def test_read_rpm_sqlite(self):
+        """Test rpm headers are decoded from the sqlite Packages table"""
+        path = os.path.join(self.temp_dir, 'rpmdb.sqlite')
+        connection = sqlite3.connect(path)
+        connection.execute('CREATE TABLE Packages (hnum INTEGER PRIMARY KEY, blob BLOB NOT NULL)')
+        connection.execute('INSERT INTO Packages (blob) VALUES (?)', (rpm_header({
+            RPMTAG_NAME: 'bash', RPMTAG_VERSION: '5.2.26', RPMTAG_RELEASE: '3.fc40',
+            RPMTAG_INSTALLTIME: 1700000000, RPMTAG_VENDOR: 'Fedora Project'
+        }),))
+        connection.execute('INSERT INTO Packages (blob) VALUES (?)', (rpm_header({RPMTAG_NAME: 'gpg-pubkey'}),))
+        connection.commit()
+        connection.close()
+
+        packages = read_rpm_sqlite(path)
+        self.assertEqual(len(packages), 1)
+        self.assertEqual(packages[0]['version'], '5.2.26-3.fc40')
+        self.assertEqual(packages[0]['vendor'], 'Fedora Project')
+        self.assertEqual(packages[0]['install_time'], 1700000000)
+
+    def test_rpm_version_matches_query_format(self):
+        """Test sqlite header values and rpm -qa output give the same version string"""
+        self.assertEqual(rpm_version('5.2.26', '3.fc40', 0), '5.2.26-3.fc40')
+        self.assertEqual(rpm_version('5.2.26', '3.fc40', '(none)'), '5.2.26-3.fc40')
+        self.assertEqual(rpm_version('1.1.1k', '12.el8', 1), '1:1.1.1k-12.el8')
+        self.assertEqual(rpm_version('1.1.1k', '12.el8', '1'), '1:1.1.1k-12.el8')
+        self.assertEqual(rpm_version('2.0', '(none)', '(none)'), '2.0')
+
+    def test_parse_rpm_header_skips_unknown_tags(self):
+        """Test tags outside the wanted set are ignored"""
+        self.assertEqual(parse_rpm_header(rpm_header({RPMTAG_NAME: 'vim', 5000: 'ignored'})), {'name': 'vim'})
+
+    def test_read_flatpaks(self):
+        """Test flatpak apps are found from their active deployment"""
+        branch = os.path.join(self.temp_dir, 'app', 'org.example.App', 'x86_64', 'stable')
+        metainfo = os.path.join(branch, 'abc123', 'files', 'share', 'metainfo')
+        os.makedirs(metainfo)
+        with open(os.path.join(metainfo, 'org.example.App.metainfo.xml'), 'w') as f:
+            f.write('<component><releases><release version="2.1" date="2026-01-01"/></releases></component>')
+        os.symlink('abc123', os.path.join(branch, 'active'))
+
+        packages = read_flatpaks([self.temp_dir])
+        self.assertEqual(packages, [{'name': 'org.example.App', 'version': '2.1', 'architecture': 'x86_64',
+                                     'branch': 'stable', 'commit': 'abc123'}])
+
+
+class TestPackageDatabase(unittest.TestCase):
+    """Test memoization on database signatures"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'status')
+        with open(self.path, 'w') as f:
+            f.write(DPKG_STATUS)
+        self.database = PackageDatabase({
+            'dpkg': (lambda: _stat_signature(self.path), lambda: parse_dpkg_status(self.path))
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_unchanged_database_is_not_reread(self):
+        """Test the cached list is returned until the file changes"""
+        first = self.database.packages('dpkg')
+        self.assertIs(self.database.packages('dpkg'), first)
+        self.assertEqual(self.database.read_count, 1)
+
+        with open(self.path, 'a') as f:
+            f.write('\nPackage: new-tool\nStatus: install ok installed\nVersion: 1\n')
+        self.assertEqual(len(self.database.packages('dpkg')), 3)
+        self.assertEqual(self.database.read_count, 2)
+
+    def test_missing_database(self):
+        """Test a missing database reports None rather than an empty inventory"""
+        os.remove(self.path)
+        self.assertFalse(self.database.available('dpkg'))
+        self.assertIsNone(self.database.packages('dpkg'))
+
+
+if __name__ == '__main__':
+    unittest.main()
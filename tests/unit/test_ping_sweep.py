@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Ping Sweep Engine
+Tests target parsing, ARP cache parsing and asynchronous probing
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.ping_sweep import (
+    PingSweeper, parse_targets, parse_proc_arp, parse_arp_output,
+    guess_os_from_ttl, _build_echo_request, _parse_echo_reply
+)
+
+
+class TestParsing(unittest.TestCase):
+    """Test target and ARP parsing"""
+
+    def test_parse_targets(self):
+        """Test CIDR, ranges, wildcards and single addresses"""
+        self.assertEqual(len(parse_targets('10.0.0.0/16')), 65534)
+        self.assertEqual(parse_targets('192.168.1.254-192.168.2.1'),
+                         ['192.168.1.254', '192.168.1.255', '192.168.2.0', '192.168.2.1'])
+        self.assertEqual(parse_targets('192.168.1.10-12'), ['192.168.1.10', '192.168.1.11', '192.168.1.12'])
+        self.assertEqual(len(parse_targets('192.168.1.*')), 254)
+        self.assertEqual(parse_targets('10.0.0.5'), ['10.0.0.5'])
+        self.assertEqual(len(parse_targets('10.0.0.0/8', max_hosts=1000)), 1000)
+
+    def test_parse_proc_arp(self):
+        """Test incomplete /proc/net/arp entries are skipped"""
+        text = (
+            "IP address       HW type     Flags       HW address            Mask     Device\n"
+            "192.168.1.1      0x1         0x2         AA:BB:CC:DD:EE:01     *        eth0\n"
+            "192.168.1.7      0x1         0x0         00:00:00:00:00:00     *        eth0\n"
+        )
+        self.assertEqual(parse_proc_arp(text), {'192.168.1.1': 'aa:bb:cc:dd:ee:01'})
+
+    def test_parse_arp_output(self):
+        """Test Windows and BSD style arp -a output"""
+        windows = (
+            "Interface: 192.168.1.20 --- 0x4\n"
+            "  Internet Address      Physical Address      Type\n"
+            "  192.168.1.1           aa-bb-cc-dd-ee-01     dynamic\n"
+            "  192.168.1.255         ff-ff-ff-ff-ff-ff     static\n"
+        )
+        bsd = "router.lan (192.168.1.1) at aa:bb:cc:dd:ee:01 on en0 ifscope [ethernet]\n"
+
+        self.assertEqual(parse_arp_output(windows), {'192.168.1.1': 'aa:bb:cc:dd:ee:01'})
+        self.assertEqual(parse_arp_output(bsd), {'192.168.1.1': 'aa:bb:cc:dd:ee:01'})
+
+    def test_echo_reply_parsing(self):
+        """Test echo replies are parsed with and without an IP header"""
+        reply = bytearray(_build_echo_request(1, 42))
+        reply[0] = 0
+        ip_header = bytes([0x45, 0, 0, 0, 0, 0, 0, 0, 117, 1]) + bytes(10)
+
+        self.assertEqual(_parse_echo_reply(bytes(reply)), (42, None))
+        self.assertEqual(_parse_echo_reply(ip_header + bytes(reply)), (42, 117))
+        self.assertIsNone(_parse_echo_reply(_build_echo_request(1, 42)))
+        self.assertEqual(guess_os_from_ttl(117), 'Windows')
+
+
+class TestPingSweeper(unittest.TestCase):
+    """Test probing against loopback addresses"""
+
+    def test_tcp_sweep_finds_loopback_hosts(self):
+        """Test refused TCP connections count as live hosts"""
+        sweeper = PingSweeper(method='tcp', timeout=1.0)
+        alive = sweeper.sweep(parse_targets('127.0.0.1-127.0.0.8'))
+
+        self.assertEqual(len(alive), 8)
+        self.assertEqual(alive['127.0.0.1']['method'], 'tcp')
+        self.assertEqual(sweeper.stats['method'], 'tcp')
+
+    def test_rate_limit(self):
+        """Test probes are spaced to the configured rate"""
+        sweeper = PingSweeper(method='tcp', rate=100)
+        start = time.perf_counter()
+        sweeper.sweep(parse_targets('127.0.0.1-127.0.0.21'))
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.19)
+
+    def test_auto_sweep(self):
+        """Test the auto method finds loopback via ICMP or TCP"""
+        sweeper = PingSweeper(timeout=1.0)
+        alive = sweeper.sweep(['127.0.0.1'])
+
+        self.assertIn('127.0.0.1', alive)
+        self.assertIn(sweeper.stats['method'], ('icmp', 'tcp'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Predictive Analytics Module
+Tests how disk usage and rate history is stored, pruned and forecast
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules.predictive_analytics_module import PredictiveAnalyticsModule
+
+
+def partition(mountpoint):
+    return {'mountpoint': mountpoint, 'percent': 50.0, 'used': 500, 'total': 1000}
+
+
+class TestDiskHistory(unittest.TestCase):
+    """Test per-mountpoint disk history"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.module = PredictiveAnalyticsModule()
+
+    def tearDown(self):
+        self.module.cleanup()
+
+    def test_unmounted_history_is_removed(self):
+        """Test series of a mountpoint that disappeared are dropped"""
+        self.module._store_disk_historical_data({'partitions': [partition('/'), partition('/mnt/usb')]})
+        self.assertEqual(self.module._disk_mountpoints(), ['/', '/mnt/usb'])
+
+        self.module._store_disk_historical_data({'partitions': [partition('/')]})
+        self.assertEqual(self.module._disk_mountpoints(), ['/'])
+        self.assertEqual(self.module.metric_store.names('disk./mnt/usb'), [])
+
+    def test_empty_partition_list_keeps_history(self):
+        """Test a failed partition listing does not wipe the history"""
+        self.module._store_disk_historical_data({'partitions': [partition('/')]})
+        self.module._store_disk_historical_data({'partitions': []})
+        self.assertEqual(self.module._disk_mountpoints(), ['/'])
+
+
+class TestRateHistory(unittest.TestCase):
+    """Test forecasts over stored rate series"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.module = PredictiveAnalyticsModule()
+        self.start = time.time() - 100 * 60
+
+    def tearDown(self):
+        self.module.cleanup()
+
+    def _record(self, metrics, samples=100):
+        for i in range(samples):
+            self.module.metric_store.record(metrics(i), timestamp=self.start + i * 60)
+        self.module.analytics.update()
+
+    def test_network_rate_is_forecast_as_stored(self):
+        """Test a steady bytes-per-second series is not differentiated again"""
+        self._record(lambda i: {'network.bytes_recv_per_sec': 1000.0, 'network.bytes_recv': 60000.0 * i})
+        forecast = self.module._forecast('network.bytes_recv_per_sec')
+        self.assertEqual((forecast['current'], forecast['predicted']), (1000.0, 1000.0))
+        # The raw counter is still turned into the same rate
+        self.assertEqual(self.module._forecast('network.bytes_recv')['current'], 1000.0)
+
+    def test_disk_io_rates_are_forecast_as_stored(self):
+        """Test disk throughput, IOPS and utilisation series are not differentiated again"""
+        rates = {'read_bytes_per_sec': 5000.0, 'read_iops': 20.0, 'avg_read_latency_ms': 1.5,
+                 'max_utilization_percent': 12.5}
+        self._record(lambda i: {f"disk_io.{name}": value for name, value in rates.items()})
+        self.module._store_disk_historical_data({'io_counters': {'read_bytes': 1, 'write_bytes': 1, 'rates': rates}})
+        self.module.analytics.update()
+        self.assertEqual(sorted(self.module.metric_store.names('disk_io.')),
+                         sorted(['disk_io.read_bytes', 'disk_io.write_bytes'] + [f"disk_io.{name}" for name in rates]))
+
+        for name, value in rates.items():
+            self.assertEqual(self.module._forecast(f"disk_io.{name}")['current'], value, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Process Metadata Cache
+Tests PID lookups, PID reuse and per-process connection summaries
+"""
+
+import unittest
+import sys
+import os
+from collections import namedtuple
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules import process_cache
+from modules.process_cache import ProcessMetadataCache, summarize_connections
+
+
+addr = namedtuple('addr', ['ip', 'port'])
+sconn = namedtuple('sconn', ['fd', 'family', 'type', 'laddr', 'raddr', 'status', 'pid'])
+
+
+def connection(pid, local_port, remote_ip, remote_port, status='ESTABLISHED'):
+    return sconn(-1, 2, 1, addr('10.0.0.5', local_port), addr(remote_ip, remote_port) if remote_ip else (), status, pid)
+
+
+class FakeProcess:
+    """Stand-in for psutil.Process backed by a pid -> (create_time, name) table"""
+
+    table = {}
+    constructed = 0
+
+    def __init__(self, pid):
+        if pid not in self.table:
+            raise process_cache.psutil.NoSuchProcess(pid)
+        FakeProcess.constructed += 1
+        self.pid = pid
+
+    def create_time(self):
+        return self.table[self.pid][0]
+
+    def name(self):
+        return self.table[self.pid][1]
+
+    def username(self):
+        return 'svc'
+
+    def oneshot(self):
+        return mock.MagicMock()
+
+
+class TestProcessMetadataCache(unittest.TestCase):
+    """Test PID metadata lookups"""
+
+    def setUp(self):
+        """Set up test environment"""
+        FakeProcess.table = {100: (1000.0, 'nginx'), 200: (2000.0, 'chrome')}
+        FakeProcess.constructed = 0
+        patcher = mock.patch.object(process_cache.psutil, 'Process', FakeProcess)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ProcessMetadataCache(revalidate_after=60)
+
+    def test_repeated_lookups_are_cached(self):
+        """Test a PID is read once however many times it is looked up"""
+        for _ in range(50):
+            self.assertEqual(self.cache.get(100).name, 'nginx')
+        self.assertEqual(FakeProcess.constructed, 1)
+        self.assertEqual(self.cache.get_stats()['hits'], 49)
+
+    def test_pid_reuse_is_detected(self):
+        """Test a reused PID with a new create_time is read again"""
+        self.cache.revalidate_after = 0
+        self.assertEqual(self.cache.get(100).name, 'nginx')
+        self.assertEqual(self.cache.get(100).name, 'nginx')
+        self.assertEqual(self.cache.get_stats()['revalidations'], 1)
+
+        FakeProcess.table[100] = (1500.0, 'postgres')
+        metadata = self.cache.get(100)
+        self.assertEqual((metadata.name, metadata.create_time), ('postgres', 1500.0))
+        self.assertEqual(self.cache.get_stats()['pid_reuses'], 1)
+
+    def test_exited_process(self):
+        """Test an exited process gives None and is forgotten"""
+        self.cache.revalidate_after = 0
+        self.cache.get(100)
+        del FakeProcess.table[100]
+        self.assertIsNone(self.cache.get(100))
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get(None))
+
+    def test_prune_expired(self):
+        """Test entries not looked up recently are dropped"""
+        self.cache.get(100)
+        self.cache.expire_after = -1
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestSummarizeConnections(unittest.TestCase):
+    """Test aggregating connections by process and remote endpoint"""
+
+    def setUp(self):
+        """Set up test environment"""
+        FakeProcess.table = {100: (1000.0, 'nginx'), 200: (2000.0, 'chrome')}
+        FakeProcess.constructed = 0
+        patcher = mock.patch.object(process_cache.psutil, 'Process', FakeProcess)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ProcessMetadataCache(revalidate_after=60)
+
+    def test_summaries(self):
+        """Test connections collapse into one entry per process with busiest remotes first"""
+        connections = [connection(100, 40000 + i, '192.0.2.10', 5432) for i in range(1000)]
+        connections += [connection(100, 50000, '192.0.2.11', 6379)]
+        connections += [connection(200, 50001, '198.51.100.1', 443)]
+        connections += [connection(100, 80, None, None, status='LISTEN')]
+        connections += [connection(None, 50002, '198.51.100.2', 22)]
+
+        summaries = summarize_connections(connections, cache=self.cache, max_remotes=5)
+        self.assertEqual([s['process_name'] for s in summaries], ['nginx', 'unknown'])
+        nginx = summaries[0]
+        self.assertEqual(nginx['connection_count'], 1001)
+        self.assertEqual(nginx['remote_endpoint_count'], 2)
+        self.assertEqual(nginx['remote_endpoints'][0], {'remote_address': '192.0.2.10:5432', 'connections': 1000})
+        self.assertEqual(len(nginx['local_ports']), 5)
+        # One process read per PID, not per connection
+        self.assertEqual(FakeProcess.constructed, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
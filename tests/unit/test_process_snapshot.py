@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Process Snapshot
+Tests the shared per-cycle process table
+"""
+
+import unittest
+import sys
+import os
+import threading
+from collections import namedtuple
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules import process_snapshot
+from modules.process_snapshot import ProcessSnapshot, get_process_snapshot, invalidate_process_snapshot
+
+pcputimes = namedtuple('pcputimes', ['user', 'system'])
+
+
+class FakeProcess:
+    """Stand-in for psutil.Process with pre-filled info"""
+
+    def __init__(self, **info):
+        self.info = info
+
+
+def fake_process_table(mysqld_cpu=120.0, mysqld_create_time=2.0):
+    return [
+        FakeProcess(pid=1, name='systemd', username='root', cpu_times=pcputimes(4.0, 1.0), memory_percent=0.1,
+                    create_time=1.0, status='sleeping', num_threads=1, cmdline=['/sbin/init']),
+        FakeProcess(pid=20, name='mysqld', username='mysql', cpu_times=pcputimes(mysqld_cpu, 0.0),
+                    memory_percent=8.0, create_time=mysqld_create_time, status='running', num_threads=30,
+                    cmdline=['mysqld', '--port=3306']),
+        FakeProcess(pid=30, name='nginx', username=None, cpu_times=None, memory_percent=1.0,
+                    create_time=3.0, status='sleeping', num_threads=4, cmdline=None),
+    ]
+
+
+class TestProcessSnapshot(unittest.TestCase):
+    """Test snapshot capture and queries"""
+
+    def setUp(self):
+        """Set up test environment"""
+        invalidate_process_snapshot()
+        with mock.patch('psutil.process_iter', return_value=fake_process_table()), \
+                mock.patch.object(process_snapshot.time, 'time', return_value=1001.0):
+            self.snapshot = ProcessSnapshot.capture()
+
+    def tearDown(self):
+        invalidate_process_snapshot()
+
+    def test_columns_and_records(self):
+        """Test attributes are stored as columns"""
+        self.assertEqual(len(self.snapshot), 3)
+        self.assertEqual(self.snapshot.column('pid'), [1, 20, 30])
+        self.assertEqual(self.snapshot.records(['pid', 'name'])[2], {'pid': 30, 'name': 'nginx'})
+
+    def test_queries(self):
+        """Test top, filter, counts and totals"""
+        self.assertEqual([p['name'] for p in self.snapshot.top('cpu_percent', 2, ['name'])], ['mysqld', 'systemd'])
+        self.assertEqual(self.snapshot.filter_by_name(lambda name: 'sql' in name, ['pid']), [{'pid': 20}])
+        self.assertEqual(self.snapshot.count_by('status'), {'sleeping': 2, 'running': 1})
+        self.assertEqual(self.snapshot.total('cpu_percent'), 12.5)
+        self.assertTrue(self.snapshot.has_name_containing(['NGINX'.lower()]))
+
+    def test_cpu_against_previous_snapshot(self):
+        """Test CPU is the delta since the previous snapshot, and reused PIDs start afresh"""
+        # The first snapshot averages since process start: mysqld used 120s of CPU in 999s
+        self.assertEqual(self.snapshot.column('cpu_percent'), [0.5, 12.0, None])
+
+        with mock.patch('psutil.process_iter', return_value=fake_process_table(mysqld_cpu=125.0)), \
+                mock.patch.object(process_snapshot.time, 'time', return_value=1011.0), \
+                mock.patch.object(process_snapshot.time, 'monotonic', return_value=self.snapshot.monotonic + 10):
+            second = ProcessSnapshot.capture(previous=self.snapshot)
+        self.assertEqual(second.column('cpu_percent')[:2], [0.0, 50.0])
+
+        # PID 20 now belongs to a process started at 1001 that used 5s of CPU
+        with mock.patch('psutil.process_iter',
+                        return_value=fake_process_table(mysqld_cpu=5.0, mysqld_create_time=1001.0)), \
+                mock.patch.object(process_snapshot.time, 'time', return_value=1011.0), \
+                mock.patch.object(process_snapshot.time, 'monotonic', return_value=self.snapshot.monotonic + 10):
+            reused = ProcessSnapshot.capture(previous=self.snapshot)
+        self.assertEqual(reused.column('cpu_percent')[1], 50.0)
+
+    def test_shared_snapshot_keeps_cpu_baseline(self):
+        """Test invalidation does not lose the baseline for the next snapshot"""
+        with mock.patch('psutil.process_iter', side_effect=lambda *a, **k: fake_process_table()):
+            first = get_process_snapshot()
+            invalidate_process_snapshot()
+            with mock.patch.object(ProcessSnapshot, 'capture', wraps=ProcessSnapshot.capture) as capture:
+                get_process_snapshot()
+        self.assertIs(capture.call_args.kwargs['previous'], first)
+
+    def test_shared_snapshot_scans_once(self):
+        """Test concurrent callers within max_age share one scan"""
+        with mock.patch('psutil.process_iter', side_effect=lambda *a, **k: fake_process_table()) as process_iter:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(get_process_snapshot())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(process_iter.call_count, 1)
+            self.assertTrue(all(result is results[0] for result in results))
+
+            get_process_snapshot(max_age=-1)
+            self.assertEqual(process_iter.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
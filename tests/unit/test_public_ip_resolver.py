@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Public IP Resolver
+Tests hedged lookups, caching and invalidation
+"""
+
+import unittest
+import sys
+import os
+import time
+import json
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules import public_ip_resolver
+from modules.public_ip_resolver import PublicIPResolver, parse_ip_response, normalize_geo
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+
+GEO = {'city': 'Pune', 'region': 'Maharashtra', 'country': 'India', 'lat': 18.5, 'lon': 73.8, 'isp': 'Example ISP'}
+
+
+def fake_get(url, timeout=None, headers=None):
+    if 'slow' in url:
+        time.sleep(2)
+        return FakeResponse(200, '203.0.113.99')
+    if 'broken' in url:
+        raise ConnectionError('unreachable')
+    if 'geo' in url:
+        return FakeResponse(200, json.dumps(GEO))
+    return FakeResponse(200, json.dumps({'ip': '203.0.113.7'}))
+
+
+class TestParsing(unittest.TestCase):
+    """Test service response parsing"""
+
+    def test_parse_ip_response(self):
+        """Test JSON, plain text and invalid bodies"""
+        self.assertEqual(parse_ip_response('{"origin": "203.0.113.7, 10.0.0.1"}'), '203.0.113.7')
+        self.assertEqual(parse_ip_response('203.0.113.7\n'), '203.0.113.7')
+        self.assertIsNone(parse_ip_response('<html>blocked</html>'))
+
+    def test_normalize_geo(self):
+        """Test geolocation fields from different services are normalized"""
+        geo = normalize_geo({'city': 'Pune', 'region': 'MH', 'country': 'IN', 'loc': '18.5,73.8', 'org': 'AS1'})
+        self.assertEqual(geo['location'], 'Pune, MH, IN')
+        self.assertEqual(geo['latitude'], '18.5')
+        self.assertIsNone(normalize_geo({'status': 'fail'}))
+
+
+class TestPublicIPResolver(unittest.TestCase):
+    """Test hedged lookups and caching"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.fingerprint = (('192.168.1.20',), '0101A8C0')
+        self.patches = [
+            mock.patch.object(public_ip_resolver.requests, 'get', side_effect=fake_get),
+            mock.patch.object(public_ip_resolver, 'get_network_fingerprint', side_effect=lambda: self.fingerprint)
+        ]
+        self.get = self.patches[0].start()
+        self.patches[1].start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def test_first_good_answer_wins(self):
+        """Test a slow or broken service does not delay the result"""
+        resolver = PublicIPResolver(
+            timeout=3,
+            ip_services=['https://slow.test', 'https://broken.test', 'https://fast.test'],
+            geo_services=['https://geo.test/{ip}']
+        )
+        start = time.perf_counter()
+        result = resolver.resolve()
+
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertEqual(result['public_ip'], '203.0.113.7')
+        self.assertEqual(result['source'], 'https://fast.test')
+        self.assertEqual(result['geo']['location'], 'Pune, Maharashtra, India')
+        self.assertFalse(result['cached'])
+
+    def test_cached_until_network_changes(self):
+        """Test the cache is reused until the interface or gateway changes"""
+        resolver = PublicIPResolver(ip_services=['https://fast.test'], geo_services=['https://geo.test/{ip}'])
+        resolver.resolve()
+        calls = self.get.call_count
+
+        self.assertTrue(resolver.resolve()['cached'])
+        self.assertEqual(self.get.call_count, calls)
+
+        self.fingerprint = (('10.0.0.5',), '0100000A')
+        self.assertFalse(resolver.resolve()['cached'])
+        self.assertEqual(resolver.stats['invalidations'], 1)
+
+    def test_negative_cache(self):
+        """Test failures are remembered so offline hosts fail fast"""
+        resolver = PublicIPResolver(ip_services=['https://broken.test'], negative_ttl=300)
+        self.assertIsNone(resolver.resolve()['public_ip'])
+        calls = self.get.call_count
+
+        result = resolver.resolve()
+
+        self.assertIsNone(result['public_ip'])
+        self.assertTrue(result['cached'])
+        self.assertEqual(self.get.call_count, calls)
+        self.assertEqual(resolver.stats['negative_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Delta Reporting
+Tests JSON patch computation and incremental report fallback logic
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from report_delta import compute_delta, apply_delta
+from api_client import APIClient
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = str(data)
+
+    def json(self):
+        if self._data is None:
+            raise json.JSONDecodeError("No JSON", "", 0)
+        return self._data
+
+
+class TestComputeDelta(unittest.TestCase):
+    """Test JSON patch generation"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.snapshot = {
+            'hostname': 'test-host',
+            'timestamp': '2024-01-01T00:00:00Z',
+            'software': [{'name': f'pkg{i}', 'version': '1.0'} for i in range(200)],
+            'network': {'public_ip': '1.2.3.4', 'dns_servers': ['8.8.8.8']}
+        }
+
+    def test_identical_documents_have_no_delta(self):
+        """Test unchanged snapshots produce no operations"""
+        self.assertEqual(compute_delta(self.snapshot, self.snapshot), [])
+
+    def test_single_insert_in_long_list(self):
+        """Test an inserted package is a single add operation"""
+        new = apply_delta(self.snapshot, [])
+        new['software'].insert(50, {'name': 'new-pkg', 'version': '2.0'})
+
+        operations = compute_delta(self.snapshot, new)
+
+        self.assertEqual(operations, [{'op': 'add', 'path': '/software/50', 'value': {'name': 'new-pkg', 'version': '2.0'}}])
+        self.assertEqual(apply_delta(self.snapshot, operations), new)
+
+    def test_round_trip_with_mixed_changes(self):
+        """Test applying the delta reproduces the new document"""
+        new = apply_delta(self.snapshot, [])
+        new['timestamp'] = '2024-01-01T00:10:00Z'
+        del new['software'][10:13]
+        new['software'][0]['version'] = '1.1'
+        new['network']['gateway'] = '10.0.0.1'
+        del new['network']['dns_servers']
+        new['key/with~chars'] = True
+
+        operations = compute_delta(self.snapshot, new)
+
+        self.assertEqual(apply_delta(self.snapshot, operations), new)
+        self.assertLess(len(operations), 10)
+
+
+class TestDeltaReporting(unittest.TestCase):
+    """Test APIClient incremental reporting"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.client = APIClient('http://itsm.test', 'token', report_mode='delta', retry_attempts=1, compression='identity')
+        self.report = {'hostname': 'test-host', 'software': [{'name': f'pkg{i}'} for i in range(100)]}
+
+    def _post(self, *responses):
+        return mock.patch.object(self.client.session, 'request', side_effect=list(responses))
+
+    def test_first_report_is_full_then_delta(self):
+        """Test deltas are sent after an acknowledged full snapshot"""
+        with self._post(FakeResponse(200, {'message': 'ok'})) as request:
+            self.assertTrue(self.client.report_system_info(self.report))
+        self.assertTrue(request.call_args.kwargs['url'].endswith('/api/report'))
+
+        self.report['software'].append({'name': 'extra'})
+        with self._post(FakeResponse(200, {'acknowledged_sequence': 2})) as request:
+            self.assertTrue(self.client.report_system_info(self.report))
+
+        body = json.loads(request.call_args.kwargs['data'])
+        self.assertTrue(request.call_args.kwargs['url'].endswith('/api/report/delta'))
+        self.assertEqual(body['base_sequence'], 1)
+        self.assertEqual(body['sequence'], 2)
+        self.assertEqual(len(body['patch']), 1)
+        self.assertEqual(self.client.acked_sequence, 2)
+
+    def test_sequence_break_falls_back_to_full(self):
+        """Test a 409 from the server triggers a full snapshot"""
+        with self._post(FakeResponse(200, {})):
+            self.client.report_system_info(self.report)
+
+        self.report['software'].pop()
+        with self._post(FakeResponse(409, {'expected_sequence': 7}), FakeResponse(200, {})) as request:
+            self.assertTrue(self.client.report_system_info(self.report))
+
+        self.assertTrue(request.call_args.kwargs['url'].endswith('/api/report'))
+        self.assertEqual(self.client.report_mode, 'delta')
+
+    def test_unacknowledged_delta_disables_delta_mode(self):
+        """Test servers without delta support get full reports"""
+        with self._post(FakeResponse(200, {})):
+            self.client.report_system_info(self.report)
+
+        self.report['software'].pop()
+        with self._post(FakeResponse(200, None), FakeResponse(200, {})) as request:
+            self.assertTrue(self.client.report_system_info(self.report))
+
+        self.assertTrue(request.call_args.kwargs['url'].endswith('/api/report'))
+        self.assertEqual(self.client.report_mode, 'full')
+
+    def test_server_can_request_full_snapshot(self):
+        """Test full_snapshot_required forces the next report to be full"""
+        with self._post(FakeResponse(200, {'full_snapshot_required': True})):
+            self.client.report_system_info(self.report)
+
+        with self._post(FakeResponse(200, {})) as request:
+            self.client.report_system_info(self.report)
+
+        self.assertTrue(request.call_args.kwargs['url'].endswith('/api/report'))
+
+
+if __name__ == '__main__':
+    unittest.main()
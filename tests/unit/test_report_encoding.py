@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Report Encoding
+Tests payload compression, format fallback and transport metrics
+"""
+
+import unittest
+import sys
+import os
+import gzip
+import json
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+import report_encoding
+from report_encoding import encode_payload, parse_accept_encoding
+from api_client import APIClient
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = str(data)
+        self.headers = headers or {}
+
+    def json(self):
+        if self._data is None:
+            raise json.JSONDecodeError("No JSON", "", 0)
+        return self._data
+
+
+class TestEncodePayload(unittest.TestCase):
+    """Test payload encoding"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.payload = {
+            'hostname': 'test-host',
+            'software': [{'name': f'package-{i}', 'version': '1.0.0'} for i in range(500)]
+        }
+
+    def test_gzip_compression(self):
+        """Test gzip bodies decode back to the same JSON"""
+        body, headers, metrics = encode_payload(self.payload, 'json', 'gzip')
+
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(body)), self.payload)
+        self.assertLess(metrics['encoded_bytes'], metrics['raw_bytes'] / 5)
+        self.assertGreaterEqual(metrics['encode_ms'], 0)
+
+    def test_small_bodies_are_not_compressed(self):
+        """Test payloads under the threshold are sent as-is"""
+        body, headers, metrics = encode_payload({'hostname': 'h'}, 'json', 'gzip')
+
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(metrics['compression'], 'identity')
+        self.assertEqual(json.loads(body), {'hostname': 'h'})
+
+    def test_unavailable_encoders_fall_back(self):
+        """Test missing optional encoders fall back to JSON and identity"""
+        with mock.patch.object(report_encoding, 'msgpack', None), \
+                mock.patch.object(report_encoding, 'zstandard', None):
+            body, headers, metrics = encode_payload(self.payload, 'msgpack', 'zstd')
+
+        self.assertEqual(headers, {'Content-Type': 'application/json'})
+        self.assertEqual(metrics['format'], 'json')
+        self.assertEqual(json.loads(body), self.payload)
+
+    def test_parse_accept_encoding(self):
+        """Test Accept-Encoding parsing honours q=0"""
+        self.assertEqual(parse_accept_encoding('gzip, zstd;q=0, identity;q=0.5'), ['gzip', 'identity'])
+        self.assertEqual(parse_accept_encoding(None), [])
+
+
+class TestClientEncodingFallback(unittest.TestCase):
+    """Test APIClient encoding negotiation"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.client = APIClient('http://itsm.test', 'token', retry_attempts=1, compression='gzip')
+        self.report = {'hostname': 'test-host', 'software': [{'name': f'pkg{i}'} for i in range(200)]}
+
+    def test_refused_encoding_falls_back_to_plain_json(self):
+        """Test a 415 response makes the client resend as plain JSON"""
+        responses = [FakeResponse(415, {'message': 'unsupported'}), FakeResponse(200, {})]
+        with mock.patch.object(self.client.session, 'request', side_effect=responses) as request:
+            self.assertTrue(self.client.report_system_info(self.report))
+
+        retry_kwargs = request.call_args.kwargs
+        self.assertNotIn('Content-Encoding', retry_kwargs['headers'])
+        self.assertEqual(json.loads(retry_kwargs['data']), self.report)
+        self.assertEqual(self.client.compression, 'identity')
+
+    def test_transport_metrics_are_recorded(self):
+        """Test raw vs. encoded size is tracked per request"""
+        with mock.patch.object(self.client.session, 'request', return_value=FakeResponse(200, {})):
+            self.client.report_system_info(self.report)
+
+        metrics = self.client.get_transport_metrics()
+        self.assertEqual(metrics['requests'], 1)
+        self.assertEqual(metrics['last_request']['compression'], 'gzip')
+        self.assertLess(metrics['encoded_bytes'], metrics['raw_bytes'])
+        self.assertLess(metrics['overall_ratio'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Inventory Diffing
+Tests inventory fingerprints, sorted-merge diffs and acknowledged-base reporting
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from report_inventory import InventoryTracker, diff_inventory, sort_inventory, fingerprint_inventory
+from api_client import APIClient
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = str(data)
+        self.headers = {}
+
+    def json(self):
+        if self._data is None:
+            raise json.JSONDecodeError("No JSON", "", 0)
+        return self._data
+
+
+def packages(count, upgraded=()):
+    return [{'name': f'pkg{i}', 'version': '2.0' if i in upgraded else '1.0', 'package_manager': 'APT'}
+            for i in range(count)]
+
+
+class TestInventoryDiff(unittest.TestCase):
+    """Test fingerprints and sorted-merge diffs"""
+
+    def test_fingerprint_ignores_order(self):
+        """Test the same packages in another order have the same fingerprint"""
+        entries = packages(50)
+        self.assertEqual(fingerprint_inventory(sort_inventory(entries)),
+                         fingerprint_inventory(sort_inventory(list(reversed(entries)))))
+
+    def test_fingerprint_per_set(self):
+        """Test only the set containing a change gets a new fingerprint"""
+        snap = {'name': 'firefox', 'version': '130', 'package_manager': 'Snap'}
+        before = fingerprint_inventory(sort_inventory(packages(10) + [snap]))[1]
+        after = fingerprint_inventory(sort_inventory(packages(10, upgraded={3}) + [snap]))[1]
+        self.assertEqual(before['Snap'], after['Snap'])
+        self.assertNotEqual(before['APT'], after['APT'])
+
+    def test_added_removed_changed(self):
+        """Test the merge classifies each difference once"""
+        old = packages(10)
+        new = packages(10, upgraded={4})[1:] + [{'name': 'zlib', 'version': '1.3', 'package_manager': 'APT'}]
+
+        changes = diff_inventory(sort_inventory(old), sort_inventory(new))
+        self.assertEqual(changes['removed'], [{'package_manager': 'APT', 'name': 'pkg0'}])
+        self.assertEqual([entry['name'] for entry in changes['added']], ['zlib'])
+        self.assertEqual(len(changes['changed']), 1)
+        self.assertEqual((changes['changed'][0]['old_version'], changes['changed'][0]['new_version']), ('1.0', '2.0'))
+
+    def test_tracker_sends_full_then_unchanged(self):
+        """Test the base only moves on acknowledgement"""
+        tracker = InventoryTracker(paths=['/software'])
+        first = tracker.compact({'software': packages(100)})
+        self.assertEqual(first['inventory']['sections']['/software']['sent'], 'full')
+        self.assertEqual(len(first['software']), 100)
+
+        # Not acknowledged yet, so still full
+        self.assertIsInstance(tracker.compact({'software': packages(100)})['software'], list)
+        tracker.acknowledge()
+
+        unchanged = tracker.compact({'software': packages(100)})
+        self.assertEqual(unchanged['software'], {'fingerprint': first['inventory']['sections']['/software']['fingerprint'],
+                                                 'unchanged': True})
+        changed = tracker.compact({'software': packages(100, upgraded={7})})
+        self.assertEqual(changed['software']['changed'][0]['name'], 'pkg7')
+        self.assertTrue(tracker.is_compacted(changed))
+
+
+class TestInventoryReporting(unittest.TestCase):
+    """Test APIClient inventory diff reporting"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.client = APIClient('http://itsm.test', 'token', inventory_mode='diff', retry_attempts=1,
+                                compression='identity')
+        self.report = {'hostname': 'test-host', 'software': packages(300)}
+
+    def _post(self, *responses):
+        return mock.patch.object(self.client.session, 'request', side_effect=list(responses))
+
+    def test_unchanged_inventory_sends_fingerprint(self):
+        """Test the second report carries only the fingerprint once acknowledged"""
+        with self._post(FakeResponse(200, {})):
+            self.assertTrue(self.client.report_system_info(self.report))
+
+        fingerprint = self.client.inventory.acked['/software'][0]
+        inventory_fingerprint = self.client.inventory.compact(self.report)['inventory']['fingerprint']
+        with self._post(FakeResponse(200, {'inventory_fingerprint': inventory_fingerprint})) as request:
+            self.assertTrue(self.client.report_system_info(self.report))
+
+        body = json.loads(request.call_args.kwargs['data'])
+        self.assertEqual(body['software'], {'fingerprint': fingerprint, 'unchanged': True})
+        self.assertEqual(self.client.inventory_mode, 'diff')
+
+    def test_unacknowledged_inventory_falls_back_to_full(self):
+        """Test servers that do not echo the fingerprint get full lists"""
+        with self._post(FakeResponse(200, {})):
+            self.client.report_system_info(self.report)
+
+        with self._post(FakeResponse(200, {}), FakeResponse(200, {})) as request:
+            self.assertTrue(self.client.report_system_info(self.report))
+
+        body = json.loads(request.call_args.kwargs['data'])
+        self.assertEqual(len(body['software']), 300)
+        self.assertEqual(self.client.inventory_mode, 'full')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Report Outbox
+Tests durable queueing, size capping and background replay
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from report_outbox import ReportOutbox, OutboxSender
+
+
+class FakeClient:
+    """Stand-in for APIClient that replays scripted results"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.sent = []
+        self.last_status_code = None
+
+    def report_system_info(self, payload):
+        success, self.last_status_code = self.results.pop(0)
+        self.sent.append(payload)
+        return success
+
+
+class TestReportOutbox(unittest.TestCase):
+    """Test the on-disk outbox"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'outbox', 'reports.db')
+        self.outbox = ReportOutbox(self.path)
+
+    def tearDown(self):
+        self.outbox.close()
+        self.temp_dir.cleanup()
+
+    def test_entries_survive_reopen(self):
+        """Test queued reports persist across restarts in order"""
+        self.outbox.enqueue({'seq': 1})
+        self.outbox.enqueue({'seq': 2})
+        self.outbox.close()
+
+        self.outbox = ReportOutbox(self.path)
+        batch = self.outbox.peek_batch()
+
+        self.assertEqual([payload['seq'] for _, payload, _ in batch], [1, 2])
+
+    def test_size_cap_drops_oldest(self):
+        """Test the outbox drops the oldest reports when over its cap"""
+        self.outbox.max_bytes = 100
+        for seq in range(5):
+            self.outbox.enqueue({'seq': seq, 'data': 'x' * 30})
+
+        batch = self.outbox.peek_batch()
+
+        self.assertEqual(batch[-1][1]['seq'], 4)
+        self.assertLessEqual(self.outbox.get_stats()['bytes'], 100)
+        self.assertLess(len(batch), 5)
+
+
+class TestOutboxSender(unittest.TestCase):
+    """Test background replay of queued reports"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.outbox = ReportOutbox(os.path.join(self.temp_dir.name, 'reports.db'))
+        for seq in range(3):
+            self.outbox.enqueue({'seq': seq})
+
+    def tearDown(self):
+        self.outbox.close()
+        self.temp_dir.cleanup()
+
+    def test_drain_delivers_in_order(self):
+        """Test a batch is delivered oldest first and removed"""
+        client = FakeClient([(True, 200)] * 3)
+        sender = OutboxSender(self.outbox, client)
+
+        self.assertTrue(sender.drain_once())
+        self.assertEqual([payload['seq'] for payload in client.sent], [0, 1, 2])
+        self.assertEqual(self.outbox.get_stats()['pending'], 0)
+        self.assertIsNone(sender.drain_once())
+
+    def test_transient_failure_keeps_report(self):
+        """Test a failed delivery stops the batch and backs off"""
+        client = FakeClient([(True, 200), (False, 503)])
+        sender = OutboxSender(self.outbox, client, base_delay=2, max_delay=60)
+
+        self.assertFalse(sender.drain_once())
+
+        batch = self.outbox.peek_batch()
+        self.assertEqual([payload['seq'] for _, payload, _ in batch], [1, 2])
+        self.assertEqual(batch[0][2], 1)
+        self.assertEqual(sender.consecutive_failures, 1)
+        self.assertLessEqual(sender._next_delay(), 60)
+
+    def test_rejected_payload_is_dropped(self):
+        """Test reports the server will never accept are not retried"""
+        client = FakeClient([(False, 400), (True, 200), (True, 200)])
+        sender = OutboxSender(self.outbox, client)
+
+        self.assertTrue(sender.drain_once())
+        self.assertEqual(sender.dropped, 1)
+        self.assertEqual(sender.delivered, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
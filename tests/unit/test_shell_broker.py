@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent Shell Broker
+Tests command framing, batching, output caps, timeouts and session recycling
+"""
+
+import unittest
+import sys
+import os
+import subprocess
+import shutil
+import threading
+import time
+from unittest import mock
+
+import psutil
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+from modules import shell_broker
+from modules.shell_broker import ShellBroker, ShellSessionError
+
+
+@unittest.skipUnless(shutil.which('bash'), "bash is not installed")
+class TestShellBroker(unittest.TestCase):
+    """Test running commands through persistent bash sessions"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.broker = ShellBroker(pool_size=1)
+
+    def tearDown(self):
+        self.broker.close()
+
+    def test_exit_code_and_streams(self):
+        """Test stdout, stderr and the exit status are kept apart"""
+        result = self.broker.run('echo out; echo err >&2; exit 3')
+        self.assertEqual(result.returncode, 3)
+        self.assertEqual(result.stdout, 'out\n')
+        self.assertEqual(result.stderr, 'err\n')
+
+    def test_session_is_reused(self):
+        """Test consecutive commands share one shell process"""
+        for index in range(20):
+            self.assertEqual(self.broker.run(f'echo {index}').stdout, f'{index}\n')
+        self.assertEqual(self.broker.get_stats()['sessions_started'], 1)
+
+    def test_batch_isolates_commands(self):
+        """Test cd, syntax errors and missing newlines do not leak into later commands"""
+        results = self.broker.run_batch(['cd /', 'if then', 'printf no-newline', 'pwd'])
+        self.assertEqual(results[0].returncode, 0)
+        self.assertNotEqual(results[1].returncode, 0)
+        self.assertEqual(results[2].stdout, 'no-newline')
+        self.assertNotEqual(results[3].stdout, '/\n')
+
+    def test_output_is_capped(self):
+        """Test output beyond max_output is dropped and flagged"""
+        result = self.broker.run('head -c 100000 /dev/zero | tr "\\0" x', max_output=1000)
+        self.assertEqual(len(result.stdout), 1000)
+        self.assertTrue(result.truncated)
+        self.assertEqual(self.broker.run('echo next').stdout, 'next\n')
+
+    def test_timeout_recycles_session(self):
+        """Test a command that overruns raises TimeoutExpired and the session is replaced"""
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.broker.run('sleep 5', timeout=0.3)
+
+        results = self.broker.run_batch(['sleep 5', 'echo skipped'], timeout=0.3)
+        self.assertTrue(results[0].timed_out)
+        self.assertEqual(results[1].returncode, -1)
+
+        self.assertEqual(self.broker.run('echo ok').stdout, 'ok\n')
+        stats = self.broker.get_stats()
+        self.assertEqual(stats['timeouts'], 2)
+        self.assertEqual(stats['sessions_started'], 3)
+
+    def test_timeout_kills_command_children(self):
+        """Test a timed-out command's subshell and children die with the session"""
+        results = self.broker.run_batch(['sleep 31.7 && echo hi'], timeout=0.3)
+        self.assertTrue(results[0].timed_out)
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            sleepers = [proc for proc in psutil.process_iter(['cmdline'])
+                        if proc.info['cmdline'] == ['sleep', '31.7']]
+            pumps = [thread for thread in threading.enumerate() if thread.name.startswith('shell-bash-')]
+            if not sleepers and not pumps:
+                break
+            time.sleep(0.05)
+        self.assertEqual(sleepers, [])
+        self.assertEqual(pumps, [])
+
+    def test_dead_session_raises(self):
+        """Test a session that dies mid-command raises instead of returning a failed result"""
+        with self.assertRaises(ShellSessionError):
+            self.broker.run('kill -9 $$; sleep 5')
+        results = self.broker.run_batch(['kill -9 $$; sleep 5'])
+        self.assertTrue(results[0].session_failed)
+        self.assertEqual(self.broker.run('echo ok').stdout, 'ok\n')
+
+    def test_run_command_falls_back_when_session_dies(self):
+        """Test run_command runs the probe as its own process if the session fails"""
+        with mock.patch.object(shell_broker, '_broker', self.broker), \
+                mock.patch.object(self.broker, 'run', side_effect=ShellSessionError('bash session exited with -9')):
+            result = shell_broker.run_command(['echo', 'fallback'])
+        self.assertEqual((result.returncode, result.stdout), (0, 'fallback\n'))
+
+    def test_recycled_after_max_commands(self):
+        """Test sessions are replaced once they have run max_commands"""
+        broker = ShellBroker(pool_size=1, max_commands=5)
+        try:
+            for _ in range(12):
+                broker.run('true')
+            self.assertEqual(broker.get_stats()['sessions_started'], 3)
+        finally:
+            broker.close()
+
+    def test_disabled_pool(self):
+        """Test a pool size of 0 reports no shell available"""
+        self.assertFalse(ShellBroker(pool_size=0).available('bash'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent System Collector Report Sections
+Tests per-section refresh schedules and change-event invalidation
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+import system_collector
+from system_collector import SystemCollector, REPORT_SECTION_INTERVALS
+
+
+class TestReportSections(unittest.TestCase):
+    """Test reports built from scheduled sections"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.collector = SystemCollector.__new__(SystemCollector)
+        self.collector.is_windows = False
+        self.collector.use_modular = False
+        self.collector.section_intervals = dict(REPORT_SECTION_INTERVALS)
+        self.collector._sections = {}
+        self.collector._section_collected = {}
+        self.calls = {}
+        for method in ('_get_os_info', '_get_network_info', '_get_hardware_info', '_get_storage_info',
+                       '_get_software_info', '_get_running_processes', '_get_usb_devices',
+                       '_get_virtualization_info', '_get_system_health', '_get_security_info',
+                       '_get_current_user', '_get_filtered_tcp_ports'):
+            setattr(self.collector, method, self._recorder(method))
+
+    def _recorder(self, method):
+        def collect():
+            self.calls[method] = self.calls.get(method, 0) + 1
+            return {'collected': self.calls[method]}
+        return collect
+
+    def _report_at(self, now):
+        with mock.patch.object(system_collector.time, 'time', return_value=now):
+            return self.collector.collect_report()
+
+    def test_sections_refresh_on_their_schedule(self):
+        """Test slow sections are reused until their interval elapses"""
+        first = self._report_at(1000.0)
+        self.assertEqual(first['software'], {'collected': 1})
+        self.assertIsNone(first['windows_updates'])
+
+        second = self._report_at(1600.0)
+        self.assertEqual(self.calls['_get_software_info'], 1)
+        self.assertEqual(second['software'], {'collected': 1})
+        self.assertEqual(second['processes'], {'collected': 2})
+        self.assertEqual(self.calls['_get_network_info'], 2)
+        self.assertIn('software', second['_collection_status']['cached_sections'])
+        self.assertIn('hardware', second['_collection_status']['fresh_sections'])
+
+        self._report_at(1000.0 + 21600)
+        self.assertEqual(self.calls['_get_software_info'], 2)
+
+    def test_change_event_refreshes_only_affected_sections(self):
+        """Test a USB event refreshes USB and storage without a full collection"""
+        self._report_at(1000.0)
+        self.collector.mark_modules_dirty(['usb'])
+        report = self._report_at(1060.0)
+        self.assertEqual(sorted(report['_collection_status']['fresh_sections']),
+                         ['hardware', 'processes', 'storage', 'system_health', 'usb_devices'])
+        self.assertEqual(self.calls['_get_software_info'], 1)
+        self.assertEqual(self.calls['_get_security_info'], 1)
+
+    def test_collect_all_refreshes_every_section(self):
+        """Test on-demand collection still refreshes everything and seeds the schedule"""
+        info = self.collector.collect_all()
+        self.assertNotIn('_collection_status', info)
+        self.assertEqual(self.calls['_get_virtualization_info'], 1)
+        self.collector.collect_report()
+        self.assertEqual(self.calls['_get_virtualization_info'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Agent WebSocket Command Execution
+Tests background dispatch, concurrency limits, timeouts and cancellation
+"""
+
+import unittest
+import sys
+import os
+import json
+import time
+import asyncio
+import threading
+from unittest import mock
+
+# Add agent path to import modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../Agent'))
+
+import agent_websocket_client
+
+
+class FakeWebSocket:
+    """Records messages sent by the agent"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, message):
+        self.messages.append(json.loads(message))
+
+    def of_type(self, message_type):
+        return [message for message in self.messages if message['type'] == message_type]
+
+
+class TestWebSocketCommands(unittest.IsolatedAsyncioTestCase):
+    """Test non-blocking command handling"""
+
+    async def asyncSetUp(self):
+        """Set up test environment"""
+        with mock.patch.object(agent_websocket_client, 'SystemCollector'):
+            self.agent = agent_websocket_client.ITSMAgent('http://itsm.test', agent_id='agent_test')
+        self.agent.websocket = FakeWebSocket()
+        self.agent.progress_interval = 0.05
+        self.release = threading.Event()
+        self.agent.system_collector.collect_all.side_effect = self._slow_collect
+
+    async def asyncTearDown(self):
+        self.release.set()
+        self.agent.command_executor.shutdown(wait=True)
+
+    def _slow_collect(self):
+        self.release.wait(timeout=5)
+        return {'hostname': 'test-host'}
+
+    async def _wait_for(self, predicate, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                self.fail('condition not met in time')
+            await asyncio.sleep(0.01)
+
+    async def test_alert_push_capability_follows_config(self):
+        """Test alertPush is only advertised when alert push is enabled"""
+        self.assertFalse(self.agent.push_alerts)
+        self.assertNotIn('alertPush', self.agent.capabilities)
+
+        def enable_push(agent):
+            agent.push_alerts = True
+            agent.alert_sample_interval = 5.0
+
+        with mock.patch.object(agent_websocket_client, 'SystemCollector'), \
+                mock.patch.object(agent_websocket_client.ITSMAgent, 'load_alert_config', enable_push):
+            agent = agent_websocket_client.ITSMAgent('http://itsm.test', agent_id='agent_push')
+        self.addCleanup(agent.command_executor.shutdown)
+        self.assertIn('alertPush', agent.capabilities)
+
+    async def test_long_command_does_not_block_messages(self):
+        """Test other commands are answered while a collection runs"""
+        await self.agent.handle_message({'type': 'command', 'command': 'collectSystemInfo', 'requestId': 'slow'})
+        await self.agent.handle_message({'type': 'command', 'command': 'getADStatus', 'requestId': 'fast'})
+
+        await self._wait_for(lambda: self.agent.websocket.of_type('command-response'))
+        first = self.agent.websocket.of_type('command-response')[0]
+        self.assertEqual(first['requestId'], 'fast')
+
+        await self._wait_for(lambda: len(self.agent.websocket.of_type('command-progress')) >= 3)
+        self.release.set()
+        await self._wait_for(lambda: len(self.agent.websocket.of_type('command-response')) == 2)
+        self.assertEqual(self.agent.active_commands, {})
+
+    async def test_concurrency_limit_queues_commands(self):
+        """Test commands beyond the limit wait for a free slot"""
+        self.agent.command_slots = asyncio.Semaphore(1)
+        await self.agent.handle_message({'type': 'command', 'command': 'collectSystemInfo', 'requestId': 'a'})
+        await asyncio.sleep(0.05)
+        await self.agent.handle_message({'type': 'command', 'command': 'collectSystemInfo', 'requestId': 'b'})
+
+        await self._wait_for(lambda: any(
+            message['stage'] == 'queued' and message['requestId'] == 'b'
+            for message in self.agent.websocket.of_type('command-progress')
+        ))
+        self.release.set()
+        await self._wait_for(lambda: len(self.agent.websocket.of_type('command-response')) == 2)
+
+    async def test_command_timeout(self):
+        """Test a command exceeding its timeout reports a timeout"""
+        self.agent.command_timeouts['collectSystemInfo'] = 0.1
+        await self.agent.handle_message({'type': 'command', 'command': 'collectSystemInfo', 'requestId': 't'})
+
+        await self._wait_for(lambda: self.agent.websocket.of_type('command-response'))
+        payload = self.agent.websocket.of_type('command-response')[0]['payload']
+        self.assertEqual(payload['status'], 'timeout')
+        self.assertFalse(payload['success'])
+
+    async def test_cancel_command(self):
+        """Test a cancel-command message stops a running command"""
+        await self.agent.handle_message({'type': 'command', 'command': 'collectSystemInfo', 'requestId': 'c'})
+        await asyncio.sleep(0.05)
+        await self.agent.handle_message({'type': 'cancel-command', 'requestId': 'c'})
+
+        await self._wait_for(lambda: self.agent.websocket.of_type('command-response'))
+        payload = self.agent.websocket.of_type('command-response')[0]['payload']
+        self.assertEqual(payload['status'], 'cancelled')
+
+
+if __name__ == '__main__':
+    unittest.main()